@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
-from .models import Sklad, AuditLog, Dodavatele, Zarizeni, Varianty, Poptavky, PoptavkaVarianty
+from .models import Sklad, AuditLog, AuditLogArchiv, Dodavatele, Zarizeni, Varianty, Poptavky, PoptavkaVarianty, Inventura, InventuraPolozka, StavSkladu, Sekvence, UkazatelKpi, SpotrebaZarizeni, SpotrebaDiluZarizeni, PrognozaSpotreby
 from simple_history.admin import SimpleHistoryAdmin
 
 # Register your models here.
@@ -12,7 +12,7 @@ from simple_history.admin import SimpleHistoryAdmin
 class SkladAdmin(SimpleHistoryAdmin):
     list_display = ("evidencni_cislo", "interne_cislo", "nazev_dilu", "pod_minimem_display", "poznamka")
     search_fields = ("evidencni_cislo", "nazev_dilu")
-    list_filter = ("kriticky_dil", "ucetnictvi", "datum_nakupu")
+    list_filter = ("kriticky_dil", "ucetnictvi", "abc_trida", "xyz_trida", "datum_nakupu")
 
     history_list_display = ["evidencni_cislo", "nazev_dilu", "dodavatel", "mnozstvi", "min_mnozstvi_ks"]
     history_search_fields = ["nazev_dilu", "dodavatel"]
@@ -32,15 +32,22 @@ class AuditLogAdmin(admin.ModelAdmin):
     def get_fields(self, request, obj=None):
         fields = [
             'ucetnictvi', 'evidencni_cislo', 'interne_cislo', 'objednano', 'nazev_dilu',
-            'zmena_mnozstvi', 'mnozstvi', 'jednotky', 'typ_operace', 'pouzite_zarizeni',
+            'zmena_mnozstvi', 'mnozstvi', 'jednotky', 'typ_operace', 'pouzite_zarizeni', 'zarizeni',
             'umisteni', 'dodavatel', 'datum_vydeje', 'datum_nakupu', 'cislo_objednavky',
             'jednotkova_cena_eur', 'celkova_cena_eur', 'typ_udrzby', 'poznamka',
         ]
         if obj and obj.typ_operace == 'PŘÍJEM':
-            fields = [f for f in fields if f not in ('typ_udrzby', 'pouzite_zarizeni')]
+            fields = [f for f in fields if f not in ('typ_udrzby', 'pouzite_zarizeni', 'zarizeni')]
         return fields
 
 
+@admin.register(AuditLogArchiv)
+class AuditLogArchivAdmin(admin.ModelAdmin):
+    list_display = ("id", "rok", "evidencni_cislo", "nazev_dilu", "zmena_mnozstvi", "jednotky", "datum_nakupu", "datum_vydeje", "typ_operace")
+    search_fields = ("evidencni_cislo__pk", "nazev_dilu")
+    list_filter = ("rok", "ucetnictvi")
+
+
 @admin.register(Dodavatele)
 class DodavateleAdmin(admin.ModelAdmin):
     list_display = ("id", "dodavatel", "jazyk")
@@ -69,4 +76,54 @@ class VariantyAdmin(admin.ModelAdmin):
         nazev_dodavatele = obj.dodavatel.dodavatel
         url= reverse('admin:hpm_sklad_dodavatele_change', args=[pk_dodavatele])
         return format_html('<a href={}>{}</a>', url, nazev_dodavatele)
-    dodavatel_link.short_description = "dodavatel"
\ No newline at end of file
+    dodavatel_link.short_description = "dodavatel"
+
+
+class InventuraPolozkaInline(admin.TabularInline):
+    model = InventuraPolozka
+    fields = ("sklad", "umisteni", "stav_pri_zahajeni", "stav_pri_secteni", "sectene_mnozstvi", "secetl", "cas_secteni")
+    readonly_fields = ("sklad", "umisteni", "stav_pri_zahajeni", "stav_pri_secteni")
+    extra = 0
+
+
+@admin.register(Inventura)
+class InventuraAdmin(admin.ModelAdmin):
+    list_display = ("id", "datum", "umisteni", "stav", "zahajil", "zauctovano")
+    list_filter = ("stav", "datum")
+    inlines = [InventuraPolozkaInline]
+
+
+@admin.register(StavSkladu)
+class StavSkladuAdmin(admin.ModelAdmin):
+    list_display = ("id", "datum", "evidencni_cislo", "mnozstvi", "celkova_cena_eur")
+    search_fields = ("evidencni_cislo__pk", "evidencni_cislo__nazev_dilu")
+    list_filter = ("datum", )
+
+
+@admin.register(Sekvence)
+class SekvenceAdmin(admin.ModelAdmin):
+    list_display = ("nazev", "hodnota")
+
+
+@admin.register(UkazatelKpi)
+class UkazatelKpiAdmin(admin.ModelAdmin):
+    list_display = ("klic", "hodnota")
+
+
+@admin.register(SpotrebaZarizeni)
+class SpotrebaZarizeniAdmin(admin.ModelAdmin):
+    list_display = ("zarizeni", "mesic", "pocet_vydeju", "mnozstvi", "celkem_eur")
+    search_fields = ("zarizeni__kod_zarizeni", )
+    list_filter = ("mesic", )
+
+
+@admin.register(SpotrebaDiluZarizeni)
+class SpotrebaDiluZarizeniAdmin(admin.ModelAdmin):
+    list_display = ("zarizeni", "sklad", "pocet_vydeju", "mnozstvi", "celkem_eur", "posledni_vydej")
+    search_fields = ("zarizeni__kod_zarizeni", "sklad__nazev_dilu")
+
+
+@admin.register(PrognozaSpotreby)
+class PrognozaSpotrebyAdmin(admin.ModelAdmin):
+    list_display = ("sklad", "spotreba_mesic", "odchylka_mesic", "dodaci_lhuta", "doporucene_minimum", "datum_vypoctu")
+    search_fields = ("sklad__evidencni_cislo", "sklad__nazev_dilu")
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class HpmSkladConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hpm_sklad'
+
+    def ready(self):
+        # Registrace příjemců signálů
+        from . import signals  # noqa: F401
+
+        # Registrace systémových kontrol
+        from . import checks  # noqa: F401
+
+        # Jednorázové sestavení schémat pro detailní view
+        from .detail import build_detail_schemas
+        build_detail_schemas()
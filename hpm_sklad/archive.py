@@ -0,0 +1,207 @@
+import logging
+
+from django.db import transaction
+from django.db.models import IntegerField, Max, Value
+from django.http import Http404
+from django.utils import timezone
+
+from .models import AuditLog, AuditLogArchiv
+from .signals import auditlog_delete_signals_disconnected
+from .valuation import movement_date_expression
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+def archived_years():
+    """
+    Vrátí seznam roků, jejichž záznamy audit logu jsou v archivu, seřazený sestupně.
+    """
+    return list(AuditLogArchiv.objects.values_list('rok', flat=True).distinct().order_by('-rok'))
+
+
+def auditlog_models(year=None):
+    """
+    Vrátí modely, ve kterých mohou být záznamy audit logu pro daný rok.
+
+    - Bez zvoleného roku (nebo pro 'VŠE') vrací audit log i archiv.
+    - Roky po posledním archivovaném roce jsou jen v `AuditLog`.
+    - Archivovaný rok může mít část záznamů ještě v audit logu (pohyby dopsané zpětně po archivaci),
+      proto se pro roky do posledního archivovaného roku vrací oba modely.
+    """
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return (AuditLog, AuditLogArchiv)
+    posledni_rok = AuditLogArchiv.objects.aggregate(rok=Max('rok'))['rok']
+    if posledni_rok is None or year > posledni_rok:
+        return (AuditLog,)
+    return (AuditLog, AuditLogArchiv)
+
+
+def combine_auditlogs(querysets, ordering):
+    """
+    Spojí vyfiltrované querysety audit logu a archivu do jednoho seřazeného výběru.
+
+    - Pro jediný queryset ho vrátí seřazený beze změny.
+    - Pro více querysetů vrací `CombinedAuditLog`.
+    """
+    if len(querysets) == 1:
+        return querysets[0].order_by(*ordering)
+    return CombinedAuditLog(querysets, ordering)
+
+
+def auditlog_querysets(queryset):
+    """
+    Vrátí seznam querysetů, ze kterých je výběr audit logu složený (viz `combine_auditlogs`).
+    """
+    return list(getattr(queryset, 'querysets', [queryset]))
+
+
+def find_auditlog(pk):
+    """
+    Vrátí záznam audit logu podle ID z audit logu nebo z archivu (archivované záznamy mají původní ID).
+
+    Vyvolá:
+    - Http404, pokud záznam není ani v jednom z nich.
+    """
+    for model in (AuditLog, AuditLogArchiv):
+        instance = model.objects.filter(pk=pk).first()
+        if instance is not None:
+            return instance
+    raise Http404(f'Záznam audit logu {pk} neexistuje.')
+
+
+def grouped_sums(queryset, group_by, sums, annotations=None):
+    """
+    Sečte pole po skupinách přes všechny tabulky výběru audit logu (viz `auditlog_querysets`).
+
+    Parametry:
+    - queryset: Queryset audit logu nebo `CombinedAuditLog`.
+    - group_by: Pole (nebo anotace), podle kterých se seskupuje.
+    - sums: Slovník {název: agregace Sum(...)}.
+    - annotations: Volitelné anotace, které se přidají před seskupením.
+
+    Vrací:
+    - Seznam slovníků se sloupci `group_by` a součty seřazený podle `group_by` (prázdné hodnoty první).
+    """
+    totals = {}
+    for part in auditlog_querysets(queryset):
+        if annotations:
+            part = part.annotate(**annotations)
+        for row in part.values(*group_by).annotate(**sums).order_by():
+            key = tuple(row[field] for field in group_by)
+            if key in totals:
+                for name in sums:
+                    totals[key][name] = (totals[key][name] or 0) + (row[name] or 0)
+            else:
+                totals[key] = row
+    return sorted(totals.values(), key=lambda row: tuple((row[field] is not None, row[field]) for field in group_by))
+
+
+class CombinedAuditLog:
+    """
+    Záznamy audit logu a archivu jako jeden seřazený výběr pro stránkování, seznamy a exporty.
+
+    - Řazení a stránkování proběhne jedním dotazem UNION ALL nad ID a řadicími sloupci, záznamy
+      vybrané stránky se pak načtou z příslušných tabulek.
+    - Podporuje `count()`, indexování a řezy, iteraci, `filter()`, `exclude()`, `order_by()`
+      a `values_list()` (vrací queryset UNION ALL), takže ho lze předat stránkování i exportům.
+
+    Atributy:
+    - querysets: Vyfiltrované querysety jednotlivých tabulek.
+    - ordering: Řazení (názvy polí, sestupně s '-').
+    - model: `AuditLog`, podle kterého se určují pole exportů.
+    """
+    model = AuditLog
+    CHUNK_SIZE = 2000
+
+    def __init__(self, querysets, ordering):
+        self.querysets = [queryset.order_by() for queryset in querysets]
+        # ID se řadí jako 'pk', aby šlo v UNION vždy odkázat na stejný sloupec
+        self.ordering = [field.replace('id', 'pk') if field.lstrip('-') == 'id' else field for field in ordering]
+        if not any(field.lstrip('-') == 'pk' for field in self.ordering):
+            self.ordering.append('-pk')
+
+    def _clone(self, querysets=None, ordering=None):
+        return CombinedAuditLog(self.querysets if querysets is None else querysets,
+                                self.ordering if ordering is None else ordering)
+
+    def filter(self, *args, **kwargs):
+        return self._clone([queryset.filter(*args, **kwargs) for queryset in self.querysets])
+
+    def exclude(self, *args, **kwargs):
+        return self._clone([queryset.exclude(*args, **kwargs) for queryset in self.querysets])
+
+    def order_by(self, *ordering):
+        return self._clone(ordering=ordering)
+
+    def values_list(self, *fields):
+        """
+        Vrátí queryset UNION ALL se zadanými poli ze všech tabulek seřazený podle `ordering`.
+        """
+        first, *others = [queryset.values_list(*fields) for queryset in self.querysets]
+        return first.union(*others, all=True).order_by(*self.ordering)
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self[key:key + 1][0]
+        columns = ['pk', *(field.lstrip('-') for field in self.ordering if field.lstrip('-') != 'pk')]
+        first, *others = [
+            queryset.annotate(zdroj=Value(index, output_field=IntegerField())).values_list('zdroj', *columns)
+            for index, queryset in enumerate(self.querysets)
+        ]
+        keys = [row[:2] for row in first.union(*others, all=True).order_by(*self.ordering)[key]]
+
+        instances = {}
+        for index, queryset in enumerate(self.querysets):
+            pks = [pk for zdroj, pk in keys if zdroj == index]
+            if pks:
+                instances.update({(index, obj.pk): obj for obj in queryset.filter(pk__in=pks)})
+        return [instances[key] for key in keys]
+
+    def __iter__(self):
+        start = 0
+        while chunk := self[start:start + self.CHUNK_SIZE]:
+            yield from chunk
+            start += self.CHUNK_SIZE
+
+
+def archive_year(rok):
+    """
+    Přesune záznamy audit logu daného uzavřeného roku do archivu `AuditLogArchiv`.
+
+    - Rok záznamu se určuje podle data výdeje, nákupu nebo zápisu (viz `movement_date_expression`).
+    - Záznamy si ponechají původní ID i čas vytvoření, přesun proběhne v jedné transakci po dávkách.
+    - Z audit logu se mažou s odpojenými signály po smazání (`auditlog_delete_signals_disconnected`),
+      protože pohyby v archivu zůstávají součástí ocenění skladu, spotřeby zařízení i snímků stavu skladu.
+    - Záznamy dopsané zpětně do již archivovaného roku se přesunou při dalším spuštění.
+
+    Vrací:
+    - Počet přesunutých záznamů.
+    """
+    if rok >= timezone.localdate().year:
+        raise ValueError(f'Rok {rok} není uzavřený, archivovat lze jen minulé roky.')
+
+    queryset = AuditLog.objects.alias(datum_pohybu=movement_date_expression()).filter(datum_pohybu__year=rok)
+    fields = [field.attname for field in AuditLog._meta.concrete_fields]
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+
+    with transaction.atomic(), auditlog_delete_signals_disconnected():
+        for start in range(0, len(pks), ARCHIVE_BATCH_SIZE):
+            batch = pks[start:start + ARCHIVE_BATCH_SIZE]
+            AuditLogArchiv.objects.bulk_create([
+                AuditLogArchiv(rok=rok, **dict(zip(fields, row)))
+                for row in AuditLog.objects.filter(pk__in=batch).values_list(*fields)
+            ])
+            AuditLog.objects.filter(pk__in=batch).delete()
+
+    logger.info(f'Archivace audit logu za rok {rok}: přesunuto {len(pks)} záznamů')
+    return len(pks)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backendy cache, které nejsou sdílené mezi procesy aplikace.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Upozorní, pokud výchozí cache není sdílená mezi workery.
+
+    Verze cachovaných fragmentů detailu se zneplatňují v cache, při cache v paměti procesu
+    by ostatní workery dál vracely zastaralé detaily.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Warning(
+            'Výchozí cache není sdílená mezi procesy, fragmenty detailu se v ostatních workerech nezneplatní.',
+            hint='Nastavte v CACHES sdílený backend, např. django.core.cache.backends.db.DatabaseCache.',
+            id='hpm_sklad.W001',
+        )]
+    return []
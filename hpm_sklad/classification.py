@@ -0,0 +1,99 @@
+"""
+Klasifikace skladových položek ABC (podle roční spotřeby v EUR) a XYZ (podle variability spotřeby).
+
+Výdeje za posledních 12 celých měsíců se načtou do matic NumPy (viz `forecast.dispatch_matrices`)
+a třídy se spočítají vektorově pro celý katalog v jednom průchodu.
+"""
+from itertools import islice
+import logging
+
+import numpy as np
+
+from .detail import bump_detail_version
+from .forecast import dispatch_matrices
+from .models import Sklad
+
+logger = logging.getLogger(__name__)
+
+CLASSIFICATION_MONTHS = 12
+CLASSIFICATION_BATCH_SIZE = 500
+
+# Podíl na celkové roční spotřebě v EUR, do kterého položky patří do třídy A, resp. B.
+ABC_LIMITS = (0.80, 0.95)
+# Variační koeficient měsíční spotřeby, do kterého položky patří do třídy X, resp. Y.
+XYZ_LIMITS = (0.5, 1.0)
+
+
+def abc_classes(hodnota, limits=ABC_LIMITS):
+    """
+    Přiřadí třídy ABC podle roční spotřeby v EUR.
+
+    - Položky se seřadí sestupně podle spotřeby, položka patří do třídy A, dokud kumulativní podíl
+      položek před ní nedosáhl `limits[0]`, do třídy B do `limits[1]`, ostatní do C.
+    - Položky bez spotřeby jsou vždy v třídě C.
+
+    Vrací:
+    - Pole tříd ('A', 'B', 'C') v pořadí vstupu.
+    """
+    classes = np.full(len(hodnota), 'C', dtype='<U1')
+    celkem = hodnota.sum()
+    if celkem <= 0:
+        return classes
+    poradi = np.argsort(-hodnota, kind='stable')
+    pred = (np.cumsum(hodnota[poradi]) - hodnota[poradi]) / celkem
+    serazene = np.where(pred < limits[0], 'A', np.where(pred < limits[1], 'B', 'C'))
+    classes[poradi] = serazene
+    classes[hodnota <= 0] = 'C'
+    return classes
+
+
+def xyz_classes(mnozstvi, limits=XYZ_LIMITS):
+    """
+    Přiřadí třídy XYZ podle variačního koeficientu měsíční spotřeby (řádek matice = položka).
+
+    - Položky bez spotřeby jsou v třídě Z.
+
+    Vrací:
+    - Pole tříd ('X', 'Y', 'Z') v pořadí řádků.
+    """
+    prumer = mnozstvi.mean(axis=1)
+    odchylka = mnozstvi.std(axis=1, ddof=1) if mnozstvi.shape[1] > 1 else np.zeros(len(mnozstvi))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variacni_koeficient = np.where(prumer > 0, odchylka / prumer, np.inf)
+    return np.where(variacni_koeficient <= limits[0], 'X', np.where(variacni_koeficient <= limits[1], 'Y', 'Z'))
+
+
+def classify_stock(months=CLASSIFICATION_MONTHS, today=None):
+    """
+    Přepočítá třídy ABC a XYZ všech skladových položek a uloží změněné třídy.
+
+    - Audit log se jen čte agregovanými dotazy, nic se v něm nezamyká.
+    - Třídy se zapisují jen u položek, kterým se změnily, hromadným UPDATE po dávkách
+      `CLASSIFICATION_BATCH_SIZE` (každá dávka je krátká samostatná transakce), bez záznamu
+      do historie a bez signálů uložení skladové položky.
+
+    Vrací:
+    - Slovník {(třída ABC, třída XYZ): počet položek} pro všechny položky.
+    """
+    pks, mnozstvi, hodnota = dispatch_matrices(months, today)
+    abc = abc_classes(hodnota.sum(axis=1))
+    xyz = xyz_classes(mnozstvi)
+
+    current = {pk: (abc_trida, xyz_trida) for pk, abc_trida, xyz_trida in Sklad.objects.values_list('pk', 'abc_trida', 'xyz_trida')}
+    changed = {}
+    counts = {}
+    for pk, classes in zip(pks.tolist(), zip(abc.tolist(), xyz.tolist())):
+        counts[classes] = counts.get(classes, 0) + 1
+        if current.get(pk) != classes:
+            changed.setdefault(classes, []).append(pk)
+
+    updated = 0
+    for (abc_trida, xyz_trida), changed_pks in changed.items():
+        batches = iter(changed_pks)
+        while batch := list(islice(batches, CLASSIFICATION_BATCH_SIZE)):
+            updated += Sklad.objects.filter(pk__in=batch).update(abc_trida=abc_trida, xyz_trida=xyz_trida)
+            for pk in batch:
+                bump_detail_version(Sklad, pk)
+
+    logger.info(f'Klasifikace ABC/XYZ za {months} měsíců: {len(pks)} položek, změněno {updated}')
+    return counts
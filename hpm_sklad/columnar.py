@@ -0,0 +1,102 @@
+"""
+Sloupcový export audit logu a skladu do formátu Parquet pro analýzy.
+
+Modul načítá pyarrow, proto ho views a příkazy importují až při exportu. Hodnoty se čtou
+přímo z `values_list` po dávkách a každá dávka se zapíše jako jedna row group, takže se
+celá tabulka nikdy nedrží v paměti.
+"""
+from itertools import islice
+import logging
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .models import Sklad, AuditLog
+
+logger = logging.getLogger(__name__)
+
+ROW_GROUP_SIZE = 50_000
+
+EXPORT_MODELS = {
+    'audit_log': AuditLog,
+    'sklad': Sklad,
+}
+
+ARROW_TYPES = {
+    'AutoField': pa.int64(),
+    'BigAutoField': pa.int64(),
+    'IntegerField': pa.int64(),
+    'BigIntegerField': pa.int64(),
+    'PositiveIntegerField': pa.int64(),
+    'PositiveSmallIntegerField': pa.int64(),
+    'BooleanField': pa.bool_(),
+    'FloatField': pa.float64(),
+    'DateField': pa.date32(),
+    'DateTimeField': pa.timestamp('us', tz='UTC'),
+}
+
+
+def arrow_type(field):
+    """
+    Vrátí typ pyarrow pro pole modelu (cizí klíč podle typu odkazovaného pole, ostatní pole jako text).
+    """
+    if field.many_to_one or field.one_to_one:
+        field = field.target_field
+    internal_type = field.get_internal_type()
+    if internal_type == 'DecimalField':
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    return ARROW_TYPES.get(internal_type, pa.string())
+
+
+def export_schema(model):
+    """
+    Sestaví schéma exportu modelu: všechna sloupcová pole v pořadí podle modelu (cizí klíče jako `<pole>_id`).
+
+    Vrací:
+    - Dvojici (seznam názvů polí pro `values_list`, `pyarrow.Schema`).
+    """
+    fields = model._meta.concrete_fields
+    schema = pa.schema([pa.field(field.attname, arrow_type(field), nullable=field.null) for field in fields])
+    return [field.attname for field in fields], schema
+
+
+def record_batches(queryset, row_group_size=ROW_GROUP_SIZE):
+    """
+    Generuje dávky (`pyarrow.RecordBatch`) o nejvýše `row_group_size` řádcích z querysetu seřazeného podle pk.
+    """
+    fields, schema = export_schema(queryset.model)
+    rows = queryset.order_by('pk').values_list(*fields).iterator(chunk_size=min(row_group_size, 2000))
+    while chunk := list(islice(rows, row_group_size)):
+        columns = zip(*chunk)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+        )
+
+
+def write_parquet(queryset, sink, since_id=None, row_group_size=ROW_GROUP_SIZE):
+    """
+    Zapíše záznamy querysetu do souboru Parquet se zachováním datových typů.
+
+    Parametry:
+    - queryset: Queryset exportovaného modelu (může být vyfiltrovaný).
+    - sink: Cesta k souboru nebo binární stream.
+    - since_id: Exportuje jen záznamy s pk větším než zadané (přírůstkový export).
+    - row_group_size: Maximální počet řádků v jedné row group.
+
+    Vrací:
+    - Dvojici (počet exportovaných řádků, pk posledního exportovaného záznamu nebo `since_id`).
+    """
+    if since_id is not None:
+        queryset = queryset.filter(pk__gt=since_id)
+
+    _, schema = export_schema(queryset.model)
+    count = 0
+    last_id = since_id
+    with pq.ParquetWriter(sink, schema, compression='zstd') as writer:
+        for batch in record_batches(queryset, row_group_size):
+            writer.write_batch(batch)
+            count += batch.num_rows
+            last_id = batch.column(queryset.model._meta.pk.attname)[-1].as_py()
+
+    logger.info(f'Export {queryset.model.__name__} do Parquet: {count} řádků, poslední pk {last_id}')
+    return count, last_id
@@ -0,0 +1,246 @@
+import copy
+import operator
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import QueryDict, Http404
+from django.urls import resolve, reverse, NoReverseMatch
+from django.utils.functional import SimpleLazyObject
+
+DetailRow = namedtuple('DetailRow', ['name', 'verbose_name', 'value'])
+
+
+class DetailField:
+    """
+    Předpočítaný popis jednoho řádku detailu: název, popisek a funkce pro získání zobrazované hodnoty.
+    """
+    __slots__ = ('name', 'verbose_name', 'accessor')
+
+    def __init__(self, name, verbose_name, accessor):
+        self.name = name
+        self.verbose_name = verbose_name
+        self.accessor = accessor
+
+    def row(self, obj):
+        return DetailRow(self.name, self.verbose_name, self.accessor(obj))
+
+
+def _bool_accessor(name):
+    getter = operator.attrgetter(name)
+    return lambda obj: "ANO" if getter(obj) else "NE"
+
+
+def _many_to_many_accessor(name):
+    getter = operator.attrgetter(name)
+    return lambda obj: ", ".join(str(related) for related in getter(obj).all())
+
+
+class DetailSchema:
+    """
+    Předpočítané schéma detailu modelu.
+
+    - Obsahuje seznam polí v pořadí podle modelu s připravenými funkcemi pro hodnoty
+      (boolean jako ANO/NE, cizí klíče jako text navázaného objektu, many to many jako seznam).
+    - Udržuje seznam vazeb, které má view načíst pomocí `select_related` / `prefetch_related`.
+    """
+    def __init__(self, model, fields=None, exclude=(), extra=()):
+        self.fields = []
+        self.select_related = []
+        self.prefetch_related = []
+
+        model_fields = [*model._meta.fields, *model._meta.many_to_many]
+        if fields is not None:
+            model_fields = [model._meta.get_field(name) for name in fields]
+
+        for field in model_fields:
+            if field.name in exclude:
+                continue
+            if field.many_to_many:
+                accessor = _many_to_many_accessor(field.name)
+                self.prefetch_related.append(field.name)
+            elif field.get_internal_type() == 'BooleanField':
+                accessor = _bool_accessor(field.name)
+            else:
+                accessor = operator.attrgetter(field.name)
+                if field.many_to_one or field.one_to_one:
+                    self.select_related.append(field.name)
+            self.fields.append(DetailField(field.name, field.verbose_name, accessor))
+
+        for name, verbose_name, accessor in extra:
+            self.fields.append(DetailField(name, verbose_name, accessor))
+
+    def rows(self, obj):
+        """
+        Vrátí řádky detailu (název, popisek, hodnota) pro danou instanci.
+        """
+        return [field.row(obj) for field in self.fields]
+
+
+DETAIL_SCHEMAS = {}
+
+
+def register_detail_schema(model, name='detail', **kwargs):
+    DETAIL_SCHEMAS[(model, name)] = DetailSchema(model, **kwargs)
+
+
+def get_detail_schema(model, name='detail'):
+    return DETAIL_SCHEMAS[(model, name)]
+
+
+DETAIL_VERSION_KEY = 'hpm_sklad:detail-version:{}:{}'
+
+
+def detail_version(model, pk):
+    """
+    Vrátí verzi detailu objektu pro klíč cache fragmentu, při prvním dotazu ji založí.
+
+    - Verze je ve výchozí cache, která musí být sdílená mezi workery (viz `checks.check_shared_cache`),
+      aby zneplatnění v jednom procesu platilo i v ostatních.
+    """
+    key = DETAIL_VERSION_KEY.format(model._meta.label_lower, pk)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_detail_version(model, pk):
+    """
+    Zneplatní cachované fragmenty detailu objektu nastavením nové verze.
+
+    - Verze se změní až po potvrzení transakce, jinak by souběžný požadavek mohl pod novou verzí
+      uložit fragment vykreslený z dat před změnou.
+    """
+    key = DETAIL_VERSION_KEY.format(model._meta.label_lower, pk)
+    transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
+
+
+def build_detail_schemas():
+    """
+    Sestaví schémata detailů všech modelů, volá se jednou při startu aplikace.
+    """
+    from .models import Sklad, AuditLog, AuditLogArchiv, Dodavatele, Zarizeni, Poptavky
+
+    register_detail_schema(Sklad, exclude=('nazev_dilu', 'ucetnictvi', 'kriticky_dil', 'zarizeni', 'abc_trida', 'xyz_trida'))
+    register_detail_schema(
+        Sklad, 'info', fields=('ucetnictvi', 'kriticky_dil', 'abc_trida', 'xyz_trida'),
+        extra=[('pod_minimem', 'Pod minimem', Sklad.pod_minimem_display)],
+    )
+    register_detail_schema(AuditLog, exclude=('zarizeni',))
+    register_detail_schema(AuditLogArchiv, exclude=('rok', 'zarizeni'))
+    register_detail_schema(Dodavatele)
+    register_detail_schema(Zarizeni)
+    register_detail_schema(Poptavky)
+
+
+class DetailFragmentMixin:
+    """
+    Mixin pro fragmentové endpointy pravého panelu seznamu.
+
+    - Objekt se načte jedním dotazem bez `select_related` / `prefetch_related` schémat;
+      navázané objekty se načtou až při vykreslení řádků, tedy jen při výpadku cache fragmentu.
+    - Do kontextu přidá `fragment`, podle kterého šablona vynechá části plného detailu,
+      které do panelu nepatří.
+    """
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['fragment'] = True
+        return context
+
+
+class DetailSchemaMixin:
+    """
+    Mixin pro detailní view, který do kontextu vkládá řádky podle předpočítaných schémat.
+
+    Atributy:
+    - detail_schemas: Slovník {název proměnné v kontextu: název schématu}.
+    """
+    detail_schemas = {'detail_item_fields': 'detail'}
+
+    def get_schemas(self):
+        return {context_name: get_detail_schema(self.model, name) for context_name, name in self.detail_schemas.items()}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        schemas = self.get_schemas().values()
+        select_related = {name for schema in schemas for name in schema.select_related}
+        prefetch_related = {name for schema in schemas for name in schema.prefetch_related}
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        """
+        Řádky se vyhodnotí až při vykreslení, takže při zásahu do cache fragmentu se vůbec nepočítají.
+        """
+        context = super().get_context_data(**kwargs)
+        for context_name, schema in self.get_schemas().items():
+            context[context_name] = SimpleLazyObject(lambda schema=schema: schema.rows(self.object))
+        context['detail_version'] = detail_version(self.model, self.object.pk)
+        return context
+
+
+def render_detail_panel(request, url_name, pk):
+    """
+    Vykreslí na serveru obsah pravého panelu (detailu) pro objekt s daným pk.
+
+    - Použije stejné view jako fragmentový endpoint, ale bez parametrů seznamu v GET.
+    - Vrací None, pokud view nevrátí vykreslitelnou odpověď (např. chybí oprávnění).
+    """
+    try:
+        url = reverse(url_name, kwargs={'pk': pk})
+    except NoReverseMatch:
+        return None
+    match = resolve(url)
+
+    panel_request = copy.copy(request)
+    panel_request.method = 'GET'
+    panel_request.GET = QueryDict()
+    panel_request.path = panel_request.path_info = url
+    panel_request.resolver_match = match
+
+    try:
+        response = match.func(panel_request, *match.args, **match.kwargs)
+    except Http404:
+        return None
+    if response.status_code != 200 or not hasattr(response, 'rendered_content'):
+        return None
+    return response.rendered_content
+
+
+class DetailPanelMixin:
+    """
+    Mixin pro seznamy s pravým panelem, který detail vybraného (nebo prvního) řádku
+    vloží přímo do stránky, takže prohlížeč nemusí posílat druhý požadavek.
+
+    Atributy:
+    - detail_panel_url_name: Název URL fragmentového endpointu detailu, který přijímá parametr `pk`.
+    """
+    detail_panel_url_name = None
+
+    def get_detail_panel_pk(self, context):
+        selected = self.request.GET.get('selected')
+        if selected:
+            return selected
+        # iterace načte celý (stránkovaný) queryset, který pak šablona použije bez dalšího dotazu
+        first = next(iter(context.get('object_list') or ()), None)
+        return first.pk if first is not None else None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if getattr(self.request, 'htmx', False) or not self.detail_panel_url_name:
+            return context
+        pk = self.get_detail_panel_pk(context)
+        if pk is not None:
+            context['detail_panel'] = render_detail_panel(self.request, self.detail_panel_url_name, pk)
+            context['detail_panel_pk'] = pk
+        return context
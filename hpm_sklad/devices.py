@@ -0,0 +1,91 @@
+import logging
+from functools import lru_cache
+
+from user_agents import parse
+
+logger = logging.getLogger(__name__)
+
+DEVICE_PC = 'pc'
+DEVICE_MOBILE = 'mobile'
+DEVICE_TABLET = 'tablet'
+DEVICE_BOT = 'bot'
+DEVICE_OTHER = 'other'
+
+USER_AGENT_CACHE_SIZE = 1024
+# Po kolika klasifikovaných požadavcích se do logu zapíše úspěšnost cache.
+STATS_LOG_INTERVAL = 1000
+
+_classified_requests = 0
+
+
+@lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def classify_user_agent(user_agent_string):
+    """
+    Zařadí řetězec user agenta do třídy zařízení.
+
+    Výsledek se drží v omezené LRU cache sdílené v rámci procesu, takže se stejný
+    řetězec parsuje pomocí ua-parser jen jednou.
+    """
+    user_agent = parse(user_agent_string)
+    if user_agent.is_bot:
+        device = DEVICE_BOT
+    elif user_agent.is_tablet:
+        device = DEVICE_TABLET
+    elif user_agent.is_mobile:
+        device = DEVICE_MOBILE
+    elif user_agent.is_pc:
+        device = DEVICE_PC
+    else:
+        device = DEVICE_OTHER
+
+    logger.debug(f'Klasifikace nového user agenta: {device}')
+    return device
+
+
+def get_device_class(request):
+    """
+    Vrátí třídu zařízení pro požadavek, v rámci jednoho požadavku se určuje jen jednou.
+    """
+    global _classified_requests
+
+    device = getattr(request, '_device_class', None)
+    if device is None:
+        device = classify_user_agent(request.META.get('HTTP_USER_AGENT', ''))
+        request._device_class = device
+        _classified_requests += 1
+        if _classified_requests % STATS_LOG_INTERVAL == 0:
+            _log_cache_stats()
+    return device
+
+
+def is_pc(request):
+    return get_device_class(request) == DEVICE_PC
+
+
+def device_context(request):
+    """
+    Context processor: zpřístupní šablonám třídu zařízení (`device_class`) a příznak `is_pc`.
+    """
+    device = get_device_class(request)
+    return {'device_class': device, 'is_pc': device == DEVICE_PC}
+
+
+def device_cache_stats():
+    """
+    Vrací statistiky cache klasifikace user agentů (zásahy, výpadky, velikost, úspěšnost).
+    """
+    info = classify_user_agent.cache_info()
+    total = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'currsize': info.currsize,
+        'maxsize': info.maxsize,
+        'hit_rate': info.hits / total if total else 0.0,
+    }
+
+
+def _log_cache_stats():
+    stats = device_cache_stats()
+    logger.info(f'Cache klasifikace user agentů: úspěšnost {stats["hit_rate"]:.1%}, zásahy {stats["hits"]}, '
+                f'výpadky {stats["misses"]}, velikost {stats["currsize"]}/{stats["maxsize"]}')
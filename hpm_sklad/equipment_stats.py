@@ -0,0 +1,200 @@
+import datetime
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
+from django.utils import timezone
+
+from .models import AuditLog, AuditLogArchiv, Zarizeni, SpotrebaZarizeni, SpotrebaDiluZarizeni
+from .valuation import movement_date_expression
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_MONTHS = 12
+DASHBOARD_TOP_PARTS = 10
+
+
+def backfill_auditlog_zarizeni():
+    """
+    Doplní odkaz na zařízení do výdejů v audit logu i v archivu podle kódu v `pouzite_zarizeni`.
+
+    - Kód se porovnává bez ohledu na velikost písmen (výdej ukládá kód velkými písmeny).
+    - Pro každé zařízení proběhne jediný UPDATE, záznamy s odkazem už vyplněným se nemění.
+
+    Vrací:
+    - Počet doplněných záznamů.
+    """
+    count = 0
+    for pk, kod_zarizeni in Zarizeni.objects.values_list('pk', 'kod_zarizeni'):
+        for model in (AuditLog, AuditLogArchiv):
+            count += model.objects.filter(
+                zarizeni__isnull=True, pouzite_zarizeni__iexact=kod_zarizeni
+            ).update(zarizeni=pk)
+    logger.info(f'Doplnění zařízení do audit logu: {count} záznamů')
+    return count
+
+
+def _dispatches(model):
+    return model.objects.filter(typ_operace='VÝDEJ', zarizeni__isnull=False)
+
+
+def rebuild_equipment_totals():
+    """
+    Přepočítá předpočítanou spotřebu zařízení (po měsících a po dílech) z audit logu i archivu.
+
+    - Spotřeba se ukládá kladně (vydané množství a cena výdeje), měsíc výdeje se určuje
+      podle `movement_date_expression`.
+    - Čtení audit logu i přepsání souhrnů proběhne v jedné transakci, takže detail zařízení nikdy nevidí
+      prázdné souhrny. Řádky souhrnů se na začátku zamknou: souběžný výdej počká, až přepočet skončí,
+      a připočte se k novým souhrnům, místo aby se jeho přírůstek přepsal. Souběžný výdej, který zakládá
+      dosud neexistující řádek, přepočet zastaví chybou unikátnosti a přepočet je třeba spustit znovu.
+
+    Vrací:
+    - Dvojici (počet řádků měsíční spotřeby, počet řádků spotřeby dílů).
+    """
+    with transaction.atomic():
+        list(SpotrebaZarizeni.objects.select_for_update().values_list('pk', flat=True))
+        list(SpotrebaDiluZarizeni.objects.select_for_update().values_list('pk', flat=True))
+
+        mesice = {}
+        dily = {}
+        for model in (AuditLog, AuditLogArchiv):
+            rows = _dispatches(model).annotate(
+                mesic=TruncMonth(movement_date_expression())
+            ).values('zarizeni_id', 'mesic').annotate(
+                pocet=Count('pk'), mnozstvi=Sum('zmena_mnozstvi'), celkem=Sum('celkova_cena_eur')
+            ).order_by()
+            for row in rows:
+                totals = mesice.setdefault((row['zarizeni_id'], row['mesic']), [0, 0, 0.0])
+                totals[0] += row['pocet']
+                totals[1] -= row['mnozstvi'] or 0
+                totals[2] -= row['celkem'] or 0.0
+
+            rows = _dispatches(model).values('zarizeni_id', 'evidencni_cislo_id').annotate(
+                pocet=Count('pk'), mnozstvi=Sum('zmena_mnozstvi'), celkem=Sum('celkova_cena_eur'),
+                posledni=Max(movement_date_expression()),
+            ).order_by()
+            for row in rows:
+                if row['evidencni_cislo_id'] is None:
+                    continue
+                totals = dily.setdefault((row['zarizeni_id'], row['evidencni_cislo_id']), [0, 0, 0.0, None])
+                totals[0] += row['pocet']
+                totals[1] -= row['mnozstvi'] or 0
+                totals[2] -= row['celkem'] or 0.0
+                totals[3] = max(filter(None, (totals[3], row['posledni'])), default=None)
+
+        SpotrebaZarizeni.objects.all().delete()
+        SpotrebaDiluZarizeni.objects.all().delete()
+        SpotrebaZarizeni.objects.bulk_create([
+            SpotrebaZarizeni(zarizeni_id=zarizeni_id, mesic=mesic, pocet_vydeju=pocet, mnozstvi=mnozstvi,
+                             celkem_eur=round(celkem, 2))
+            for (zarizeni_id, mesic), (pocet, mnozstvi, celkem) in mesice.items()
+        ], batch_size=500)
+        SpotrebaDiluZarizeni.objects.bulk_create([
+            SpotrebaDiluZarizeni(zarizeni_id=zarizeni_id, sklad_id=sklad_id, pocet_vydeju=pocet, mnozstvi=mnozstvi,
+                                 celkem_eur=round(celkem, 2), posledni_vydej=posledni)
+            for (zarizeni_id, sklad_id), (pocet, mnozstvi, celkem, posledni) in dily.items()
+        ], batch_size=500)
+
+    logger.info(f'Přepočet spotřeby zařízení: {len(mesice)} měsíčních řádků, {len(dily)} řádků dílů')
+    return len(mesice), len(dily)
+
+
+def _add_totals(model, lookup, sign, mnozstvi, celkem_eur, posledni_vydej=None):
+    """
+    Připočte (sign=1) nebo odečte (sign=-1) jeden výdej k řádku souhrnu jediným UPDATE,
+    chybějící řádek založí a řádek bez výdejů smaže.
+    """
+    changes = {
+        'pocet_vydeju': F('pocet_vydeju') + sign,
+        'mnozstvi': F('mnozstvi') + sign * mnozstvi,
+        'celkem_eur': F('celkem_eur') + sign * celkem_eur,
+    }
+    if posledni_vydej is not None:
+        changes['posledni_vydej'] = Greatest(Coalesce('posledni_vydej', Value(posledni_vydej)), Value(posledni_vydej))
+
+    with transaction.atomic():
+        if model.objects.filter(**lookup).update(**changes):
+            if sign < 0:
+                model.objects.filter(**lookup, pocet_vydeju__lte=0).delete()
+            return
+        if sign < 0:
+            return
+        create = {'pocet_vydeju': 1, 'mnozstvi': mnozstvi, 'celkem_eur': celkem_eur}
+        if posledni_vydej is not None:
+            create['posledni_vydej'] = posledni_vydej
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup, **create)
+        except IntegrityError:
+            # řádek mezitím založil souběžný výdej
+            model.objects.filter(**lookup).update(**changes)
+
+
+def _apply_dispatch(stav, sign):
+    typ_operace, _, zarizeni_id, evidencni_cislo, datum, zmena_mnozstvi, celkova_cena_eur = stav
+    if typ_operace != 'VÝDEJ' or zarizeni_id is None:
+        return
+    mnozstvi = -(zmena_mnozstvi or 0)
+    celkem_eur = -(celkova_cena_eur or 0.0)
+
+    _add_totals(
+        SpotrebaZarizeni, {'zarizeni_id': zarizeni_id, 'mesic': datum.replace(day=1)},
+        sign, mnozstvi, celkem_eur,
+    )
+    if evidencni_cislo is not None:
+        _add_totals(
+            SpotrebaDiluZarizeni, {'zarizeni_id': zarizeni_id, 'sklad_id': evidencni_cislo},
+            sign, mnozstvi, celkem_eur, posledni_vydej=datum if sign > 0 else None,
+        )
+
+
+def update_equipment_totals(puvodni, novy):
+    """
+    Promítne zápis, úpravu nebo smazání pohybu do předpočítané spotřeby zařízení: odečte původní
+    stav výdeje a připočte nový (viz `AuditLog.current_spotreba_stav`, None znamená žádný stav).
+
+    - Záznamy, které nejsou výdejem pro zařízení, se ignorují.
+    - Datum posledního výdeje dílu se při odečtení nesnižuje, opraví ho až `rebuild_equipment_totals`.
+    """
+    if puvodni == novy:
+        return
+    if puvodni is not None:
+        _apply_dispatch(puvodni, -1)
+    if novy is not None:
+        _apply_dispatch(novy, 1)
+
+
+def equipment_dashboard(zarizeni, months=DASHBOARD_MONTHS, top_parts=DASHBOARD_TOP_PARTS):
+    """
+    Připraví přehled spotřeby zařízení z předpočítaných souhrnů (dva dotazy nezávislé na počtu pohybů).
+
+    Vrací:
+    - Slovník s měsíční spotřebou za posledních `months` měsíců (`mesice`, od nejstaršího, včetně měsíců
+      bez výdeje), součty za toto období (`celkem_eur`, `mnozstvi`, `pocet_vydeju`)
+      a `top_parts` nejdražších dílů za celou dobu (`dily`).
+    """
+    mesic = timezone.localdate().replace(day=1)
+    mesice = []
+    for _ in range(months):
+        mesice.append(mesic)
+        mesic = (mesic - datetime.timedelta(days=1)).replace(day=1)
+    mesice.reverse()
+
+    ulozene = {
+        spotreba.mesic: spotreba
+        for spotreba in SpotrebaZarizeni.objects.filter(zarizeni=zarizeni, mesic__gte=mesice[0])
+    }
+    rows = [ulozene.get(mesic) or SpotrebaZarizeni(zarizeni=zarizeni, mesic=mesic) for mesic in mesice]
+    dily = list(
+        SpotrebaDiluZarizeni.objects.filter(zarizeni=zarizeni).select_related('sklad')
+        .order_by('-celkem_eur')[:top_parts]
+    )
+    return {
+        'mesice': rows,
+        'celkem_eur': round(sum(row.celkem_eur for row in rows), 2),
+        'mnozstvi': sum(row.mnozstvi for row in rows),
+        'pocet_vydeju': sum(row.pocet_vydeju for row in rows),
+        'dily': dily,
+    }
@@ -0,0 +1,54 @@
+import json
+import logging
+
+from django.db.models import Max
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+STOCK_EVENTS_BATCH = 200
+
+# Sloupce audit logu a skladové položky, ze kterých se sestavují data události.
+STOCK_EVENT_FIELDS = ('pk', 'evidencni_cislo_id', 'mnozstvi', 'evidencni_cislo__min_mnozstvi_ks', 'typ_operace', 'zmena_mnozstvi')
+
+
+def latest_stock_event_id():
+    """
+    Vrátí ID posledního záznamu audit logu (0 pro prázdný audit log), od kterého začíná nový odběratel.
+    """
+    return AuditLog.objects.aggregate(posledni=Max('pk'))['posledni'] or 0
+
+
+def stock_events_since(last_id, limit=STOCK_EVENTS_BATCH):
+    """
+    Vrátí události o změnách stavu skladu zapsané po záznamu audit logu `last_id`.
+
+    - Události se čtou z databáze s kurzorem na ID audit logu, takže odběratel vidí pohyby
+      zapsané kterýmkoli procesem (workerem) aplikace a po výpadku spojení se dorovná
+      podle hlavičky `Last-Event-ID`.
+    - Pořadové číslo události je ID záznamu audit logu, množství je stav položky po pohybu.
+
+    Vrací:
+    - Seznam dvojic (ID záznamu, data události) seřazený podle ID, nejvýše `limit` událostí.
+    """
+    rows = AuditLog.objects.filter(pk__gt=last_id).order_by('pk').values_list(*STOCK_EVENT_FIELDS)[:limit]
+    return [
+        (pk, {
+            'evidencni_cislo': evidencni_cislo,
+            'mnozstvi': mnozstvi,
+            'min_mnozstvi_ks': min_mnozstvi_ks,
+            'pod_minimem': mnozstvi < min_mnozstvi_ks,
+            'typ_operace': typ_operace,
+            'zmena_mnozstvi': zmena_mnozstvi,
+        })
+        for pk, evidencni_cislo, mnozstvi, min_mnozstvi_ks, typ_operace, zmena_mnozstvi in rows
+    ]
+
+
+def format_sse(event):
+    """
+    Naformátuje událost (id, data) do textového formátu server-sent events.
+    """
+    event_id, data = event
+    return f"id: {event_id}\nevent: stock\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,63 @@
+import json
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import AuditLog, AuditLogArchiv
+
+logger = logging.getLogger(__name__)
+
+FEED_DEFAULT_LIMIT = 1000
+FEED_MAX_LIMIT = 5000
+
+# Sloupce kanálu změn: všechna pole audit logu, cizí klíče jako ID (`evidencni_cislo_id`, `operaci_provedl_id`).
+FEED_FIELDS = tuple(field.attname for field in AuditLog._meta.concrete_fields)
+
+
+def changes_since(after=0, limit=FEED_DEFAULT_LIMIT):
+    """
+    Vrátí dávku záznamů audit logu s ID větším než `after`, seřazenou podle ID.
+
+    - Čte i z archivu uzavřených roků (archivované záznamy mají původní ID), takže odběratel,
+      který je pozadu, nepřijde o záznamy přesunuté do archivu.
+    - Kurzor je ID záznamu: ID v audit logu rostou, nový pohyb má vždy vyšší ID než ty předchozí.
+
+    Parametry:
+    - after: ID posledního záznamu, který odběratel už má (0 = od začátku).
+    - limit: Maximální počet záznamů v dávce (omezený na `FEED_MAX_LIMIT`).
+
+    Vrací:
+    - Trojici (seznam řádků jako n-tice v pořadí `FEED_FIELDS`, high-water mark, zda jsou další záznamy).
+      High-water mark je ID posledního vráceného záznamu, bez nových záznamů zůstává `after`.
+    """
+    limit = max(1, min(limit, FEED_MAX_LIMIT))
+    rows = []
+    for model in (AuditLogArchiv, AuditLog):
+        rows.extend(model.objects.filter(pk__gt=after).order_by('pk').values_list(*FEED_FIELDS)[:limit + 1])
+    rows.sort(key=lambda row: row[0])
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    high_water_mark = rows[-1][0] if rows else after
+    logger.debug(f'Kanál změn audit logu od ID {after}: {len(rows)} záznamů, high-water mark {high_water_mark}')
+    return rows, high_water_mark, has_more
+
+
+def to_ndjson(rows):
+    """
+    Převede řádky na NDJSON: jeden JSON objekt se sloupci `FEED_FIELDS` na řádek.
+    """
+    return ''.join(
+        json.dumps(dict(zip(FEED_FIELDS, row)), cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n'
+        for row in rows
+    )
+
+
+def to_compact_json(rows, high_water_mark, has_more):
+    """
+    Převede dávku na kompaktní JSON: názvy sloupců jednou v `columns`, řádky jako pole hodnot.
+    """
+    return json.dumps(
+        {'columns': FEED_FIELDS, 'rows': rows, 'high_water_mark': high_water_mark, 'has_more': has_more},
+        cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'),
+    )
@@ -0,0 +1,169 @@
+"""
+Prognóza spotřeby skladových položek a doporučená minima.
+
+Měsíční výdeje všech položek se načtou jedním agregovaným dotazem do matice NumPy
+(řádek = položka, sloupec = měsíc) a spotřeba, variabilita i doporučené minimum se
+spočítají vektorově pro celý katalog najednou.
+"""
+import datetime
+import logging
+import math
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Min, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Sklad, AuditLog, AuditLogArchiv, Varianty, PrognozaSpotreby
+from .valuation import movement_date_expression
+
+logger = logging.getLogger(__name__)
+
+FORECAST_MONTHS = 24
+DEFAULT_LEAD_TIME_DAYS = 30
+DAYS_PER_MONTH = 365.25 / 12
+
+# Úroveň obsluhy v procentech: koeficient normálního rozdělení pro pojistnou zásobu.
+SERVICE_LEVELS = {
+    90: 1.28,
+    95: 1.65,
+    98: 2.05,
+    99: 2.33,
+}
+DEFAULT_SERVICE_LEVEL = 95
+
+
+def _month_index(datum):
+    return datum.year * 12 + datum.month - 1
+
+
+def forecast_period(months=FORECAST_MONTHS, today=None):
+    """
+    Vrátí období prognózy: posledních `months` celých měsíců před aktuálním měsícem.
+
+    Vrací:
+    - Dvojici (první den prvního měsíce, první den aktuálního měsíce), konec je vyloučen.
+    """
+    do = (today or timezone.localdate()).replace(day=1)
+    index = _month_index(do) - months
+    return datetime.date(index // 12, index % 12 + 1, 1), do
+
+
+def dispatch_matrices(months=FORECAST_MONTHS, today=None):
+    """
+    Sestaví matice měsíčního vydaného množství a hodnoty výdejů všech skladových položek
+    (jeden agregovaný dotaz na audit log a jeden na archiv).
+
+    - Zahrnuje výdeje z audit logu i archivu kromě inventurních rozdílů, které nejsou spotřebou.
+    - Měsíc pohybu se určuje podle `movement_date_expression`.
+    - Dotazy jen čtou, nezamykají audit log ani skladové položky.
+
+    Vrací:
+    - Trojici (pole pk skladových položek seřazené vzestupně, matice vydaného množství,
+      matice hodnoty výdejů v EUR), matice mají rozměry počet položek × `months`.
+    """
+    od, do = forecast_period(months, today)
+    pks = np.fromiter(Sklad.objects.order_by('pk').values_list('pk', flat=True), dtype=np.int64)
+    mnozstvi_matrix = np.zeros((len(pks), months))
+    hodnota_matrix = np.zeros((len(pks), months))
+
+    for model in (AuditLog, AuditLogArchiv):
+        rows = model.objects.alias(datum_pohybu=movement_date_expression()).filter(
+            typ_operace='VÝDEJ', evidencni_cislo__isnull=False, datum_pohybu__gte=od, datum_pohybu__lt=do,
+        ).exclude(typ_udrzby='Inventura').values_list(
+            'evidencni_cislo_id', TruncMonth('datum_pohybu')
+        ).annotate(mnozstvi=Sum('zmena_mnozstvi'), hodnota=Sum('celkova_cena_eur')).order_by()
+        rows = list(rows)
+        if not rows:
+            continue
+        ids, mesice, mnozstvi, hodnota = zip(*rows)
+        radky = np.searchsorted(pks, np.array(ids, dtype=np.int64))
+        sloupce = np.array([_month_index(mesic) for mesic in mesice]) - _month_index(od)
+        # výdeje jsou v audit logu záporné
+        np.add.at(mnozstvi_matrix, (radky, sloupce), -np.array(mnozstvi, dtype=float))
+        np.add.at(hodnota_matrix, (radky, sloupce), -np.array([h or 0.0 for h in hodnota], dtype=float))
+
+    return pks, mnozstvi_matrix, hodnota_matrix
+
+
+def monthly_dispatch_matrix(months=FORECAST_MONTHS, today=None):
+    """
+    Vrátí dvojici (pole pk skladových položek, matice měsíčního vydaného množství), viz `dispatch_matrices`.
+    """
+    pks, mnozstvi_matrix, _ = dispatch_matrices(months, today)
+    return pks, mnozstvi_matrix
+
+
+def lead_times(pks, default=DEFAULT_LEAD_TIME_DAYS):
+    """
+    Vrátí pole dodacích lhůt v dnech pro skladové položky `pks` (nejkratší ze všech variant položky,
+    bez varianty `default`).
+    """
+    lhuty = np.full(len(pks), default, dtype=np.int64)
+    rows = list(
+        Varianty.objects.values('sklad_id')
+        .annotate(lhuta=Min('dodaci_lhuta')).values_list('sklad_id', 'lhuta').order_by()
+    )
+    if rows:
+        ids, hodnoty = zip(*rows)
+        lhuty[np.searchsorted(pks, np.array(ids, dtype=np.int64))] = hodnoty
+    return lhuty
+
+
+def recommended_minimums(matrix, lhuty, z=SERVICE_LEVELS[DEFAULT_SERVICE_LEVEL]):
+    """
+    Spočítá vektorově spotřebu, variabilitu a doporučené minimum pro všechny řádky matice.
+
+    - Doporučené minimum = průměrná spotřeba za dodací lhůtu + pojistná zásoba
+      z · σ · √(dodací lhůta v měsících), zaokrouhleno nahoru.
+
+    Vrací:
+    - Čtveřici polí (průměrná měsíční spotřeba, směrodatná odchylka, variační koeficient
+      s NaN pro položky bez spotřeby, doporučené minimum).
+    """
+    prumer = matrix.mean(axis=1)
+    odchylka = matrix.std(axis=1, ddof=1) if matrix.shape[1] > 1 else np.zeros(len(matrix))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variacni_koeficient = np.where(prumer > 0, odchylka / prumer, np.nan)
+    lhuta_mesice = lhuty / DAYS_PER_MONTH
+    # tolerance proti zaokrouhlení např. 2.0000000001 nahoru na 3
+    minimum = np.ceil(prumer * lhuta_mesice + z * odchylka * np.sqrt(lhuta_mesice) - 1e-9)
+    return prumer, odchylka, variacni_koeficient, np.maximum(minimum, 0).astype(np.int64)
+
+
+def forecast_minimums(months=FORECAST_MONTHS, service_level=DEFAULT_SERVICE_LEVEL, today=None):
+    """
+    Přepočítá a uloží prognózu spotřeby a doporučené minimum pro všechny skladové položky.
+
+    - Výsledky nahradí předchozí prognózu v jedné transakci, ruční minimum (`min_mnozstvi_ks`) se nemění.
+
+    Parametry:
+    - months: Počet celých měsíců historie výdejů.
+    - service_level: Úroveň obsluhy v procentech (klíč `SERVICE_LEVELS`).
+
+    Vrací:
+    - Počet položek s prognózou.
+    """
+    pks, matrix = monthly_dispatch_matrix(months, today)
+    lhuty = lead_times(pks)
+    prumer, odchylka, variacni_koeficient, minimum = recommended_minimums(matrix, lhuty, SERVICE_LEVELS[service_level])
+    datum_vypoctu = today or timezone.localdate()
+
+    prognozy = [
+        PrognozaSpotreby(
+            sklad_id=pk, spotreba_mesic=round(spotreba, 3), odchylka_mesic=round(sigma, 3),
+            variacni_koeficient=None if math.isnan(cv) else round(cv, 3),
+            dodaci_lhuta=lhuta, doporucene_minimum=doporucene, datum_vypoctu=datum_vypoctu,
+        )
+        for pk, spotreba, sigma, cv, lhuta, doporucene in zip(
+            pks.tolist(), prumer.tolist(), odchylka.tolist(), variacni_koeficient.tolist(),
+            lhuty.tolist(), minimum.tolist(),
+        )
+    ]
+    with transaction.atomic():
+        PrognozaSpotreby.objects.all().delete()
+        PrognozaSpotreby.objects.bulk_create(prognozy, batch_size=500)
+
+    logger.info(f'Prognóza spotřeby za {months} měsíců přepočítána pro {len(prognozy)} položek')
+    return len(prognozy)
@@ -1,5 +1,6 @@
 from django import forms
-from .models import Sklad, AuditLog, Dodavatele, Varianty, Poptavky, PoptavkaVarianty, Zarizeni, JEDNOTKY_CHOICES, UDRZBA_CHOICES
+from .models import (Sklad, AuditLog, Dodavatele, Varianty, Poptavky, PoptavkaVarianty, Zarizeni, Inventura,
+                     JEDNOTKY_CHOICES, UDRZBA_CHOICES)
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Div, Field, Submit
 from crispy_forms.bootstrap import FormActions
@@ -7,9 +8,9 @@ from django.contrib.auth.forms import UserCreationForm, PasswordChangeForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
 from django.utils import timezone
 from datetime import date, timedelta
+from .sequences import allocate_interne_cislo, advance, INTERNE_CISLO
 
 
 class SkladCreateForm(forms.ModelForm):
@@ -43,9 +44,9 @@ class SkladCreateForm(forms.ModelForm):
         self.helper.form_method = 'post'
         self.helper.form_class = 'form-grid'
 
-        max_interne_cislo = Sklad.objects.aggregate(models.Max('interne_cislo'))['interne_cislo__max']
-        initial_interne_cislo = (max_interne_cislo or 0) + 1
-        self.fields['interne_cislo'].initial = initial_interne_cislo
+        # číslo karty se bez vyplnění přidělí z čítače až při uložení
+        self.fields['interne_cislo'].required = False
+        self.fields['interne_cislo'].widget.attrs['placeholder'] = 'přidělí se automaticky'
 
         # Add form-label-sm class to all labels
         for field_name, field in self.fields.items():
@@ -70,6 +71,16 @@ class SkladCreateForm(forms.ModelForm):
             )
         )
 
+    def save(self, commit=True):
+        """
+        Uloží položku, bez zadaného čísla karty jí přidělí nové číslo z čítače.
+        """
+        if self.instance.interne_cislo is None:
+            self.instance.interne_cislo = allocate_interne_cislo()
+        elif 'interne_cislo' in self.changed_data:
+            advance(INTERNE_CISLO, self.instance.interne_cislo)
+        return super(SkladCreateForm, self).save(commit)
+
 
 class SkladUpdateForm(forms.ModelForm):
     """
@@ -114,6 +125,14 @@ class SkladUpdateForm(forms.ModelForm):
             )
         )
 
+    def save(self, commit=True):
+        """
+        Uloží položku a ručně změněné číslo karty promítne do čítače čísel karet.
+        """
+        if 'interne_cislo' in self.changed_data:
+            advance(INTERNE_CISLO, self.instance.interne_cislo)
+        return super(SkladUpdateForm, self).save(commit)
+
 
 class SkladUpdateObjednanoForm(forms.ModelForm):
     """
@@ -277,9 +296,92 @@ class AuditLogDispatchForm(forms.ModelForm):
         self.fields['datum_vydeje'].required = True
         self.fields['zmena_mnozstvi'].choices = [('', 'Vyberte vydávané množství')] + [(i, str(i)) for i in range(1, int(max_mnozstvi) + 1)]
 
-        zarizeni_choices = [('', 'Vyberte zařízení')] + [(z.kod_zarizeni.upper(), z.nazev_zarizeni) for z in zarizeni_qs] + [('VIZ POZN.', 'Ostatní zařízení - do poznámky')]
+        self.zarizeni_map = {z.kod_zarizeni.upper(): z for z in zarizeni_qs}
+        zarizeni_choices = [('', 'Vyberte zařízení')] + [(kod, z.nazev_zarizeni) for kod, z in self.zarizeni_map.items()] + [('VIZ POZN.', 'Ostatní zařízení - do poznámky')]
         self.fields['pouzite_zarizeni'].choices = zarizeni_choices
 
+    def save(self, commit=True):
+        """
+        Kromě kódu zařízení uloží i odkaz na vybrané zařízení (u 'VIZ POZN.' zůstane prázdný).
+        """
+        self.instance.zarizeni = self.zarizeni_map.get(self.cleaned_data.get('pouzite_zarizeni'))
+        return super().save(commit)
+
+
+class SkladInventuraForm(forms.Form):
+    """
+    Formulář pro zaznamenání inventurního rozdílu.
+    Obsahuje pole pro skutečné (napočítané) množství, datum inventury a poznámku.
+    """
+    skutecne_mnozstvi = forms.IntegerField(min_value=0, label='Skutečné množství')
+    datum = forms.DateField(
+        widget=forms.DateInput(attrs={'type': 'date'}),
+        label='Datum inventury'
+    )
+    poznamka = forms.CharField(max_length=200, required=False, label='Poznámka')
+
+    def __init__(self, *args, **kwargs):
+        super(SkladInventuraForm, self).__init__(*args, **kwargs)
+        today = date.today()
+        self.fields['datum'].widget.attrs['max'] = today.isoformat()
+        self.fields['datum'].validators.append(MaxValueValidator(today))
+
+
+class InventuraCreateForm(forms.ModelForm):
+    """
+    Formulář pro zahájení inventury.
+    Obsahuje pole pro datum inventury, prefix umístění, na které se inventura omezí, a poznámku.
+    """
+    class Meta:
+        model = Inventura
+        fields = ['datum', 'umisteni', 'poznamka']
+        widgets = {
+            'datum': forms.DateInput(attrs={'type': 'date'}),
+        }
+        help_texts = {
+            'umisteni': 'Prázdné = celý sklad, jinak všechna umístění začínající zadaným textem.',
+        }
+
+    def __init__(self, *args, **kwargs):
+        super(InventuraCreateForm, self).__init__(*args, **kwargs)
+        today = date.today()
+        self.fields['datum'].widget.attrs['max'] = today.isoformat()
+        self.fields['datum'].validators.append(MaxValueValidator(today))
+
+
+class InventuraPocitaniForm(forms.Form):
+    """
+    Formulář pro zadání sečtených množství položek jednoho umístění.
+    Pro každou inventurní položku obsahuje pole `polozka_<pk>`, nevyplněná pole se neukládají.
+    """
+    def __init__(self, *args, polozky=(), **kwargs):
+        super(InventuraPocitaniForm, self).__init__(*args, **kwargs)
+        self.polozky = list(polozky)
+        for polozka in self.polozky:
+            self.fields[f'polozka_{polozka.pk}'] = forms.IntegerField(
+                min_value=0,
+                required=False,
+                initial=polozka.sectene_mnozstvi,
+                label=f'{polozka.sklad.nazev_dilu} ({polozka.sklad.jednotky})',
+                widget=forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'inputmode': 'numeric'}),
+            )
+
+    def rows(self):
+        """
+        Vrátí dvojice (inventurní položka, pole formuláře) pro vykreslení v šabloně.
+        """
+        return [(polozka, self[f'polozka_{polozka.pk}']) for polozka in self.polozky]
+
+    def counts(self):
+        """
+        Vrátí slovník {pk inventurní položky: sečtené množství} pro vyplněná pole.
+        """
+        return {
+            polozka.pk: self.cleaned_data[f'polozka_{polozka.pk}']
+            for polozka in self.polozky
+            if self.cleaned_data.get(f'polozka_{polozka.pk}') is not None
+        }
+
 
 class VariantyCreateForm(forms.ModelForm):
     """
@@ -451,10 +553,131 @@ class ZarizeniUpdateForm(forms.ModelForm):
         )
 
 
+class SkladImportForm(forms.ModelForm):
+    """
+    Formulář pro ověření jednoho řádku hromadného importu skladových položek.
+    Zařízení se zadávají kódy oddělenými čárkou, dodavatel názvem existujícího dodavatele.
+
+    Parametry:
+    - dodavatele: Množina názvů existujících dodavatelů.
+    - zarizeni_map: Slovník {kód zařízení: pk} existujících zařízení.
+    """
+    zarizeni = forms.CharField(required=False, label="Zařízení")
+
+    class Meta:
+        model = Sklad
+        fields = [
+            "ucetnictvi", "kriticky_dil", "interne_cislo", "min_mnozstvi_ks", "objednano", "nazev_dilu", "jednotky",
+            "umisteni", "dodavatel", "poznamka",
+        ]
+
+    def __init__(self, *args, dodavatele=None, zarizeni_map=None, **kwargs):
+        super(SkladImportForm, self).__init__(*args, **kwargs)
+        # prázdné číslo karty se přidělí při importu
+        self.fields['interne_cislo'].required = False
+        self.dodavatele = dodavatele or set()
+        self.zarizeni_map = zarizeni_map or {}
+
+    def clean_dodavatel(self):
+        dodavatel = self.cleaned_data.get('dodavatel')
+        if dodavatel and dodavatel not in self.dodavatele:
+            raise forms.ValidationError(f"Dodavatel '{dodavatel}' neexistuje.")
+        return dodavatel
+
+    def clean_zarizeni(self):
+        """
+        Převede kódy zařízení na seznam pk, neznámé kódy jsou chyba.
+        """
+        kody = [kod.strip() for kod in (self.cleaned_data.get('zarizeni') or '').split(',') if kod.strip()]
+        nezname = [kod for kod in kody if kod not in self.zarizeni_map]
+        if nezname:
+            raise forms.ValidationError(f"Neznámé kódy zařízení: {', '.join(nezname)}.")
+        return [self.zarizeni_map[kod] for kod in kody]
+
+
+class DodavateleImportForm(forms.ModelForm):
+    """
+    Formulář pro ověření jednoho řádku hromadného importu dodavatelů.
+
+    Parametry:
+    - existujici: Množina názvů dodavatelů, které už existují (nebo jsou výše v importu).
+    """
+    class Meta:
+        model = Dodavatele
+        fields = ["dodavatel", "kontakt", "email", "telefon", "jazyk"]
+
+    def __init__(self, *args, existujici=None, **kwargs):
+        super(DodavateleImportForm, self).__init__(*args, **kwargs)
+        self.existujici = existujici or set()
+
+    def clean_dodavatel(self):
+        dodavatel = self.cleaned_data.get('dodavatel')
+        if dodavatel in self.existujici:
+            raise forms.ValidationError(f"Dodavatel '{dodavatel}' už existuje.")
+        return dodavatel
+
+
+class ZarizeniImportForm(forms.ModelForm):
+    """
+    Formulář pro ověření jednoho řádku hromadného importu zařízení.
+
+    Parametry:
+    - existujici: Množina kódů zařízení, které už existují (nebo jsou výše v importu).
+    """
+    class Meta:
+        model = Zarizeni
+        fields = ['kod_zarizeni', 'nazev_zarizeni', 'umisteni', 'typ_zarizeni']
+
+    def __init__(self, *args, existujici=None, **kwargs):
+        super(ZarizeniImportForm, self).__init__(*args, **kwargs)
+        self.existujici = existujici or set()
+
+    def clean_kod_zarizeni(self):
+        kod_zarizeni = self.cleaned_data.get('kod_zarizeni')
+        if kod_zarizeni in self.existujici:
+            raise forms.ValidationError(f"Zařízení s kódem '{kod_zarizeni}' už existuje.")
+        return kod_zarizeni
+
+
+class ImportForm(forms.Form):
+    """
+    Formulář pro nahrání souboru hromadného importu (CSV nebo XLSX).
+    """
+    typ = forms.ChoiceField(choices=[
+        ('sklad', 'Skladové položky'), ('dodavatele', 'Dodavatelé'), ('zarizeni', 'Zařízení'),
+    ], label="Importovat")
+    soubor = forms.FileField(label="Soubor (CSV nebo XLSX)")
+    dry_run = forms.BooleanField(required=False, initial=True, label="Pouze ověřit (nic neukládat)")
+    chybovy_soubor = forms.BooleanField(required=False, label="Stáhnout chybné řádky jako CSV")
+
+
+class PreloadedVariantaChoiceField(forms.ModelChoiceField):
+    """
+    Výběr varianty, který vyhledává hodnotu v předem načteném slovníku {pk: varianta}
+    místo samostatného dotazu do databáze pro každý formulář.
+    """
+    def __init__(self, varianty_map, *args, **kwargs):
+        self.varianty_map = varianty_map
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return self.varianty_map[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+
+
 class PoptavkaVariantyForm(forms.ModelForm):
     """
     Formulář pro přidání varianty do poptávky.
     Umožňuje vybrat variantu produktu, množství a jednotky.
+
+    Parametry:
+    - varianty_dodavatele: Queryset variant, ze kterých lze vybírat.
+    - varianty_map: Volitelný slovník {pk: varianta} s již načtenými variantami dodavatele,
+      podle kterého se varianta ověří bez dalších dotazů.
     """
     should_save = forms.BooleanField(required=False, label='Do poptávky')
 
@@ -468,11 +691,24 @@ class PoptavkaVariantyForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         varianty_dodavatele = kwargs.pop('varianty_dodavatele', None)
+        self.varianty_map = kwargs.pop('varianty_map', None)
         super(PoptavkaVariantyForm, self).__init__(*args, **kwargs)
         if varianty_dodavatele is not None:
             self.fields['varianta'].queryset = varianty_dodavatele
+        if self.varianty_map is not None:
+            field = self.fields['varianta']
+            self.fields['varianta'] = PreloadedVariantaChoiceField(
+                self.varianty_map, queryset=field.queryset, widget=field.widget, label=field.label
+            )
         self.fields['mnozstvi'].widget.attrs.update({'class': 'form-control form-control-sm w-75'})
 
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        if self.varianty_map is not None:
+            # existence varianty už ověřilo pole podle načteného slovníku
+            exclude.add('varianta')
+        return exclude
+
     def clean_jednotky(self):
         """
         Ověření, že zadaná hodnota jednotek je platná.
@@ -0,0 +1,139 @@
+import gzip
+import json
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from .models import Sklad
+
+logger = logging.getLogger(__name__)
+
+# Pole, jejichž změny zaznamenává audit log, v historii skladu je tedy není nutné držet u každého pohybu.
+QUANTITY_FIELDS = ('mnozstvi', 'celkova_cena_eur', 'jednotkova_cena_eur')
+
+DELETE_BATCH_SIZE = 500
+
+
+def _history_model():
+    return Sklad.history.model
+
+
+def _compared_fields():
+    """
+    Pole historického záznamu, která se porovnávají při kompakci (stav položky bez množstevních polí).
+    """
+    return [
+        field.attname for field in _history_model()._meta.concrete_fields
+        if not field.name.startswith('history_') and field.name not in QUANTITY_FIELDS
+    ]
+
+
+def _delete_in_batches(model, pks):
+    deleted = 0
+    for start in range(0, len(pks), DELETE_BATCH_SIZE):
+        deleted += model.objects.filter(pk__in=pks[start:start + DELETE_BATCH_SIZE]).delete()[0]
+    return deleted
+
+
+def compaction_candidates(before):
+    """
+    Najde historické záznamy skladu starší než `before`, které lze při kompakci vynechat.
+
+    Záznam je nadbytečný, pokud se od předchozího i od následujícího záznamu stejné položky liší
+    jen v množstevních polích (`QUANTITY_FIELDS`). Z každého souvislého běhu takových změn tak
+    zůstane první a poslední záznam a všechny změny ostatních polí zůstanou zachovány.
+
+    Vrací:
+    - Seznam `history_id` záznamů ke smazání.
+    """
+    fields = _compared_fields()
+    rows = (
+        _history_model().objects.filter(history_date__lt=before)
+        .order_by('evidencni_cislo', 'history_date', 'history_id')
+        .values_list('history_id', 'evidencni_cislo', 'history_type', *fields)
+        .iterator(chunk_size=2000)
+    )
+
+    candidates = []
+    prev = cur = None
+    for row in rows:
+        if (
+            prev is not None and cur is not None
+            and prev[1] == cur[1] == row[1]
+            and cur[2] == row[2] == '~'
+            and prev[3:] == cur[3:] == row[3:]
+        ):
+            candidates.append(cur[0])
+        prev, cur = cur, row
+    return candidates
+
+
+def compact_history(before):
+    """
+    Smaže nadbytečné historické záznamy skladu starší než `before` (viz `compaction_candidates`).
+
+    Vrací:
+    - Počet smazaných záznamů.
+    """
+    candidates = compaction_candidates(before)
+    with transaction.atomic():
+        deleted = _delete_in_batches(_history_model(), candidates)
+    logger.info(f'Kompakce historie skladu před {before}: smazáno {deleted} záznamů')
+    return deleted
+
+
+def archive_history(before, path):
+    """
+    Přesune historické záznamy skladu starší než `before` do komprimovaného souboru a z databáze je smaže.
+
+    - Záznamy se zapíší jako JSON řádky do souboru `path` (gzip), soubor se nepřepisuje, ale doplňuje.
+    - Záznamy se mažou až po úspěšném zápisu celého archivu.
+
+    Vrací:
+    - Dvojici (počet archivovaných záznamů, počet bajtů nekomprimovaných dat).
+    """
+    queryset = _history_model().objects.filter(history_date__lt=before).order_by('history_id')
+    pks = []
+    size = 0
+    with gzip.open(path, 'at', encoding='utf-8') as archive:
+        for row in queryset.values().iterator(chunk_size=2000):
+            line = json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+            archive.write(line)
+            size += len(line.encode('utf-8'))
+            pks.append(row['history_id'])
+
+    with transaction.atomic():
+        deleted = _delete_in_batches(_history_model(), pks)
+    logger.info(f'Archivace historie skladu před {before} do {path}: {deleted} záznamů')
+    return deleted, size
+
+
+def history_table_stats():
+    """
+    Vrátí počet záznamů historie skladu a obsazené místo v bajtech: u SQLite velikost celé databáze,
+    u PostgreSQL velikost tabulky historie včetně indexů, u ostatních databází None.
+    """
+    count = _history_model().objects.count()
+    size = None
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('PRAGMA page_count')
+            page_count = cursor.fetchone()[0]
+            cursor.execute('PRAGMA page_size')
+            size = page_count * cursor.fetchone()[0]
+        elif connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s)', [_history_model()._meta.db_table])
+            size = cursor.fetchone()[0]
+    return count, size
+
+
+def vacuum_database():
+    """
+    Uvolní místo po smazaných záznamech (SQLite VACUUM, PostgreSQL VACUUM na tabulce historie).
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('VACUUM')
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'VACUUM {connection.ops.quote_name(_history_model()._meta.db_table)}')
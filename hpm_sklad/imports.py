@@ -0,0 +1,299 @@
+import csv
+import io
+import logging
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from simple_history.utils import bulk_create_with_history
+
+from .forms import SkladImportForm, DodavateleImportForm, ZarizeniImportForm
+from .kpi import invalidate_kpis
+from .models import Sklad, Dodavatele, Zarizeni, SkladZarizeni, Nedostatek
+from .sequences import allocate, advance, INTERNE_CISLO
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+
+TRUE_VALUES = {'1', 'ano', 'a', 'true', 'yes', 'x', 'on'}
+FALSE_VALUES = {'', '0', 'ne', 'n', 'false', 'no', 'off'}
+
+
+class ImportFileError(Exception):
+    """
+    Vyvolána, pokud soubor importu nejde přečíst (neznámý formát, chybí hlavička nebo knihovna pro XLSX).
+    """
+
+
+@dataclass
+class ImportResult:
+    """
+    Výsledek hromadného importu.
+
+    Atributy:
+    - rows: Počet zpracovaných řádků.
+    - created: Počet vytvořených záznamů (při ověření bez uložení počet platných řádků).
+    - errors: Seznam (číslo řádku v souboru, data řádku, seznam chyb).
+    - columns: Sloupce souboru v původním pořadí (pro chybový soubor).
+    - dry_run: Zda šlo jen o ověření bez uložení.
+    """
+    rows: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+    columns: list = field(default_factory=list)
+    dry_run: bool = False
+
+
+def _read_csv(file):
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    sample = text.readline()
+    if not sample.strip():
+        raise ImportFileError("Soubor je prázdný.")
+    # Excel v české lokalizaci ukládá CSV se středníkem
+    delimiter = ';' if sample.count(';') > sample.count(',') else ','
+    header = next(csv.reader([sample], delimiter=delimiter))
+    yield [name.strip() for name in header]
+    yield from csv.reader(text, delimiter=delimiter)
+
+
+def _read_xlsx(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("Import z XLSX vyžaduje knihovnu openpyxl.")
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ImportFileError("Soubor je prázdný.")
+        yield [str(name).strip() if name is not None else '' for name in header]
+        for row in rows:
+            yield ['' if value is None else value for value in row]
+    finally:
+        workbook.close()
+
+
+def read_table(file, filename):
+    """
+    Čte soubor importu po řádcích, bez načtení celého souboru do paměti.
+
+    - CSV (oddělovač čárka nebo středník, kódování UTF-8) nebo XLSX (první list).
+    - První řádek je hlavička, další řádky se vrací postupně.
+
+    Vrací:
+    - Generátor, jehož první prvek je seznam názvů sloupců a další prvky jsou řádky (seznamy hodnot).
+    """
+    name = filename.lower()
+    if name.endswith('.csv'):
+        return _read_csv(file)
+    if name.endswith('.xlsx'):
+        return _read_xlsx(file)
+    raise ImportFileError("Podporované formáty jsou CSV a XLSX.")
+
+
+def _column_map(header, form_class):
+    """
+    Přiřadí sloupce souboru polím formuláře podle názvu pole nebo jeho popisku (bez ohledu na velikost písmen).
+    """
+    names = {}
+    for name, form_field in form_class.base_fields.items():
+        names[name.lower()] = name
+        names[str(form_field.label).lower()] = name
+    return {index: names[column.lower()] for index, column in enumerate(header) if column.lower() in names}
+
+
+def _form_data(values, columns, form_class):
+    """
+    Převede hodnoty řádku na data formuláře: prázdné hodnoty nahradí výchozí hodnotou pole modelu
+    a textové boolean hodnoty (ANO/NE, 1/0, true/false) převede pro checkbox.
+    """
+    data = {}
+    for index, name in columns.items():
+        value = values[index] if index < len(values) else ''
+        data[name] = value.strip() if isinstance(value, str) else value
+
+    model = form_class._meta.model
+    for name in form_class._meta.fields:
+        model_field = model._meta.get_field(name)
+        value = data.get(name, '')
+        if (value == '' or value is None) and model_field.has_default():
+            value = model_field.get_default()
+        if model_field.get_internal_type() == 'BooleanField':
+            text = str(value).strip().lower()
+            if text in TRUE_VALUES or value is True:
+                value = 'on'
+            elif text in FALSE_VALUES or value is False:
+                value = ''
+        data[name] = value
+    return data
+
+
+class _Importer:
+    """
+    Základ importu jednoho typu záznamů: připraví kontext pro ověření řádků a ukládá platné řádky po dávkách.
+    """
+    form_class = None
+    model = None
+
+    def form_kwargs(self):
+        return {}
+
+    def accept(self, form):
+        """
+        Vrátí instanci k uložení z platného formuláře a zaznamená ji pro kontrolu dalších řádků.
+        """
+        return form.save(commit=False)
+
+    def save_batch(self, instances):
+        self.model.objects.bulk_create(instances, batch_size=IMPORT_BATCH_SIZE)
+
+
+class _DodavateleImporter(_Importer):
+    form_class = DodavateleImportForm
+    model = Dodavatele
+
+    def __init__(self):
+        self.existujici = set(Dodavatele.objects.values_list('dodavatel', flat=True))
+
+    def form_kwargs(self):
+        return {'existujici': self.existujici}
+
+    def accept(self, form):
+        self.existujici.add(form.cleaned_data['dodavatel'])
+        return form.save(commit=False)
+
+
+class _ZarizeniImporter(_Importer):
+    form_class = ZarizeniImportForm
+    model = Zarizeni
+
+    def __init__(self):
+        self.existujici = set(Zarizeni.objects.values_list('kod_zarizeni', flat=True))
+
+    def form_kwargs(self):
+        return {'existujici': self.existujici}
+
+    def accept(self, form):
+        self.existujici.add(form.cleaned_data['kod_zarizeni'])
+        return form.save(commit=False)
+
+
+class _SkladImporter(_Importer):
+    """
+    Import skladových položek.
+
+    - Položkám bez čísla karty se pro každou dávku přidělí blok čísel z čítače čísel karet.
+    - Ukládají se hromadně i se záznamem historie, vazbami na zařízení a množinou položek pod minimem.
+    """
+    form_class = SkladImportForm
+    model = Sklad
+
+    def __init__(self):
+        self.dodavatele = set(Dodavatele.objects.values_list('dodavatel', flat=True))
+        self.zarizeni_map = dict(Zarizeni.objects.values_list('kod_zarizeni', 'pk'))
+
+    def form_kwargs(self):
+        return {'dodavatele': self.dodavatele, 'zarizeni_map': self.zarizeni_map}
+
+    def accept(self, form):
+        sklad = form.save(commit=False)
+        sklad._import_zarizeni = form.cleaned_data['zarizeni']
+        return sklad
+
+    def save_batch(self, instances):
+        advance(INTERNE_CISLO, max((sklad.interne_cislo for sklad in instances if sklad.interne_cislo is not None), default=None))
+        bez_cisla = [sklad for sklad in instances if sklad.interne_cislo is None]
+        for sklad, interne_cislo in zip(bez_cisla, allocate(INTERNE_CISLO, len(bez_cisla))):
+            sklad.interne_cislo = interne_cislo
+
+        created = bulk_create_with_history(instances, Sklad, batch_size=IMPORT_BATCH_SIZE)
+        SkladZarizeni.objects.bulk_create([
+            SkladZarizeni(sklad_id=sklad.pk, zarizeni_id=zarizeni_id)
+            for sklad, original in zip(created, instances)
+            for zarizeni_id in dict.fromkeys(original._import_zarizeni)
+        ], batch_size=IMPORT_BATCH_SIZE)
+        Nedostatek.objects.bulk_create([
+            Nedostatek(sklad_id=sklad.pk, chybi=sklad.min_mnozstvi_ks - sklad.mnozstvi)
+            for sklad in created
+            if sklad.min_mnozstvi_ks > sklad.mnozstvi
+        ], batch_size=IMPORT_BATCH_SIZE)
+        # bulk_create obchází signály, ukazatele úvodní stránky se spočítají znovu
+        transaction.on_commit(invalidate_kpis)
+
+
+IMPORTERS = {
+    'sklad': _SkladImporter,
+    'dodavatele': _DodavateleImporter,
+    'zarizeni': _ZarizeniImporter,
+}
+
+
+def import_rows(kind, table, dry_run=False):
+    """
+    Hromadně importuje skladové položky, dodavatele nebo zařízení.
+
+    - Každý řádek se ověří formulářem importu (`SkladImportForm` a další), chybné řádky se přeskočí
+      a zaznamenají do výsledku.
+    - Platné řádky se ukládají pomocí `bulk_create` po dávkách `IMPORT_BATCH_SIZE`, celý import
+      běží v jedné transakci.
+    - Při `dry_run` se řádky jen ověří a nic se neuloží.
+
+    Parametry:
+    - kind: Typ importu ('sklad', 'dodavatele' nebo 'zarizeni').
+    - table: Řádky souboru z `read_table` (první prvek je hlavička).
+    - dry_run: Pouze ověřit bez uložení.
+
+    Vrací:
+    - `ImportResult`.
+    """
+    importer = IMPORTERS[kind]()
+    header = next(table, None)
+    if not header:
+        raise ImportFileError("Soubor nemá hlavičku.")
+    columns = _column_map(header, importer.form_class)
+    if not columns:
+        raise ImportFileError("Hlavička souboru neobsahuje žádný známý sloupec.")
+
+    result = ImportResult(columns=header, dry_run=dry_run)
+    batch = []
+    with transaction.atomic():
+        # číslo řádku v souboru včetně hlavičky
+        for row_number, values in enumerate(table, start=2):
+            if not any(value not in ('', None) for value in values):
+                continue
+            result.rows += 1
+            form = importer.form_class(_form_data(values, columns, importer.form_class), **importer.form_kwargs())
+            if not form.is_valid():
+                messages = [
+                    f"{form.fields[name].label if name in form.fields else name}: {' '.join(errors)}"
+                    for name, errors in form.errors.items()
+                ]
+                result.errors.append((row_number, values, messages))
+                continue
+
+            batch.append(importer.accept(form))
+            result.created += 1
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                if not dry_run:
+                    importer.save_batch(batch)
+                batch = []
+
+        if batch and not dry_run:
+            importer.save_batch(batch)
+
+    logger.info(
+        f"Import {kind}{' (ověření)' if dry_run else ''}: řádků {result.rows}, "
+        f"{'platných' if dry_run else 'vytvořeno'} {result.created}, chyb {len(result.errors)}"
+    )
+    return result
+
+
+def write_error_file(result, output):
+    """
+    Zapíše chybné řádky importu jako CSV: číslo řádku, popis chyb a původní sloupce.
+    """
+    writer = csv.writer(output)
+    writer.writerow(['Řádek', 'Chyby', *result.columns])
+    for row_number, values, messages in result.errors:
+        writer.writerow([row_number, '; '.join(messages), *values])
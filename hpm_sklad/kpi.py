@@ -0,0 +1,226 @@
+"""
+Ukazatele (KPI) na úvodní stránce: hodnota skladu, položky pod minimem, kritické díly pod minimem,
+náklady na výdeje v aktuálním měsíci podle typu údržby a otevřené poptávky.
+
+Ukazatele jsou čítače v tabulce `UkazatelKpi` (sdílené všemi workery), které signály průběžně upravují
+o rozdíl při každém zápisu skladové položky, pohybu nebo poptávky. Rozdíly se promítnou až po potvrzení
+transakce, takže vrácená transakce čítače nezmění. Agregací z databáze se počítají jen čítače, které
+chybí (první zobrazení, nový měsíc, zneplatnění po hromadné operaci).
+"""
+import datetime
+import logging
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Sklad, AuditLog, Poptavky, UkazatelKpi, UDRZBA_CHOICES
+from .reorder import OPEN_POPTAVKA_STAVY
+from .valuation import movement_date_expression
+
+logger = logging.getLogger(__name__)
+
+HODNOTA_SKLADU = 'hodnota_skladu'
+POD_MINIMEM = 'pod_minimem'
+KRITICKE_POD_MINIMEM = 'kriticke_pod_minimem'
+OTEVRENE_POPTAVKY = 'otevrene_poptavky'
+
+SPEND_PREFIX = 'naklady:'
+
+# Typy údržby, pro které se sledují náklady (inventurní rozdíl není spotřeba).
+SPEND_TYPES = [(value, label) for value, label in UDRZBA_CHOICES if value != 'Inventura']
+# Položka je pod minimem stejně jako `Sklad.pod_minimem`.
+POD_MINIMEM_Q = Q(mnozstvi__lt=F('min_mnozstvi_ks'))
+
+_NEZNAMY = object()
+
+
+def _spend_counter(mesic, typ_udrzby):
+    return f'{SPEND_PREFIX}{mesic:%Y-%m}:{typ_udrzby}'
+
+
+def _counters(mesic):
+    return [HODNOTA_SKLADU, POD_MINIMEM, KRITICKE_POD_MINIMEM, OTEVRENE_POPTAVKY,
+            *(_spend_counter(mesic, typ_udrzby) for typ_udrzby, _ in SPEND_TYPES)]
+
+
+def _incr(counter, delta):
+    """
+    Po potvrzení transakce upraví čítač o `delta` jediným UPDATE.
+
+    - Chybějící čítač se neupravuje, spočítá se z databáze při příštím zobrazení.
+    """
+    if not delta:
+        return
+    transaction.on_commit(lambda: UkazatelKpi.objects.filter(klic=counter).update(hodnota=F('hodnota') + delta))
+
+
+def _drop(counters):
+    """
+    Po potvrzení transakce zahodí čítače, aby se při příštím zobrazení spočítaly z databáze.
+    """
+    transaction.on_commit(lambda: UkazatelKpi.objects.filter(klic__in=counters).delete())
+
+
+def _compute(counters, mesic):
+    """
+    Spočítá zadané čítače z databáze.
+    """
+    values = {}
+    if {HODNOTA_SKLADU, POD_MINIMEM, KRITICKE_POD_MINIMEM} & set(counters):
+        souhrn = Sklad.objects.aggregate(
+            hodnota=Sum('celkova_cena_eur'),
+            pod_minimem=Count('pk', filter=POD_MINIMEM_Q),
+            kriticke=Count('pk', filter=POD_MINIMEM_Q & Q(kriticky_dil=True)),
+        )
+        values[HODNOTA_SKLADU] = round((souhrn['hodnota'] or 0) * 100)
+        values[POD_MINIMEM] = souhrn['pod_minimem']
+        values[KRITICKE_POD_MINIMEM] = souhrn['kriticke']
+    if OTEVRENE_POPTAVKY in counters:
+        values[OTEVRENE_POPTAVKY] = Poptavky.objects.filter(stav__in=OPEN_POPTAVKA_STAVY).count()
+    spend_counters = {_spend_counter(mesic, typ_udrzby): typ_udrzby for typ_udrzby, _ in SPEND_TYPES}
+    if set(spend_counters) & set(counters):
+        dalsi_mesic = (mesic + datetime.timedelta(days=31)).replace(day=1)
+        naklady = dict(
+            AuditLog.objects.alias(datum_pohybu=movement_date_expression()).filter(
+                typ_operace='VÝDEJ', datum_pohybu__gte=mesic, datum_pohybu__lt=dalsi_mesic,
+            ).values('typ_udrzby').annotate(celkem=Sum('celkova_cena_eur')).values_list('typ_udrzby', 'celkem').order_by()
+        )
+        for counter, typ_udrzby in spend_counters.items():
+            values[counter] = -round((naklady.get(typ_udrzby) or 0) * 100)
+    return {counter: value for counter, value in values.items() if counter in counters}
+
+
+def kpi_values():
+    """
+    Vrátí ukazatele pro úvodní stránku jedním dotazem na čítače, chybějící čítače dopočítá z databáze.
+
+    Vrací:
+    - Slovník s hodnotou skladu v EUR (`hodnota_skladu`), počty položek pod minimem (`pod_minimem`,
+      `kriticke_pod_minimem`), počtem otevřených poptávek (`otevrene_poptavky`), náklady aktuálního měsíce
+      po typech údržby (`naklady`, seznam dvojic (typ údržby, EUR)) a jejich součtem (`naklady_celkem`).
+    """
+    mesic = timezone.localdate().replace(day=1)
+    counters = _counters(mesic)
+    values = dict(UkazatelKpi.objects.filter(klic__in=counters).values_list('klic', 'hodnota'))
+
+    missing = [counter for counter in counters if counter not in values]
+    if missing:
+        computed = _compute(missing, mesic)
+        with transaction.atomic():
+            # čítače nákladů minulých měsíců se už nezobrazují
+            UkazatelKpi.objects.filter(klic__startswith=SPEND_PREFIX).exclude(klic__in=counters).delete()
+            # ignore_conflicts nepřepíše čítač, který mezitím založil a upravil souběžný požadavek
+            UkazatelKpi.objects.bulk_create(
+                [UkazatelKpi(klic=counter, hodnota=value) for counter, value in computed.items()],
+                ignore_conflicts=True,
+            )
+        # pohyb potvrzený mezi výpočtem a založením čítače svůj rozdíl nepromítl (čítač ještě neexistoval),
+        # založené čítače se proto pod zámkem spočítají znovu a přepíšou
+        with transaction.atomic():
+            list(UkazatelKpi.objects.select_for_update().filter(klic__in=missing).values_list('klic', flat=True))
+            computed = _compute(missing, mesic)
+            UkazatelKpi.objects.bulk_update(
+                [UkazatelKpi(klic=counter, hodnota=value) for counter, value in computed.items()], ['hodnota']
+            )
+        values.update(computed)
+        logger.debug(f'Ukazatele úvodní stránky dopočítány z databáze: {", ".join(missing)}')
+
+    naklady = [(label, values[_spend_counter(mesic, typ_udrzby)] / 100) for typ_udrzby, label in SPEND_TYPES]
+    return {
+        'hodnota_skladu': values[HODNOTA_SKLADU] / 100,
+        'pod_minimem': values[POD_MINIMEM],
+        'kriticke_pod_minimem': values[KRITICKE_POD_MINIMEM],
+        'otevrene_poptavky': values[OTEVRENE_POPTAVKY],
+        'naklady': naklady,
+        'naklady_celkem': sum(value for _, value in naklady),
+        'mesic': mesic,
+    }
+
+
+def invalidate_kpis():
+    """
+    Zahodí všechny čítače, aby se při příštím zobrazení spočítaly z databáze.
+
+    Volá se po hromadných operacích, které obcházejí signály (např. `bulk_create` při importu).
+    """
+    UkazatelKpi.objects.all().delete()
+
+
+def update_sklad_kpis(sklad, created=False, deleted=False):
+    """
+    Promítne uložení nebo smazání skladové položky do čítačů podle rozdílu proti stavu
+    načtenému z databáze (`Sklad.kpi_stav`).
+
+    - Pokud původní stav není známý (instance nebyla načtena z databáze se všemi poli),
+      čítače skladu se zahodí a spočítají znovu.
+    - Rozdíl se spočítá bez dotazu do databáze, čítače se upraví po potvrzení transakce.
+    """
+    if created:
+        puvodni = (0, False, False)
+    else:
+        puvodni = getattr(sklad, 'kpi_stav', None)
+    novy = (0, False, False) if deleted else sklad.current_kpi_stav()
+
+    if puvodni is None:
+        _drop([HODNOTA_SKLADU, POD_MINIMEM, KRITICKE_POD_MINIMEM])
+    else:
+        _incr(HODNOTA_SKLADU, novy[0] - puvodni[0])
+        _incr(POD_MINIMEM, int(novy[1]) - int(puvodni[1]))
+        _incr(KRITICKE_POD_MINIMEM, int(novy[2]) - int(puvodni[2]))
+    sklad.kpi_stav = novy
+
+
+def update_spend_kpis(puvodni, novy):
+    """
+    Promítne zápis, úpravu nebo smazání pohybu do nákladů aktuálního měsíce podle typu údržby: odečte
+    původní stav výdeje a připočte nový (viz `AuditLog.current_spotreba_stav`, None znamená žádný stav).
+
+    - Výdeje se zpětným datem v minulém měsíci a inventurní rozdíly se nepočítají.
+    """
+    mesic = timezone.localdate().replace(day=1)
+    for stav, sign in ((puvodni, -1), (novy, 1)):
+        if stav is None:
+            continue
+        typ_operace, typ_udrzby, _, _, datum, _, celkova_cena_eur = stav
+        if typ_operace != 'VÝDEJ' or typ_udrzby not in dict(SPEND_TYPES) or datum.replace(day=1) != mesic:
+            continue
+        _incr(_spend_counter(mesic, typ_udrzby), -sign * round((celkova_cena_eur or 0) * 100))
+
+
+def invalidate_spend_kpis():
+    """
+    Po potvrzení transakce zahodí čítače nákladů aktuálního měsíce, spočítají se z databáze.
+    """
+    mesic = timezone.localdate().replace(day=1)
+    _drop([_spend_counter(mesic, typ_udrzby) for typ_udrzby, _ in SPEND_TYPES])
+
+
+def update_poptavky_kpis(poptavka, created=False, deleted=False):
+    """
+    Upraví počet otevřených poptávek podle změny stavu poptávky proti stavu načtenému z databáze
+    (`Poptavky.kpi_stav`), čítač se upraví po potvrzení transakce.
+
+    - Pokud původní stav není známý, čítač se zahodí a spočítá znovu.
+    """
+    if created:
+        puvodni = None
+    else:
+        puvodni = getattr(poptavka, 'kpi_stav', _NEZNAMY)
+        if puvodni is _NEZNAMY:
+            _drop([OTEVRENE_POPTAVKY])
+            return
+    novy = None if deleted else poptavka.stav
+
+    _incr(OTEVRENE_POPTAVKY, int(novy in OPEN_POPTAVKA_STAVY) - int(puvodni in OPEN_POPTAVKA_STAVY))
+    poptavka.kpi_stav = novy
+
+
+def add_created_poptavky_kpis(poptavky):
+    """
+    Připočte k počtu otevřených poptávek poptávky založené hromadně (`bulk_create` obchází signály),
+    čítač se upraví jediným UPDATE po potvrzení transakce.
+    """
+    _incr(OTEVRENE_POPTAVKY, sum(poptavka.stav in OPEN_POPTAVKA_STAVY for poptavka in poptavky))
+    for poptavka in poptavky:
+        poptavka.kpi_stav = poptavka.stav
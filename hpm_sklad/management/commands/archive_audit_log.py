@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+from hpm_sklad.archive import archive_year
+from hpm_sklad.models import AuditLog
+from hpm_sklad.valuation import movement_date_expression
+
+
+class Command(BaseCommand):
+    help = ("Přesune záznamy audit logu uzavřených roků do archivu, aby seznamy, filtry a exporty "
+            "běžely jen nad pohyby otevřených roků.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year', type=int, action='append', dest='years', metavar='ROK',
+            help="Archivuje zadaný rok (lze zadat vícekrát).",
+        )
+        parser.add_argument(
+            '--keep-years', type=int, default=2, metavar='ROKY',
+            help="Bez --year archivuje všechny roky kromě zadaného počtu posledních (výchozí 2 = letošní a loňský).",
+        )
+
+    def handle(self, *args, **options):
+        years = options['years']
+        if not years:
+            if options['keep_years'] < 1:
+                raise CommandError("--keep-years musí být alespoň 1 (letošní rok se nearchivuje).")
+            limit = timezone.localdate().year - options['keep_years'] + 1
+            years = sorted(
+                AuditLog.objects.annotate(rok=ExtractYear(movement_date_expression()))
+                .filter(rok__lt=limit)
+                .values_list('rok', flat=True).order_by().distinct()
+            )
+
+        for rok in years:
+            try:
+                count = archive_year(rok)
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(f"Rok {rok}: archivováno {count} záznamů")
+
+        self.stdout.write(self.style.SUCCESS(f"Záznamů v audit logu: {AuditLog.objects.count()}"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from hpm_sklad.movements import backfill_last_movements
+
+
+class Command(BaseCommand):
+    help = ("Doplní skladovým položkám datum posledního výdeje a příjmu z audit logu (po nasazení nebo "
+            "po hromadných úpravách audit logu mimo aplikaci).")
+
+    def handle(self, *args, **options):
+        count = backfill_last_movements()
+        self.stdout.write(self.style.SUCCESS(f"Datum posledního pohybu aktualizováno u {count} položek"))
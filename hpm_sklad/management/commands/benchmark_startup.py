@@ -0,0 +1,64 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+# Spouští se v čistém interpretu, aby se měřil skutečný studený start procesu.
+STARTUP_SCRIPT = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+import hpm_sklad.urls
+import hpm_sklad.views
+for module in set(hpm_sklad.views.VIEW_MODULES.values()):
+    importlib.import_module(f'hpm_sklad.views.{{module}}')
+if {load_reports}:
+    import hpm_sklad.reports
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'plotting_loaded': 'matplotlib' in sys.modules,
+}}))
+"""
+
+
+class Command(BaseCommand):
+    help = ("Změří studený start procesu (čas a RSS) s načtením URL a views "
+            "bez reportovacích knihoven a s nimi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help="Počet měření pro každou variantu.")
+
+    def measure(self, load_reports, runs):
+        script = STARTUP_SCRIPT.format(load_reports=load_reports)
+        results = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, '-c', script], env=os.environ.copy(), capture_output=True, text=True, check=True
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        return {
+            'seconds': statistics.median(result['seconds'] for result in results),
+            'max_rss_kb': statistics.median(result['max_rss_kb'] for result in results),
+            'plotting_loaded': results[0]['plotting_loaded'],
+        }
+
+    def handle(self, *args, **options):
+        runs = options['runs']
+        lazy = self.measure(False, runs)
+        full = self.measure(True, runs)
+
+        for label, result in (('Bez reportů', lazy), ('S reporty', full)):
+            self.stdout.write(
+                f"{label}: {result['seconds'] * 1000:.0f} ms, RSS {result['max_rss_kb'] / 1024:.1f} MB, "
+                f"matplotlib načten: {'ano' if result['plotting_loaded'] else 'ne'}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Úspora pro workery bez grafů: {(full['seconds'] - lazy['seconds']) * 1000:.0f} ms, "
+            f"{(full['max_rss_kb'] - lazy['max_rss_kb']) / 1024:.1f} MB RSS"
+        ))
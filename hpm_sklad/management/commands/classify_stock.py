@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hpm_sklad.classification import classify_stock, CLASSIFICATION_MONTHS
+
+
+class Command(BaseCommand):
+    help = ("Přepočítá třídy ABC (roční spotřeba v EUR) a XYZ (variabilita spotřeby) všech skladových "
+            "položek. Audit log jen čte, takže může běžet každou noc za provozu.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=CLASSIFICATION_MONTHS, metavar='MĚSÍCE',
+            help=f"Počet celých měsíců historie výdejů (výchozí {CLASSIFICATION_MONTHS}).",
+        )
+
+    def handle(self, *args, **options):
+        if options['months'] < 2:
+            raise CommandError("--months musí být alespoň 2 (pro výpočet variability).")
+
+        counts = classify_stock(options['months'])
+        for (abc_trida, xyz_trida), count in sorted(counts.items()):
+            self.stdout.write(f"{abc_trida}{xyz_trida}: {count} položek")
+        self.stdout.write(self.style.SUCCESS("Třídy ABC/XYZ přepočítány."))
@@ -0,0 +1,61 @@
+import datetime
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from hpm_sklad.history import (compaction_candidates, compact_history, archive_history, history_table_stats,
+                               vacuum_database)
+
+
+class Command(BaseCommand):
+    help = ("Zkompaktuje historii skladových položek (simple_history): vynechá záznamy, které se liší jen "
+            "v množstevních polích, volitelně archivuje staré záznamy do souboru a vypíše uvolněné místo.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=90, metavar='DNY',
+            help="Kompaktuje pouze záznamy starší než zadaný počet dní (výchozí 90).",
+        )
+        parser.add_argument(
+            '--archive-older-than', type=int, metavar='DNY',
+            help="Záznamy starší než zadaný počet dní přesune do komprimovaného archivu.",
+        )
+        parser.add_argument(
+            '--archive-dir', default=None,
+            help="Adresář pro archiv historie (výchozí BASE_DIR).",
+        )
+        parser.add_argument('--vacuum', action='store_true', help="Po smazání uvolní místo v databázi (VACUUM).")
+        parser.add_argument('--dry-run', action='store_true', help="Pouze vypíše, kolik záznamů by se smazalo.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        before = now - datetime.timedelta(days=options['older_than'])
+        count_before, size_before = history_table_stats()
+        self.stdout.write(f"Záznamů historie skladu: {count_before}")
+
+        if options['dry_run']:
+            self.stdout.write(f"Ke kompakci (starší než {before:%Y-%m-%d}): {len(compaction_candidates(before))} záznamů")
+            return
+
+        deleted = compact_history(before)
+        self.stdout.write(f"Kompakce: smazáno {deleted} záznamů lišících se jen v množství")
+
+        if options['archive_older_than'] is not None:
+            archive_before = now - datetime.timedelta(days=options['archive_older_than'])
+            archive_dir = options['archive_dir'] or settings.BASE_DIR
+            path = os.path.join(archive_dir, f"sklad_history_{archive_before:%Y-%m-%d}.jsonl.gz")
+            archived, archived_size = archive_history(archive_before, path)
+            self.stdout.write(f"Archivace: {archived} záznamů ({archived_size / 1024:.1f} kB dat) přesunuto do {path}")
+
+        if options['vacuum']:
+            vacuum_database()
+
+        count_after, size_after = history_table_stats()
+        self.stdout.write(self.style.SUCCESS(f"Záznamů historie skladu: {count_after} (o {count_before - count_after} méně)"))
+        if size_before is not None:
+            self.stdout.write(self.style.SUCCESS(
+                f"Obsazené místo: {size_after / 1024 / 1024:.1f} MB, uvolněno {(size_before - size_after) / 1024:.1f} kB"
+                + ("" if options['vacuum'] else " (bez --vacuum se místo vrátí až při dalším VACUUM)")
+            ))
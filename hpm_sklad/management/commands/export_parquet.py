@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+try:
+    from hpm_sklad import columnar
+except ImportError:
+    columnar = None
+
+
+class Command(BaseCommand):
+    help = ("Exportuje audit log nebo sklad do souboru Parquet se zachováním datových typů pro analýzy "
+            "(vyžaduje knihovnu pyarrow).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=('audit_log', 'sklad'), help="Exportovaná tabulka.")
+        parser.add_argument(
+            '--output', help="Cesta k výstupnímu souboru, výchozí je <tabulka>_<RRRR-MM-DD>.parquet.",
+        )
+        parser.add_argument(
+            '--since-id', type=int, metavar='ID',
+            help="Exportuje jen záznamy s ID větším než zadané (přírůstkový export).",
+        )
+        parser.add_argument(
+            '--row-group-size', type=int, default=50_000, metavar='ŘÁDKY',
+            help="Maximální počet řádků v jedné row group (výchozí 50000).",
+        )
+
+    def handle(self, *args, **options):
+        if columnar is None:
+            raise CommandError("Export do Parquet vyžaduje knihovnu pyarrow (pip install pyarrow).")
+        if options['row_group_size'] < 1:
+            raise CommandError("--row-group-size musí být alespoň 1.")
+
+        model = columnar.EXPORT_MODELS[options['model']]
+        output = options['output'] or f"{options['model']}_{timezone.localdate():%Y-%m-%d}.parquet"
+        count, last_id = columnar.write_parquet(
+            model.objects.all(), output, since_id=options['since_id'], row_group_size=options['row_group_size'],
+        )
+
+        self.stdout.write(f"Exportováno {count} řádků do {output}")
+        self.stdout.write(self.style.SUCCESS(f"Poslední ID: {last_id} (pro další přírůstkový export --since-id {last_id})"))
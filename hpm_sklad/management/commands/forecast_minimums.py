@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hpm_sklad.forecast import forecast_minimums, FORECAST_MONTHS, SERVICE_LEVELS, DEFAULT_SERVICE_LEVEL
+
+
+class Command(BaseCommand):
+    help = ("Spočítá z měsíčních výdejů prognózu spotřeby všech skladových položek a doporučená minima "
+            "(s ohledem na dodací lhůty variant), která se zobrazují v seznamu skladu vedle ručních minim.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=FORECAST_MONTHS, metavar='MĚSÍCE',
+            help=f"Počet celých měsíců historie výdejů (výchozí {FORECAST_MONTHS}).",
+        )
+        parser.add_argument(
+            '--service-level', type=int, choices=sorted(SERVICE_LEVELS), default=DEFAULT_SERVICE_LEVEL,
+            help=f"Úroveň obsluhy v procentech pro pojistnou zásobu (výchozí {DEFAULT_SERVICE_LEVEL}).",
+        )
+
+    def handle(self, *args, **options):
+        if options['months'] < 2:
+            raise CommandError("--months musí být alespoň 2 (pro výpočet variability).")
+
+        count = forecast_minimums(options['months'], options['service_level'])
+        self.stdout.write(self.style.SUCCESS(f"Prognóza spotřeby uložena pro {count} položek"))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from hpm_sklad.reorder import plan_reorder, create_draft_poptavky, rebuild_shortages, STRATEGY_CHOICES
+
+
+class Command(BaseCommand):
+    help = "Vygeneruje rozpracované poptávky pro všechny skladové položky pod minimem."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strategy', choices=[value for value, _ in STRATEGY_CHOICES], default='cheapest',
+            help="Výběr dodavatele: nejlevnější (cheapest) nebo nejrychlejší (fastest).",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Pouze vypíše plán, poptávky nevytváří.")
+        parser.add_argument('--rebuild', action='store_true', help="Před plánováním znovu sestaví množinu položek pod minimem.")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            count = rebuild_shortages()
+            self.stdout.write(f"Položek pod minimem: {count}")
+
+        plan = plan_reorder(options['strategy'])
+        for dodavatel, polozky in plan.items():
+            self.stdout.write(f"{dodavatel}:")
+            for varianta, mnozstvi in polozky:
+                self.stdout.write(f"  {varianta.sklad_id} {varianta.nazev_varianty}: {mnozstvi} {varianta.sklad.jednotky}")
+
+        if options['dry_run']:
+            return
+
+        poptavky = create_draft_poptavky(plan)
+        self.stdout.write(self.style.SUCCESS(f"Vytvořeno poptávek: {len(poptavky)}"))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hpm_sklad.imports import IMPORTERS, read_table, import_rows, write_error_file, ImportFileError
+
+
+class Command(BaseCommand):
+    help = ("Hromadně importuje skladové položky, dodavatele nebo zařízení ze souboru CSV nebo XLSX "
+            "(první řádek je hlavička s názvy polí nebo jejich popisky).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS), help="Typ importovaných záznamů.")
+        parser.add_argument('path', help="Cesta k souboru CSV nebo XLSX.")
+        parser.add_argument('--dry-run', action='store_true', help="Pouze ověří řádky, nic neuloží.")
+        parser.add_argument('--errors', metavar='CESTA', help="Zapíše chybné řádky s popisem chyb do CSV.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as file:
+                result = import_rows(options['kind'], read_table(file, options['path']), dry_run=options['dry_run'])
+        except (OSError, ImportFileError) as e:
+            raise CommandError(str(e))
+
+        for row_number, values, messages in result.errors[:50]:
+            self.stdout.write(f"Řádek {row_number}: {'; '.join(messages)}")
+        if len(result.errors) > 50:
+            self.stdout.write(f"... a dalších {len(result.errors) - 50} chybných řádků")
+
+        if options['errors'] and result.errors:
+            with open(options['errors'], 'w', newline='', encoding='utf-8-sig') as output:
+                write_error_file(result, output)
+            self.stdout.write(f"Chybné řádky zapsány do {options['errors']}")
+
+        summary = (f"Řádků {result.rows}, {'platných' if result.dry_run else 'vytvořeno'} {result.created}, "
+                   f"chybných {len(result.errors)}{' (ověření, nic neuloženo)' if result.dry_run else ''}")
+        self.stdout.write(self.style.SUCCESS(summary) if not result.errors else self.style.WARNING(summary))
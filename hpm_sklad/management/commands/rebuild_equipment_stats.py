@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from hpm_sklad.equipment_stats import backfill_auditlog_zarizeni, rebuild_equipment_totals
+
+
+class Command(BaseCommand):
+    help = ("Přepočítá předpočítanou spotřebu dílů zařízení (po měsících a po dílech) z audit logu, "
+            "ze které se zobrazuje přehled v detailu zařízení.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help="Nejprve doplní odkaz na zařízení do starších výdejů podle kódu v poli 'Pro zařízení'.",
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            count = backfill_auditlog_zarizeni()
+            self.stdout.write(f"Doplněno zařízení do {count} záznamů audit logu")
+
+        mesice, dily = rebuild_equipment_totals()
+        self.stdout.write(self.style.SUCCESS(
+            f"Spotřeba zařízení přepočítána: {mesice} měsíčních řádků, {dily} řádků dílů"
+        ))
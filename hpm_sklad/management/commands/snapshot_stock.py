@@ -0,0 +1,50 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from hpm_sklad.valuation import (create_checkpoint, nearest_checkpoint, period_ends, prune_checkpoints,
+                                 is_month_end, SNAPSHOT_PERIODS)
+
+
+class Command(BaseCommand):
+    help = ("Uloží snímky stavu skladu (množství a hodnota položek ke konci dne), ze kterých se "
+            "počítají historické stavy, ocenění a grafy.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period', choices=SNAPSHOT_PERIODS, default='daily',
+            help="Denní snímky (daily) nebo snímky k poslednímu dni měsíce (monthly).",
+        )
+        parser.add_argument(
+            '--date', type=datetime.date.fromisoformat,
+            help="Datum posledního snímku (RRRR-MM-DD), výchozí je včerejšek.",
+        )
+        parser.add_argument(
+            '--backfill-from', type=datetime.date.fromisoformat,
+            help="Doplní chybějící snímky od tohoto data (RRRR-MM-DD).",
+        )
+        parser.add_argument(
+            '--keep-daily', type=int, metavar='DNY',
+            help="Denní snímky starší než zadaný počet dní smaže, měsíční ponechá.",
+        )
+
+    def handle(self, *args, **options):
+        do = options['date'] or timezone.localdate() - datetime.timedelta(days=1)
+        if options['period'] == 'monthly' and not options['backfill_from'] and not is_month_end(do):
+            do = do.replace(day=1) - datetime.timedelta(days=1)
+        od = options['backfill_from'] or do
+        if od > do:
+            raise CommandError("Datum --backfill-from musí být nejpozději datum posledního snímku.")
+
+        # Každý snímek vychází z předchozího, takže se zapisují chronologicky.
+        for datum in period_ends(od, do, options['period']):
+            if not options['backfill_from'] or nearest_checkpoint(datum) != datum:
+                count = create_checkpoint(datum)
+                self.stdout.write(f"Snímek k {datum}: {count} položek")
+
+        if options['keep_daily'] is not None:
+            deleted = prune_checkpoints(timezone.localdate() - datetime.timedelta(days=options['keep_daily']))
+            self.stdout.write(f"Smazáno řádků starých denních snímků: {deleted}")
+
+        self.stdout.write(self.style.SUCCESS("Snímky stavu skladu uloženy."))
@@ -33,12 +33,29 @@ UDRZBA_CHOICES = [
     ('Inventura', 'Inventurní rozdíl'),
 ]
 
+ABC_CHOICES = [
+    ('A', 'A - nejvyšší roční spotřeba v EUR'),
+    ('B', 'B - střední roční spotřeba v EUR'),
+    ('C', 'C - nízká roční spotřeba v EUR'),
+]
+
+XYZ_CHOICES = [
+    ('X', 'X - stabilní spotřeba'),
+    ('Y', 'Y - kolísavá spotřeba'),
+    ('Z', 'Z - nepravidelná spotřeba'),
+]
+
 STAVY_CHOICES = [
     ('Tvorba', 'Ve tvorbě'),
     ('Poptáno', 'Poptáno'),
     ('Uzavřeno', 'Uzavřeno'),
 ]
 
+INVENTURA_STAVY_CHOICES = [
+    ('Otevřená', 'Otevřená'),
+    ('Zaúčtovaná', 'Zaúčtovaná'),
+]
+
 
 class Zarizeni(models.Model):
     """
@@ -87,11 +104,17 @@ class Sklad(models.Model):
     - ucetnictvi: Indikace, zda je položka v účetnictví.
     - kriticky_dil: Indikace, zda jde o kritický díl.
     - zarizeni: many to many pole k tabulce Zarizeni - zařízení, pro které je ND určen.  
+    - abc_trida: Třída ABC podle roční spotřeby v EUR (viz `classification.classify_stock`).
+    - xyz_trida: Třída XYZ podle variability měsíční spotřeby.
+    - posledni_vydej: Datum posledního výdeje (bez inventurních rozdílů), udržuje se při zápisu pohybu.
+    - posledni_prijem: Datum posledního příjmu (bez inventurních rozdílů), udržuje se při zápisu pohybu.
     - history: Historie změn položky.
 
     Vlastnosti:
     - pod_minimem: Vlastnost vracející True, pokud je položka pod minimálním množstvím.
     - pod_minimem_display: Vrací řetězec 'ANO' nebo 'NE', podle toho, zda je položka pod minimem.
+    - kpi_stav: Hodnoty pro ukazatele úvodní stránky (cena, pod minimem, kritický pod minimem)
+      ve stavu načteném z databáze nebo naposledy uloženém, pokud jsou známé (viz `kpi`).
 
     Meta:
     - ordering: Záznamy jsou řazeny podle evidenčního čísla sestupně.
@@ -105,7 +128,7 @@ class Sklad(models.Model):
         ]
 
     evidencni_cislo = models.AutoField(primary_key=True, verbose_name="Evidenční číslo")
-    interne_cislo = models.IntegerField(null=True, verbose_name="Číslo karty")  
+    interne_cislo = models.IntegerField(null=True, db_index=True, verbose_name="Číslo karty")
     objednano = models.CharField(max_length=100, null=True, blank=True, verbose_name="Objednáno?")
     nazev_dilu = models.CharField(max_length=100, verbose_name="Název dílu")
     min_mnozstvi_ks = models.PositiveIntegerField(default=0, verbose_name="Minimum")
@@ -121,7 +144,11 @@ class Sklad(models.Model):
     ucetnictvi = models.BooleanField(default=True, verbose_name="V účetnictví")
     kriticky_dil = models.BooleanField(default=False, verbose_name="Kritický díl") 
     zarizeni = models.ManyToManyField(Zarizeni, blank=True, through='SkladZarizeni', verbose_name="Zařízení")
-    history = HistoricalRecords()
+    abc_trida = models.CharField(max_length=1, choices=ABC_CHOICES, null=True, blank=True, db_index=True, verbose_name="Třída ABC")
+    xyz_trida = models.CharField(max_length=1, choices=XYZ_CHOICES, null=True, blank=True, db_index=True, verbose_name="Třída XYZ")
+    posledni_vydej = models.DateField(null=True, blank=True, db_index=True, verbose_name="Poslední výdej")
+    posledni_prijem = models.DateField(null=True, blank=True, db_index=True, verbose_name="Poslední příjem")
+    history = HistoricalRecords(excluded_fields=['abc_trida', 'xyz_trida', 'posledni_vydej', 'posledni_prijem'])
 
     def get_absolute_url(self):
         return reverse("sklad")
@@ -129,6 +156,21 @@ class Sklad(models.Model):
     def __str__(self):
         return f"Evid. č. {str(self.evidencni_cislo)}, {self.nazev_dilu}"
 
+    KPI_FIELDS = ('celkova_cena_eur', 'mnozstvi', 'min_mnozstvi_ks', 'kriticky_dil')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(field in field_names for field in cls.KPI_FIELDS):
+            instance.kpi_stav = instance.current_kpi_stav()
+        return instance
+
+    def current_kpi_stav(self):
+        """
+        Vrátí trojici (celková cena v centech, pod minimem, kritický díl pod minimem) podle aktuálních hodnot.
+        """
+        return (round(self.celkova_cena_eur * 100), self.pod_minimem, self.kriticky_dil and self.pod_minimem)
+
     @property
     def pod_minimem(self):
         return self.mnozstvi < self.min_mnozstvi_ks
@@ -137,6 +179,62 @@ class Sklad(models.Model):
         return "ANO" if self.pod_minimem else "NE"
 
 
+class Nedostatek(models.Model):
+    """
+    Materializovaná množina skladových položek pod minimem.
+
+    Záznam existuje právě tehdy, když je množství položky menší než minimum. Udržuje se
+    průběžně při každém uložení skladové položky (viz `reorder.update_shortage`).
+
+    Pole:
+    - sklad: Skladová položka pod minimem (zároveň primární klíč).
+    - chybi: Množství chybějící do minima.
+
+    Meta:
+    - verbose_name_plural: Množné číslo názvu modelu je "Položky pod minimem".
+    """
+    class Meta:
+        verbose_name = "Položka pod minimem"
+        verbose_name_plural = "Položky pod minimem"
+
+    sklad = models.OneToOneField(Sklad, on_delete=models.CASCADE, primary_key=True, related_name='nedostatek', verbose_name="Skladová položka")
+    chybi = models.PositiveIntegerField(verbose_name="Chybí do minima")
+
+    def __str__(self):
+        return f"{self.sklad} - chybí {self.chybi}"
+
+
+class PrognozaSpotreby(models.Model):
+    """
+    Uložený výsledek prognózy spotřeby skladové položky a doporučené minimum.
+
+    Počítá se hromadně pro všechny položky z měsíčních výdejů v audit logu (viz `forecast.forecast_minimums`).
+
+    Pole:
+    - sklad: Skladová položka (zároveň primární klíč).
+    - spotreba_mesic: Průměrná měsíční spotřeba.
+    - odchylka_mesic: Směrodatná odchylka měsíční spotřeby.
+    - variacni_koeficient: Poměr směrodatné odchylky a průměru (prázdný, pokud položka nemá spotřebu).
+    - dodaci_lhuta: Dodací lhůta v dnech, se kterou se počítalo (nejkratší ze variant položky).
+    - doporucene_minimum: Doporučené minimální množství (spotřeba za dodací lhůtu a pojistná zásoba).
+    - datum_vypoctu: Datum výpočtu prognózy.
+    """
+    class Meta:
+        verbose_name = "Prognóza spotřeby"
+        verbose_name_plural = "Prognózy spotřeby"
+
+    sklad = models.OneToOneField(Sklad, on_delete=models.CASCADE, primary_key=True, related_name='prognoza', verbose_name="Skladová položka")
+    spotreba_mesic = models.FloatField(default=0.0, verbose_name="Spotřeba za měsíc")
+    odchylka_mesic = models.FloatField(default=0.0, verbose_name="Směrodatná odchylka")
+    variacni_koeficient = models.FloatField(null=True, blank=True, verbose_name="Variační koeficient")
+    dodaci_lhuta = models.PositiveIntegerField(verbose_name="Dodací lhůta")
+    doporucene_minimum = models.PositiveIntegerField(default=0, verbose_name="Doporučené minimum")
+    datum_vypoctu = models.DateField(verbose_name="Datum výpočtu")
+
+    def __str__(self):
+        return f"{self.sklad} - doporučené minimum {self.doporucene_minimum}"
+
+
 class SkladZarizeni(models.Model):
     """
     Propojovací model mezi skladovými položkami a zařízeními.
@@ -187,9 +285,9 @@ class Dodavatele(models.Model):
         return f"{self.dodavatel}"
     
 
-class AuditLog(models.Model):
+class AuditLogBase(models.Model):
     """
-    Model pro sledování pohybů (příjem a výdej) položek ve skladu.
+    Společná pole záznamů o pohybech (příjem a výdej) položek ve skladu pro audit log a jeho archiv.
 
     Pole:
     - ucetnictvi: Indikace, zda je skladová položka v účetnictví.
@@ -201,7 +299,8 @@ class AuditLog(models.Model):
     - mnozstvi: Aktuální množství položky po změně.
     - jednotky: Jednotky, ve kterých je změna měřena.
     - typ_operace: Typ operace (příjem nebo výdej).
-    - pouzite_zarizeni: Zařízení, pro které byla položka použita.
+    - pouzite_zarizeni: Zařízení, pro které byla položka použita (kód zařízení v době výdeje).
+    - zarizeni: Odkaz na zařízení, pro které byla položka vydána (cizí klíč na model Zarizeni).
     - umisteni: Umístění položky.
     - dodavatel: Dodavatel položky.
     - datum_vydeje: Datum výdeje položky.
@@ -214,14 +313,10 @@ class AuditLog(models.Model):
     - typ_udrzby: Typ údržby (reaktivní, preventivní, prediktivní, ostatní).
     - poznamka: Další poznámky k operaci.
 
-    Meta:
-    - verbose_name_plural: Množné číslo názvu modelu je "Skladové pohyby".
-    - ordering: Záznamy jsou řazeny podle ID sestupně (nejnovější nahoře).
     """
     class Meta:
-        verbose_name_plural = "Skladové pohyby"
-        ordering = ["-id"]
-    
+        abstract = True
+
     ucetnictvi = models.BooleanField(verbose_name="V účetnictví")
     evidencni_cislo = models.ForeignKey(Sklad, on_delete=models.CASCADE, verbose_name="Evidenční číslo")
     interne_cislo = models.IntegerField(null=True, verbose_name="Číslo karty")
@@ -232,6 +327,7 @@ class AuditLog(models.Model):
     jednotky = models.CharField(max_length=10, choices=JEDNOTKY_CHOICES, default='ks', verbose_name="Jednotky")
     typ_operace = models.CharField(max_length=10, choices=MOVEMENT_CHOICES, null=True, verbose_name="Typ operace")
     pouzite_zarizeni = models.CharField(max_length=70, null=True, verbose_name="Pro zařízení")
+    zarizeni = models.ForeignKey(Zarizeni, null=True, blank=True, on_delete=models.SET_NULL, verbose_name="Zařízení")
     umisteni = models.CharField(max_length=25, verbose_name="Umístění")
     dodavatel = models.CharField(max_length=70, verbose_name="Dodavatel")
     datum_vydeje = models.DateField(null=True, blank=True, verbose_name="Datum výdeje")
@@ -247,6 +343,191 @@ class AuditLog(models.Model):
     def __str__(self):
         return f"{self.typ_operace}: {self.zmena_mnozstvi}x {self.nazev_dilu}"
 
+    def datum_pohybu(self):
+        """
+        Datum, ke kterému se pohyb vztahuje: datum výdeje, u příjmu datum nákupu, jinak den zápisu pohybu.
+        """
+        if self.datum_vydeje or self.datum_nakupu:
+            return self.datum_vydeje or self.datum_nakupu
+        return timezone.localdate(self.cas_vytvoreni) if self.cas_vytvoreni else timezone.localdate()
+
+
+class AuditLog(AuditLogBase):
+    """
+    Model pro sledování pohybů (příjem a výdej) položek ve skladu, pole viz `AuditLogBase`.
+
+    Obsahuje pohyby otevřených roků, záznamy uzavřených roků se přesouvají do `AuditLogArchiv`.
+
+    Vlastnosti:
+    - checkpoint_stav: Položka, datum pohybu, změna množství a cena ve stavu načteném z databáze
+      nebo naposledy uloženém, pokud jsou známé (viz `valuation.update_checkpoints`).
+    - spotreba_stav: Údaje výdeje pro náklady na úvodní stránce a spotřebu zařízení ve stavu načteném
+      z databáze nebo naposledy uloženém, pokud jsou známé (viz `signals.update_spend_totals`).
+
+    Meta:
+    - verbose_name_plural: Množné číslo názvu modelu je "Skladové pohyby".
+    - ordering: Záznamy jsou řazeny podle ID sestupně (nejnovější nahoře).
+    """
+    class Meta:
+        verbose_name_plural = "Skladové pohyby"
+        ordering = ["-id"]
+
+    CHECKPOINT_FIELDS = ('evidencni_cislo_id', 'zmena_mnozstvi', 'celkova_cena_eur', 'datum_vydeje', 'datum_nakupu', 'cas_vytvoreni')
+    SPOTREBA_FIELDS = ('typ_operace', 'typ_udrzby', 'zarizeni_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(field in field_names for field in cls.CHECKPOINT_FIELDS):
+            instance.checkpoint_stav = instance.current_checkpoint_stav()
+            if all(field in field_names for field in cls.SPOTREBA_FIELDS):
+                instance.spotreba_stav = instance.current_spotreba_stav()
+        return instance
+
+    def current_checkpoint_stav(self):
+        """
+        Vrátí čtveřici (evidenční číslo, datum pohybu, změna množství, celková cena) podle aktuálních hodnot.
+        """
+        return (self.evidencni_cislo_id, self.datum_pohybu(), self.zmena_mnozstvi, self.celkova_cena_eur)
+
+    def current_spotreba_stav(self):
+        """
+        Vrátí sedmici (typ operace, typ údržby, zařízení, evidenční číslo, datum pohybu, změna množství,
+        celková cena) podle aktuálních hodnot.
+        """
+        return (self.typ_operace, self.typ_udrzby, self.zarizeni_id, *self.current_checkpoint_stav())
+
+
+class AuditLogArchiv(AuditLogBase):
+    """
+    Archiv záznamů audit logu z uzavřených roků.
+
+    Pole (navíc k `AuditLogBase`):
+    - id: Původní ID záznamu v audit logu, odkazy na záznam tak zůstanou platné i po archivaci.
+    - rok: Rok, ke kterému se pohyb vztahuje (podle data výdeje, nákupu nebo zápisu).
+    - cas_vytvoreni: Původní čas vytvoření záznamu (při archivaci se nepřepisuje).
+
+    Meta:
+    - verbose_name_plural: Množné číslo názvu modelu je "Archiv skladových pohybů".
+    - ordering: Záznamy jsou řazeny podle ID sestupně (nejnovější nahoře).
+    """
+    class Meta:
+        verbose_name = "Archivovaný skladový pohyb"
+        verbose_name_plural = "Archiv skladových pohybů"
+        ordering = ["-id"]
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    rok = models.PositiveSmallIntegerField(db_index=True, verbose_name="Rok")
+    cas_vytvoreni = models.DateTimeField(verbose_name="Čas vytvoření")
+
+
+class SpotrebaZarizeni(models.Model):
+    """
+    Předpočítaná měsíční spotřeba náhradních dílů pro zařízení.
+
+    Pole:
+    - zarizeni: Odkaz na zařízení (cizí klíč na model Zarizeni).
+    - mesic: První den měsíce, za který je spotřeba počítána.
+    - pocet_vydeju: Počet výdejů pro zařízení v měsíci.
+    - mnozstvi: Celkové vydané množství.
+    - celkem_eur: Celková cena vydaných dílů v eurech.
+
+    Meta:
+    - unique_together: Jeden řádek na zařízení a měsíc.
+    - ordering: Záznamy jsou řazeny podle měsíce.
+    """
+    class Meta:
+        verbose_name = "Spotřeba zařízení"
+        verbose_name_plural = "Spotřeba zařízení po měsících"
+        unique_together = ('zarizeni', 'mesic')
+        ordering = ['zarizeni', 'mesic']
+
+    zarizeni = models.ForeignKey(Zarizeni, on_delete=models.CASCADE, related_name='spotreba', verbose_name="Zařízení")
+    mesic = models.DateField(verbose_name="Měsíc")
+    pocet_vydeju = models.PositiveIntegerField(default=0, verbose_name="Počet výdejů")
+    mnozstvi = models.IntegerField(default=0, verbose_name="Množství")
+    celkem_eur = models.FloatField(default=0.0, verbose_name="Celkem EUR")
+
+    def __str__(self):
+        return f"{self.zarizeni} {self.mesic:%m/%Y}: {self.celkem_eur} EUR"
+
+
+class SpotrebaDiluZarizeni(models.Model):
+    """
+    Předpočítaná celková spotřeba jednoho náhradního dílu pro zařízení.
+
+    Pole:
+    - zarizeni: Odkaz na zařízení (cizí klíč na model Zarizeni).
+    - sklad: Odkaz na skladovou položku (cizí klíč na model Sklad).
+    - pocet_vydeju: Počet výdejů dílu pro zařízení.
+    - mnozstvi: Celkové vydané množství.
+    - celkem_eur: Celková cena vydaných dílů v eurech.
+    - posledni_vydej: Datum posledního výdeje.
+
+    Meta:
+    - unique_together: Jeden řádek na zařízení a skladovou položku.
+    - indexes: Index pro výběr nejdražších dílů zařízení.
+    """
+    class Meta:
+        verbose_name = "Spotřeba dílu pro zařízení"
+        verbose_name_plural = "Spotřeba dílů pro zařízení"
+        unique_together = ('zarizeni', 'sklad')
+        indexes = [models.Index(fields=['zarizeni', '-celkem_eur'])]
+
+    zarizeni = models.ForeignKey(Zarizeni, on_delete=models.CASCADE, related_name='spotreba_dilu', verbose_name="Zařízení")
+    sklad = models.ForeignKey(Sklad, on_delete=models.CASCADE, verbose_name="Skladová položka")
+    pocet_vydeju = models.PositiveIntegerField(default=0, verbose_name="Počet výdejů")
+    mnozstvi = models.IntegerField(default=0, verbose_name="Množství")
+    celkem_eur = models.FloatField(default=0.0, verbose_name="Celkem EUR")
+    posledni_vydej = models.DateField(null=True, blank=True, verbose_name="Poslední výdej")
+
+    def __str__(self):
+        return f"{self.zarizeni} - {self.sklad}: {self.mnozstvi}"
+
+
+class Sekvence(models.Model):
+    """
+    Čítač pro přidělování jedinečných čísel (např. čísel karet) bez agregace nad tabulkou.
+
+    Pole:
+    - nazev: Název čítače (např. 'interne_cislo').
+    - hodnota: Poslední přidělená hodnota.
+
+    Meta:
+    - verbose_name_plural: Množné číslo názvu modelu je "Sekvence".
+    """
+    class Meta:
+        verbose_name = "Sekvence"
+        verbose_name_plural = "Sekvence"
+
+    nazev = models.CharField(max_length=50, primary_key=True, verbose_name="Název")
+    hodnota = models.BigIntegerField(default=0, verbose_name="Poslední hodnota")
+
+    def __str__(self):
+        return f"{self.nazev}: {self.hodnota}"
+
+
+class UkazatelKpi(models.Model):
+    """
+    Čítač ukazatele na úvodní stránce, průběžně upravovaný o rozdíly při zápisech (viz `kpi`).
+
+    Pole:
+    - klic: Název čítače (např. 'hodnota_skladu', 'naklady:2024-10:Preventivní').
+    - hodnota: Hodnota čítače, částky v eurocentech.
+
+    Meta:
+    - verbose_name_plural: Množné číslo názvu modelu je "Ukazatele KPI".
+    """
+    class Meta:
+        verbose_name = "Ukazatel KPI"
+        verbose_name_plural = "Ukazatele KPI"
+
+    klic = models.CharField(max_length=50, primary_key=True, verbose_name="Klíč")
+    hodnota = models.BigIntegerField(default=0, verbose_name="Hodnota")
+
+    def __str__(self):
+        return f"{self.klic}: {self.hodnota}"
+
 
 class Varianty(models.Model):
     """
@@ -290,6 +571,9 @@ class Poptavky(models.Model):
     - stav: Stav poptávky (např. Ve tvorbě, Poptáno, Uzavřeno).
     - varianty: Varianty, které jsou součástí poptávky.
 
+    Vlastnosti:
+    - kpi_stav: Stav poptávky načtený z databáze nebo naposledy uložený, pokud je známý (viz `kpi`).
+
     Meta:
     - verbose_name_plural: Množné číslo názvu modelu je "Poptávky".
     """
@@ -302,6 +586,13 @@ class Poptavky(models.Model):
     stav = models.CharField(max_length=10, choices=STAVY_CHOICES, default='Tvorba', verbose_name="Stav poptávky")
     varianty = models.ManyToManyField('Varianty', through='PoptavkaVarianty')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'stav' in field_names:
+            instance.kpi_stav = instance.stav
+        return instance
+
     def __str__(self):
         return f"Poptávka #{self.id} u dodavatele: {self.dodavatel.dodavatel}"
     
@@ -330,4 +621,125 @@ class PoptavkaVarianty(models.Model):
     jednotky = models.CharField(max_length=10, choices=JEDNOTKY_CHOICES, verbose_name="Jednotky")
 
     def __str__(self):
-        return f"{self.poptavka} - {self.varianta} - {self.mnozstvi} {self.jednotky}"
\ No newline at end of file
+        return f"{self.poptavka} - {self.varianta} - {self.mnozstvi} {self.jednotky}"
+
+
+class Inventura(models.Model):
+    """
+    Model reprezentující inventuru (relaci počítání skladu).
+
+    Při zahájení se uloží snímek množství všech položek v rozsahu inventury (viz `InventuraPolozka`).
+    Sečtená množství se porovnávají s tímto snímkem, ne s aktuálním stavem skladu.
+
+    Pole:
+    - datum: Datum inventury, použije se jako datum inventurních pohybů.
+    - umisteni: Prefix umístění, na které je inventura omezena (prázdný = celý sklad).
+    - stav: Stav inventury (Otevřená, Zaúčtovaná).
+    - zahajeno: Čas zahájení inventury a pořízení snímku.
+    - zahajil: Uživatel, který inventuru zahájil.
+    - zauctovano: Čas zaúčtování inventurních rozdílů.
+    - zauctoval: Uživatel, který rozdíly zaúčtoval.
+    - poznamka: Další poznámky k inventuře.
+
+    Meta:
+    - verbose_name_plural: Množné číslo názvu modelu je "Inventury".
+    - ordering: Záznamy jsou řazeny podle ID sestupně (nejnovější nahoře).
+    """
+    class Meta:
+        verbose_name = "Inventura"
+        verbose_name_plural = "Inventury"
+        ordering = ["-id"]
+
+    datum = models.DateField(default=timezone.localdate, verbose_name="Datum inventury")
+    umisteni = models.CharField(max_length=25, blank=True, verbose_name="Umístění")
+    stav = models.CharField(max_length=10, choices=INVENTURA_STAVY_CHOICES, default='Otevřená', verbose_name="Stav inventury")
+    zahajeno = models.DateTimeField(auto_now_add=True, verbose_name="Zahájeno")
+    zahajil = models.ForeignKey(User, on_delete=models.CASCADE, related_name='zahajene_inventury', verbose_name="Zahájil")
+    zauctovano = models.DateTimeField(null=True, blank=True, verbose_name="Zaúčtováno")
+    zauctoval = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='zauctovane_inventury', verbose_name="Zaúčtoval")
+    poznamka = models.CharField(null=True, blank=True, max_length=200, verbose_name="Poznámka")
+
+    def get_absolute_url(self):
+        return reverse("detail_inventury", kwargs={'pk': self.pk})
+
+    def __str__(self):
+        return f"Inventura #{self.id} ze dne {self.datum}"
+
+
+class InventuraPolozka(models.Model):
+    """
+    Model reprezentující jednu skladovou položku v inventuře.
+
+    Pole:
+    - inventura: Odkaz na inventuru.
+    - sklad: Odkaz na skladovou položku.
+    - umisteni: Umístění položky v okamžiku zahájení inventury.
+    - stav_pri_zahajeni: Množství položky v okamžiku zahájení inventury (snímek).
+    - stav_pri_secteni: Evidované množství položky v okamžiku zadání sečteného množství.
+    - sectene_mnozstvi: Sečtené množství, dokud položka není sečtena, je prázdné.
+    - secetl: Uživatel, který položku sečetl.
+    - cas_secteni: Čas zadání sečteného množství.
+
+    Vlastnosti:
+    - rozdil: Rozdíl mezi sečteným a evidovaným množstvím v okamžiku sečtení (u starších záznamů
+      bez `stav_pri_secteni` proti snímku), None pro nesečtené položky.
+
+    Omezení:
+    - Kombinace Inventura / Sklad musí být jedinečná v rámci této tabulky.
+    """
+    class Meta:
+        unique_together = ('inventura', 'sklad')
+        ordering = ['umisteni', 'sklad_id']
+        verbose_name = "Inventurní položka"
+        verbose_name_plural = "Inventurní položky"
+
+    inventura = models.ForeignKey(Inventura, on_delete=models.CASCADE, related_name='polozky', verbose_name="Inventura")
+    sklad = models.ForeignKey(Sklad, on_delete=models.CASCADE, related_name='inventurni_polozky', verbose_name="Skladová položka")
+    umisteni = models.CharField(max_length=25, blank=True, verbose_name="Umístění")
+    stav_pri_zahajeni = models.PositiveIntegerField(verbose_name="Stav při zahájení")
+    stav_pri_secteni = models.PositiveIntegerField(null=True, blank=True, verbose_name="Stav při sečtení")
+    sectene_mnozstvi = models.PositiveIntegerField(null=True, blank=True, verbose_name="Sečtené množství")
+    secetl = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Sečetl")
+    cas_secteni = models.DateTimeField(null=True, blank=True, verbose_name="Čas sečtení")
+
+    @property
+    def rozdil(self):
+        if self.sectene_mnozstvi is None:
+            return None
+        if self.stav_pri_secteni is None:
+            return self.sectene_mnozstvi - self.stav_pri_zahajeni
+        return self.sectene_mnozstvi - self.stav_pri_secteni
+
+    def __str__(self):
+        return f"{self.inventura} - {self.sklad}"
+
+
+class StavSkladu(models.Model):
+    """
+    Snímek (checkpoint) stavu skladové položky ke konci dne.
+
+    Slouží jako výchozí bod pro výpočet stavu a ocenění skladu k libovolnému datu:
+    k nejbližšímu snímku se připočtou pohyby z audit logu zapsané po něm (viz `valuation`).
+    Položky s nulovým množstvím i hodnotou se neukládají.
+
+    Pole:
+    - evidencni_cislo: Odkaz na skladovou položku.
+    - datum: Den, ke konci kterého snímek platí.
+    - mnozstvi: Množství položky ke konci dne.
+    - celkova_cena_eur: Hodnota položky v eurech ke konci dne.
+
+    Omezení:
+    - Kombinace Skladová položka / Datum musí být jedinečná v rámci této tabulky.
+    """
+    class Meta:
+        unique_together = ('evidencni_cislo', 'datum')
+        verbose_name = "Stav skladu"
+        verbose_name_plural = "Stavy skladu"
+
+    evidencni_cislo = models.ForeignKey(Sklad, on_delete=models.CASCADE, related_name='stavy', verbose_name="Evidenční číslo")
+    datum = models.DateField(db_index=True, verbose_name="Datum")
+    mnozstvi = models.IntegerField(verbose_name="Množství")
+    celkova_cena_eur = models.FloatField(verbose_name="Celkem EUR")
+
+    def __str__(self):
+        return f"{self.evidencni_cislo} k {self.datum}: {self.mnozstvi}"
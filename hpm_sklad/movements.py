@@ -0,0 +1,286 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Max
+
+from .models import Sklad, AuditLog, AuditLogArchiv
+from .forms import (SkladReceiptForm, SkladDispatchForm, AuditLogReceiptForm, AuditLogDispatchForm,
+                    SkladInventuraForm)
+from .valuation import movement_date, movement_date_expression
+
+logger = logging.getLogger(__name__)
+
+RECEIPT_FIELDS_TO_COPY = [
+    'ucetnictvi', 'interne_cislo', 'objednano', 'nazev_dilu', 'mnozstvi',
+    'jednotky', 'umisteni', 'dodavatel', 'datum_nakupu',
+    'cislo_objednavky', 'poznamka'
+]
+
+DISPATCH_FIELDS_TO_COPY = [
+    'ucetnictvi', 'interne_cislo', 'objednano', 'nazev_dilu', 'mnozstvi',
+    'jednotky', 'umisteni', 'dodavatel', 'cislo_objednavky', 'poznamka'
+]
+
+INVENTURA_FIELDS_TO_COPY = [
+    'ucetnictvi', 'interne_cislo', 'objednano', 'nazev_dilu', 'mnozstvi',
+    'jednotky', 'cislo_objednavky'
+]
+
+
+class MovementBatchError(Exception):
+    """
+    Vyvolána, pokud některý pohyb v dávce neprošel validací. Celá dávka se vrací zpět.
+
+    Atributy:
+    - errors: Seznam dvojic (index pohybu v dávce, slovník chyb podle polí).
+    """
+    def __init__(self, errors):
+        super().__init__(f'Neplatné pohyby v dávce: {len(errors)}')
+        self.errors = errors
+
+
+def _copy_fields(auditlog, sklad, fields):
+    for field in fields:
+        setattr(auditlog, field, getattr(sklad, field))
+
+
+def _update_last_movement(sklad, auditlog):
+    """
+    Posune datum posledního výdeje nebo příjmu skladové položky podle zapisovaného pohybu.
+
+    - Inventurní rozdíly se nepočítají, nejde o skutečnou spotřebu ani nákup.
+    - Pohyb se zpětným datem datum nesníží.
+    """
+    if auditlog.typ_udrzby == 'Inventura':
+        return
+    field = 'posledni_vydej' if auditlog.typ_operace == 'VÝDEJ' else 'posledni_prijem'
+    datum = movement_date(auditlog)
+    if getattr(sklad, field) is None or getattr(sklad, field) < datum:
+        setattr(sklad, field, datum)
+
+
+def _save_movement(sklad, auditlog):
+    """
+    Uloží skladovou položku i záznam audit logu v jedné transakci.
+    """
+    _update_last_movement(sklad, auditlog)
+    with transaction.atomic():
+        sklad.save()
+        auditlog.save()
+    logger.info(f'Uložení úspěšné: sklad {sklad.pk}, auditlog {auditlog.pk}')
+
+
+def record_receipt(sklad_instance, sklad_form, auditlog_form, user):
+    """
+    Zapíše příjem položky na sklad z validních formulářů `SkladReceiptForm` a `AuditLogReceiptForm`.
+
+    Vrací:
+    - Dvojici (aktualizovaná skladová položka, vytvořený audit log).
+    """
+    updated_sklad = sklad_form.save(commit=False)
+    created_auditlog = auditlog_form.save(commit=False)
+
+    logger.debug(f"Původní množství: {sklad_instance.mnozstvi}, příjem: {created_auditlog.zmena_mnozstvi}")
+
+    created_auditlog.jednotkova_cena_eur = round(updated_sklad.jednotkova_cena_eur, 2)
+    created_auditlog.celkova_cena_eur = round(created_auditlog.jednotkova_cena_eur * created_auditlog.zmena_mnozstvi, 2)
+    updated_sklad.mnozstvi = sklad_instance.mnozstvi + created_auditlog.zmena_mnozstvi
+    updated_sklad.celkova_cena_eur = round(sklad_instance.celkova_cena_eur + created_auditlog.celkova_cena_eur, 2)
+    updated_sklad.jednotkova_cena_eur = round(updated_sklad.celkova_cena_eur / updated_sklad.mnozstvi, 2)
+
+    logger.debug(f'Výpočty aktualizace skladu při příjmu dokončeny, množství po příjmu: {updated_sklad.mnozstvi}')
+
+    created_auditlog.typ_operace = "PŘÍJEM"
+    created_auditlog.operaci_provedl = user
+    created_auditlog.evidencni_cislo = updated_sklad
+    _copy_fields(created_auditlog, updated_sklad, RECEIPT_FIELDS_TO_COPY)
+
+    _save_movement(updated_sklad, created_auditlog)
+    return updated_sklad, created_auditlog
+
+
+def record_dispatch(sklad_instance, sklad_form, auditlog_form, user):
+    """
+    Zapíše výdej položky ze skladu z validních formulářů `SkladDispatchForm` a `AuditLogDispatchForm`.
+
+    Vrací:
+    - Dvojici (aktualizovaná skladová položka, vytvořený audit log).
+    """
+    updated_sklad = sklad_form.save(commit=False)
+    created_auditlog = auditlog_form.save(commit=False)
+
+    logger.debug(f'Původní množství: {sklad_instance.mnozstvi}, výdej: {created_auditlog.zmena_mnozstvi}')
+
+    created_auditlog.jednotkova_cena_eur = sklad_instance.jednotkova_cena_eur
+    created_auditlog.zmena_mnozstvi = -created_auditlog.zmena_mnozstvi
+    created_auditlog.celkova_cena_eur = created_auditlog.jednotkova_cena_eur * created_auditlog.zmena_mnozstvi
+    updated_sklad.mnozstvi = sklad_instance.mnozstvi + created_auditlog.zmena_mnozstvi
+    updated_sklad.celkova_cena_eur = sklad_instance.celkova_cena_eur + created_auditlog.celkova_cena_eur
+
+    logger.debug(f'Výpočty akualizace skladu při výdeji dokončeny, množství po výdeji: {updated_sklad.mnozstvi}')
+
+    created_auditlog.typ_operace = "VÝDEJ"
+    created_auditlog.evidencni_cislo = updated_sklad
+    created_auditlog.operaci_provedl = user
+    _copy_fields(created_auditlog, updated_sklad, DISPATCH_FIELDS_TO_COPY)
+
+    _save_movement(updated_sklad, created_auditlog)
+    return updated_sklad, created_auditlog
+
+
+def record_inventory_adjustment(sklad_instance, inventura_form, user):
+    """
+    Zapíše inventurní rozdíl mezi skutečným množstvím z validního `SkladInventuraForm` a stavem skladu.
+
+    - Manko se zapíše jako výdej, přebytek jako příjem, obojí s typem údržby 'Inventura'.
+    - Rozdíl se oceňuje aktuální jednotkovou cenou skladové položky.
+
+    Vrací:
+    - Dvojici (skladová položka, vytvořený audit log), audit log je None, pokud rozdíl neexistuje.
+    """
+    rozdil = inventura_form.cleaned_data['skutecne_mnozstvi'] - sklad_instance.mnozstvi
+    if rozdil == 0:
+        logger.debug(f'Inventura skladové položky {sklad_instance.pk} bez rozdílu')
+        return sklad_instance, None
+
+    poznamka = inventura_form.cleaned_data.get('poznamka') or 'Inventurní rozdíl'
+    created_auditlog = AuditLog(
+        zmena_mnozstvi=rozdil,
+        typ_operace="PŘÍJEM" if rozdil > 0 else "VÝDEJ",
+        typ_udrzby='Inventura',
+        datum_vydeje=inventura_form.cleaned_data['datum'],
+        jednotkova_cena_eur=sklad_instance.jednotkova_cena_eur,
+        celkova_cena_eur=round(sklad_instance.jednotkova_cena_eur * rozdil, 2),
+        umisteni=sklad_instance.umisteni or '',
+        dodavatel=sklad_instance.dodavatel or '',
+        poznamka=poznamka,
+        evidencni_cislo=sklad_instance,
+        operaci_provedl=user,
+    )
+    sklad_instance.mnozstvi += rozdil
+    sklad_instance.celkova_cena_eur = round(sklad_instance.celkova_cena_eur + created_auditlog.celkova_cena_eur, 2)
+    _copy_fields(created_auditlog, sklad_instance, INVENTURA_FIELDS_TO_COPY)
+
+    logger.debug(f'Inventurní rozdíl skladové položky {sklad_instance.pk}: {rozdil}')
+    _save_movement(sklad_instance, created_auditlog)
+    return sklad_instance, created_auditlog
+
+
+def _receipt_forms(sklad, data):
+    sklad_data = {field: getattr(sklad, field) for field in SkladReceiptForm.Meta.fields}
+    sklad_data['dodavatel'] = None
+    sklad_data.update({key: value for key, value in data.items() if key in SkladReceiptForm.Meta.fields})
+    return [
+        SkladReceiptForm(sklad_data, instance=sklad),
+        AuditLogReceiptForm({'zmena_mnozstvi': data.get('zmena_mnozstvi')}),
+    ]
+
+
+def _dispatch_forms(sklad, data):
+    sklad_data = {field: getattr(sklad, field) for field in SkladDispatchForm.Meta.fields}
+    sklad_data.update({key: value for key, value in data.items() if key in SkladDispatchForm.Meta.fields})
+    auditlog_data = {key: data.get(key) for key in AuditLogDispatchForm.Meta.fields}
+    return [
+        SkladDispatchForm(sklad_data, instance=sklad),
+        AuditLogDispatchForm(auditlog_data, max_mnozstvi=sklad.mnozstvi, zarizeni=sklad.zarizeni.all()),
+    ]
+
+
+def _inventura_forms(sklad, data):
+    return [SkladInventuraForm(data)]
+
+
+MOVEMENT_KINDS = {
+    'receipt': (_receipt_forms, record_receipt),
+    'dispatch': (_dispatch_forms, record_dispatch),
+    'inventura': (_inventura_forms, record_inventory_adjustment),
+}
+
+
+def record_movement_batch(kind, items, user):
+    """
+    Zapíše dávku pohybů jednoho druhu ('receipt', 'dispatch', 'inventura') v jediné transakci.
+
+    - Každý pohyb se validuje stejnými formuláři jako v HTML view.
+    - Skladové položky dávky se načtou jedním dotazem a pohyby na stejnou položku se řetězí.
+    - Pokud je kterýkoli pohyb neplatný, vyvolá `MovementBatchError` a celá dávka se vrátí zpět.
+
+    Parameters:
+    - kind: Druh pohybu.
+    - items: Seznam slovníků s klíčem `evidencni_cislo` a daty formulářů.
+    - user: Uživatel, který pohyby provádí.
+
+    Vrací:
+    - Seznam vytvořených záznamů audit logu.
+    """
+    build_forms, record = MOVEMENT_KINDS[kind]
+    logger.info(f'{user} zapisuje dávku pohybů {kind}, počet: {len(items)}')
+
+    errors = []
+    created_auditlogs = []
+    with transaction.atomic():
+        evidencni_cisla = {item.get('evidencni_cislo') for item in items}
+        skladove_polozky = (
+            Sklad.objects.select_for_update()
+            .prefetch_related('zarizeni')
+            .in_bulk(evidencni_cisla)
+        )
+
+        for index, item in enumerate(items):
+            sklad = skladove_polozky.get(item.get('evidencni_cislo'))
+            if sklad is None:
+                errors.append((index, {'evidencni_cislo': ['Skladová položka neexistuje.']}))
+                continue
+
+            forms = build_forms(sklad, item)
+            if not all(form.is_valid() for form in forms):
+                form_errors = {}
+                for form in forms:
+                    form_errors.update(form.errors)
+                errors.append((index, form_errors))
+                # Formulář mohl změnit instanci při validaci, další pohyby musí vycházet z uloženého stavu.
+                sklad.refresh_from_db()
+                continue
+
+            _, auditlog = record(sklad, *forms, user)
+            if auditlog is not None:
+                created_auditlogs.append(auditlog)
+
+        if errors:
+            logger.warning(f'Dávka pohybů {kind} obsahuje neplatné položky, počet: {len(errors)}')
+            raise MovementBatchError(errors)
+
+    return created_auditlogs
+
+
+def backfill_last_movements():
+    """
+    Doplní datum posledního výdeje a příjmu všech skladových položek z audit logu i archivu.
+
+    - Pro každou tabulku proběhne jediný agregovaný dotaz seskupený podle položky a typu operace.
+    - Položky se ukládají hromadně (`bulk_update`) bez záznamu do historie a bez signálů.
+
+    Vrací:
+    - Počet aktualizovaných skladových položek.
+    """
+    posledni = {}
+    for model in (AuditLog, AuditLogArchiv):
+        rows = model.objects.filter(evidencni_cislo__isnull=False).exclude(typ_udrzby='Inventura').values(
+            'evidencni_cislo_id', 'typ_operace'
+        ).annotate(datum=Max(movement_date_expression())).order_by()
+        for row in rows:
+            field = 'posledni_vydej' if row['typ_operace'] == 'VÝDEJ' else 'posledni_prijem'
+            dates = posledni.setdefault(row['evidencni_cislo_id'], {'posledni_vydej': None, 'posledni_prijem': None})
+            dates[field] = max(filter(None, (dates[field], row['datum'])), default=None)
+
+    changed = []
+    for sklad in Sklad.objects.only('pk', 'posledni_vydej', 'posledni_prijem').iterator(chunk_size=2000):
+        dates = posledni.get(sklad.pk, {'posledni_vydej': None, 'posledni_prijem': None})
+        if (sklad.posledni_vydej, sklad.posledni_prijem) != (dates['posledni_vydej'], dates['posledni_prijem']):
+            sklad.posledni_vydej = dates['posledni_vydej']
+            sklad.posledni_prijem = dates['posledni_prijem']
+            changed.append(sklad)
+    Sklad.objects.bulk_update(changed, ['posledni_vydej', 'posledni_prijem'], batch_size=500)
+
+    logger.info(f'Doplnění data posledního pohybu: aktualizováno {len(changed)} položek')
+    return len(changed)
@@ -0,0 +1,135 @@
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Sklad, Varianty, Poptavky, PoptavkaVarianty, Nedostatek
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_CHOICES = [
+    ('cheapest', 'Nejlevnější dodavatel'),
+    ('fastest', 'Nejrychlejší dodavatel'),
+]
+
+OPEN_POPTAVKA_STAVY = ('Tvorba', 'Poptáno')
+
+
+def update_shortage(sklad):
+    """
+    Průběžně aktualizuje množinu položek pod minimem podle aktuálního stavu skladové položky.
+    """
+    chybi = sklad.min_mnozstvi_ks - sklad.mnozstvi
+    if chybi > 0:
+        Nedostatek.objects.update_or_create(sklad_id=sklad.pk, defaults={'chybi': chybi})
+    else:
+        Nedostatek.objects.filter(sklad_id=sklad.pk).delete()
+
+
+def rebuild_shortages():
+    """
+    Znovu sestaví celou množinu položek pod minimem, např. po hromadných úpravách mimo `save()`.
+
+    Vrací:
+    - Počet položek pod minimem.
+    """
+    shortages = [
+        Nedostatek(sklad_id=pk, chybi=min_mnozstvi_ks - mnozstvi)
+        for pk, min_mnozstvi_ks, mnozstvi in Sklad.objects.filter(
+            mnozstvi__lt=F('min_mnozstvi_ks')
+        ).values_list('pk', 'min_mnozstvi_ks', 'mnozstvi').iterator()
+    ]
+    with transaction.atomic():
+        Nedostatek.objects.all().delete()
+        Nedostatek.objects.bulk_create(shortages, batch_size=500)
+    logger.info(f'Množina položek pod minimem znovu sestavena, počet: {len(shortages)}')
+    return len(shortages)
+
+
+def backfill_shortages():
+    """
+    Sestaví množinu položek pod minimem, pokud je prázdná, ale položky pod minimem existují
+    (např. první `migrate` po založení tabulky nedostatků na existující databázi).
+
+    Vrací:
+    - Počet doplněných položek pod minimem, 0 pokud nebylo co doplňovat.
+    """
+    if Nedostatek.objects.exists() or not Sklad.objects.filter(mnozstvi__lt=F('min_mnozstvi_ks')).exists():
+        return 0
+    return rebuild_shortages()
+
+
+def _variant_sort_key(strategy, varianta, mnozstvi):
+    cena = varianta.jednotkova_cena_eur * mnozstvi
+    if strategy == 'fastest':
+        return (varianta.dodaci_lhuta, cena)
+    return (cena, varianta.dodaci_lhuta)
+
+
+def plan_reorder(strategy='cheapest'):
+    """
+    Sestaví plán doobjednání všech položek pod minimem seskupený podle dodavatelů.
+
+    - Pro každou položku vybere variantu nejlevnějšího ('cheapest', podle ceny za objednávané množství)
+      nebo nejrychlejšího ('fastest', podle dodací lhůty) dodavatele.
+    - Objednávané množství je chybějící množství, nejméně však minimální objednací množství varianty.
+    - Přeskočí položky, které už jsou v otevřené poptávce.
+
+    Vrací:
+    - Slovník {dodavatel: [(varianta, mnozstvi), ...]}.
+    """
+    shortages = dict(Nedostatek.objects.values_list('sklad_id', 'chybi'))
+    already_requested = set(
+        PoptavkaVarianty.objects.filter(
+            poptavka__stav__in=OPEN_POPTAVKA_STAVY, varianta__sklad_id__in=shortages
+        ).values_list('varianta__sklad_id', flat=True)
+    )
+
+    best = {}
+    varianty = Varianty.objects.filter(sklad_id__in=shortages).select_related('dodavatel', 'sklad')
+    for varianta in varianty:
+        if varianta.sklad_id in already_requested:
+            continue
+        mnozstvi = max(shortages[varianta.sklad_id], varianta.min_obj_mnozstvi)
+        key = _variant_sort_key(strategy, varianta, mnozstvi)
+        if varianta.sklad_id not in best or key < best[varianta.sklad_id][0]:
+            best[varianta.sklad_id] = (key, varianta, mnozstvi)
+
+    plan = defaultdict(list)
+    for _, varianta, mnozstvi in best.values():
+        plan[varianta.dodavatel].append((varianta, mnozstvi))
+
+    logger.debug(f'Plán doobjednání ({strategy}): {len(best)} položek u {len(plan)} dodavatelů, '
+                 f'bez varianty: {len(set(shortages) - set(best) - already_requested)}')
+    return dict(plan)
+
+
+def create_draft_poptavky(plan):
+    """
+    Vytvoří v jedné transakci rozpracované poptávky (stav 'Tvorba') pro všechny dodavatele z plánu.
+
+    Vrací:
+    - Seznam vytvořených poptávek.
+    """
+    # kpi importuje OPEN_POPTAVKA_STAVY z tohoto modulu
+    from .kpi import add_created_poptavky_kpis
+
+    if not plan:
+        return []
+
+    dodavatele = list(plan)
+    with transaction.atomic():
+        poptavky = Poptavky.objects.bulk_create(
+            [Poptavky(dodavatel=dodavatel, stav='Tvorba') for dodavatel in dodavatele]
+        )
+        PoptavkaVarianty.objects.bulk_create([
+            PoptavkaVarianty(poptavka=poptavka, varianta=varianta, mnozstvi=mnozstvi, jednotky=varianta.sklad.jednotky)
+            for poptavka, dodavatel in zip(poptavky, dodavatele)
+            for varianta, mnozstvi in plan[dodavatel]
+        ], batch_size=500)
+        # bulk_create obchází signály, počet otevřených poptávek se upraví přímo
+        add_created_poptavky_kpis(poptavky)
+
+    logger.info(f'Vytvořeno {len(poptavky)} rozpracovaných poptávek z položek pod minimem')
+    return poptavky
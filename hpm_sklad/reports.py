@@ -0,0 +1,391 @@
+"""
+Generování PDF exportů a grafů z audit logu a ocenění skladu.
+
+Modul načítá matplotlib, reportlab a PIL, proto ho views importují až při prvním
+požadavku na export nebo graf. Procesy, které grafy nikdy nevykreslují (ostatní
+workery, management příkazy, GraphQL), tak tyto knihovny vůbec nenačítají.
+"""
+import io
+import os
+import datetime
+import logging
+
+from django.db.models import Q, F, Case, When, Value, Sum, CharField
+from django.http import FileResponse
+from matplotlib.figure import Figure
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.utils import ImageReader
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from PIL import Image
+
+from .archive import grouped_sums
+from .models import Sklad, UDRZBA_CHOICES
+
+logger = logging.getLogger(__name__)
+
+
+def _unicode_fonts():
+    """
+    Zaregistruje Unicode TTF fonty pro PDF exporty a vrátí dvojici (běžný font, tučný font).
+
+    ReportLab built-in fonty nezobrazují spolehlivě českou diakritiku, proto se zkusí
+    zaregistrovat Unicode TTF fonty (Windows/Linux), jinak se použije Helvetica.
+    """
+    font_regular = 'Helvetica'
+    font_bold = 'Helvetica-Bold'
+    try:
+        regular_path_candidates = [
+            r'C:\Windows\Fonts\arial.ttf',
+            '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+        ]
+        bold_path_candidates = [
+            r'C:\Windows\Fonts\arialbd.ttf',
+            '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+        ]
+
+        regular_path = next((p for p in regular_path_candidates if os.path.exists(p)), None)
+        bold_path = next((p for p in bold_path_candidates if os.path.exists(p)), None)
+
+        if regular_path and 'ExportUnicode' not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont('ExportUnicode', regular_path))
+        if bold_path and 'ExportUnicodeBold' not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont('ExportUnicodeBold', bold_path))
+
+        if 'ExportUnicode' in pdfmetrics.getRegisteredFontNames():
+            font_regular = 'ExportUnicode'
+        if 'ExportUnicodeBold' in pdfmetrics.getRegisteredFontNames():
+            font_bold = 'ExportUnicodeBold'
+        else:
+            font_bold = font_regular
+    except Exception:
+        logger.warning('Nepodařilo se načíst Unicode font pro PDF export, používám výchozí font.')
+    return font_regular, font_bold
+
+
+def consumption_pdf_response(queryset, month, year, ucetnictvi, typ_udrzby, query):
+    """
+    Exportuje spotřebu jednotlivých dílů za vyfiltrované období do PDF.
+
+    Parametry:
+    - queryset: Vyfiltrované záznamy audit logu (queryset nebo `CombinedAuditLog`).
+    - month, year, ucetnictvi, typ_udrzby, query: Použité filtry, které se vypíší do hlavičky.
+
+    Vrací:
+    - FileResponse s PDF souborem.
+    """
+    rows = grouped_sums(
+        queryset, ('interne_cislo', 'evidencni_cislo', 'pouzite_zarizeni', 'group_poznamka'),
+        {'celkovy_vydej': Sum('zmena_mnozstvi')},
+        annotations={'group_poznamka': Case(
+            When(pouzite_zarizeni='VIZ POZN.', then=F('poznamka')),
+            default=Value(''),
+            output_field=CharField()
+        )},
+    )
+
+    today = datetime.date.today().strftime('%Y-%m-%d')
+    today_for_filename = datetime.date.today().strftime('%d-%m-%Y')
+    filename = f'spotreba_export_{today_for_filename}.pdf'
+
+    sklad_map = {
+        item.evidencni_cislo: item
+        for item in Sklad.objects.filter(evidencni_cislo__in=[row['evidencni_cislo'] for row in rows])
+    }
+
+    pdf_buffer = io.BytesIO()
+    page_width, page_height = landscape(letter)
+    font_regular, font_bold = _unicode_fonts()
+    margin_x = 30
+    margin_y = 30
+    pdf = canvas.Canvas(pdf_buffer, pagesize=landscape(letter))
+
+    col_widths = [60, 60, 357, 55, 50, 75, 75]
+    headers = ['Číslo karty', 'Evidenční č.', 'Název dílu', 'Vydáno', 'Jednotky', 'Použité zařízení', 'Poznámka']
+
+    x_positions = [margin_x]
+    for width in col_widths[:-1]:
+        x_positions.append(x_positions[-1] + width)
+
+    def wrap_text(value, max_width, font_name=font_regular, font_size=8):
+        text = str(value or '')
+        if not text:
+            return ['']
+        words = text.split()
+        if not words:
+            return ['']
+
+        lines = []
+        current_line = words[0]
+        for word in words[1:]:
+            candidate = f"{current_line} {word}"
+            if pdf.stringWidth(candidate, font_name, font_size) <= max_width:
+                current_line = candidate
+            else:
+                lines.append(current_line)
+                current_line = word
+        lines.append(current_line)
+        return lines
+
+    def get_wrapped_columns(values, font_name=font_regular, font_size=8):
+        wrapped_columns = []
+        max_lines = 1
+        for idx, value in enumerate(values):
+            wrapped = wrap_text(value, col_widths[idx] - 6, font_name=font_name, font_size=font_size)
+            wrapped_columns.append(wrapped)
+            max_lines = max(max_lines, len(wrapped))
+        return wrapped_columns, max_lines
+
+    def draw_wrapped_row(y_start, values, font_name=font_regular, font_size=8):
+        wrapped_columns, max_lines = get_wrapped_columns(values, font_name=font_name, font_size=font_size)
+
+        line_height = 10
+        row_height = max_lines * line_height + 4
+        y_text = y_start - 10
+        row_bottom = y_start - row_height
+
+        # Mřížka tabulky: obrys každé buňky v řádku.
+        for col_idx, col_width in enumerate(col_widths):
+            pdf.rect(x_positions[col_idx], row_bottom, col_width, row_height, stroke=1, fill=0)
+
+        pdf.setFont(font_name, font_size)
+        for col_idx, lines_in_col in enumerate(wrapped_columns):
+            current_y = y_text
+            for line in lines_in_col:
+                if col_idx == 2:
+                    pdf.drawString(x_positions[col_idx] + 3, current_y, line)
+                else:
+                    line_width = pdf.stringWidth(line, font_name, font_size)
+                    centered_x = x_positions[col_idx] + (col_widths[col_idx] - line_width) / 2
+                    pdf.drawString(centered_x, current_y, line)
+                current_y -= line_height
+
+        return row_bottom
+
+    def draw_table_header(y_start):
+        header_height = 18
+        header_bottom = y_start - header_height
+        pdf.setFont(font_bold, 8)
+
+        for idx, header in enumerate(headers):
+            pdf.rect(x_positions[idx], header_bottom, col_widths[idx], header_height, stroke=1, fill=0)
+            if idx == 2:
+                pdf.drawString(x_positions[idx] + 3, y_start - 11, header)
+            else:
+                header_width = pdf.stringWidth(header, font_bold, 8)
+                centered_x = x_positions[idx] + (col_widths[idx] - header_width) / 2
+                pdf.drawString(centered_x, y_start - 11, header)
+
+        return header_bottom
+
+    def draw_page_number_footer():
+        pdf.setFont(font_regular, 8)
+        pdf.drawRightString(page_width - margin_x, margin_y - 10, f"Strana {pdf.getPageNumber()}")
+
+    pdf.setTitle('Export spotreby')
+    pdf.setFont(font_bold, 12)
+    pdf.drawString(margin_x, page_height - 30, f'Export spotřeby náhradních dílů {month}/{year}')
+    pdf.setFont(font_regular, 8)
+    pdf.drawRightString(page_width - margin_x, page_height - 30, f"Datum tisku: {today}")
+
+    pdf.setFont(font_regular, 9)
+    filter_text = (
+        f"Použité filtry: měsíc: {month}, rok: {year}, "
+        f"pouze v účetnictví: {'ano' if ucetnictvi == 'on' else 'ne'}, "
+        f"typ údržby: {typ_udrzby}, vyhledávání: {query or '-'}"
+    )
+    filter_lines = wrap_text(filter_text, page_width - (2 * margin_x), font_name=font_regular, font_size=9)
+    filter_start_y = page_height - 46
+    filter_y = filter_start_y
+    for line in filter_lines[:3]:
+        pdf.drawString(margin_x, filter_y, line)
+        filter_y -= 11
+
+    y = filter_y - 6
+    y = draw_table_header(y)
+
+    for item in rows:
+        skladova_polozka = sklad_map.get(item['evidencni_cislo'])
+        nazev_dilu = skladova_polozka.nazev_dilu if skladova_polozka else ''
+        jednotky = skladova_polozka.jednotky if skladova_polozka else ''
+        auditlog_poznamka = item['group_poznamka'] or '' if item['pouzite_zarizeni'] == 'VIZ POZN.' else ''
+
+        row_data = [
+            str(item['interne_cislo'] or ''),
+            str(item['evidencni_cislo'] or ''),
+            nazev_dilu,
+            str(item['celkovy_vydej'] or ''),
+            str(jednotky),
+            item['pouzite_zarizeni'] or '',
+            auditlog_poznamka,
+        ]
+
+        _, max_lines = get_wrapped_columns(row_data, font_name=font_regular, font_size=8)
+        next_row_height = max_lines * 10 + 4
+        if y - next_row_height < margin_y:
+            draw_page_number_footer()
+            pdf.showPage()
+            pdf.setFont(font_bold, 12)
+            pdf.drawString(margin_x, page_height - 30, f'Export spotřeby náhradních dílů {month}/{year}')
+            pdf.setFont(font_regular, 8)
+            pdf.drawRightString(page_width - margin_x, page_height - 30, f"Datum tisku: {today}")
+            pdf.setFont(font_regular, 9)
+            filter_y = filter_start_y
+            for line in filter_lines[:3]:
+                pdf.drawString(margin_x, filter_y, line)
+                filter_y -= 11
+            y = filter_y - 6
+            y = draw_table_header(y)
+
+        y = draw_wrapped_row(y, row_data)
+
+    draw_page_number_footer()
+
+    pdf.save()
+    pdf_buffer.seek(0)
+
+    logger.info(f"Export spotřeby do PDF připraven. Počet položek: {len(rows)}")
+    return FileResponse(pdf_buffer, as_attachment=True, filename=filename)
+
+
+def _bar_chart_pdf_response(labels, values, xlabel, title, heading, filename):
+    """
+    Vykreslí sloupcový graf a vloží ho do PDF souboru.
+
+    Graf se kreslí přímo do `Figure` bez pyplot, takže nevzniká globální stav
+    ani neuvolněné figury a není potřeba přepínat backend matplotlibu.
+    """
+    fig = Figure(figsize=(14, 8))
+    ax = fig.subplots()
+
+    # Vytvoření sloupcového grafu
+    bars = ax.bar(labels, values, color='skyblue')
+
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('EUR')
+    ax.set_title(title)
+    ax.set_xticks(labels)
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+
+    # Přidání hodnot nad sloupce
+    ax.bar_label(bars, fmt='%.0f', padding=3)
+
+    # Uložení grafu do obrázku
+    buf = io.BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format='png')
+    buf.seek(0)
+    image = Image.open(buf)
+
+    # Vytvoření PDF s vloženým grafem
+    pdf_buffer = io.BytesIO()
+    p = canvas.Canvas(pdf_buffer, pagesize=landscape(letter))
+    p.drawString(100, 560, heading)
+    img_reader = ImageReader(image)
+    p.drawImage(img_reader, 50, 150, width=700, height=400)
+    p.showPage()
+    p.save()
+    pdf_buffer.seek(0)
+
+    return FileResponse(pdf_buffer, as_attachment=True, filename=filename)
+
+
+def costs_by_equipment_pdf_response(queryset, month, year):
+    """
+    Generuje graf nákladů na náhradní díly podle zařízení a ukládá ho do PDF souboru.
+
+    Vrací:
+    - FileResponse obsahující graf ve formátu PDF.
+    """
+    data = {}
+    for item in queryset:
+        if item.typ_operace == 'VÝDEJ':
+            if item.pouzite_zarizeni not in data:
+                data[item.pouzite_zarizeni] = 0
+            data[item.pouzite_zarizeni] += abs(item.celkova_cena_eur)
+
+    zarizeni = sorted(data.keys())
+    naklady = [data[key] for key in zarizeni]
+
+    return _bar_chart_pdf_response(
+        zarizeni, naklady, 'Zařízení', f"Náklady za období: měsíc:{month}, rok:{year}",
+        "Náklady na náhradní díly", 'graf_naklady_na_zarizeni.pdf',
+    )
+
+
+def costs_by_maintenance_pdf_response(queryset, month, year):
+    """
+    Generuje graf nákladů podle typu údržby za zvolený měsíc a rok a ukládá ho do PDF souboru.
+
+    Vrací:
+    - FileResponse obsahující graf ve formátu PDF.
+    """
+    data = {}
+    for choice in UDRZBA_CHOICES:
+        data[choice[0]] = 0
+    queryset = queryset.exclude(Q(typ_udrzby__isnull=True) | Q(typ_udrzby=''))
+    for item in queryset:
+        data[item.typ_udrzby] += abs(item.celkova_cena_eur)
+
+    typy_udrzby = sorted(data.keys(), reverse=True)
+    naklady = [data[key] for key in typy_udrzby]
+
+    return _bar_chart_pdf_response(
+        typy_udrzby, naklady, 'Typ údržby', f"Náklady podle typu údržby: měsíc {month}, rok {year}",
+        "Náklady podle typu údržby", 'graf_naklady_podle_typu_udrzby.pdf',
+    )
+
+
+def valuation_pdf_response(rows, datum):
+    """
+    Exportuje ocenění skladu k danému datu do PDF.
+
+    Parametry:
+    - rows: Řádky reportu z `valuation.valuation_rows`.
+    - datum: Datum, ke kterému je sklad oceněn.
+
+    Vrací:
+    - FileResponse s PDF souborem.
+    """
+    font_regular, font_bold = _unicode_fonts()
+    styles = getSampleStyleSheet()
+    styles['Title'].fontName = font_bold
+    styles['Normal'].fontName = font_regular
+
+    data = [['Evidenční č.', 'Číslo karty', 'Název dílu', 'Množství', 'Jednotky', 'Celkem EUR']]
+    data += [
+        [row['evidencni_cislo'], row['interne_cislo'] or '', row['nazev_dilu'], row['mnozstvi'],
+         row['jednotky'], f"{row['celkova_cena_eur']:.2f}"]
+        for row in rows
+    ]
+    data.append(['', '', 'Celkem', '', '', f"{sum(row['celkova_cena_eur'] for row in rows):.2f}"])
+
+    table = Table(data, colWidths=[60, 60, 360, 60, 50, 80], repeatRows=1)
+    table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), font_regular),
+        ('FONTNAME', (0, 0), (-1, 0), font_bold),
+        ('FONTNAME', (0, -1), (-1, -1), font_bold),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
+    ]))
+
+    pdf_buffer = io.BytesIO()
+    document = SimpleDocTemplate(
+        pdf_buffer, pagesize=landscape(letter), leftMargin=30, rightMargin=30, topMargin=30, bottomMargin=30,
+        title='Oceneni skladu',
+    )
+    document.build([
+        Paragraph(f'Ocenění skladu k {datum.strftime("%d.%m.%Y")}', styles['Title']),
+        Paragraph(f'Datum tisku: {datetime.date.today().strftime("%Y-%m-%d")}', styles['Normal']),
+        Spacer(1, 8),
+        table,
+    ])
+    pdf_buffer.seek(0)
+
+    logger.info(f"Export ocenění skladu do PDF připraven. Počet položek: {len(rows)}")
+    return FileResponse(pdf_buffer, as_attachment=True, filename=f'oceneni_skladu_{datum.isoformat()}.pdf')
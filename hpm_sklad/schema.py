@@ -1,15 +1,124 @@
 import graphene
 from graphene_django.types import DjangoObjectType
-from .models import Sklad
+from graphql import GraphQLError
+from .models import Sklad, AuditLog
+from .movements import record_movement_batch, MovementBatchError
+
+MOVEMENT_PERMISSIONS = ('hpm_sklad.change_sklad', 'hpm_sklad.add_auditlog')
+
 
 class SkladType(DjangoObjectType):
     class Meta:
         model = Sklad
 
+
+class AuditLogType(DjangoObjectType):
+    class Meta:
+        model = AuditLog
+        exclude = ('operaci_provedl',)
+
+
+class MovementErrorType(graphene.ObjectType):
+    """ Chyba validace jednoho pohybu v dávce. """
+    index = graphene.Int()
+    field = graphene.String()
+    messages = graphene.List(graphene.String)
+
+
+class ReceiptInput(graphene.InputObjectType):
+    evidencni_cislo = graphene.Int(required=True)
+    zmena_mnozstvi = graphene.Int(required=True)
+    dodavatel = graphene.ID(required=True, description="ID dodavatele")
+    datum_nakupu = graphene.Date(required=True)
+    cislo_objednavky = graphene.String(required=True)
+    jednotkova_cena_eur = graphene.Float(required=True)
+    umisteni = graphene.String()
+    objednano = graphene.String()
+    poznamka = graphene.String()
+
+
+class DispatchInput(graphene.InputObjectType):
+    evidencni_cislo = graphene.Int(required=True)
+    zmena_mnozstvi = graphene.Int(required=True)
+    pouzite_zarizeni = graphene.String(required=True)
+    typ_udrzby = graphene.String(required=True)
+    datum_vydeje = graphene.Date(required=True)
+    umisteni = graphene.String()
+    poznamka = graphene.String()
+
+
+class InventoryAdjustmentInput(graphene.InputObjectType):
+    evidencni_cislo = graphene.Int(required=True)
+    skutecne_mnozstvi = graphene.Int(required=True)
+    datum = graphene.Date(required=True)
+    poznamka = graphene.String()
+
+
+class MovementBatchMutation(graphene.Mutation):
+    """
+    Společný základ mutací, které zapisují dávku pohybů v jedné transakci.
+    Při chybě validace kteréhokoli pohybu se nezapíše nic a vrátí se seznam chyb.
+    """
+    kind = None
+
+    ok = graphene.Boolean()
+    audit_logs = graphene.List(AuditLogType)
+    errors = graphene.List(MovementErrorType)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def mutate(cls, root, info, movements):
+        user = info.context.user
+        if not user.is_authenticated or not user.has_perms(MOVEMENT_PERMISSIONS):
+            raise GraphQLError('Nedostatečná oprávnění pro zápis skladových pohybů.')
+
+        items = [{key: value for key, value in movement.items() if value is not None} for movement in movements]
+        try:
+            audit_logs = record_movement_batch(cls.kind, items, user)
+        except MovementBatchError as e:
+            errors = [
+                MovementErrorType(index=index, field=field, messages=list(messages))
+                for index, form_errors in e.errors
+                for field, messages in form_errors.items()
+            ]
+            return cls(ok=False, audit_logs=[], errors=errors)
+        return cls(ok=True, audit_logs=audit_logs, errors=[])
+
+
+class RecordReceipts(MovementBatchMutation):
+    kind = 'receipt'
+
+    class Arguments:
+        movements = graphene.List(graphene.NonNull(ReceiptInput), required=True)
+
+
+class RecordDispatches(MovementBatchMutation):
+    kind = 'dispatch'
+
+    class Arguments:
+        movements = graphene.List(graphene.NonNull(DispatchInput), required=True)
+
+
+class RecordInventoryAdjustments(MovementBatchMutation):
+    kind = 'inventura'
+
+    class Arguments:
+        movements = graphene.List(graphene.NonNull(InventoryAdjustmentInput), required=True)
+
+
 class Query(graphene.ObjectType):
     all_sklad = graphene.List(SkladType)
 
     def resolve_all_sklad(self, info, **kwargs):
         return Sklad.objects.all()
 
-schema = graphene.Schema(query=Query)
+
+class Mutation(graphene.ObjectType):
+    record_receipts = RecordReceipts.Field()
+    record_dispatches = RecordDispatches.Field()
+    record_inventory_adjustments = RecordInventoryAdjustments.Field()
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
@@ -0,0 +1,69 @@
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max
+
+from .models import Sklad, Sekvence
+
+logger = logging.getLogger(__name__)
+
+INTERNE_CISLO = 'interne_cislo'
+
+# Pole, podle jehož maxima se čítač založí při prvním použití.
+SEQUENCE_SOURCES = {
+    INTERNE_CISLO: (Sklad, 'interne_cislo'),
+}
+
+
+def _create_sequence(nazev):
+    """
+    Založí čítač s hodnotou podle nejvyššího existujícího čísla (jediná agregace za život čítače).
+    """
+    model, field = SEQUENCE_SOURCES[nazev]
+    start = model.objects.aggregate(maximum=Max(field))['maximum'] or 0
+    try:
+        with transaction.atomic():
+            Sekvence.objects.create(nazev=nazev, hodnota=start)
+    except IntegrityError:
+        # čítač mezitím založil jiný proces
+        pass
+    logger.info(f'Založen čítač {nazev} s počáteční hodnotou {start}')
+
+
+def allocate(nazev, count=1):
+    """
+    Atomicky přidělí blok `count` po sobě jdoucích čísel z čítače.
+
+    - Čítač se posune jediným UPDATE, který řádek čítače zamkne do konce transakce,
+      takže souběžné požadavky dostanou vždy různá čísla.
+    - Vrácená čísla se už znovu nepřidělí, ani když se nakonec nepoužijí.
+
+    Vrací:
+    - `range` přidělených čísel.
+    """
+    if count < 1:
+        return range(0)
+    with transaction.atomic():
+        if not Sekvence.objects.filter(nazev=nazev).update(hodnota=F('hodnota') + count):
+            _create_sequence(nazev)
+            Sekvence.objects.filter(nazev=nazev).update(hodnota=F('hodnota') + count)
+        hodnota = Sekvence.objects.values_list('hodnota', flat=True).get(nazev=nazev)
+    return range(hodnota - count + 1, hodnota + 1)
+
+
+def advance(nazev, hodnota):
+    """
+    Posune čítač alespoň na zadanou hodnotu, aby se ručně zadané číslo později nepřidělilo znovu.
+    """
+    if hodnota is None:
+        return
+    if not Sekvence.objects.filter(nazev=nazev).exists():
+        _create_sequence(nazev)
+    Sekvence.objects.filter(nazev=nazev, hodnota__lt=hodnota).update(hodnota=hodnota)
+
+
+def allocate_interne_cislo():
+    """
+    Přidělí jedno nové číslo karty skladové položky.
+    """
+    return allocate(INTERNE_CISLO)[0]
@@ -0,0 +1,206 @@
+import logging
+from contextlib import contextmanager
+
+from django.db.models.signals import pre_save, post_save, post_delete, post_migrate, m2m_changed
+from django.dispatch import receiver
+
+from .detail import bump_detail_version
+from .equipment_stats import update_equipment_totals
+from .kpi import update_sklad_kpis, update_spend_kpis, invalidate_spend_kpis, update_poptavky_kpis
+from .models import Sklad, AuditLog, Dodavatele, Zarizeni, Poptavky, PoptavkaVarianty
+from .reorder import update_shortage, backfill_shortages
+from .valuation import update_checkpoints
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Sklad)
+def update_sklad_shortage(sender, instance, **kwargs):
+    """
+    Udržuje množinu položek pod minimem při každém uložení skladové položky.
+    """
+    update_shortage(instance)
+
+
+@receiver(post_migrate)
+def backfill_sklad_shortages(sender, **kwargs):
+    """
+    Po migraci doplní množinu položek pod minimem, aby filtr "pod minimem" fungoval hned po nasazení.
+    """
+    if sender.name == 'hpm_sklad':
+        backfill_shortages()
+
+
+@receiver(pre_save, sender=AuditLog)
+def load_auditlog_state(sender, instance, raw=False, **kwargs):
+    """
+    Před úpravou pohybu načte z databáze jeho původní stav pro snímky stavu skladu (`AuditLog.checkpoint_stav`)
+    a spotřebu (`AuditLog.spotreba_stav`), pokud ho instance nemá (např. byla načtena přes `only()`
+    nebo sestavena s existujícím ID).
+    """
+    if raw or instance.pk is None:
+        return
+    if getattr(instance, 'checkpoint_stav', None) is not None and getattr(instance, 'spotreba_stav', None) is not None:
+        return
+    puvodni = AuditLog.objects.filter(pk=instance.pk).first()
+    if puvodni is not None:
+        instance.checkpoint_stav = puvodni.current_checkpoint_stav()
+        instance.spotreba_stav = puvodni.current_spotreba_stav()
+
+
+@receiver(post_save, sender=AuditLog)
+def update_stock_checkpoints(sender, instance, created, raw=False, **kwargs):
+    """
+    Upraví snímky stavu skladu, které pohyb se zpětným datem změnil.
+
+    - Při načítání fixtur (`loaddata`) se snímky nemění.
+    """
+    if raw:
+        return
+    update_checkpoints(instance, created=created)
+
+
+@receiver(post_delete, sender=AuditLog)
+def remove_stock_checkpoints(sender, instance, origin=None, **kwargs):
+    """
+    Odečte smazaný pohyb ze snímků stavu skladu.
+
+    - Při mazání skladové položky se snímky položky mažou kaskádou spolu s pohyby, neupravují se.
+    """
+    if isinstance(origin, Sklad) or getattr(origin, 'model', None) is Sklad:
+        return
+    update_checkpoints(instance, deleted=True)
+
+
+@receiver(post_save, sender=Sklad)
+def update_sklad_kpi_counters(sender, instance, created, **kwargs):
+    """
+    Upraví čítače hodnoty skladu a položek pod minimem na úvodní stránce.
+    """
+    update_sklad_kpis(instance, created=created)
+
+
+@receiver(post_delete, sender=Sklad)
+def remove_sklad_kpi_counters(sender, instance, **kwargs):
+    update_sklad_kpis(instance, deleted=True)
+
+
+@receiver(post_save, sender=Poptavky)
+def update_poptavky_kpi_counter(sender, instance, created, **kwargs):
+    """
+    Upraví počet otevřených poptávek na úvodní stránce.
+    """
+    update_poptavky_kpis(instance, created=created)
+
+
+@receiver(post_delete, sender=Poptavky)
+def remove_poptavky_kpi_counter(sender, instance, **kwargs):
+    update_poptavky_kpis(instance, deleted=True)
+
+
+@receiver(post_save, sender=AuditLog)
+def update_spend_totals(sender, instance, created, **kwargs):
+    """
+    Promítne zápis nebo úpravu výdeje do nákladů aktuálního měsíce na úvodní stránce a do předpočítané
+    spotřeby zařízení podle rozdílu proti stavu načtenému z databáze (`AuditLog.spotreba_stav`).
+
+    - Pokud původní stav upraveného pohybu není známý, čítače nákladů se zahodí a spotřeba zařízení
+      se nemění, opraví ji až příkaz `rebuild_equipment_stats`.
+    """
+    novy = instance.current_spotreba_stav()
+    if created:
+        puvodni = None
+    else:
+        puvodni = getattr(instance, 'spotreba_stav', None)
+        if puvodni is None:
+            invalidate_spend_kpis()
+            logger.warning(f'Neznámý původní stav pohybu {instance.pk}, spotřeba zařízení není aktuální, '
+                           f'spusťte rebuild_equipment_stats')
+            instance.spotreba_stav = novy
+            return
+
+    update_spend_kpis(puvodni, novy)
+    update_equipment_totals(puvodni, novy)
+    instance.spotreba_stav = novy
+
+
+def _deleted_spotreba_stav(auditlog):
+    return getattr(auditlog, 'spotreba_stav', None) or auditlog.current_spotreba_stav()
+
+
+@receiver(post_delete, sender=AuditLog)
+def subtract_spend_kpi_counters(sender, instance, **kwargs):
+    """
+    Odečte smazaný výdej z nákladů aktuálního měsíce na úvodní stránce.
+    """
+    update_spend_kpis(_deleted_spotreba_stav(instance), None)
+
+
+@receiver(post_delete, sender=AuditLog)
+def subtract_equipment_totals(sender, instance, **kwargs):
+    """
+    Odečte smazaný výdej pro zařízení z předpočítané spotřeby zařízení.
+    """
+    update_equipment_totals(_deleted_spotreba_stav(instance), None)
+
+
+@receiver(post_save, sender=Sklad)
+@receiver(post_save, sender=AuditLog)
+@receiver(post_save, sender=Dodavatele)
+@receiver(post_save, sender=Zarizeni)
+@receiver(post_save, sender=Poptavky)
+@receiver(post_delete, sender=Sklad)
+@receiver(post_delete, sender=AuditLog)
+@receiver(post_delete, sender=Dodavatele)
+@receiver(post_delete, sender=Zarizeni)
+@receiver(post_delete, sender=Poptavky)
+def invalidate_detail_fragment(sender, instance, **kwargs):
+    """
+    Zneplatní cachovaný fragment detailu po změně nebo smazání objektu.
+    """
+    bump_detail_version(sender, instance.pk)
+
+
+@receiver(post_save, sender=PoptavkaVarianty)
+@receiver(post_delete, sender=PoptavkaVarianty)
+def invalidate_poptavka_detail_fragment(sender, instance, **kwargs):
+    bump_detail_version(Poptavky, instance.poptavka_id)
+
+
+@receiver(m2m_changed, sender=Sklad.zarizeni.through)
+def invalidate_sklad_zarizeni_fragment(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Zneplatní detail skladových položek po změně přiřazených zařízení.
+    """
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        bump_detail_version(Sklad, instance.pk)
+    else:
+        for pk in pk_set or ():
+            bump_detail_version(Sklad, pk)
+
+
+# Příjemci signálu post_delete pro AuditLog, které archivace audit logu odpojuje.
+AUDITLOG_DELETE_RECEIVERS = (
+    remove_stock_checkpoints, subtract_spend_kpi_counters, subtract_equipment_totals, invalidate_detail_fragment,
+)
+
+
+@contextmanager
+def auditlog_delete_signals_disconnected():
+    """
+    Dočasně odpojí příjemce signálu post_delete pro AuditLog.
+
+    - Používá se při přesunu záznamů do archivu: pohyb z audit logu nemizí, jen se přesouvá,
+      a předpočítané hodnoty (snímky, spotřeba zařízení, ukazatele) se proto nemají měnit.
+    - Bez příjemců smaže Django záznamy jedním dotazem bez načítání instancí.
+    - Odpojení platí pro celý proces, volá se proto jen z management příkazu.
+    """
+    for receiver_func in AUDITLOG_DELETE_RECEIVERS:
+        post_delete.disconnect(receiver_func, sender=AuditLog)
+    try:
+        yield
+    finally:
+        for receiver_func in AUDITLOG_DELETE_RECEIVERS:
+            post_delete.connect(receiver_func, sender=AuditLog)
@@ -1,15 +1,24 @@
+// Zvýraznění vybraného řádku tabulky
+function highlightRow(evidencniCislo) {
+    document.querySelectorAll('tr').forEach(row => {
+        row.classList.remove('table-info');
+    });
+    const row = document.querySelector('tr[data-id="' + evidencniCislo + '"]');
+    if (row) {
+        row.classList.add('table-info');
+    }
+}
+
 // Funkce pro načtení detailu a zvýraznění řádku
 function loadDetail(url, evidencniCislo) {
-    fetch(url)
+    // hlavička HX-Request označí požadavek na fragment (django-htmx, request.htmx)
+    fetch(url, {headers: {'HX-Request': 'true'}})
     .then(response => response.text())
     .then(html => {
         document.getElementById('detail').innerHTML = html;
         // Aktualizace URL a zvýraznění řádku
         history.pushState(null, '', '?selected=' + evidencniCislo); // Aktualizace URL
-        document.querySelectorAll('tr').forEach(row => {
-            row.classList.remove('table-info');
-        });
-        document.querySelector('tr[data-id="' + evidencniCislo + '"]').classList.add('table-info');
+        highlightRow(evidencniCislo);
     })
     .catch(err => console.error('Chyba při načítání detailů:', err));
 }
@@ -25,25 +34,18 @@ function loadForm(url) {
 }
 
 document.addEventListener("DOMContentLoaded", function() {
-    function selectFirstRow() {
-        const firstRow = document.querySelector('table tbody tr:nth-child(1)'); // První řádek v těle tabulky
-        if (firstRow) {
-            const evidencniCislo = firstRow.getAttribute('data-id');
-            const detailUrl = firstRow.getAttribute('data-detail-url');
-            loadDetail(detailUrl, evidencniCislo);
-        }
+    // Detail vybraného (nebo prvního) řádku je vložen do stránky už serverem
+    const detail = document.getElementById('detail');
+    if (detail && detail.dataset.selected) {
+        highlightRow(detail.dataset.selected);
     }
 
-    // Automaticky vyberte první řádek při načtení stránky
-    selectFirstRow();    
-
-    // Přidání onclick události ke všem řádkům
-    document.querySelectorAll('table tbody tr').forEach(row => {
-        row.addEventListener('click', function() {
-            const evidencniCislo = this.getAttribute('data-id');
-            const detailUrl = this.getAttribute('data-detail-url');
-            loadDetail(detailUrl, evidencniCislo);
-        });
+    // Kliknutí na řádek seznamu načte fragment detailu do pravého panelu
+    document.body.addEventListener('click', function(event) {
+        const row = event.target.closest('tr[data-fragment-url]');
+        if (row) {
+            loadDetail(row.getAttribute('data-fragment-url'), row.getAttribute('data-id'));
+        }
     });
 
     // Přidání onclick události k odkazům, které načítají formuláře
@@ -55,3 +57,25 @@ document.addEventListener("DOMContentLoaded", function() {
         });
     });
 });
+
+// Průběžná aktualizace množství v tabulce skladu podle event streamu změn
+document.addEventListener("DOMContentLoaded", function() {
+    const tbody = document.querySelector('tbody[data-stock-events-url]');
+    if (!tbody || !window.EventSource) {
+        return;
+    }
+
+    const source = new EventSource(tbody.getAttribute('data-stock-events-url'));
+    source.addEventListener('stock', function(event) {
+        const data = JSON.parse(event.data);
+        const row = tbody.querySelector('tr[data-id="' + data.evidencni_cislo + '"]');
+        if (!row) {
+            return;
+        }
+        const mnozstviCell = row.querySelector('td[data-field="mnozstvi"]');
+        if (mnozstviCell) {
+            mnozstviCell.textContent = data.mnozstvi;
+        }
+        row.classList.toggle('pod-minimem-row', data.pod_minimem);
+    });
+});
@@ -0,0 +1,155 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Sklad, Inventura, InventuraPolozka
+from .movements import record_movement_batch, MovementBatchError
+
+logger = logging.getLogger(__name__)
+
+
+class StocktakeError(Exception):
+    """
+    Vyvolána při operaci, kterou stav inventury neumožňuje (např. počítání v zaúčtované inventuře).
+    """
+
+
+def start_stocktake(user, datum=None, umisteni='', poznamka=None):
+    """
+    Zahájí inventuru a uloží snímek množství všech položek v jejím rozsahu.
+
+    Parametry:
+    - user: Uživatel, který inventuru zahajuje.
+    - datum: Datum inventury (výchozí dnešní datum).
+    - umisteni: Prefix umístění, na které se inventura omezí (prázdný = celý sklad).
+    - poznamka: Poznámka k inventuře.
+
+    Vrací:
+    - Vytvořenou inventuru.
+    """
+    polozky = Sklad.objects.all()
+    if umisteni:
+        polozky = polozky.filter(umisteni__startswith=umisteni)
+
+    with transaction.atomic():
+        inventura = Inventura.objects.create(
+            datum=datum or timezone.localdate(), umisteni=umisteni, poznamka=poznamka, zahajil=user
+        )
+        snapshot = [
+            InventuraPolozka(inventura=inventura, sklad_id=pk, umisteni=sklad_umisteni or '', stav_pri_zahajeni=mnozstvi)
+            for pk, sklad_umisteni, mnozstvi in polozky.values_list('pk', 'umisteni', 'mnozstvi').iterator()
+        ]
+        InventuraPolozka.objects.bulk_create(snapshot, batch_size=500)
+
+    logger.info(f'{user} zahájil {inventura}, počet položek ve snímku: {len(snapshot)}')
+    return inventura
+
+
+def stocktake_locations(inventura):
+    """
+    Vrátí přehled umístění v inventuře s počtem položek a počtem již sečtených položek.
+
+    Vrací:
+    - Seznam slovníků s klíči `umisteni`, `pocet` a `secteno`, seřazený podle umístění.
+    """
+    return list(
+        inventura.polozky.values('umisteni')
+        .annotate(pocet=Count('pk'), secteno=Count('sectene_mnozstvi'))
+        .order_by('umisteni')
+    )
+
+
+def record_counts(inventura, counts, user):
+    """
+    Uloží sečtená množství položek inventury spolu s evidovaným množstvím v okamžiku sečtení.
+
+    - Pohyby zapsané mezi zahájením inventury a sečtením položky jsou už ve fyzickém stavu
+      i v evidovaném množství, rozdíl se proto počítá proti stavu při sečtení.
+    - Inventura i dotčené položky skladu se po dobu zápisu zamknou, stav inventury se ověřuje
+      na čerstvě načteném řádku.
+
+    Parametry:
+    - inventura: Otevřená inventura.
+    - counts: Slovník {pk inventurní položky: sečtené množství}.
+    - user: Uživatel, který položky sečetl.
+
+    Vrací:
+    - Počet aktualizovaných položek.
+    """
+    with transaction.atomic():
+        # stejný zámek jako při zaúčtování, souběžné zaúčtování počká nebo se počty odmítnou
+        inventura = Inventura.objects.select_for_update().get(pk=inventura.pk)
+        if inventura.stav != 'Otevřená':
+            raise StocktakeError(f'{inventura} je již zaúčtovaná.')
+
+        now = timezone.now()
+        polozky = list(inventura.polozky.filter(pk__in=counts))
+        # zamčené položky skladu zaručí, že se mezi čtením stavu a uložením nezapíše žádný pohyb
+        aktualni_stav = dict(
+            Sklad.objects.select_for_update().filter(pk__in=[polozka.sklad_id for polozka in polozky])
+            .values_list('pk', 'mnozstvi')
+        )
+        for polozka in polozky:
+            polozka.sectene_mnozstvi = counts[polozka.pk]
+            polozka.stav_pri_secteni = aktualni_stav[polozka.sklad_id]
+            polozka.secetl = user
+            polozka.cas_secteni = now
+        InventuraPolozka.objects.bulk_update(
+            polozky, ['sectene_mnozstvi', 'stav_pri_secteni', 'secetl', 'cas_secteni'], batch_size=500
+        )
+
+    logger.debug(f'{user} zadal sečtená množství v {inventura}, počet položek: {len(polozky)}')
+    return len(polozky)
+
+
+def reconcile_stocktake(inventura, user):
+    """
+    Zaúčtuje inventurní rozdíly všech sečtených položek jako jednu dávku pohybů 'Inventura'.
+
+    - Rozdíl se počítá proti evidovanému množství v okamžiku sečtení položky a připočte se
+      k aktuálnímu stavu, takže se pohyby zapsané během inventury nezapočtou dvakrát ani nepřepíšou.
+    - Celá dávka se zapíše v jedné transakci (viz `record_movement_batch`). Pokud je některý
+      pohyb neplatný, vyvolá se `MovementBatchError` (chyby místo indexů obsahují evidenční čísla)
+      a inventura zůstane otevřená.
+
+    Vrací:
+    - Seznam vytvořených záznamů audit logu.
+    """
+    with transaction.atomic():
+        inventura = Inventura.objects.select_for_update().get(pk=inventura.pk)
+        if inventura.stav != 'Otevřená':
+            raise StocktakeError(f'{inventura} je již zaúčtovaná.')
+
+        rozdily = {
+            polozka.sklad_id: polozka.rozdil
+            for polozka in inventura.polozky.filter(sectene_mnozstvi__isnull=False)
+            if polozka.rozdil != 0
+        }
+        aktualni_stav = dict(
+            Sklad.objects.select_for_update().filter(pk__in=rozdily).values_list('pk', 'mnozstvi')
+        )
+        items = [
+            {
+                'evidencni_cislo': pk,
+                'skutecne_mnozstvi': aktualni_stav[pk] + rozdil,
+                'datum': inventura.datum,
+                'poznamka': f'Inventura #{inventura.pk}',
+            }
+            for pk, rozdil in rozdily.items()
+            if pk in aktualni_stav
+        ]
+        try:
+            auditlogs = record_movement_batch('inventura', items, user)
+        except MovementBatchError as e:
+            e.errors = [(items[index]['evidencni_cislo'], errors) for index, errors in e.errors]
+            raise
+
+        inventura.stav = 'Zaúčtovaná'
+        inventura.zauctovano = timezone.now()
+        inventura.zauctoval = user
+        inventura.save(update_fields=['stav', 'zauctovano', 'zauctoval'])
+
+    logger.info(f'{user} zaúčtoval {inventura}, počet inventurních pohybů: {len(auditlogs)}')
+    return auditlogs
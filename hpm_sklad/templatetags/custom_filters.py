@@ -1,5 +1,8 @@
+from collections.abc import Mapping
+from urllib.parse import urlencode
+
 from django import template
-from ..models import Varianty
+from django.core.exceptions import ValidationError
 
 register = template.Library()
 
@@ -12,6 +15,47 @@ def get_attribute(value, arg):
     return result
 
 
+def _query_params(context):
+    """
+    Rozparsuje `request.GET` jednou za vykreslení šablony na seznam (klíč, [hodnoty]).
+    Zachovává pořadí, vícenásobné i prázdné parametry.
+    """
+    params = context.render_context.get('query_params')
+    if params is None:
+        request = context.get('request')
+        params = list(request.GET.lists()) if request is not None else []
+        context.render_context['query_params'] = params
+    return params
+
+
+def _build_query(params, updates):
+    pairs = [(key, value) for key, values in params if key not in updates for value in values]
+    pairs += [(key, value) for key, value in updates.items() if value is not None]
+    return '?' + urlencode(pairs)
+
+
+@register.simple_tag(takes_context=True)
+def query_url(context, **updates):
+    """
+    Vrátí querystring aktuálního požadavku se změněnými parametry, hodnota None parametr odstraní.
+
+    Použití:
+    <a href="{% query_url page=page_obj.next_page_number %}">
+    """
+    return _build_query(_query_params(context), updates)
+
+
+@register.simple_tag(takes_context=True)
+def sort_url(context, field):
+    """
+    Vrátí querystring pro řazení podle sloupce `field`; opakované kliknutí na
+    sloupec seřazený vzestupně přepne řazení na sestupné. Ostatní parametry zachová.
+    """
+    params = dict(_query_params(context))
+    is_up = params.get('sort', [None])[-1] == field and params.get('order', [None])[-1] == 'up'
+    return _build_query(_query_params(context), {'sort': field, 'order': 'down' if is_up else 'up'})
+
+
 @register.filter
 def url_remove_param(querystring, params):
     params = params.split(',')
@@ -23,9 +67,56 @@ def url_remove_param(querystring, params):
     return new_querystring
 
 
+def _pk_map(objects):
+    """ Sestaví slovník {pk: instance} z querysetu nebo jiného iterovatelného seznamu instancí. """
+    return {obj.pk: obj for obj in objects}
+
+
+@register.simple_tag(takes_context=True)
+def instance_map(context, queryset):
+    """
+    Načte queryset jednou za vykreslení šablony do slovníku {pk: instance}.
+
+    Použití:
+    {% instance_map varianty_dodavatele as varianty_map %}
+    {{ varianty_map|get_instance:pk }}
+    """
+    cache = context.render_context.setdefault('instance_map', {})
+    key = id(queryset)
+    if key not in cache:
+        cache[key] = (queryset, queryset if isinstance(queryset, Mapping) else _pk_map(queryset))
+    return cache[key][1]
+
+
 @register.filter
 def get_instance(queryset, pk):
+    """
+    Vrátí instanci podle primárního klíče.
+
+    - Pro slovník {pk: instance} (např. z tagu `instance_map`) jde o vyhledání v paměti.
+    - Queryset se při prvním použití načte celý a slovník se uloží přímo na něj,
+      takže další volání v cyklu už nedělají dotazy do databáze.
+    """
+    if isinstance(queryset, Mapping):
+        mapping = queryset
+        model = type(next(iter(mapping.values()), None))
+    else:
+        mapping = getattr(queryset, '_instance_map', None)
+        if mapping is None:
+            mapping = _pk_map(queryset)
+            try:
+                queryset._instance_map = mapping
+            except AttributeError:
+                pass
+        model = getattr(queryset, 'model', None)
+
+    # klíč z šablony (např. řetězec z formuláře) se převede na typ primárního klíče modelu
+    if hasattr(model, '_meta'):
+        try:
+            pk = model._meta.pk.to_python(pk)
+        except ValidationError:
+            return 'Instance neexistuje'
     try:
-        return queryset.get(pk=pk)
-    except (Varianty.DoesNotExist, TypeError, ValueError):
+        return mapping.get(pk, 'Instance neexistuje')
+    except TypeError:
         return 'Instance neexistuje'
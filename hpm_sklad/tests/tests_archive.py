@@ -0,0 +1,133 @@
+from datetime import date
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command, CommandError
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from hpm_sklad.models import Sklad, AuditLog, AuditLogArchiv, StavSkladu
+from hpm_sklad.archive import archive_year, archived_years, auditlog_models
+from hpm_sklad.valuation import stock_valuation, create_checkpoint
+
+
+######################## Testy archivace audit logu ###########################
+
+class AuditLogArchiveTest(TestCase):
+    """
+    Testy pro přesun uzavřených roků audit logu do archivu.
+
+    Testuje:
+    - Přesun záznamů s ponecháním ID a času vytvoření.
+    - Ocenění skladu a platnost snímků po archivaci.
+    - Směrování seznamu a detailu archivovaného roku do archivu.
+    - Spojení audit logu a archivu v seznamu bez zvoleného roku, u částečně archivovaného roku,
+      v pohybech položky a v exportu.
+    - Odpojení signálů jen po dobu archivace.
+    - Management příkaz `archive_audit_log`.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.sklad = Sklad.objects.create(nazev_dilu='Testovací díl', umisteni='A1')
+        self.current_year = timezone.localdate().year
+        self.old = self.log(10, 100.0, date(2023, 5, 10))
+        self.log(-4, -40.0, date(2023, 11, 2))
+        self.new = self.log(3, 30.0, date(self.current_year, 1, 5))
+
+    def log(self, zmena_mnozstvi, celkova_cena_eur, datum):
+        receipt = zmena_mnozstvi > 0
+        return AuditLog.objects.create(
+            ucetnictvi=True, evidencni_cislo=self.sklad, nazev_dilu=self.sklad.nazev_dilu,
+            zmena_mnozstvi=zmena_mnozstvi, mnozstvi=0, typ_operace='PŘÍJEM' if receipt else 'VÝDEJ',
+            umisteni='A1', dodavatel='Test', operaci_provedl=self.user, celkova_cena_eur=celkova_cena_eur,
+            datum_nakupu=datum if receipt else None, datum_vydeje=None if receipt else datum,
+        )
+
+    def test_archive_moves_closed_year(self):
+        self.assertEqual(archive_year(2023), 2)
+
+        self.assertEqual(list(AuditLog.objects.values_list('pk', flat=True)), [self.new.pk])
+        archived = AuditLogArchiv.objects.get(pk=self.old.pk)
+        self.assertEqual(archived.rok, 2023)
+        self.assertEqual(archived.cas_vytvoreni, self.old.cas_vytvoreni)
+        self.assertEqual(archived_years(), [2023])
+        self.assertEqual(auditlog_models('2023'), (AuditLog, AuditLogArchiv))
+        self.assertEqual(auditlog_models(self.current_year), (AuditLog,))
+        self.assertEqual(auditlog_models('VŠE'), (AuditLog, AuditLogArchiv))
+
+    def test_current_year_cannot_be_archived(self):
+        with self.assertRaises(ValueError):
+            archive_year(self.current_year)
+
+    def test_valuation_and_checkpoints_survive_archive(self):
+        create_checkpoint(date(2023, 6, 30))
+        before = stock_valuation(date(self.current_year, 12, 31))
+
+        archive_year(2023)
+
+        self.assertTrue(StavSkladu.objects.filter(datum=date(2023, 6, 30)).exists())
+        self.assertEqual(stock_valuation(date(self.current_year, 12, 31)), before)
+        self.assertEqual(stock_valuation(date(2023, 12, 31)), {self.sklad.pk: (6, 60.0)})
+        StavSkladu.objects.all().delete()
+        self.assertEqual(stock_valuation(date(self.current_year, 12, 31)), before)
+
+    def test_list_and_detail_route_to_archive(self):
+        archive_year(2023)
+        self.client.login(username='testuser', password='testpassword')
+
+        response = self.client.get(reverse('audit_log'), {'year': 2023, 'selected': self.old.pk})
+        self.assertEqual({item.pk for item in response.context['object_list']}, {self.old.pk, self.old.pk + 1})
+        self.assertEqual(response.context['selected_item'].pk, self.old.pk)
+
+        response = self.client.get(reverse('audit_log'), {'year': self.current_year})
+        self.assertEqual([item.pk for item in response.context['object_list']], [self.new.pk])
+
+        response = self.client.get(reverse('detail_audit_log', kwargs={'pk': self.old.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['object'].rok, 2023)
+
+    def test_all_years_and_partial_year_combine_archive(self):
+        archive_year(2023)
+        # pohyb dopsaný zpětně do archivovaného roku zůstane do další archivace v audit logu
+        late = self.log(-1, -10.0, date(2023, 12, 20))
+        self.client.login(username='testuser', password='testpassword')
+
+        response = self.client.get(reverse('audit_log'))
+        self.assertEqual(
+            [item.pk for item in response.context['object_list']], [late.pk, self.new.pk, self.old.pk + 1, self.old.pk]
+        )
+        self.assertEqual(response.context['paginator'].count, 4)
+
+        response = self.client.get(reverse('audit_log'), {'year': 2023, 'sort': 'zmena_mnozstvi', 'order': 'up'})
+        self.assertEqual([item.zmena_mnozstvi for item in response.context['object_list']], [-4, -1, 10])
+
+        response = self.client.get(reverse('audit_log_export_csv'))
+        self.assertEqual(response.content.decode().count('Testovací díl'), 4)
+
+        response = self.client.get(reverse('show_audit_log'), {'pk': self.sklad.pk})
+        self.assertEqual([item.pk for item in response.context['object_list']], [late.pk, self.new.pk, self.old.pk + 1, self.old.pk])
+
+    def test_archive_disconnects_delete_signals_only_while_moving(self):
+        create_checkpoint(date(2023, 12, 31))
+
+        archive_year(2023)
+        self.assertEqual(stock_valuation(date(2023, 12, 31)), {self.sklad.pk: (6, 60.0)})
+        self.assertEqual(StavSkladu.objects.get().mnozstvi, 6)
+
+        # po archivaci se zápis i smazání pohybu do snímku opět promítne
+        late = self.log(2, 20.0, date(2023, 12, 15))
+        self.assertEqual(StavSkladu.objects.get().mnozstvi, 8)
+        late.delete()
+        self.assertEqual(StavSkladu.objects.get().mnozstvi, 6)
+
+    def test_command_keeps_recent_years(self):
+        out = StringIO()
+        call_command('archive_audit_log', stdout=out)
+
+        self.assertIn('Rok 2023: archivováno 2 záznamů', out.getvalue())
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+        with self.assertRaises(CommandError):
+            call_command('archive_audit_log', year=[self.current_year], stdout=StringIO())
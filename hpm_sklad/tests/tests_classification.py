@@ -0,0 +1,73 @@
+from datetime import date
+from io import StringIO
+
+import numpy as np
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from hpm_sklad.models import Sklad, AuditLog
+from hpm_sklad.classification import abc_classes, xyz_classes, classify_stock
+
+PC_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                 '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+
+
+######################## Testy klasifikace ABC/XYZ ###########################
+
+class ClassificationTest(TestCase):
+    """
+    Testy pro klasifikaci skladových položek ABC/XYZ.
+
+    Testuje:
+    - Přiřazení tříd ABC podle kumulativního podílu spotřeby a XYZ podle variačního koeficientu.
+    - Uložení tříd na skladové položky a filtrování v seznamu skladu.
+    - Management příkaz `classify_stock`.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.today = date(2025, 7, 15)
+        self.stabilni = Sklad.objects.create(nazev_dilu='Filtr', umisteni='A1')
+        self.narazovy = Sklad.objects.create(nazev_dilu='Motor', umisteni='A2')
+        self.bez_spotreby = Sklad.objects.create(nazev_dilu='Těsnění', umisteni='A3')
+        # stabilní spotřeba ve všech 12 měsících před aktuálním měsícem, motor jednorázově
+        for mesic in range(7, 19):
+            self.dispatch(self.stabilni, 2, 20.0, date(2024 + (mesic - 1) // 12, (mesic - 1) % 12 + 1, 10))
+        self.dispatch(self.narazovy, 1, 1000.0, date(2025, 3, 10))
+
+    def dispatch(self, sklad, mnozstvi, cena, datum):
+        AuditLog.objects.create(
+            ucetnictvi=False, evidencni_cislo=sklad, nazev_dilu=sklad.nazev_dilu, zmena_mnozstvi=-mnozstvi,
+            mnozstvi=0, typ_operace='VÝDEJ', umisteni='A1', dodavatel='Test', operaci_provedl=self.user,
+            typ_udrzby='Reaktivní', datum_vydeje=datum, celkova_cena_eur=-cena,
+        )
+
+    def test_abc_and_xyz_classes(self):
+        self.assertEqual(abc_classes(np.array([10.0, 700.0, 0.0, 200.0, 90.0])).tolist(), ['C', 'A', 'C', 'A', 'B'])
+        self.assertEqual(abc_classes(np.zeros(2)).tolist(), ['C', 'C'])
+        matrix = np.array([[2, 2, 2, 2], [1, 3, 1, 3], [0, 0, 4, 0], [0, 0, 0, 0]], dtype=float)
+        self.assertEqual(xyz_classes(matrix).tolist(), ['X', 'Y', 'Z', 'Z'])
+
+    def test_classify_stock(self):
+        counts = classify_stock(today=self.today)
+        self.assertEqual(counts, {('A', 'Z'): 1, ('B', 'X'): 1, ('C', 'Z'): 1})
+
+        self.narazovy.refresh_from_db()
+        self.stabilni.refresh_from_db()
+        self.assertEqual((self.narazovy.abc_trida, self.narazovy.xyz_trida), ('A', 'Z'))
+        self.assertEqual((self.stabilni.abc_trida, self.stabilni.xyz_trida), ('B', 'X'))
+        self.assertFalse(self.stabilni.history.filter(history_type='~').exists())
+
+        self.client.login(username='testuser', password='testpassword')
+        response = self.client.get(reverse('sklad'), {'abc_trida': 'A'}, HTTP_USER_AGENT=PC_USER_AGENT)
+        self.assertEqual(list(response.context['object_list']), [self.narazovy])
+        response = self.client.get(reverse('sklad'), {'xyz_trida': 'X'}, HTTP_USER_AGENT=PC_USER_AGENT)
+        self.assertEqual(list(response.context['object_list']), [self.stabilni])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('classify_stock', stdout=out)
+        self.assertIn('Třídy ABC/XYZ přepočítány.', out.getvalue())
+        self.assertFalse(Sklad.objects.filter(abc_trida__isnull=True).exists())
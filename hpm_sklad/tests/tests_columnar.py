@@ -0,0 +1,96 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from hpm_sklad.models import Sklad, AuditLog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+######################## Testy exportu do Parquet ###########################
+
+@unittest.skipIf(pa is None, "Export do Parquet vyžaduje pyarrow.")
+class ParquetExportTest(TestCase):
+    """
+    Testy pro sloupcový export audit logu a skladu do formátu Parquet.
+
+    Testuje:
+    - Zachování datových typů (datum, boolean, čísla).
+    - Zápis po row groups.
+    - Přírůstkový export od zadaného ID.
+    - Export z audit logu i archivu uzavřených roků.
+    - Export z view a management příkazem.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.sklad = Sklad.objects.create(nazev_dilu='Testovací díl', umisteni='A1', mnozstvi=10)
+        self.logs = [
+            AuditLog.objects.create(
+                ucetnictvi=index % 2 == 0, evidencni_cislo=self.sklad, nazev_dilu=self.sklad.nazev_dilu,
+                zmena_mnozstvi=index + 1, mnozstvi=index + 1, typ_operace='PŘÍJEM', umisteni='A1',
+                dodavatel='Test', operaci_provedl=self.user, celkova_cena_eur=1.5 * (index + 1),
+                datum_nakupu=date(2024, 1, index + 1),
+            )
+            for index in range(5)
+        ]
+
+    def test_types_and_row_groups(self):
+        from hpm_sklad.columnar import write_parquet
+
+        buffer = io.BytesIO()
+        count, last_id = write_parquet(AuditLog.objects.all(), buffer, row_group_size=2)
+
+        self.assertEqual((count, last_id), (5, self.logs[-1].pk))
+        parquet = pq.ParquetFile(io.BytesIO(buffer.getvalue()))
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        table = parquet.read()
+        self.assertEqual(table.schema.field('datum_nakupu').type, pa.date32())
+        self.assertEqual(table.schema.field('ucetnictvi').type, pa.bool_())
+        self.assertEqual(table.schema.field('evidencni_cislo_id').type, pa.int64())
+        self.assertEqual(table.column('datum_nakupu')[0].as_py(), date(2024, 1, 1))
+        self.assertEqual(table.column('celkova_cena_eur').to_pylist(), [1.5, 3.0, 4.5, 6.0, 7.5])
+
+    def test_incremental_view_export(self):
+        self.client.login(username='testuser', password='testpassword')
+
+        response = self.client.get(reverse('audit_log_export_parquet'), {'since_id': self.logs[2].pk})
+
+        self.assertEqual(response['X-Last-Id'], str(self.logs[-1].pk))
+        self.assertIn('audit_log_export.parquet', response['Content-Disposition'])
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.column('id').to_pylist(), [self.logs[3].pk, self.logs[4].pk])
+
+    def test_view_export_includes_archived_year(self):
+        from hpm_sklad.archive import archive_year
+
+        archive_year(2024)
+        self.client.login(username='testuser', password='testpassword')
+
+        response = self.client.get(reverse('audit_log_export_parquet'))
+
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.column('id').to_pylist(), [log.pk for log in self.logs])
+
+    def test_command_exports_sklad(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'sklad.parquet')
+            out = StringIO()
+            call_command('export_parquet', 'sklad', output=path, stdout=out)
+            table = pq.read_table(path)
+
+        self.assertIn('Exportováno 1 řádků', out.getvalue())
+        self.assertEqual(table.column('nazev_dilu').to_pylist(), ['Testovací díl'])
+        self.assertEqual(table.schema.field('kriticky_dil').type, pa.bool_())
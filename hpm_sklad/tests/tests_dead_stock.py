@@ -0,0 +1,100 @@
+import datetime
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User, Permission
+from django.utils import timezone
+
+from hpm_sklad.models import Sklad, AuditLog, Zarizeni
+from hpm_sklad.movements import backfill_last_movements
+
+
+######################## Testy nepohyblivých zásob ###########################
+
+class DeadStockTest(TestCase):
+    """
+    Testy pro datum posledního pohybu a přehled nepohyblivých zásob.
+
+    Testuje:
+    - Aktualizaci data posledního výdeje při zápisu výdeje.
+    - Doplnění dat posledního pohybu z audit logu (bez inventurních rozdílů) a příkaz `backfill_last_movements`.
+    - Filtrování, řazení a vázaný kapitál v přehledu nepohyblivých zásob.
+    - Vynechání nikdy nevydaných položek, které byly přijaty až po hranici.
+    - Omezení příliš velkého počtu měsíců.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(Permission.objects.get(codename='change_sklad'))
+        self.user.user_permissions.add(Permission.objects.get(codename='add_auditlog'))
+        self.today = timezone.localdate()
+        self.stary = Sklad.objects.create(nazev_dilu='Starý díl', umisteni='A1', dodavatel='Test', mnozstvi=4,
+                                          celkova_cena_eur=400.0, posledni_vydej=datetime.date(2020, 1, 1))
+        self.nikdy = Sklad.objects.create(nazev_dilu='Nevydaný díl', umisteni='A2', dodavatel='Test', mnozstvi=1,
+                                          celkova_cena_eur=50.0)
+        self.aktivni = Sklad.objects.create(nazev_dilu='Aktivní díl', umisteni='A3', dodavatel='Test', mnozstvi=10,
+                                            jednotkova_cena_eur=10.0, celkova_cena_eur=100.0)
+        self.prazdny = Sklad.objects.create(nazev_dilu='Vyskladněný díl', umisteni='A4', mnozstvi=0,
+                                            posledni_vydej=datetime.date(2020, 1, 1))
+
+    def log(self, sklad, zmena_mnozstvi, datum, typ_udrzby='Reaktivní'):
+        AuditLog.objects.create(
+            ucetnictvi=False, evidencni_cislo=sklad, nazev_dilu=sklad.nazev_dilu, zmena_mnozstvi=zmena_mnozstvi,
+            mnozstvi=0, typ_operace='PŘÍJEM' if zmena_mnozstvi > 0 else 'VÝDEJ', umisteni='A1', dodavatel='Test',
+            operaci_provedl=self.user, typ_udrzby=typ_udrzby,
+            datum_vydeje=None if zmena_mnozstvi > 0 else datum, datum_nakupu=datum if zmena_mnozstvi > 0 else None,
+        )
+
+    def test_dispatch_updates_last_dispatch(self):
+        zarizeni = Zarizeni.objects.create(kod_zarizeni='hsh', nazev_zarizeni='HSH', umisteni='Hala 1', typ_zarizeni='Pec')
+        self.aktivni.zarizeni.add(zarizeni)
+        self.client.login(username='testuser', password='testpassword')
+        self.client.post(reverse('dispatch_audit_log', kwargs={'pk': self.aktivni.pk}), data={
+            'zmena_mnozstvi': 1, 'datum_vydeje': self.today.isoformat(), 'typ_udrzby': 'Preventivní',
+            'pouzite_zarizeni': 'HSH', 'umisteni': 'A3',
+        })
+        self.aktivni.refresh_from_db()
+        self.assertEqual((self.aktivni.posledni_vydej, self.aktivni.posledni_prijem), (self.today, None))
+
+    def test_backfill(self):
+        self.log(self.aktivni, -1, datetime.date(2024, 3, 1))
+        self.log(self.aktivni, -1, datetime.date(2024, 5, 1))
+        self.log(self.aktivni, 5, datetime.date(2024, 2, 1))
+        self.log(self.nikdy, -1, datetime.date(2024, 6, 1), typ_udrzby='Inventura')
+
+        self.assertEqual(backfill_last_movements(), 3)
+        self.aktivni.refresh_from_db()
+        self.stary.refresh_from_db()
+        self.assertEqual((self.aktivni.posledni_vydej, self.aktivni.posledni_prijem),
+                         (datetime.date(2024, 5, 1), datetime.date(2024, 2, 1)))
+        self.assertIsNone(Sklad.objects.get(pk=self.nikdy.pk).posledni_vydej)
+        self.assertIsNone(self.stary.posledni_vydej)
+
+        out = StringIO()
+        call_command('backfill_last_movements', stdout=out)
+        self.assertIn('aktualizováno u 0 položek', out.getvalue())
+
+    def test_dead_stock_report(self):
+        Sklad.objects.filter(pk=self.aktivni.pk).update(posledni_vydej=self.today)
+        # nikdy nevydaný díl přijatý včera ještě není nepohyblivý, díl přijatý před lety ano
+        Sklad.objects.create(nazev_dilu='Nový díl', umisteni='A5', mnozstvi=2, celkova_cena_eur=20.0,
+                             posledni_prijem=self.today - datetime.timedelta(days=1))
+        Sklad.objects.filter(pk=self.nikdy.pk).update(posledni_prijem=datetime.date(2019, 6, 1))
+        self.client.login(username='testuser', password='testpassword')
+
+        response = self.client.get(reverse('nepohyblive_zasoby'), {'mesice': 6})
+        self.assertEqual(list(response.context['object_list']), [self.nikdy, self.stary])
+        self.assertEqual(response.context['celkem_eur'], 450.0)
+        self.assertContains(response, 'nikdy')
+
+        response = self.client.get(reverse('nepohyblive_zasoby_export_csv'))
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="nepohyblive_zasoby.csv"')
+        self.assertIn('Starý díl', response.content.decode())
+
+    def test_dead_stock_months_clamped(self):
+        self.client.login(username='testuser', password='testpassword')
+        response = self.client.get(reverse('nepohyblive_zasoby'), {'mesice': 30000})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['mesice'], 240)
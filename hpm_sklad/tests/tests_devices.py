@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from hpm_sklad.devices import classify_user_agent, get_device_class, device_cache_stats, device_context
+
+PC_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                 '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+MOBILE_USER_AGENT = ('Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 '
+                     '(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1')
+
+
+######################## Testy detekce zařízení ###########################
+
+class DeviceClassificationTest(TestCase):
+    """
+    Testy pro klasifikaci user agentů.
+
+    Testuje:
+    - Zařazení PC a mobilního user agenta.
+    - Opakované dotazy se stejným řetězcem obsloužené z cache.
+    - Jedinou klasifikaci v rámci požadavku.
+    - Třídu zařízení v kontextu šablon a odkazy modulů v navigaci jen pro PC.
+    - Pravidelný zápis úspěšnosti cache do logu.
+    """
+
+    def setUp(self):
+        classify_user_agent.cache_clear()
+
+    def test_classification(self):
+        self.assertEqual(classify_user_agent(PC_USER_AGENT), 'pc')
+        self.assertEqual(classify_user_agent(MOBILE_USER_AGENT), 'mobile')
+
+    def test_repeated_lookups_hit_cache(self):
+        for _ in range(3):
+            classify_user_agent(PC_USER_AGENT)
+        stats = device_cache_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 2)
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+    def test_request_classified_once(self):
+        request = RequestFactory().get('/sklad/', HTTP_USER_AGENT=PC_USER_AGENT)
+        self.assertEqual(get_device_class(request), 'pc')
+        self.assertEqual(get_device_class(request), 'pc')
+        self.assertEqual(device_cache_stats()['hits'] + device_cache_stats()['misses'], 1)
+
+    def test_context_processor(self):
+        request = RequestFactory().get('/sklad/', HTTP_USER_AGENT=MOBILE_USER_AGENT)
+        self.assertEqual(device_context(request), {'device_class': 'mobile', 'is_pc': False})
+
+    def test_navbar_modules_for_pc_only(self):
+        url = reverse('inventury')
+        self.client.force_login(User.objects.create_user(username='testuser', password='testpassword'))
+        response = self.client.get(url, HTTP_USER_AGENT=PC_USER_AGENT)
+        self.assertContains(response, reverse('audit_log'))
+        response = self.client.get(url, HTTP_USER_AGENT=MOBILE_USER_AGENT)
+        self.assertNotContains(response, reverse('audit_log'))
+
+    def test_cache_stats_logged_periodically(self):
+        with mock.patch('hpm_sklad.devices.STATS_LOG_INTERVAL', 2), mock.patch('hpm_sklad.devices._classified_requests', 0):
+            with self.assertLogs('hpm_sklad.devices', level='INFO') as logs:
+                for _ in range(2):
+                    get_device_class(RequestFactory().get('/sklad/', HTTP_USER_AGENT=PC_USER_AGENT))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('úspěšnost 50.0%', logs.output[0])
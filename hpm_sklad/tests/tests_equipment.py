@@ -0,0 +1,132 @@
+from datetime import date
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User, Permission
+from django.utils import timezone
+
+from hpm_sklad.models import Sklad, AuditLog, Zarizeni, SpotrebaZarizeni, SpotrebaDiluZarizeni
+from hpm_sklad.equipment_stats import backfill_auditlog_zarizeni, rebuild_equipment_totals, equipment_dashboard
+
+
+######################## Testy spotřeby zařízení ###########################
+
+class EquipmentTotalsTest(TestCase):
+    """
+    Testy pro předpočítanou spotřebu dílů zařízení.
+
+    Testuje:
+    - Uložení odkazu na zařízení při výdeji a průběžnou aktualizaci souhrnů.
+    - Odečtení smazaného výdeje ze souhrnů.
+    - Převedení upraveného výdeje (zařízení, množství, cena) na jiné řádky souhrnů a jeho pozdější smazání.
+    - Úpravu výdeje načteného jen s částí polí podle původního stavu z databáze.
+    - Doplnění odkazu na zařízení do starších výdejů a přepočet souhrnů.
+    - Přehled spotřeby v detailu zařízení.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(Permission.objects.get(codename='change_sklad'))
+        self.user.user_permissions.add(Permission.objects.get(codename='add_auditlog'))
+        self.zarizeni = Zarizeni.objects.create(
+            kod_zarizeni='hsh', nazev_zarizeni='HSH TQ7', umisteni='Hala 1', typ_zarizeni='Kalicí pec'
+        )
+        self.sklad = Sklad.objects.create(
+            nazev_dilu='Testovací díl', umisteni='A1', dodavatel='Test', mnozstvi=10,
+            jednotkova_cena_eur=100.0, celkova_cena_eur=1000.0,
+        )
+        self.sklad.zarizeni.add(self.zarizeni)
+        self.today = timezone.localdate()
+
+    def dispatch(self, mnozstvi, datum):
+        self.client.login(username='testuser', password='testpassword')
+        return self.client.post(reverse('dispatch_audit_log', kwargs={'pk': self.sklad.pk}), data={
+            'zmena_mnozstvi': mnozstvi, 'datum_vydeje': datum.isoformat(), 'typ_udrzby': 'Preventivní',
+            'pouzite_zarizeni': 'HSH', 'umisteni': 'A1',
+        })
+
+    def old_dispatch(self, mnozstvi, datum):
+        return AuditLog.objects.create(
+            ucetnictvi=False, evidencni_cislo=self.sklad, nazev_dilu=self.sklad.nazev_dilu,
+            zmena_mnozstvi=-mnozstvi, mnozstvi=0, umisteni='A1', dodavatel='Test',
+            typ_operace='VÝDEJ', pouzite_zarizeni='HSH', operaci_provedl=self.user,
+            celkova_cena_eur=-100.0 * mnozstvi, datum_vydeje=datum,
+        )
+
+    def test_dispatch_updates_totals(self):
+        self.dispatch(2, self.today)
+        self.dispatch(3, self.today)
+
+        auditlog = AuditLog.objects.latest('id')
+        self.assertEqual(auditlog.zarizeni, self.zarizeni)
+        spotreba = SpotrebaZarizeni.objects.get(zarizeni=self.zarizeni, mesic=self.today.replace(day=1))
+        self.assertEqual((spotreba.pocet_vydeju, spotreba.mnozstvi, spotreba.celkem_eur), (2, 5, 500.0))
+        dil = SpotrebaDiluZarizeni.objects.get(zarizeni=self.zarizeni, sklad=self.sklad)
+        self.assertEqual((dil.mnozstvi, dil.posledni_vydej), (5, self.today))
+
+        auditlog.delete()
+        spotreba.refresh_from_db()
+        self.assertEqual((spotreba.pocet_vydeju, spotreba.mnozstvi, spotreba.celkem_eur), (1, 2, 200.0))
+
+    def test_edited_dispatch_moves_totals(self):
+        self.dispatch(2, self.today)
+        jine = Zarizeni.objects.create(kod_zarizeni='ipsen', nazev_zarizeni='Ipsen', umisteni='Hala 2', typ_zarizeni='Pec')
+
+        auditlog = AuditLog.objects.get()
+        auditlog.zarizeni = jine
+        auditlog.zmena_mnozstvi = -3
+        auditlog.celkova_cena_eur = -300.0
+        auditlog.save()
+        self.assertFalse(SpotrebaZarizeni.objects.filter(zarizeni=self.zarizeni).exists())
+        self.assertFalse(SpotrebaDiluZarizeni.objects.filter(zarizeni=self.zarizeni).exists())
+        spotreba = SpotrebaZarizeni.objects.get(zarizeni=jine)
+        self.assertEqual((spotreba.pocet_vydeju, spotreba.mnozstvi, spotreba.celkem_eur), (1, 3, 300.0))
+        self.assertEqual(SpotrebaDiluZarizeni.objects.get(zarizeni=jine).mnozstvi, 3)
+
+        auditlog.delete()
+        self.assertFalse(SpotrebaZarizeni.objects.exists())
+        self.assertFalse(SpotrebaDiluZarizeni.objects.exists())
+
+    def test_edited_partially_loaded_dispatch(self):
+        self.dispatch(2, self.today)
+
+        auditlog = AuditLog.objects.only('id', 'zmena_mnozstvi').get()
+        auditlog.zmena_mnozstvi = -3
+        auditlog.save(update_fields=['zmena_mnozstvi'])
+        spotreba = SpotrebaZarizeni.objects.get(zarizeni=self.zarizeni)
+        self.assertEqual((spotreba.pocet_vydeju, spotreba.mnozstvi), (1, 3))
+
+    def test_backfill_and_rebuild(self):
+        self.old_dispatch(4, date(2023, 5, 10))
+        self.old_dispatch(1, date(2023, 5, 20))
+        self.assertFalse(SpotrebaZarizeni.objects.exists())
+
+        self.assertEqual(backfill_auditlog_zarizeni(), 2)
+        self.assertEqual(rebuild_equipment_totals(), (1, 1))
+
+        spotreba = SpotrebaZarizeni.objects.get()
+        self.assertEqual((spotreba.mesic, spotreba.pocet_vydeju, spotreba.mnozstvi), (date(2023, 5, 1), 2, 5))
+        dil = SpotrebaDiluZarizeni.objects.get()
+        self.assertEqual((dil.celkem_eur, dil.posledni_vydej), (500.0, date(2023, 5, 20)))
+
+    def test_rebuild_command(self):
+        self.old_dispatch(4, self.today)
+        out = StringIO()
+        call_command('rebuild_equipment_stats', '--backfill', stdout=out)
+        self.assertIn('Doplněno zařízení do 1 záznamů', out.getvalue())
+        self.assertEqual(SpotrebaZarizeni.objects.get().mnozstvi, 4)
+
+    def test_dashboard(self):
+        self.dispatch(2, self.today)
+
+        spotreba = equipment_dashboard(self.zarizeni)
+        self.assertEqual(len(spotreba['mesice']), 12)
+        self.assertEqual(spotreba['mesice'][-1].mnozstvi, 2)
+        self.assertEqual(spotreba['celkem_eur'], 200.0)
+        self.assertEqual([dil.sklad for dil in spotreba['dily']], [self.sklad])
+
+        response = self.client.get(reverse('detail_zarizeni', kwargs={'pk': self.zarizeni.pk}))
+        self.assertContains(response, 'Nejdražší použité díly')
+        self.assertContains(response, 'Testovací díl')
@@ -0,0 +1,71 @@
+import json
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from hpm_sklad.models import Sklad, AuditLog
+from hpm_sklad.archive import archive_year
+from hpm_sklad.feed import changes_since
+
+
+######################## Testy kanálu změn audit logu ###########################
+
+class AuditLogFeedTest(TestCase):
+    """
+    Testy pro kanál změn audit logu.
+
+    Testuje:
+    - Dávky omezené limitem s high-water mark a příznakem dalších záznamů.
+    - Záznamy z archivu uzavřených roků.
+    - Formáty NDJSON a kompaktní JSON ve view.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.sklad = Sklad.objects.create(nazev_dilu='Testovací díl', umisteni='A1')
+        self.logs = [
+            AuditLog.objects.create(
+                ucetnictvi=True, evidencni_cislo=self.sklad, nazev_dilu=self.sklad.nazev_dilu,
+                zmena_mnozstvi=1, mnozstvi=index + 1, typ_operace='PŘÍJEM', umisteni='A1', dodavatel='Test',
+                operaci_provedl=self.user, datum_nakupu=date(2023 if index < 2 else 2099, 1, 1),
+            )
+            for index in range(5)
+        ]
+
+    def test_batches_follow_cursor(self):
+        rows, high_water_mark, has_more = changes_since(0, limit=2)
+        self.assertEqual([row[0] for row in rows], [self.logs[0].pk, self.logs[1].pk])
+        self.assertEqual(high_water_mark, self.logs[1].pk)
+        self.assertTrue(has_more)
+
+        rows, high_water_mark, has_more = changes_since(high_water_mark, limit=10)
+        self.assertEqual(len(rows), 3)
+        self.assertFalse(has_more)
+
+        self.assertEqual(changes_since(high_water_mark), ([], high_water_mark, False))
+
+    def test_archived_rows_stay_in_feed(self):
+        archive_year(2023)
+
+        rows, _, _ = changes_since(0)
+
+        self.assertEqual([row[0] for row in rows], [log.pk for log in self.logs])
+
+    def test_view_formats(self):
+        self.client.login(username='testuser', password='testpassword')
+
+        response = self.client.get(reverse('audit_log_feed'), {'after': self.logs[2].pk})
+        lines = response.content.decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [self.logs[3].pk, self.logs[4].pk])
+        self.assertEqual(response['X-High-Water-Mark'], str(self.logs[4].pk))
+        self.assertEqual(response['X-Has-More'], 'false')
+
+        response = self.client.get(reverse('audit_log_feed'), {'format': 'json', 'limit': 1})
+        data = response.json()
+        self.assertEqual(data['high_water_mark'], self.logs[0].pk)
+        self.assertTrue(data['has_more'])
+        self.assertEqual(dict(zip(data['columns'], data['rows'][0]))['datum_nakupu'], '2023-01-01')
+
+        self.assertEqual(self.client.get(reverse('audit_log_feed'), {'after': 'x'}).status_code, 400)
@@ -0,0 +1,77 @@
+from datetime import date
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from hpm_sklad.models import Sklad, AuditLog, Dodavatele, Varianty, PrognozaSpotreby
+from hpm_sklad.forecast import forecast_period, monthly_dispatch_matrix, forecast_minimums
+
+PC_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                 '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+
+
+######################## Testy prognózy spotřeby ###########################
+
+class ForecastTest(TestCase):
+    """
+    Testy pro prognózu spotřeby a doporučená minima.
+
+    Testuje:
+    - Období prognózy a sestavení matice měsíčních výdejů (bez inventurních rozdílů).
+    - Výpočet spotřeby, variability a doporučeného minima s dodací lhůtou varianty.
+    - Management příkaz `forecast_minimums` a zobrazení v seznamu skladu.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.today = date(2025, 7, 15)
+        self.sklad = Sklad.objects.create(nazev_dilu='Ložisko', umisteni='A1', min_mnozstvi_ks=1)
+        self.bez_spotreby = Sklad.objects.create(nazev_dilu='Těsnění', umisteni='A2')
+        dodavatel = Dodavatele.objects.create(dodavatel='Test')
+        Varianty.objects.create(sklad=self.sklad, dodavatel=dodavatel, nazev_varianty='A', dodaci_lhuta=61, min_obj_mnozstvi=1)
+        Varianty.objects.create(sklad=self.sklad, dodavatel=dodavatel, nazev_varianty='B', dodaci_lhuta=90, min_obj_mnozstvi=1)
+        # dva výdeje v lednu, jeden v únoru, inventura a výdej v aktuálním měsíci se nepočítají
+        for mnozstvi, datum, typ_udrzby in [
+            (4, date(2025, 1, 10), 'Preventivní'), (2, date(2025, 1, 20), 'Preventivní'),
+            (6, date(2025, 2, 5), 'Preventivní'), (9, date(2025, 3, 5), 'Inventura'),
+            (5, date(2025, 7, 1), 'Preventivní'),
+        ]:
+            AuditLog.objects.create(
+                ucetnictvi=False, evidencni_cislo=self.sklad, nazev_dilu='Ložisko', zmena_mnozstvi=-mnozstvi,
+                mnozstvi=0, typ_operace='VÝDEJ', umisteni='A1', dodavatel='Test', operaci_provedl=self.user,
+                typ_udrzby=typ_udrzby, datum_vydeje=datum,
+            )
+
+    def test_period_and_matrix(self):
+        self.assertEqual(forecast_period(6, self.today), (date(2025, 1, 1), date(2025, 7, 1)))
+
+        pks, matrix = monthly_dispatch_matrix(6, self.today)
+        self.assertEqual(list(pks), [self.sklad.pk, self.bez_spotreby.pk])
+        self.assertEqual(matrix[0].tolist(), [6, 6, 0, 0, 0, 0])
+        self.assertEqual(matrix[1].tolist(), [0] * 6)
+
+    def test_forecast_minimums(self):
+        self.assertEqual(forecast_minimums(6, today=self.today), 2)
+
+        prognoza = PrognozaSpotreby.objects.get(sklad=self.sklad)
+        self.assertEqual(prognoza.spotreba_mesic, 2.0)
+        self.assertEqual(prognoza.dodaci_lhuta, 61)
+        self.assertAlmostEqual(prognoza.variacni_koeficient, 1.549, places=3)
+        # 2 ks/měsíc × ~2 měsíce + 1,65 × 3,1 × √2 ≈ 11,3
+        self.assertEqual(prognoza.doporucene_minimum, 12)
+
+        prazdna = PrognozaSpotreby.objects.get(sklad=self.bez_spotreby)
+        self.assertEqual((prazdna.doporucene_minimum, prazdna.variacni_koeficient, prazdna.dodaci_lhuta), (0, None, 30))
+
+    def test_command_and_stock_list(self):
+        out = StringIO()
+        call_command('forecast_minimums', '--months', '12', stdout=out)
+        self.assertIn('Prognóza spotřeby uložena pro 2 položek', out.getvalue())
+
+        self.client.login(username='testuser', password='testpassword')
+        response = self.client.get(reverse('sklad'), HTTP_USER_AGENT=PC_USER_AGENT)
+        self.assertContains(response, 'Min. (dop.)')
+        self.assertContains(response, f'({PrognozaSpotreby.objects.get(sklad=self.sklad).doporucene_minimum})')
@@ -3,12 +3,12 @@ from django.urls import reverse
 
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django_user_agents.utils import get_user_agent
 
 from datetime import date, timedelta
 
 from hpm_sklad.models import Poptavky, Dodavatele, Sklad, Zarizeni, SkladZarizeni, AuditLog, Varianty, PoptavkaVarianty
-from hpm_sklad.forms import SkladReceiptForm, AuditLogReceiptForm, SkladDispatchForm, AuditLogDispatchForm
+from hpm_sklad.forms import SkladReceiptForm, AuditLogReceiptForm, SkladDispatchForm, AuditLogDispatchForm, SkladCreateForm
+from hpm_sklad.sequences import allocate, INTERNE_CISLO
 
 
 ######################## Testy Formulářů ###########################
@@ -267,4 +267,47 @@ class AuditLogReceiptFormTest(TestCase):
         )
         self.assertFalse(form.is_valid())
         self.assertIn('zmena_mnozstvi', form.errors)
-        
\ No newline at end of file
+        
+
+
+class SkladCreateFormTest(TestCase):
+    """
+    Testy pro přidělování čísel karet ve formuláři `SkladCreateForm`.
+
+    Testuje:
+    - vykreslení formuláře bez agregace nad skladem
+    - přidělení čísla karty z čítače při uložení
+    - posunutí čítače po ručně zadaném čísle
+    - přidělení bloku čísel
+    """
+
+    def setUp(self):
+        Sklad.objects.create(nazev_dilu='Existující díl', interne_cislo=10)
+
+    def form_data(self, **kwargs):
+        return {'nazev_dilu': 'Nový díl', 'jednotky': 'ks', 'min_mnozstvi_ks': 0, 'ucetnictvi': True, **kwargs}
+
+    def test_render_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            SkladCreateForm()
+
+    def test_save_allocates_unique_numbers(self):
+        first = SkladCreateForm(data=self.form_data())
+        second = SkladCreateForm(data=self.form_data())
+        self.assertTrue(first.is_valid() and second.is_valid())
+
+        self.assertEqual(first.save().interne_cislo, 11)
+        self.assertEqual(second.save().interne_cislo, 12)
+
+    def test_manual_number_advances_sequence(self):
+        form = SkladCreateForm(data=self.form_data(interne_cislo=50))
+        self.assertTrue(form.is_valid())
+        form.save()
+
+        form = SkladCreateForm(data=self.form_data())
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save().interne_cislo, 51)
+
+    def test_allocate_block(self):
+        self.assertEqual(list(allocate(INTERNE_CISLO, 3)), [11, 12, 13])
+        self.assertEqual(list(allocate(INTERNE_CISLO)), [14])
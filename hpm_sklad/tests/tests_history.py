@@ -0,0 +1,73 @@
+import datetime
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+
+from hpm_sklad.models import Sklad
+from hpm_sklad.history import compaction_candidates, compact_history, archive_history
+
+
+######################## Testy kompakce historie ###########################
+
+class HistoryCompactionTest(TestCase):
+    """
+    Testy pro kompakci a archivaci historie skladových položek.
+
+    Testuje:
+    - Vynechání záznamů, které se liší jen v množstevních polích.
+    - Zachování záznamů se změnou ostatních polí.
+    - Archivaci starých záznamů do komprimovaného souboru.
+    - Management příkaz `compact_history`.
+    """
+
+    def setUp(self):
+        self.sklad = Sklad.objects.create(nazev_dilu='Testovací díl', umisteni='A1')
+        for mnozstvi in (5, 4, 3):
+            self.sklad.mnozstvi = mnozstvi
+            self.sklad.save()
+        self.sklad.umisteni = 'B2'
+        self.sklad.save()
+        for mnozstvi in (2, 1):
+            self.sklad.mnozstvi = mnozstvi
+            self.sklad.save()
+        self.before = timezone.now() + datetime.timedelta(seconds=1)
+
+    def history(self):
+        return list(self.sklad.history.order_by('history_date', 'history_id').values_list('umisteni', 'mnozstvi'))
+
+    def test_compaction_keeps_run_boundaries(self):
+        self.assertEqual(len(compaction_candidates(self.before)), 3)
+
+        compact_history(self.before)
+
+        self.assertEqual(self.history(), [('A1', 0), ('A1', 3), ('B2', 3), ('B2', 1)])
+
+    def test_archive_moves_rows_to_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'history.jsonl.gz')
+            archived, size = archive_history(self.before, path)
+
+            with gzip.open(path, 'rt', encoding='utf-8') as archive:
+                rows = [json.loads(line) for line in archive]
+
+        self.assertEqual(archived, 7)
+        self.assertGreater(size, 0)
+        self.assertEqual([row['mnozstvi'] for row in rows], [0, 5, 4, 3, 3, 2, 1])
+        self.assertFalse(self.sklad.history.exists())
+
+    def test_command_reports_and_compacts(self):
+        out = StringIO()
+        call_command('compact_history', older_than=-1, dry_run=True, stdout=out)
+        self.assertIn('Ke kompakci', out.getvalue())
+        self.assertEqual(len(self.history()), 7)
+
+        out = StringIO()
+        call_command('compact_history', older_than=-1, stdout=out)
+        self.assertIn('o 3 méně', out.getvalue())
+        self.assertEqual(len(self.history()), 4)
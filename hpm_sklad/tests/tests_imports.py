@@ -0,0 +1,126 @@
+import io
+import os
+import tempfile
+import unittest
+from io import StringIO
+
+from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User, Permission
+
+from hpm_sklad.models import Sklad, Dodavatele, Zarizeni, SkladZarizeni, Nedostatek
+from hpm_sklad.imports import read_table, import_rows
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+def csv_file(text):
+    return io.BytesIO(text.encode('utf-8'))
+
+
+######################## Testy hromadného importu ###########################
+
+class ImportTest(TestCase):
+    """
+    Testy pro hromadný import skladových položek, dodavatelů a zařízení.
+
+    Testuje:
+    - Ověření řádků bez uložení a report chyb.
+    - Přidělení čísel karet v bloku, vazby na zařízení a množinu položek pod minimem.
+    - Odmítnutí duplicitních dodavatelů a zařízení.
+    - Čtení CSV se středníkem a XLSX.
+    - View a management příkaz s chybovým souborem.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        Sklad.objects.create(nazev_dilu='Existující díl', interne_cislo=41)
+        Dodavatele.objects.create(dodavatel='Dodavatel A')
+        self.zarizeni = Zarizeni.objects.create(kod_zarizeni='L1', nazev_zarizeni='Linka 1', umisteni='H1', typ_zarizeni='Linka')
+        self.sklad_csv = (
+            "Název dílu;Minimum;Jednotky;Dodavatel;Zařízení;V účetnictví\n"
+            "Ložisko;5;ks;Dodavatel A;L1;NE\n"
+            "Řemen;;;;;\n"
+            "Neplatný;x;ks;Neznámý;L9;\n"
+        )
+
+    def test_dry_run_reports_errors_and_saves_nothing(self):
+        result = import_rows('sklad', read_table(csv_file(self.sklad_csv), 'sklad.csv'), dry_run=True)
+
+        self.assertEqual((result.rows, result.created), (3, 2))
+        self.assertEqual(result.errors[0][0], 4)
+        self.assertEqual(len(result.errors[0][2]), 3)
+        self.assertEqual(Sklad.objects.count(), 1)
+
+    def test_import_creates_items_with_links(self):
+        result = import_rows('sklad', read_table(csv_file(self.sklad_csv), 'sklad.csv'))
+
+        self.assertEqual(result.created, 2)
+        lozisko = Sklad.objects.get(nazev_dilu='Ložisko')
+        remen = Sklad.objects.get(nazev_dilu='Řemen')
+        self.assertEqual((lozisko.interne_cislo, remen.interne_cislo), (42, 43))
+        self.assertFalse(lozisko.ucetnictvi)
+        self.assertTrue(remen.ucetnictvi)
+        self.assertEqual(remen.jednotky, 'ks')
+        self.assertTrue(SkladZarizeni.objects.filter(sklad=lozisko, zarizeni=self.zarizeni).exists())
+        self.assertEqual(Nedostatek.objects.get(sklad=lozisko).chybi, 5)
+        self.assertEqual(lozisko.history.count(), 1)
+
+    def test_duplicates_are_rejected(self):
+        csv_text = (
+            "dodavatel,kontakt,email,telefon\n"
+            "Dodavatel A,Jan,a@example.com,1\nDodavatel B,Eva,b@example.com,2\nDodavatel B,Eva,b@example.com,2\n"
+        )
+        result = import_rows('dodavatele', read_table(csv_file(csv_text), 'dodavatele.csv'))
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual([row_number for row_number, _, _ in result.errors], [2, 4])
+
+        result = import_rows('zarizeni', read_table(csv_file("kod_zarizeni,nazev_zarizeni,umisteni,typ_zarizeni\nL1,X,H1,Y\n"), 'z.csv'))
+        self.assertEqual(result.created, 0)
+
+    @unittest.skipIf(openpyxl is None, "Import z XLSX vyžaduje openpyxl.")
+    def test_xlsx(self):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['kod_zarizeni', 'nazev_zarizeni', 'umisteni', 'typ_zarizeni'])
+        sheet.append(['L2', 'Linka 2', 'H2', 'Linka'])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
+
+        result = import_rows('zarizeni', read_table(buffer, 'zarizeni.xlsx'))
+
+        self.assertEqual(result.created, 1)
+        self.assertTrue(Zarizeni.objects.filter(kod_zarizeni='L2').exists())
+
+    def test_view_requires_permission_and_returns_error_file(self):
+        self.client.login(username='testuser', password='testpassword')
+        upload = lambda: SimpleUploadedFile('sklad.csv', self.sklad_csv.encode('utf-8'))
+
+        response = self.client.post(reverse('import_dat'), {'typ': 'sklad', 'soubor': upload()})
+        self.assertContains(response, 'Nemáte oprávnění')
+
+        self.user.user_permissions.add(Permission.objects.get(codename='add_sklad'))
+        response = self.client.post(reverse('import_dat'), {'typ': 'sklad', 'soubor': upload(), 'chybovy_soubor': 'on'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('Neplatný', response.content.decode())
+        self.assertEqual(Sklad.objects.count(), 3)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'sklad.csv')
+            errors = os.path.join(tmpdir, 'chyby.csv')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(self.sklad_csv)
+            out = StringIO()
+            call_command('import_data', 'sklad', path, dry_run=True, errors=errors, stdout=out)
+
+            self.assertTrue(os.path.exists(errors))
+        self.assertIn('Řádek 4', out.getvalue())
+        self.assertEqual(Sklad.objects.count(), 1)
@@ -0,0 +1,152 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User, Permission
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from hpm_sklad.models import Sklad, AuditLog, Poptavky, Zarizeni, Dodavatele, Nedostatek, UkazatelKpi, Varianty
+from hpm_sklad.kpi import kpi_values, invalidate_kpis, HODNOTA_SKLADU, _compute
+from hpm_sklad.reorder import plan_reorder, create_draft_poptavky
+from hpm_sklad.movements import record_movement_batch, MovementBatchError
+
+
+######################## Testy ukazatelů úvodní stránky ###########################
+
+class KpiTest(TestCase):
+    """
+    Testy pro ukazatele (KPI) na úvodní stránce.
+
+    Testuje:
+    - Výpočet chybějících čítačů z databáze se stejnou definicí položky pod minimem jako `Sklad.pod_minimem`.
+    - Průběžnou úpravu čítačů při uložení a smazání skladové položky, výdeji, úpravě výdeje a změně poptávky bez dotazů na agregace.
+    - Zachování čítačů při vrácené transakci dávky pohybů.
+    - Promítnutí pohybu potvrzeného mezi výpočtem a založením chybějícího čítače.
+    - Započtení rozpracovaných poptávek vytvořených hromadně doobjednáním.
+    - Zobrazení panelu jen přihlášenému uživateli.
+    """
+
+    def setUp(self):
+        invalidate_kpis()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(Permission.objects.get(codename='change_sklad'))
+        self.user.user_permissions.add(Permission.objects.get(codename='add_auditlog'))
+        self.sklad = Sklad.objects.create(nazev_dilu='Ložisko', umisteni='A1', dodavatel='Test', mnozstvi=10,
+                                          min_mnozstvi_ks=2, jednotkova_cena_eur=10.0, celkova_cena_eur=100.0,
+                                          kriticky_dil=True)
+        Sklad.objects.create(nazev_dilu='Těsnění', umisteni='A2', mnozstvi=0, min_mnozstvi_ks=1, celkova_cena_eur=0.0)
+        self.dodavatel = Dodavatele.objects.create(dodavatel='Test')
+        Poptavky.objects.create(dodavatel=self.dodavatel)
+
+    def test_values_computed_from_database(self):
+        kpi = kpi_values()
+        self.assertEqual(kpi['hodnota_skladu'], 100.0)
+        self.assertEqual((kpi['pod_minimem'], kpi['kriticke_pod_minimem'], kpi['otevrene_poptavky']), (1, 0, 1))
+        self.assertEqual(kpi['naklady_celkem'], 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            kpi_values()
+        self.assertEqual(len(queries), 1)
+
+    def test_below_minimum_matches_model_property(self):
+        # množina nedostatků nemusí být na existující databázi naplněná
+        Nedostatek.objects.all().delete()
+        kpi = kpi_values()
+        self.assertEqual(kpi['pod_minimem'], sum(sklad.pod_minimem for sklad in Sklad.objects.all()))
+        self.assertEqual(kpi['pod_minimem'], 1)
+
+    def test_counters_updated_on_writes(self):
+        kpi_values()
+        zarizeni = Zarizeni.objects.create(kod_zarizeni='hsh', nazev_zarizeni='HSH', umisteni='Hala 1', typ_zarizeni='Pec')
+        self.sklad.zarizeni.add(zarizeni)
+        self.client.login(username='testuser', password='testpassword')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('dispatch_audit_log', kwargs={'pk': self.sklad.pk}), data={
+                'zmena_mnozstvi': 9, 'datum_vydeje': timezone.localdate().isoformat(), 'typ_udrzby': 'Preventivní',
+                'pouzite_zarizeni': 'HSH', 'umisteni': 'A1',
+            })
+            Poptavky.objects.create(dodavatel=self.dodavatel, stav='Uzavřeno')
+
+        with mock.patch('hpm_sklad.kpi._compute') as compute:
+            kpi = kpi_values()
+        compute.assert_not_called()
+        self.assertEqual(kpi['hodnota_skladu'], 10.0)
+        self.assertEqual((kpi['pod_minimem'], kpi['kriticke_pod_minimem'], kpi['otevrene_poptavky']), (2, 1, 1))
+        self.assertIn(('Preventivní', 90.0), kpi['naklady'])
+
+        vydej = AuditLog.objects.latest('id')
+        vydej.celkova_cena_eur = -50.0
+        with self.captureOnCommitCallbacks(execute=True):
+            vydej.save()
+        self.assertIn(('Preventivní', 50.0), kpi_values()['naklady'])
+
+        poptavka = Poptavky.objects.get(stav='Tvorba')
+        poptavka.stav = 'Uzavřeno'
+        with self.captureOnCommitCallbacks(execute=True):
+            poptavka.save()
+        self.assertEqual(kpi_values()['otevrene_poptavky'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AuditLog.objects.latest('id').delete()
+            Sklad.objects.get(pk=self.sklad.pk).delete()
+        kpi = kpi_values()
+        self.assertEqual((kpi['hodnota_skladu'], kpi['pod_minimem'], kpi['kriticke_pod_minimem']), (0.0, 1, 0))
+        self.assertEqual(kpi['naklady_celkem'], 0)
+
+    def test_movement_between_compute_and_insert(self):
+        def compute_then_commit_movement(counters, mesic):
+            values = _compute(counters, mesic)
+            if compute_then_commit_movement.first:
+                compute_then_commit_movement.first = False
+                # pohyb potvrzený po výpočtu, jeho rozdíl nenajde čítač
+                Sklad.objects.filter(pk=self.sklad.pk).update(celkova_cena_eur=50.0)
+                UkazatelKpi.objects.filter(klic=HODNOTA_SKLADU).update(hodnota=F('hodnota') - 5000)
+            return values
+        compute_then_commit_movement.first = True
+
+        with mock.patch('hpm_sklad.kpi._compute', side_effect=compute_then_commit_movement):
+            self.assertEqual(kpi_values()['hodnota_skladu'], 50.0)
+        self.assertEqual(UkazatelKpi.objects.get(klic=HODNOTA_SKLADU).hodnota, 5000)
+
+    def test_rolled_back_batch_keeps_counters(self):
+        zarizeni = Zarizeni.objects.create(kod_zarizeni='hsh', nazev_zarizeni='HSH', umisteni='Hala 1', typ_zarizeni='Pec')
+        self.sklad.zarizeni.add(zarizeni)
+        pred = kpi_values()
+        vydej = {'zmena_mnozstvi': 9, 'datum_vydeje': timezone.localdate().isoformat(), 'typ_udrzby': 'Preventivní',
+                 'pouzite_zarizeni': 'HSH', 'umisteni': 'A1'}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(MovementBatchError):
+                record_movement_batch('dispatch', [
+                    {'evidencni_cislo': self.sklad.pk, **vydej},
+                    {'evidencni_cislo': 9999, **vydej},
+                ], self.user)
+
+        self.assertEqual(Sklad.objects.get(pk=self.sklad.pk).mnozstvi, 10)
+        self.assertEqual(kpi_values(), pred)
+        self.assertEqual(UkazatelKpi.objects.get(klic='hodnota_skladu').hodnota, 10000)
+
+    def test_counter_updated_by_draft_poptavky(self):
+        self.assertEqual(kpi_values()['otevrene_poptavky'], 1)
+        Varianty.objects.create(sklad=Sklad.objects.get(nazev_dilu='Těsnění'), dodavatel=self.dodavatel,
+                                nazev_varianty='Těsnění T', jednotkova_cena_eur=1.0, dodaci_lhuta=5, min_obj_mnozstvi=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            poptavky = create_draft_poptavky(plan_reorder())
+        self.assertEqual(len(poptavky), 1)
+
+        with mock.patch('hpm_sklad.kpi._compute') as compute:
+            self.assertEqual(kpi_values()['otevrene_poptavky'], 2)
+        compute.assert_not_called()
+
+    def test_home_view_panel(self):
+        response = self.client.get(reverse('home'))
+        self.assertNotIn('kpi', response.context)
+
+        self.client.login(username='testuser', password='testpassword')
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Kritické díly pod minimem')
+        self.assertContains(response, '100,00 EUR')
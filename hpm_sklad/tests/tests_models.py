@@ -8,7 +8,6 @@ from django.contrib.auth.models import User
 
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django_user_agents.utils import get_user_agent
 
 from datetime import date
 
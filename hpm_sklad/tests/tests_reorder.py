@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.apps import apps
+from django.test import TestCase
+from django.urls import reverse
+from django.core.management import call_command
+from django.contrib.auth.models import User, Permission
+
+from hpm_sklad.models import Sklad, Dodavatele, Varianty, Poptavky, PoptavkaVarianty, Nedostatek
+from hpm_sklad.reorder import plan_reorder, create_draft_poptavky, rebuild_shortages
+from hpm_sklad.signals import backfill_sklad_shortages
+
+
+######################## Testy doobjednání ###########################
+
+class ReorderTest(TestCase):
+    """
+    Testy pro doobjednání položek pod minimem.
+
+    Testuje:
+    - Průběžnou aktualizaci množiny položek pod minimem při uložení položky.
+    - Doplnění prázdné množiny položek pod minimem po migraci.
+    - Výběr nejlevnějšího a nejrychlejšího dodavatele včetně minimálního objednacího množství.
+    - Vynechání položek, které už jsou v otevřené poptávce.
+    - Vytvoření rozpracovaných poptávek přes view a management command.
+    """
+
+    def setUp(self):
+        self.levny = Dodavatele.objects.create(dodavatel='Levný dodavatel')
+        self.rychly = Dodavatele.objects.create(dodavatel='Rychlý dodavatel')
+        self.sklad = Sklad.objects.create(interne_cislo=1, nazev_dilu='Ložisko', mnozstvi=2, min_mnozstvi_ks=10)
+        self.sklad_ok = Sklad.objects.create(interne_cislo=2, nazev_dilu='Těsnění', mnozstvi=5, min_mnozstvi_ks=5)
+        self.varianta_levna = Varianty.objects.create(
+            sklad=self.sklad, dodavatel=self.levny, nazev_varianty='Ložisko L',
+            jednotkova_cena_eur=5.0, dodaci_lhuta=30, min_obj_mnozstvi=1,
+        )
+        self.varianta_rychla = Varianty.objects.create(
+            sklad=self.sklad, dodavatel=self.rychly, nazev_varianty='Ložisko R',
+            jednotkova_cena_eur=8.0, dodaci_lhuta=3, min_obj_mnozstvi=20,
+        )
+
+    def test_shortage_updated_on_save(self):
+        self.assertEqual(Nedostatek.objects.get(sklad=self.sklad).chybi, 8)
+        self.assertFalse(Nedostatek.objects.filter(sklad=self.sklad_ok).exists())
+
+        self.sklad.mnozstvi = 10
+        self.sklad.save()
+        self.assertFalse(Nedostatek.objects.filter(sklad=self.sklad).exists())
+
+        self.sklad_ok.mnozstvi = 1
+        self.sklad_ok.save()
+        self.assertEqual(Nedostatek.objects.get(sklad=self.sklad_ok).chybi, 4)
+
+    def test_rebuild_shortages(self):
+        Sklad.objects.filter(pk=self.sklad_ok.pk).update(mnozstvi=0)
+        self.assertEqual(rebuild_shortages(), 2)
+        self.assertEqual(Nedostatek.objects.get(sklad=self.sklad_ok).chybi, 5)
+
+    def test_backfill_after_migrate(self):
+        Nedostatek.objects.all().delete()
+        backfill_sklad_shortages(sender=apps.get_app_config('hpm_sklad'))
+        self.assertEqual(Nedostatek.objects.get().sklad, self.sklad)
+
+        Sklad.objects.filter(pk=self.sklad_ok.pk).update(mnozstvi=0)
+        backfill_sklad_shortages(sender=apps.get_app_config('hpm_sklad'))
+        self.assertEqual(Nedostatek.objects.count(), 1)
+
+    def test_plan_cheapest(self):
+        plan = plan_reorder('cheapest')
+        self.assertEqual(plan, {self.levny: [(self.varianta_levna, 8)]})
+
+    def test_plan_fastest_respects_min_order_quantity(self):
+        plan = plan_reorder('fastest')
+        self.assertEqual(plan, {self.rychly: [(self.varianta_rychla, 20)]})
+
+    def test_plan_skips_open_poptavky(self):
+        poptavka = Poptavky.objects.create(dodavatel=self.levny, stav='Poptáno')
+        PoptavkaVarianty.objects.create(poptavka=poptavka, varianta=self.varianta_levna, mnozstvi=8, jednotky='ks')
+        self.assertEqual(plan_reorder(), {})
+
+    def test_create_draft_poptavky(self):
+        poptavky = create_draft_poptavky(plan_reorder())
+        self.assertEqual(len(poptavky), 1)
+        radek = PoptavkaVarianty.objects.get()
+        self.assertEqual(radek.poptavka.stav, 'Tvorba')
+        self.assertEqual(radek.varianta, self.varianta_levna)
+        self.assertEqual(radek.mnozstvi, 8)
+
+    def test_generate_reorders_view(self):
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+        self.assertEqual(self.client.post(reverse('generate_reorders')).status_code, 403)
+
+        user.user_permissions.add(Permission.objects.get(codename='add_poptavky'))
+        response = self.client.post(reverse('generate_reorders'), {'strategy': 'fastest'})
+        self.assertRedirects(response, reverse('poptavky'))
+        self.assertEqual(PoptavkaVarianty.objects.get().varianta, self.varianta_rychla)
+
+    def test_generate_reorders_command(self):
+        out = StringIO()
+        call_command('generate_reorders', '--dry-run', stdout=out)
+        self.assertIn('Ložisko L', out.getvalue())
+        self.assertFalse(Poptavky.objects.exists())
+
+        call_command('generate_reorders', stdout=out)
+        self.assertEqual(Poptavky.objects.count(), 1)
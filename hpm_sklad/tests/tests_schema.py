@@ -0,0 +1,142 @@
+import json
+from datetime import date
+
+from django.test import TestCase
+from django.contrib.auth.models import User, Permission
+
+from hpm_sklad.models import Sklad, AuditLog, Dodavatele, Zarizeni
+
+
+######################## Testy GraphQL ###########################
+
+class MovementMutationsTest(TestCase):
+    """
+    Testy pro GraphQL mutace zapisující dávky skladových pohybů.
+
+    Testuje:
+    - Zápis dávky výdejů a příjmů včetně řetězení pohybů na stejnou položku.
+    - Vrácení celé dávky zpět, pokud je některý pohyb neplatný.
+    - Zápis inventurních rozdílů.
+    - Odmítnutí uživatele bez oprávnění.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(Permission.objects.get(codename='change_sklad'))
+        self.user.user_permissions.add(Permission.objects.get(codename='add_auditlog'))
+        self.client.login(username='testuser', password='testpassword')
+
+        self.dodavatel = Dodavatele.objects.create(dodavatel='Test Dodavatel')
+        self.zarizeni = Zarizeni.objects.create(
+            kod_zarizeni='hsh', nazev_zarizeni='HSH TQ7', umisteni='Hala 1', typ_zarizeni='Pec'
+        )
+        self.sklad = Sklad.objects.create(
+            interne_cislo=123,
+            nazev_dilu='Testovací díl',
+            mnozstvi=10,
+            umisteni='A1',
+            jednotkova_cena_eur=100.0,
+            celkova_cena_eur=1000.0,
+            dodavatel=self.dodavatel.dodavatel,
+        )
+        self.sklad.zarizeni.add(self.zarizeni)
+
+    def execute(self, query, variables):
+        response = self.client.post(
+            '/graphql', data=json.dumps({'query': query, 'variables': variables}), content_type='application/json'
+        )
+        return response.json()
+
+    def dispatch(self, movements):
+        query = """
+            mutation($movements: [DispatchInput!]!) {
+                recordDispatches(movements: $movements) {
+                    ok
+                    auditLogs { zmenaMnozstvi mnozstvi }
+                    errors { index field messages }
+                }
+            }
+        """
+        return self.execute(query, {'movements': movements})['data']['recordDispatches']
+
+    def dispatch_item(self, zmena_mnozstvi):
+        return {
+            'evidencniCislo': self.sklad.pk,
+            'zmenaMnozstvi': zmena_mnozstvi,
+            'pouziteZarizeni': 'HSH',
+            'typUdrzby': 'Preventivní',
+            'datumVydeje': date.today().isoformat(),
+        }
+
+    def test_dispatch_batch_chains_movements(self):
+        result = self.dispatch([self.dispatch_item(3), self.dispatch_item(4)])
+
+        self.assertTrue(result['ok'])
+        self.assertEqual([log['mnozstvi'] for log in result['auditLogs']], [7, 3])
+        self.sklad.refresh_from_db()
+        self.assertEqual(self.sklad.mnozstvi, 3)
+        self.assertAlmostEqual(self.sklad.celkova_cena_eur, 300.0)
+        self.assertEqual(AuditLog.objects.filter(typ_operace='VÝDEJ').count(), 2)
+
+    def test_invalid_movement_rolls_back_batch(self):
+        result = self.dispatch([self.dispatch_item(3), self.dispatch_item(8)])
+
+        self.assertFalse(result['ok'])
+        self.assertEqual(result['errors'][0]['index'], 1)
+        self.assertEqual(result['errors'][0]['field'], 'zmena_mnozstvi')
+        self.sklad.refresh_from_db()
+        self.assertEqual(self.sklad.mnozstvi, 10)
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_receipt_batch(self):
+        query = """
+            mutation($movements: [ReceiptInput!]!) {
+                recordReceipts(movements: $movements) { ok errors { field messages } }
+            }
+        """
+        result = self.execute(query, {'movements': [{
+            'evidencniCislo': self.sklad.pk,
+            'zmenaMnozstvi': 10,
+            'dodavatel': self.dodavatel.pk,
+            'datumNakupu': date.today().isoformat(),
+            'cisloObjednavky': 'OBJ-1',
+            'jednotkovaCenaEur': 50.0,
+        }]})['data']['recordReceipts']
+
+        self.assertTrue(result['ok'])
+        self.sklad.refresh_from_db()
+        self.assertEqual(self.sklad.mnozstvi, 20)
+        self.assertAlmostEqual(self.sklad.celkova_cena_eur, 1500.0)
+        self.assertEqual(self.sklad.umisteni, 'A1')
+
+    def test_inventory_adjustment_batch(self):
+        query = """
+            mutation($movements: [InventoryAdjustmentInput!]!) {
+                recordInventoryAdjustments(movements: $movements) { ok auditLogs { zmenaMnozstvi typUdrzby } }
+            }
+        """
+        result = self.execute(query, {'movements': [{
+            'evidencniCislo': self.sklad.pk,
+            'skutecneMnozstvi': 8,
+            'datum': date.today().isoformat(),
+        }]})['data']['recordInventoryAdjustments']
+
+        self.assertTrue(result['ok'])
+        self.assertEqual(result['auditLogs'][0]['zmenaMnozstvi'], -2)
+        self.sklad.refresh_from_db()
+        self.assertEqual(self.sklad.mnozstvi, 8)
+        self.assertAlmostEqual(self.sklad.celkova_cena_eur, 800.0)
+
+    def test_permission_required(self):
+        self.user.user_permissions.clear()
+        response = self.client.post(
+            '/graphql',
+            data=json.dumps({
+                'query': 'mutation($m: [DispatchInput!]!) { recordDispatches(movements: $m) { ok } }',
+                'variables': {'m': [self.dispatch_item(1)]},
+            }),
+            content_type='application/json',
+        )
+        self.assertIn('errors', response.json())
+        self.sklad.refresh_from_db()
+        self.assertEqual(self.sklad.mnozstvi, 10)
@@ -0,0 +1,160 @@
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User, Permission
+
+from hpm_sklad.models import Sklad, AuditLog, Inventura
+from hpm_sklad.movements import MovementBatchError
+from hpm_sklad.stocktake import start_stocktake, stocktake_locations, record_counts, reconcile_stocktake, StocktakeError
+
+
+######################## Testy inventury ###########################
+
+class StocktakeTest(TestCase):
+    """
+    Testy pro inventuru se snímkem stavu a dávkovým zaúčtováním rozdílů.
+
+    Testuje:
+    - Uložení snímku množství při zahájení a omezení rozsahu podle umístění.
+    - Přehled umístění s počtem sečtených položek.
+    - Výpočet rozdílů proti stavu při sečtení, pohyby před sečtením i po něm se nezapočtou dvakrát.
+    - Vrácení celé dávky zpět, pokud je některý inventurní pohyb neplatný.
+    - Odmítnutí práce se zaúčtovanou inventurou i přes zastaralou instanci.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.sklad_a1 = Sklad.objects.create(
+            nazev_dilu='Díl A1', mnozstvi=10, umisteni='A1', jednotkova_cena_eur=2.0, celkova_cena_eur=20.0,
+        )
+        self.sklad_a2 = Sklad.objects.create(
+            nazev_dilu='Díl A2', mnozstvi=5, umisteni='A2', jednotkova_cena_eur=4.0, celkova_cena_eur=20.0,
+        )
+        self.sklad_b1 = Sklad.objects.create(
+            nazev_dilu='Díl B1', mnozstvi=3, umisteni='B1', jednotkova_cena_eur=1.0, celkova_cena_eur=3.0,
+        )
+
+    def counts(self, inventura, values):
+        polozky = {polozka.sklad_id: polozka.pk for polozka in inventura.polozky.all()}
+        record_counts(inventura, {polozky[sklad.pk]: mnozstvi for sklad, mnozstvi in values.items()}, self.user)
+
+    def test_start_takes_snapshot_of_location_prefix(self):
+        inventura = start_stocktake(self.user, umisteni='A')
+
+        self.assertEqual(
+            sorted(inventura.polozky.values_list('sklad_id', 'stav_pri_zahajeni')),
+            sorted([(self.sklad_a1.pk, 10), (self.sklad_a2.pk, 5)]),
+        )
+
+    def test_locations_overview(self):
+        inventura = start_stocktake(self.user)
+        self.counts(inventura, {self.sklad_a1: 10})
+
+        lokace = {row['umisteni']: (row['secteno'], row['pocet']) for row in stocktake_locations(inventura)}
+        self.assertEqual(lokace, {'A1': (1, 1), 'A2': (0, 1), 'B1': (0, 1)})
+
+    def test_reconcile_posts_differences_against_stock_at_count(self):
+        inventura = start_stocktake(self.user)
+        # výdej 2 ks po zahájení a před sečtením: sečteno 8 = evidovaný stav, žádný rozdíl
+        self.sklad_a1.mnozstvi = 8
+        self.sklad_a1.save()
+        self.counts(inventura, {self.sklad_a1: 8, self.sklad_a2: 4, self.sklad_b1: 4})
+        # příjem 2 ks po sečtení se k inventurnímu rozdílu jen připočte
+        self.sklad_b1.mnozstvi = 5
+        self.sklad_b1.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            auditlogs = reconcile_stocktake(inventura, self.user)
+
+        self.assertEqual(sorted(log.zmena_mnozstvi for log in auditlogs), [-1, 1])
+        self.assertTrue(all(log.typ_udrzby == 'Inventura' for log in auditlogs))
+        for sklad in (self.sklad_a1, self.sklad_a2, self.sklad_b1):
+            sklad.refresh_from_db()
+        self.assertEqual((self.sklad_a1.mnozstvi, self.sklad_a2.mnozstvi, self.sklad_b1.mnozstvi), (8, 4, 6))
+        inventura.refresh_from_db()
+        self.assertEqual(inventura.stav, 'Zaúčtovaná')
+        self.assertEqual(inventura.zauctoval, self.user)
+
+    def test_invalid_difference_rolls_back_batch(self):
+        inventura = start_stocktake(self.user)
+        self.counts(inventura, {self.sklad_a1: 12, self.sklad_b1: 0})
+        # po snímku se vydalo víc, než inventura napočítala, stav by byl záporný
+        self.sklad_b1.mnozstvi = 1
+        self.sklad_b1.save()
+
+        with self.assertRaises(MovementBatchError) as cm:
+            reconcile_stocktake(inventura, self.user)
+
+        self.assertEqual(cm.exception.errors[0][0], self.sklad_b1.pk)
+        self.assertFalse(AuditLog.objects.exists())
+        self.sklad_a1.refresh_from_db()
+        self.assertEqual(self.sklad_a1.mnozstvi, 10)
+        inventura.refresh_from_db()
+        self.assertEqual(inventura.stav, 'Otevřená')
+
+    def test_reconciled_stocktake_is_closed(self):
+        inventura = start_stocktake(self.user)
+        # zaúčtování jinou instancí, instance `inventura` má zastaralý stav
+        reconcile_stocktake(Inventura.objects.get(pk=inventura.pk), self.user)
+
+        with self.assertRaises(StocktakeError):
+            reconcile_stocktake(inventura, self.user)
+        with self.assertRaises(StocktakeError):
+            record_counts(inventura, {inventura.polozky.first().pk: 1}, self.user)
+        self.assertFalse(inventura.polozky.filter(sectene_mnozstvi__isnull=False).exists())
+
+
+class StocktakeViewsTest(TestCase):
+    """
+    Testy pro views inventury.
+
+    Testuje:
+    - Zahájení inventury z formuláře.
+    - Zadání sečtených množství pro umístění.
+    - Zaúčtování rozdílů a kontrolu oprávnění.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        for codename in ('add_inventura', 'change_inventurapolozka', 'change_sklad', 'add_auditlog'):
+            self.user.user_permissions.add(Permission.objects.get(codename=codename))
+        self.client.login(username='testuser', password='testpassword')
+        self.sklad = Sklad.objects.create(
+            nazev_dilu='Díl A1', mnozstvi=10, umisteni='A1', jednotkova_cena_eur=2.0, celkova_cena_eur=20.0,
+        )
+
+    def test_start_and_count(self):
+        self.assertContains(self.client.get(reverse('inventury')), 'Zahájit inventuru')
+        response = self.client.post(reverse('start_inventura'), {'datum': date.today().isoformat(), 'umisteni': ''})
+        inventura = Inventura.objects.get()
+        self.assertRedirects(response, reverse('detail_inventury', kwargs={'pk': inventura.pk}))
+
+        url = reverse('count_inventura', kwargs={'pk': inventura.pk}) + '?umisteni=A1'
+        response = self.client.get(url)
+        self.assertContains(response, 'Díl A1')
+
+        polozka = inventura.polozky.get()
+        self.client.post(url, {f'polozka_{polozka.pk}': 9})
+        polozka.refresh_from_db()
+        self.assertEqual(polozka.sectene_mnozstvi, 9)
+        self.assertEqual(polozka.secetl, self.user)
+
+    def test_reconcile_view(self):
+        inventura = start_stocktake(self.user)
+        record_counts(inventura, {inventura.polozky.get().pk: 9}, self.user)
+        self.assertContains(self.client.get(reverse('detail_inventury', kwargs={'pk': inventura.pk})), 'Zaúčtovat')
+
+        response = self.client.post(reverse('reconcile_inventura', kwargs={'pk': inventura.pk}))
+
+        self.assertRedirects(response, reverse('detail_inventury', kwargs={'pk': inventura.pk}))
+        self.sklad.refresh_from_db()
+        self.assertEqual(self.sklad.mnozstvi, 9)
+
+    def test_reconcile_requires_permission(self):
+        inventura = start_stocktake(self.user)
+        self.user.user_permissions.remove(Permission.objects.get(codename='add_auditlog'))
+
+        response = self.client.post(reverse('reconcile_inventura', kwargs={'pk': inventura.pk}))
+
+        self.assertEqual(response.status_code, 403)
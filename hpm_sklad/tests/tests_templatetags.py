@@ -0,0 +1,83 @@
+from django.test import TestCase, RequestFactory
+from django.template import Context, Template
+
+from hpm_sklad.models import Sklad, Dodavatele, Varianty, UkazatelKpi
+from hpm_sklad.templatetags.custom_filters import get_instance
+
+
+######################## Testy šablonových filtrů ###########################
+
+class GetInstanceFilterTest(TestCase):
+    """
+    Testy pro filtr `get_instance` a tag `instance_map`.
+
+    Testuje:
+    - Vyhledání instance ve slovníku i v querysetu.
+    - Načtení querysetu jediným dotazem při opakovaném volání v cyklu.
+    - Neexistující primární klíč.
+    - Nečíselné primární klíče a klíče slovníku bez převodu na číslo.
+    """
+
+    def setUp(self):
+        self.dodavatel = Dodavatele.objects.create(dodavatel='Test Dodavatel')
+        self.varianty = [
+            Varianty.objects.create(
+                sklad=Sklad.objects.create(nazev_dilu=f'Díl {i}'), dodavatel=self.dodavatel,
+                nazev_varianty=f'Varianta {i}', dodaci_lhuta=7, min_obj_mnozstvi=1,
+            )
+            for i in range(3)
+        ]
+
+    def test_mapping_lookup(self):
+        mapping = {varianta.pk: varianta for varianta in self.varianty}
+        with self.assertNumQueries(0):
+            self.assertEqual(get_instance(mapping, str(self.varianty[1].pk)), self.varianty[1])
+            self.assertEqual(get_instance(mapping, 'x'), 'Instance neexistuje')
+
+    def test_queryset_loaded_once(self):
+        queryset = Varianty.objects.all()
+        with self.assertNumQueries(1):
+            for varianta in self.varianty:
+                self.assertEqual(get_instance(queryset, varianta.pk), varianta)
+            self.assertEqual(get_instance(queryset, 0), 'Instance neexistuje')
+
+    def test_non_integer_keys(self):
+        ukazatel = UkazatelKpi.objects.create(klic='hodnota_skladu', hodnota=1)
+        self.assertEqual(get_instance(UkazatelKpi.objects.all(), 'hodnota_skladu'), ukazatel)
+        self.assertEqual(get_instance({'a': 'A'}, 'a'), 'A')
+        self.assertEqual(get_instance({'a': 'A'}, 'b'), 'Instance neexistuje')
+
+    def test_instance_map_tag(self):
+        template = Template(
+            '{% load custom_filters %}{% instance_map varianty as mapa %}'
+            '{% for pk in pks %}{{ mapa|get_instance:pk }};{% endfor %}'
+        )
+        context = Context({'varianty': Varianty.objects.all(), 'pks': [v.pk for v in self.varianty]})
+        with self.assertNumQueries(1):
+            output = template.render(context)
+        self.assertEqual(output, 'Varianta 0;Varianta 1;Varianta 2;')
+
+
+class QueryUrlTagTest(TestCase):
+    """
+    Testy pro tagy `query_url` a `sort_url`.
+
+    Testuje:
+    - Zachování vícenásobných a prázdných parametrů.
+    - Přepínání směru řazení podle aktuálního požadavku.
+    """
+
+    def render(self, template, querystring):
+        request = RequestFactory().get('/sklad/?' + querystring)
+        return Template('{% load custom_filters %}' + template).render(Context({'request': request}))
+
+    def test_query_url_preserves_multi_valued_and_empty_params(self):
+        output = self.render('{% query_url page=2 %}', 'zarizeni=a&zarizeni=b&query=&page=1')
+        self.assertEqual(output, '?zarizeni=a&amp;zarizeni=b&amp;query=&amp;page=2')
+
+    def test_query_url_removes_param(self):
+        self.assertEqual(self.render('{% query_url page=None %}', 'page=3&sort=id'), '?sort=id')
+
+    def test_sort_url_toggles_order(self):
+        self.assertEqual(self.render("{% sort_url 'id' %}", 'sort=id&order=up&query=x'), '?query=x&amp;sort=id&amp;order=down')
+        self.assertEqual(self.render("{% sort_url 'id' %}", 'sort=nazev&order=up'), '?sort=id&amp;order=up')
@@ -0,0 +1,188 @@
+from datetime import date
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from hpm_sklad.models import Sklad, AuditLog, StavSkladu
+from hpm_sklad.valuation import (stock_valuation, stock_at, valuation_rows, create_checkpoint, nearest_checkpoint,
+                                 rebuild_item_checkpoints)
+
+
+######################## Testy ocenění skladu ###########################
+
+class StockValuationTest(TestCase):
+    """
+    Testy pro výpočet stavu a ocenění skladu k datu ze snímků a pohybů.
+
+    Testuje:
+    - Přehrání pohybů bez snímku.
+    - Výpočet ze snímku a pohybů po něm.
+    - Úpravu snímků o pohyb se zpětným datem při zápisu, změně i smazání pohybu.
+    - Úpravu pohybu načteného jen s částí polí a načtení fixtur bez ztráty ostatních snímků.
+    - Přepočet snímků jedné položky z pohybů.
+    - Report a exporty do CSV a PDF.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.sklad = Sklad.objects.create(nazev_dilu='Testovací díl', umisteni='A1')
+
+    def log(self, zmena_mnozstvi, celkova_cena_eur, datum):
+        receipt = zmena_mnozstvi > 0
+        return AuditLog.objects.create(
+            ucetnictvi=True, evidencni_cislo=self.sklad, nazev_dilu=self.sklad.nazev_dilu,
+            zmena_mnozstvi=zmena_mnozstvi, mnozstvi=0, typ_operace='PŘÍJEM' if receipt else 'VÝDEJ',
+            umisteni='A1', dodavatel='Test', operaci_provedl=self.user, celkova_cena_eur=celkova_cena_eur,
+            datum_nakupu=datum if receipt else None, datum_vydeje=None if receipt else datum,
+        )
+
+    def test_replay_without_checkpoint(self):
+        self.log(10, 100.0, date(2024, 1, 10))
+        self.log(-4, -40.0, date(2024, 2, 5))
+        self.log(5, 60.0, date(2024, 3, 1))
+
+        self.assertEqual(stock_valuation(date(2024, 1, 31)), {self.sklad.pk: (10, 100.0)})
+        self.assertEqual(stock_valuation(date(2024, 2, 29)), {self.sklad.pk: (6, 60.0)})
+        self.assertEqual(stock_valuation(date(2023, 12, 31)), {})
+
+    def test_checkpoint_plus_delta(self):
+        self.log(10, 100.0, date(2024, 1, 10))
+        create_checkpoint(date(2024, 1, 31))
+        # snímek je zdrojem pravdy pro období před ním, i když se liší od audit logu
+        StavSkladu.objects.filter(datum=date(2024, 1, 31)).update(mnozstvi=12, celkova_cena_eur=120.0)
+        self.log(-2, -20.0, date(2024, 2, 5))
+
+        with self.assertNumQueries(3):
+            valuation = stock_valuation(date(2024, 2, 29))
+        self.assertEqual(valuation, {self.sklad.pk: (10, 100.0)})
+
+    def snapshot(self, datum):
+        return StavSkladu.objects.filter(datum=datum).values_list('evidencni_cislo_id', 'mnozstvi', 'celkova_cena_eur').first()
+
+    def test_backdated_movement_adjusts_checkpoints(self):
+        self.log(5, 50.0, date(2023, 12, 1))
+        self.log(10, 100.0, date(2024, 1, 10))
+        create_checkpoint(date(2024, 1, 31))
+        create_checkpoint(date(2023, 12, 31))
+
+        vydej = self.log(-3, -30.0, date(2024, 1, 20))
+
+        self.assertEqual(nearest_checkpoint(date(2024, 2, 29)), date(2024, 1, 31))
+        self.assertEqual(self.snapshot(date(2023, 12, 31)), (self.sklad.pk, 5, 50.0))
+        self.assertEqual(self.snapshot(date(2024, 1, 31)), (self.sklad.pk, 12, 120.0))
+        self.assertEqual(stock_valuation(date(2024, 2, 29)), {self.sklad.pk: (12, 120.0)})
+
+        vydej = AuditLog.objects.get(pk=vydej.pk)
+        vydej.datum_vydeje = date(2023, 12, 20)
+        vydej.save()
+        self.assertEqual(self.snapshot(date(2023, 12, 31)), (self.sklad.pk, 2, 20.0))
+        self.assertEqual(self.snapshot(date(2024, 1, 31)), (self.sklad.pk, 12, 120.0))
+
+        vydej.delete()
+        self.assertEqual(self.snapshot(date(2023, 12, 31)), (self.sklad.pk, 5, 50.0))
+        self.assertEqual(self.snapshot(date(2024, 1, 31)), (self.sklad.pk, 15, 150.0))
+
+    def test_backdated_movement_fills_missing_checkpoint_row(self):
+        jiny = Sklad.objects.create(nazev_dilu='Jiný díl', umisteni='A2')
+        StavSkladu.objects.create(evidencni_cislo=jiny, datum=date(2024, 1, 31), mnozstvi=1, celkova_cena_eur=1.0)
+        prijem = self.log(4, 40.0, date(2024, 1, 5))
+
+        self.assertEqual(stock_at(self.sklad.pk, date(2024, 1, 31)), (4, 40.0))
+
+        prijem.delete()
+        self.assertFalse(StavSkladu.objects.filter(evidencni_cislo=self.sklad).exists())
+
+    def test_partially_loaded_and_raw_saves_keep_checkpoints(self):
+        jiny = Sklad.objects.create(nazev_dilu='Jiný díl', umisteni='A2')
+        StavSkladu.objects.create(evidencni_cislo=jiny, datum=date(2024, 1, 31), mnozstvi=1, celkova_cena_eur=1.0)
+        vydej = self.log(-3, -30.0, date(2024, 1, 20))
+
+        vydej = AuditLog.objects.only('id', 'zmena_mnozstvi').get(pk=vydej.pk)
+        vydej.zmena_mnozstvi = -4
+        vydej.save(update_fields=['zmena_mnozstvi'])
+        self.assertEqual(stock_at(jiny.pk, date(2024, 1, 31)), (1, 1.0))
+        self.assertEqual(StavSkladu.objects.get(evidencni_cislo=self.sklad).mnozstvi, -4)
+
+        vydej = AuditLog.objects.get(pk=vydej.pk)
+        vydej.zmena_mnozstvi = -10
+        vydej.save_base(raw=True)
+        self.assertEqual(StavSkladu.objects.get(evidencni_cislo=self.sklad).mnozstvi, -4)
+        self.assertEqual(StavSkladu.objects.count(), 2)
+
+    def test_rebuild_item_checkpoints(self):
+        jiny = Sklad.objects.create(nazev_dilu='Jiný díl', umisteni='A2')
+        self.log(10, 100.0, date(2023, 12, 10))
+        self.log(-3, -30.0, date(2024, 1, 20))
+        create_checkpoint(date(2023, 12, 31))
+        create_checkpoint(date(2024, 1, 31))
+        StavSkladu.objects.create(evidencni_cislo=jiny, datum=date(2024, 1, 31), mnozstvi=1, celkova_cena_eur=1.0)
+        StavSkladu.objects.filter(evidencni_cislo=self.sklad).update(mnozstvi=99)
+
+        rebuild_item_checkpoints(self.sklad.pk, date(2024, 1, 1))
+        self.assertEqual(self.snapshot(date(2023, 12, 31))[1], 99)
+        self.assertEqual(StavSkladu.objects.get(evidencni_cislo=self.sklad, datum=date(2024, 1, 31)).mnozstvi, 7)
+        self.assertEqual(stock_at(jiny.pk, date(2024, 1, 31)), (1, 1.0))
+
+    def test_deleting_item_removes_its_checkpoints(self):
+        self.log(10, 100.0, date(2024, 1, 10))
+        create_checkpoint(date(2024, 1, 31))
+
+        self.sklad.delete()
+
+        self.assertFalse(StavSkladu.objects.exists())
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_report_and_exports(self):
+        self.log(10, 100.0, date(2024, 1, 10))
+        self.client.login(username='testuser', password='testpassword')
+
+        response = self.client.get(reverse('oceneni_skladu'), {'datum': '2024-01-31'})
+        self.assertEqual(response.context['rows'], valuation_rows(date(2024, 1, 31)))
+        self.assertEqual(response.context['celkem_eur'], 100.0)
+
+        response = self.client.get(reverse('oceneni_skladu_export_csv'), {'datum': '2024-01-31'})
+        self.assertIn('Testovací díl', response.content.decode())
+
+        response = self.client.get(reverse('oceneni_skladu_export_pdf'), {'datum': '2024-01-31'})
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+
+class SnapshotStockCommandTest(TestCase):
+    """
+    Testy pro management příkaz `snapshot_stock`.
+
+    Testuje:
+    - Doplnění měsíčních snímků do minulosti.
+    - Mazání starých denních snímků s ponecháním měsíčních.
+    - Stav jedné položky k datu ze snímku.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.sklad = Sklad.objects.create(nazev_dilu='Testovací díl', umisteni='A1')
+        AuditLog.objects.create(
+            ucetnictvi=True, evidencni_cislo=self.sklad, nazev_dilu=self.sklad.nazev_dilu, zmena_mnozstvi=10,
+            mnozstvi=10, typ_operace='PŘÍJEM', umisteni='A1', dodavatel='Test', operaci_provedl=self.user,
+            celkova_cena_eur=100.0, datum_nakupu=date(2024, 1, 10),
+        )
+
+    def test_monthly_backfill(self):
+        call_command(
+            'snapshot_stock', period='monthly', backfill_from=date(2024, 1, 1), date=date(2024, 3, 31), stdout=StringIO()
+        )
+
+        self.assertEqual(
+            list(StavSkladu.objects.order_by('datum').values_list('datum', 'mnozstvi')),
+            [(date(2024, 1, 31), 10), (date(2024, 2, 29), 10), (date(2024, 3, 31), 10)],
+        )
+        self.assertEqual(stock_at(self.sklad.pk, date(2024, 3, 15)), (10, 100.0))
+
+    def test_keep_daily_prunes_old_daily_snapshots(self):
+        call_command(
+            'snapshot_stock', backfill_from=date(2024, 1, 30), date=date(2024, 2, 2), keep_daily=30, stdout=StringIO()
+        )
+
+        self.assertEqual(list(StavSkladu.objects.values_list('datum', flat=True)), [date(2024, 1, 31)])
@@ -1,12 +1,16 @@
 import csv
+import subprocess
+import sys
 from io import StringIO, BytesIO
 
 from django.test import TestCase, RequestFactory
 from unittest.mock import patch
-from django.urls import reverse
+from django.urls import reverse, resolve
 
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
 
 from django.contrib.auth.models import User, Permission
 
@@ -14,7 +18,6 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django_user_agents.utils import get_user_agent
 from django.http import FileResponse
 
 from datetime import date
@@ -979,9 +982,14 @@ class SkladDetailViewTest(TestCase):
 
         # Ověření, že pole pro informace jsou správně nastavená
         info_fields = response.context['info_fields']
-        self.assertIn(Sklad._meta.get_field('ucetnictvi'), info_fields)
-        self.assertIn(Sklad._meta.get_field('kriticky_dil'), info_fields)
-        self.assertIn({'verbose_name': 'Pod minimem', 'name': 'pod_minimem'}, info_fields)
+        self.assertIn(('ucetnictvi', 'V účetnictví', 'ANO'), info_fields)
+        self.assertIn(('kriticky_dil', 'Kritický díl', 'NE'), info_fields)
+        self.assertIn(('pod_minimem', 'Pod minimem', 'NE'), info_fields)
+
+        # Ověření, že řádky detailu obsahují hodnoty a vynechávají pole zobrazená jinde
+        detail_item_fields = {field.name: field.value for field in response.context['detail_item_fields']}
+        self.assertEqual(detail_item_fields['umisteni'], 'Sklad A')
+        self.assertNotIn('nazev_dilu', detail_item_fields)
 
 
 class AuditLogListViewTest(TestCase):
@@ -1176,6 +1184,15 @@ class AuditLogExportGraphTest(TestCase):
         self.assertIn("ks", content)
         self.assertIn("-2", content)
 
+    def test_generate_export_consumption_to_pdf_returns_file_response(self):
+        """
+        Ověřuje, že metoda generate_export_consumption_to_pdf vrací PDF soubor.
+        """
+        queryset = AuditLog.objects.all()
+        response = self.view.generate_export_consumption_to_pdf(queryset)
+        self.assertIsInstance(response, FileResponse)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
     def test_generate_graph_to_pdf_returns_file_response(self):
         """
         Ověřuje, že metoda generate_graph_to_pdf vrací FileResponse.
@@ -1193,3 +1210,246 @@ class AuditLogExportGraphTest(TestCase):
         response = self.view.generate_graph_by_maintenance(queryset)
         self.assertIsInstance(response, FileResponse)
         self.assertEqual(response.status_code, 200)
+
+
+class CreatePoptavkaViewTest(TestCase):
+    """
+    Testy pro vytvoření poptávky `create_poptavka`.
+
+    Testuje:
+    - Počet dotazů do databáze nezávislý na počtu variant dodavatele.
+    - Uložení vybraných řádků poptávky.
+    - Odmítnutí varianty jiného dodavatele.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(Permission.objects.get(codename='add_poptavky'))
+        self.client.login(username='testuser', password='testpassword')
+        self.dodavatel = Dodavatele.objects.create(dodavatel='Test Dodavatel')
+        self.jiny_dodavatel = Dodavatele.objects.create(dodavatel='Jiný dodavatel')
+        self.varianty = [self.create_varianta(i) for i in range(2)]
+        self.url = reverse('create_poptavka', kwargs={'dodavatel_id': self.dodavatel.pk})
+
+    def create_varianta(self, i, dodavatel=None):
+        sklad = Sklad.objects.create(nazev_dilu=f'Díl {i}', mnozstvi=1, min_mnozstvi_ks=5, jednotky='ks')
+        return Varianty.objects.create(
+            sklad=sklad, dodavatel=dodavatel or self.dodavatel, nazev_varianty=f'Varianta {i}',
+            jednotkova_cena_eur=1.0, dodaci_lhuta=7, min_obj_mnozstvi=1,
+        )
+
+    def post_data(self, varianty, selected):
+        data = {
+            'poptavka-TOTAL_FORMS': str(len(varianty)),
+            'poptavka-INITIAL_FORMS': '0',
+        }
+        for i, varianta in enumerate(varianty):
+            data.update({
+                f'poptavka-{i}-varianta': varianta.pk,
+                f'poptavka-{i}-mnozstvi': 4,
+                f'poptavka-{i}-jednotky': 'ks',
+            })
+            if i in selected:
+                data[f'poptavka-{i}-should_save'] = 'on'
+        return data
+
+    def test_query_count_does_not_depend_on_variant_count(self):
+        with CaptureQueriesContext(connection) as few:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Varianta 1')
+
+        self.varianty += [self.create_varianta(i) for i in range(2, 6)]
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Varianta 5')
+        self.assertEqual(len(few), len(many))
+
+        with CaptureQueriesContext(connection) as post:
+            self.client.post(self.url, self.post_data(self.varianty, selected={0, 3, 5}))
+        self.assertLessEqual(len(post), len(many) + 4)
+
+    def test_selected_lines_saved(self):
+        response = self.client.post(self.url, self.post_data(self.varianty, selected={1}))
+        self.assertRedirects(response, reverse('poptavky'))
+        radek = PoptavkaVarianty.objects.get()
+        self.assertEqual(radek.varianta, self.varianty[1])
+        self.assertEqual(radek.poptavka.dodavatel, self.dodavatel)
+        self.assertEqual(radek.mnozstvi, 4)
+
+    def test_foreign_variant_rejected(self):
+        cizi = self.create_varianta(9, dodavatel=self.jiny_dodavatel)
+        self.client.post(self.url, self.post_data([self.varianty[0], cizi], selected={0, 1}))
+        self.assertFalse(Poptavky.objects.exists())
+
+
+class DetailPanelTest(TestCase):
+    """
+    Testy pro pravý panel s detailem.
+
+    Testuje:
+    - Vložení detailu prvního nebo vybraného řádku přímo do stránky seznamu.
+    - Cachování fragmentu detailu a jeho zneplatnění po změně položky.
+    - Fragmentové endpointy panelu a zneplatnění viditelné i z jiného procesu (sdílená cache).
+    - Upozornění systémové kontroly na cache v paměti procesu.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+        self.zarizeni = Zarizeni.objects.create(kod_zarizeni='hsh', nazev_zarizeni='HSH TQ7', umisteni='Hala 1', typ_zarizeni='Pec')
+        self.sklad = Sklad.objects.create(nazev_dilu='Díl A', umisteni='Regál 1')
+        self.sklad.zarizeni.add(self.zarizeni)
+        self.dalsi = Sklad.objects.create(nazev_dilu='Díl B', umisteni='Regál 2')
+        self.pc_agent = {'HTTP_USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+
+    def test_first_row_detail_embedded(self):
+        response = self.client.get(reverse('sklad'), **self.pc_agent)
+        self.assertEqual(response.context['detail_panel_pk'], self.dalsi.pk)
+        self.assertIn('Regál 2', response.context['detail_panel'])
+
+    def test_selected_row_detail_embedded(self):
+        response = self.client.get(reverse('sklad'), {'selected': self.sklad.pk}, **self.pc_agent)
+        self.assertIn('Regál 1', response.context['detail_panel'])
+        self.assertContains(response, f'data-selected="{self.sklad.pk}"')
+
+    def test_detail_fragment_cached_until_change(self):
+        url = reverse('detail_sklad', kwargs={'pk': self.sklad.pk})
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as cached:
+            response = self.client.get(url)
+        self.assertContains(response, 'HSH')
+        self.assertFalse(any('hpm_sklad_zarizeni' in query['sql'] for query in cached))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sklad.umisteni = 'Regál 9'
+            self.sklad.save()
+        self.assertContains(self.client.get(url), 'Regál 9')
+
+    def test_rows_load_fragment_endpoint(self):
+        response = self.client.get(reverse('sklad'), **self.pc_agent)
+        self.assertContains(response, f'data-fragment-url="{reverse("fragment_sklad", kwargs={"pk": self.sklad.pk})}"')
+        self.assertNotContains(response, 'unpkg.com')
+
+    def test_fragment_endpoint(self):
+        url = reverse('fragment_sklad', kwargs={'pk': self.sklad.pk})
+        self.assertContains(self.client.get(url), 'Regál 1')
+        with CaptureQueriesContext(connection) as cached:
+            response = self.client.get(url)
+        self.assertContains(response, 'HSH')
+        self.assertEqual(len([query for query in cached if 'FROM "hpm_sklad_sklad"' in query['sql']]), 1)
+        self.assertFalse(any('hpm_sklad_zarizeni' in query['sql'] for query in cached))
+        self.assertEqual(self.client.get(reverse('fragment_sklad', kwargs={'pk': 9999})).status_code, 404)
+
+    def test_zarizeni_fragment_without_dashboard(self):
+        response = self.client.get(reverse('fragment_zarizeni', kwargs={'pk': self.zarizeni.pk}))
+        self.assertContains(response, 'HSH TQ7')
+        self.assertNotContains(response, 'Nejdražší použité díly')
+
+    def test_version_shared_between_processes(self):
+        from django.core.cache import caches
+        from hpm_sklad.detail import detail_version, bump_detail_version
+        version = detail_version(Sklad, self.sklad.pk)
+        jiny_proces = caches.create_connection('default')
+        self.assertEqual(detail_version(Sklad, self.sklad.pk), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_detail_version(Sklad, self.sklad.pk)
+            self.assertEqual(detail_version(Sklad, self.sklad.pk), version)
+        self.assertNotEqual(jiny_proces.get(f'hpm_sklad:detail-version:hpm_sklad.sklad:{self.sklad.pk}'), version)
+
+    def test_check_warns_about_process_local_cache(self):
+        from hpm_sklad.checks import check_shared_cache
+        self.assertEqual(check_shared_cache(None), [])
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual([warning.id for warning in check_shared_cache(None)], ['hpm_sklad.W001'])
+
+
+class StockEventsViewTest(TestCase):
+    """
+    Testy pro event stream změn skladu `stock_events_view`.
+
+    Testuje:
+    - Událost po zapsání výdeje čtenou z audit logu.
+    - Odmítnutí nepřihlášeného uživatele.
+    - Doručení zmeškané události podle hlavičky `Last-Event-ID`.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.user.user_permissions.add(Permission.objects.get(codename='change_sklad'))
+        self.zarizeni = Zarizeni.objects.create(kod_zarizeni='hsh', nazev_zarizeni='HSH TQ7', umisteni='Hala 1', typ_zarizeni='Pec')
+        self.sklad = Sklad.objects.create(
+            nazev_dilu='Testovací díl', mnozstvi=10, min_mnozstvi_ks=8, umisteni='A1', dodavatel='Test Dodavatel',
+            jednotkova_cena_eur=10.0, celkova_cena_eur=100.0,
+        )
+        self.sklad.zarizeni.add(self.zarizeni)
+        self.url = reverse('stock_events')
+
+    def test_dispatch_publishes_event(self):
+        from hpm_sklad.events import latest_stock_event_id, stock_events_since
+        self.client.login(username='testuser', password='testpassword')
+        last_id = latest_stock_event_id()
+
+        self.client.post(reverse('dispatch_audit_log', kwargs={'pk': self.sklad.pk}), data={
+            'umisteni': 'A1', 'zmena_mnozstvi': 3, 'datum_vydeje': '2024-10-01',
+            'typ_udrzby': 'Preventivní', 'pouzite_zarizeni': 'HSH',
+        })
+
+        events = stock_events_since(last_id)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0][0], AuditLog.objects.get().pk)
+        self.assertEqual(events[0][1]['evidencni_cislo'], self.sklad.pk)
+        self.assertEqual(events[0][1]['mnozstvi'], 7)
+        self.assertTrue(events[0][1]['pod_minimem'])
+        self.assertEqual(stock_events_since(events[0][0]), [])
+
+    async def test_login_required(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    async def test_stream_replays_missed_events(self):
+        await self.async_client.aforce_login(self.user)
+        auditlog = await AuditLog.objects.acreate(
+            ucetnictvi=False, evidencni_cislo=self.sklad, nazev_dilu='Testovací díl', zmena_mnozstvi=-5, mnozstvi=5,
+            umisteni='A1', dodavatel='Test Dodavatel', typ_operace='VÝDEJ', operaci_provedl=self.user,
+        )
+
+        response = await self.async_client.get(self.url, headers={'Last-Event-ID': str(auditlog.pk - 1)})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        chunk = await anext(stream)
+        await stream.aclose()
+
+        self.assertIn(f'id: {auditlog.pk}', chunk.decode())
+        self.assertIn('"mnozstvi": 5', chunk.decode())
+        self.assertIn('"pod_minimem": true', chunk.decode())
+
+
+class LazyViewsTest(TestCase):
+    """
+    Testy pro líné načítání modulů views z URLconf.
+
+    Testuje:
+    - Načtení URLconf bez importu modulů views.
+    - Přeložení URL na view ze správného modulu.
+    - Zachování asynchronního view jako korutiny.
+    """
+
+    def test_urlconf_does_not_import_view_modules(self):
+        script = (
+            "import sys, django; django.setup(); import hpm_sklad.urls; "
+            "print(sorted(name for name in sys.modules if name.startswith('hpm_sklad.views.')))"
+        )
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], '[]')
+
+    def test_resolved_view_uses_domain_module(self):
+        match = resolve(reverse('sklad'))
+        self.assertEqual(match.func.__module__, 'hpm_sklad.views.stock')
+        self.assertEqual(match.func.__name__, 'SkladListView')
+
+    def test_async_view_stays_coroutine(self):
+        from asgiref.sync import iscoroutinefunction
+        self.assertTrue(iscoroutinefunction(resolve(reverse('stock_events')).func))
+        self.assertFalse(iscoroutinefunction(resolve(reverse('home')).func))
@@ -1,48 +1,67 @@
 from django.urls import path, include
-from . import views
+from .views import lazy_view
 
 urlpatterns = [
-    path('', views.home_view, name='home'),
-    path('sklad/', views.SkladListView.as_view(), name='sklad'),
-    path('sklad/export/csv/', views.SkladListView.as_view(export_csv=True), name='sklad_export_csv'),
-    path('sklad/new/', views.SkladCreateView.as_view(), name='create_sklad'),
-    path('sklad/<int:pk>/detail/', views.SkladDetailView.as_view(template_name='hpm_sklad/detail_sklad.html'), name='detail_sklad'),
-    path('sklad/<int:pk>/varianty/', views.SkladDetailView.as_view(template_name='hpm_sklad/show_varianty_sklad.html'), name='show_varianty_sklad'),      
-    path('sklad/<int:pk>/update/', views.SkladUpdateView.as_view(), name='update_sklad'),
-    path('sklad/<int:pk>/update_objednano/', views.SkladUpdateObjednanoView.as_view(), name='update_objednano_sklad'),
-    path('sklad/<int:pk>/delete/', views.SkladDeleteView.as_view(), name='delete_sklad'),
-    path('sklad/audit_logs/', views.AuditLogListView.as_view(), name='audit_log'),
-    path('sklad/audit_logs/export/csv/', views.AuditLogListView.as_view(export_csv=True), name='audit_log_export_csv'),
-    path('sklad/audit_logs/export_consumption/csv/', views.AuditLogListView.as_view(export_consumption_to_csv=True), name='audit_log_export_consumption_to_csv'),
-    path('sklad/audit_logs/export_consumption/pdf/', views.AuditLogListView.as_view(export_consumption_to_pdf=True), name='audit_log_export_consumption_to_pdf'),
-    path('sklad/audit_logs/graph/', views.AuditLogListView.as_view(graph=True), name='audit_log_graph'),
-    path('sklad/audit_logs/graph_by_maintenance/', views.AuditLogListView.as_view(graph_type_of_maintenance=True), name='audit_log_graph_type_of_maintenance'),    
-    path('sklad/audit_logs/<int:pk>/detail/', views.AuditLogDetailView.as_view(), name='detail_audit_log'),
-    path('sklad/audit_logs/show/', views.AuditLogShowView.as_view(), name='show_audit_log'),    
-    path('sklad/<int:pk>/create_varianty/', views.VariantyCreateView.as_view(), name='create_varianty'),
-    path('sklad/<int:pk>/update_varianty/', views.VariantyUpdateView.as_view(), name='update_varianty'),
-    path('sklad/<int:pk>/create_varianty_with_dodavatel/<int:dodavatel>/', views.VariantyWithDodavatelCreateView.as_view(), name='create_varianty_with_dodavatel'),
-    path('sklad/<int:pk>/receipt_audit_log/', views.receipt_form_view, name='receipt_audit_log'),
-    path('sklad/<int:pk>/dispatch_audit_log/', views.dispatch_form_view, name='dispatch_audit_log'),
-    path('sklad/dodavatele/', views.DodavateleListView.as_view(), name='dodavatele'),   
-    path('sklad/dodavatele/<int:pk>/detail/', views.DodavateleDetailView.as_view(template_name='hpm_sklad/detail_dodavatele.html'), name='detail_dodavatele'),
-    path('sklad/dodavatele/<int:pk>/varianty/', views.DodavateleDetailView.as_view(template_name='hpm_sklad/show_varianty_dodavatele.html'), name='show_varianty_dodavatele'),
-    path('sklad/dodavatele/<int:pk>/poptavky/', views.DodavateleDetailView.as_view(template_name='hpm_sklad/show_poptavky_dodavatele.html'), name='show_poptavky_dodavatele'),    
-    path('sklad/dodavatele/new/', views.DodavateleCreateView.as_view(), name='create_dodavatele'),
-    path('sklad/dodavatele/<int:pk>/update/', views.DodavateleUpdateView.as_view(), name='update_dodavatele'),
-    path('sklad/dodavatele/<int:pk>/delete/', views.DodavateleDeleteView.as_view(), name='delete_dodavatele'),
-    path('sklad/dodavatele/export/csv/', views.DodavateleListView.as_view(export_csv=True), name='dodavatele_export_csv'),
-    path('sklad/zarizeni/', views.ZarizeniListView.as_view(), name='zarizeni'),   
-    path('sklad/zarizeni/<int:pk>/detail/', views.ZarizeniDetailView.as_view(template_name='hpm_sklad/detail_zarizeni.html'), name='detail_zarizeni'),
-    path('sklad/zarizeni/new/', views.ZarizeniCreateView.as_view(), name='create_zarizeni'),
-    path('sklad/zarizeni/<int:pk>/update/', views.ZarizeniUpdateView.as_view(), name='update_zarizeni'),    
-    path('sklad/poptavky/', views.PoptavkaListView.as_view(), name='poptavky'),
-    path('sklad/poptavky/<int:dodavatel_id>/create/', views.create_poptavka, name='create_poptavka'),
-    path('sklad/poptavky/<int:pk>/update/', views.SkladUpdateView.as_view(), name='update_sklad'),
-    path('sklad/poptavky/<int:pk>/update_objednano/', views.SkladUpdateObjednanoView.as_view(), name='update_objednano_sklad'),
-    path('sklad/poptavky/<int:pk>/delete/', views.SkladDeleteView.as_view(), name='delete_sklad'),
-    path('sklad/poptavky/<int:pk>/detail/', views.PoptavkaDetailView.as_view(), name='detail_poptavky'),
-    path('sklad/poptavky/<int:pk>/poptavka_varianty/', views.PoptavkaVariantyListView.as_view(), name='poptavka_varianty'),
+    path('', lazy_view('home_view'), name='home'),
+    path('sklad/', lazy_view('SkladListView'), name='sklad'),
+    path('sklad/events/', lazy_view('stock_events_view'), name='stock_events'),
+    path('sklad/export/csv/', lazy_view('SkladListView', export_csv=True), name='sklad_export_csv'),
+    path('sklad/new/', lazy_view('SkladCreateView'), name='create_sklad'),
+    path('sklad/<int:pk>/detail/', lazy_view('SkladDetailView', template_name='hpm_sklad/detail_sklad.html'), name='detail_sklad'),
+    path('sklad/<int:pk>/fragment/', lazy_view('SkladFragmentView'), name='fragment_sklad'),
+    path('sklad/<int:pk>/varianty/', lazy_view('SkladDetailView', template_name='hpm_sklad/show_varianty_sklad.html'), name='show_varianty_sklad'),      
+    path('sklad/<int:pk>/update/', lazy_view('SkladUpdateView'), name='update_sklad'),
+    path('sklad/<int:pk>/update_objednano/', lazy_view('SkladUpdateObjednanoView'), name='update_objednano_sklad'),
+    path('sklad/<int:pk>/delete/', lazy_view('SkladDeleteView'), name='delete_sklad'),
+    path('sklad/audit_logs/', lazy_view('AuditLogListView'), name='audit_log'),
+    path('sklad/audit_logs/export/csv/', lazy_view('AuditLogListView', export_csv=True), name='audit_log_export_csv'),
+    path('sklad/audit_logs/export/parquet/', lazy_view('AuditLogListView', export_parquet=True), name='audit_log_export_parquet'),
+    path('sklad/audit_logs/export_consumption/csv/', lazy_view('AuditLogListView', export_consumption_to_csv=True), name='audit_log_export_consumption_to_csv'),
+    path('sklad/audit_logs/export_consumption/pdf/', lazy_view('AuditLogListView', export_consumption_to_pdf=True), name='audit_log_export_consumption_to_pdf'),
+    path('sklad/audit_logs/graph/', lazy_view('AuditLogListView', graph=True), name='audit_log_graph'),
+    path('sklad/audit_logs/graph_by_maintenance/', lazy_view('AuditLogListView', graph_type_of_maintenance=True), name='audit_log_graph_type_of_maintenance'),    
+    path('sklad/oceneni/', lazy_view('StockValuationView'), name='oceneni_skladu'),
+    path('sklad/oceneni/export/csv/', lazy_view('StockValuationView', export_csv=True), name='oceneni_skladu_export_csv'),
+    path('sklad/oceneni/export/pdf/', lazy_view('StockValuationView', export_pdf=True), name='oceneni_skladu_export_pdf'),
+    path('sklad/nepohyblive/', lazy_view('DeadStockListView'), name='nepohyblive_zasoby'),
+    path('sklad/nepohyblive/export/csv/', lazy_view('DeadStockListView', export_csv=True), name='nepohyblive_zasoby_export_csv'),
+    path('sklad/audit_logs/<int:pk>/detail/', lazy_view('AuditLogDetailView'), name='detail_audit_log'),
+    path('sklad/audit_logs/<int:pk>/fragment/', lazy_view('AuditLogFragmentView'), name='fragment_audit_log'),
+    path('sklad/audit_logs/show/', lazy_view('AuditLogShowView'), name='show_audit_log'),    
+    path('sklad/audit_logs/feed/', lazy_view('auditlog_feed_view'), name='audit_log_feed'),
+    path('sklad/<int:pk>/create_varianty/', lazy_view('VariantyCreateView'), name='create_varianty'),
+    path('sklad/<int:pk>/update_varianty/', lazy_view('VariantyUpdateView'), name='update_varianty'),
+    path('sklad/<int:pk>/create_varianty_with_dodavatel/<int:dodavatel>/', lazy_view('VariantyWithDodavatelCreateView'), name='create_varianty_with_dodavatel'),
+    path('sklad/<int:pk>/receipt_audit_log/', lazy_view('receipt_form_view'), name='receipt_audit_log'),
+    path('sklad/<int:pk>/dispatch_audit_log/', lazy_view('dispatch_form_view'), name='dispatch_audit_log'),
+    path('sklad/dodavatele/', lazy_view('DodavateleListView'), name='dodavatele'),   
+    path('sklad/dodavatele/<int:pk>/detail/', lazy_view('DodavateleDetailView', template_name='hpm_sklad/detail_dodavatele.html'), name='detail_dodavatele'),
+    path('sklad/dodavatele/<int:pk>/fragment/', lazy_view('DodavateleFragmentView'), name='fragment_dodavatele'),
+    path('sklad/dodavatele/<int:pk>/varianty/', lazy_view('DodavateleDetailView', template_name='hpm_sklad/show_varianty_dodavatele.html'), name='show_varianty_dodavatele'),
+    path('sklad/dodavatele/<int:pk>/poptavky/', lazy_view('DodavateleDetailView', template_name='hpm_sklad/show_poptavky_dodavatele.html'), name='show_poptavky_dodavatele'),    
+    path('sklad/dodavatele/new/', lazy_view('DodavateleCreateView'), name='create_dodavatele'),
+    path('sklad/dodavatele/<int:pk>/update/', lazy_view('DodavateleUpdateView'), name='update_dodavatele'),
+    path('sklad/dodavatele/<int:pk>/delete/', lazy_view('DodavateleDeleteView'), name='delete_dodavatele'),
+    path('sklad/dodavatele/export/csv/', lazy_view('DodavateleListView', export_csv=True), name='dodavatele_export_csv'),
+    path('sklad/zarizeni/', lazy_view('ZarizeniListView'), name='zarizeni'),   
+    path('sklad/zarizeni/<int:pk>/detail/', lazy_view('ZarizeniDetailView', template_name='hpm_sklad/detail_zarizeni.html'), name='detail_zarizeni'),
+    path('sklad/zarizeni/<int:pk>/fragment/', lazy_view('ZarizeniFragmentView'), name='fragment_zarizeni'),
+    path('sklad/zarizeni/new/', lazy_view('ZarizeniCreateView'), name='create_zarizeni'),
+    path('sklad/zarizeni/<int:pk>/update/', lazy_view('ZarizeniUpdateView'), name='update_zarizeni'),    
+    path('sklad/poptavky/', lazy_view('PoptavkaListView'), name='poptavky'),
+    path('sklad/poptavky/<int:dodavatel_id>/create/', lazy_view('create_poptavka'), name='create_poptavka'),
+    path('sklad/poptavky/generate/', lazy_view('generate_reorders_view'), name='generate_reorders'),
+    path('sklad/poptavky/<int:pk>/update/', lazy_view('SkladUpdateView'), name='update_sklad'),
+    path('sklad/poptavky/<int:pk>/update_objednano/', lazy_view('SkladUpdateObjednanoView'), name='update_objednano_sklad'),
+    path('sklad/poptavky/<int:pk>/delete/', lazy_view('SkladDeleteView'), name='delete_sklad'),
+    path('sklad/poptavky/<int:pk>/detail/', lazy_view('PoptavkaDetailView'), name='detail_poptavky'),
+    path('sklad/poptavky/<int:pk>/poptavka_varianty/', lazy_view('PoptavkaVariantyListView'), name='poptavka_varianty'),
+    path('sklad/inventury/', lazy_view('InventuraListView'), name='inventury'),
+    path('sklad/inventury/new/', lazy_view('start_inventura_view'), name='start_inventura'),
+    path('sklad/inventury/<int:pk>/', lazy_view('InventuraDetailView'), name='detail_inventury'),
+    path('sklad/inventury/<int:pk>/count/', lazy_view('inventura_count_view'), name='count_inventura'),
+    path('sklad/inventury/<int:pk>/reconcile/', lazy_view('reconcile_inventura_view'), name='reconcile_inventura'),
+    path('sklad/import/', lazy_view('import_view'), name='import_dat'),
     path('account/', include('django.contrib.auth.urls')),
-    path('account/custom_password_change/', views.CustomPasswordChangeView.as_view(), name='custom_password_change'),
+    path('account/custom_password_change/', lazy_view('CustomPasswordChangeView'), name='custom_password_change'),
 ]
@@ -0,0 +1,258 @@
+import calendar
+import datetime
+import logging
+
+from django.db import transaction
+from django.db.models import F, Sum, Max
+from django.db.models.functions import Coalesce, TruncDate
+
+from .models import Sklad, AuditLog, AuditLogArchiv, StavSkladu
+
+logger = logging.getLogger(__name__)
+
+
+def movement_date_expression():
+    """
+    Výraz pro datum, ke kterému se pohyb v audit logu vztahuje: datum výdeje, u příjmu datum nákupu,
+    jinak den zápisu pohybu.
+    """
+    return Coalesce('datum_vydeje', 'datum_nakupu', TruncDate('cas_vytvoreni'))
+
+
+def movement_date(auditlog):
+    """
+    Datum, ke kterému se vztahuje jeden záznam audit logu (stejně jako `movement_date_expression`).
+    """
+    return auditlog.datum_pohybu()
+
+
+def nearest_checkpoint(datum):
+    """
+    Vrátí datum posledního snímku stavu skladu k danému datu (včetně), nebo None, pokud žádný není.
+    """
+    return StavSkladu.objects.filter(datum__lte=datum).aggregate(datum=Max('datum'))['datum']
+
+
+def stock_valuation(datum, evidencni_cisla=None):
+    """
+    Spočítá množství a hodnotu skladových položek ke konci daného dne.
+
+    - Vyjde z nejbližšího snímku (`StavSkladu`) k danému datu a připočte pohyby z audit logu
+      s datem po snímku až do daného data včetně.
+    - Bez snímku se přehrají všechny pohyby od začátku.
+    - Pohyby se čtou z audit logu i z archivu uzavřených roků jedním dotazem (UNION ALL),
+      archiv se omezí na roky mezi snímkem a daným datem.
+    - Volitelně se omezí na vybrané skladové položky (`evidencni_cisla`).
+
+    Vrací:
+    - Slovník {evidenční číslo: (množství, hodnota v EUR)} bez položek s nulovým stavem.
+    """
+    checkpoint = nearest_checkpoint(datum)
+
+    stav = {}
+    if checkpoint is not None:
+        snimek = StavSkladu.objects.filter(datum=checkpoint)
+        if evidencni_cisla is not None:
+            snimek = snimek.filter(evidencni_cislo__in=evidencni_cisla)
+        for pk, mnozstvi, hodnota in snimek.values_list('evidencni_cislo_id', 'mnozstvi', 'celkova_cena_eur'):
+            stav[pk] = (mnozstvi, hodnota)
+
+    def pohyby(queryset):
+        queryset = queryset.alias(datum_pohybu=movement_date_expression()).filter(datum_pohybu__lte=datum)
+        if evidencni_cisla is not None:
+            queryset = queryset.filter(evidencni_cislo__in=evidencni_cisla)
+        if checkpoint is not None:
+            queryset = queryset.filter(datum_pohybu__gt=checkpoint)
+        return queryset.values('evidencni_cislo').annotate(
+            zmena=Sum('zmena_mnozstvi'), hodnota=Sum('celkova_cena_eur')
+        ).order_by()
+
+    archiv = AuditLogArchiv.objects.filter(rok__lte=datum.year)
+    if checkpoint is not None:
+        archiv = archiv.filter(rok__gte=checkpoint.year)
+    delta = list(pohyby(AuditLog.objects.all()).union(pohyby(archiv), all=True))
+
+    # položka může mít řádek z audit logu i z archivu, součty se proto přičítají
+    for row in delta:
+        mnozstvi, hodnota = stav.get(row['evidencni_cislo'], (0, 0.0))
+        stav[row['evidencni_cislo']] = (mnozstvi + row['zmena'], hodnota + (row['hodnota'] or 0.0))
+
+    logger.debug(f'Ocenění skladu k {datum}: snímek {checkpoint}, položek s pohyby po snímku: {len(delta)}')
+    return {
+        pk: (mnozstvi, round(hodnota, 2))
+        for pk, (mnozstvi, hodnota) in stav.items()
+        if mnozstvi != 0 or round(hodnota, 2) != 0
+    }
+
+
+def stock_at(evidencni_cislo, datum):
+    """
+    Vrátí dvojici (množství, hodnota v EUR) jedné skladové položky ke konci daného dne.
+    """
+    return stock_valuation(datum, [evidencni_cislo]).get(evidencni_cislo, (0, 0.0))
+
+
+def valuation_rows(datum):
+    """
+    Sestaví řádky reportu ocenění skladu k danému datu doplněné o údaje skladových položek.
+
+    Vrací:
+    - Seznam slovníků seřazený podle evidenčního čísla.
+    """
+    stav = stock_valuation(datum)
+    polozky = Sklad.objects.filter(pk__in=stav).values(
+        'evidencni_cislo', 'interne_cislo', 'nazev_dilu', 'jednotky', 'ucetnictvi'
+    ).order_by('evidencni_cislo')
+    return [
+        {**polozka, 'mnozstvi': stav[polozka['evidencni_cislo']][0], 'celkova_cena_eur': stav[polozka['evidencni_cislo']][1]}
+        for polozka in polozky
+    ]
+
+
+def create_checkpoint(datum):
+    """
+    Uloží snímek stavu skladu ke konci daného dne, existující snímek ke stejnému dni nahradí.
+
+    Vrací:
+    - Počet uložených řádků snímku.
+    """
+    stav = stock_valuation(datum)
+    with transaction.atomic():
+        StavSkladu.objects.filter(datum=datum).delete()
+        StavSkladu.objects.bulk_create([
+            StavSkladu(evidencni_cislo_id=pk, datum=datum, mnozstvi=mnozstvi, celkova_cena_eur=hodnota)
+            for pk, (mnozstvi, hodnota) in stav.items()
+        ], batch_size=500)
+    logger.info(f'Uložen snímek stavu skladu k {datum}, počet položek: {len(stav)}')
+    return len(stav)
+
+
+def rebuild_item_checkpoints(evidencni_cislo, datum):
+    """
+    Přepočítá řádky jedné položky ve snímcích od daného data dál přehráním všech jejích pohybů
+    z audit logu i archivu, ostatní položky snímků se nemění.
+
+    Používá se jen tehdy, když není známý původní stav upraveného pohybu (viz `update_checkpoints`).
+    """
+    datumy = sorted(StavSkladu.objects.filter(datum__gte=datum).order_by().values_list('datum', flat=True).distinct())
+    if not datumy:
+        return
+
+    def pohyby(queryset):
+        return queryset.filter(evidencni_cislo=evidencni_cislo).annotate(
+            datum_pohybu=movement_date_expression()
+        ).filter(datum_pohybu__lte=datumy[-1]).values('datum_pohybu').annotate(
+            zmena=Sum('zmena_mnozstvi'), hodnota=Sum('celkova_cena_eur')
+        ).values_list('datum_pohybu', 'zmena', 'hodnota').order_by()
+
+    rows = sorted(pohyby(AuditLog.objects.all()).union(pohyby(AuditLogArchiv.objects.all()), all=True),
+                  key=lambda row: row[0])
+    snimky = []
+    mnozstvi, hodnota, index = 0, 0.0, 0
+    for den in datumy:
+        while index < len(rows) and rows[index][0] <= den:
+            mnozstvi += rows[index][1] or 0
+            hodnota += rows[index][2] or 0.0
+            index += 1
+        if mnozstvi != 0 or round(hodnota, 2) != 0:
+            snimky.append(StavSkladu(evidencni_cislo_id=evidencni_cislo, datum=den, mnozstvi=mnozstvi,
+                                     celkova_cena_eur=round(hodnota, 2)))
+
+    with transaction.atomic():
+        StavSkladu.objects.filter(evidencni_cislo_id=evidencni_cislo, datum__gte=datum).delete()
+        StavSkladu.objects.bulk_create(snimky)
+    logger.info(f'Přepočítány snímky stavu skladu položky {evidencni_cislo} od {datum}')
+
+
+def adjust_checkpoints(evidencni_cislo, datum, zmena_mnozstvi, celkova_cena_eur):
+    """
+    Připočte změnu množství a hodnoty jedné položky ke všem snímkům od daného data dál.
+
+    - Existující řádky položky se upraví jedním UPDATE, snímkům bez řádku položky (nulový stav
+      ke dni snímku) se řádek založí a řádky s nulovým stavem se smažou.
+    - Bez snímků od daného data stačí jeden dotaz.
+    """
+    if not zmena_mnozstvi and not celkova_cena_eur:
+        return
+    datumy = set(StavSkladu.objects.filter(datum__gte=datum).order_by().values_list('datum', flat=True).distinct())
+    if not datumy:
+        return
+
+    with transaction.atomic():
+        radky = StavSkladu.objects.filter(evidencni_cislo_id=evidencni_cislo, datum__gte=datum)
+        chybejici = datumy - set(radky.values_list('datum', flat=True))
+        radky.update(
+            mnozstvi=F('mnozstvi') + zmena_mnozstvi, celkova_cena_eur=F('celkova_cena_eur') + celkova_cena_eur
+        )
+        StavSkladu.objects.bulk_create([
+            StavSkladu(evidencni_cislo_id=evidencni_cislo, datum=den, mnozstvi=zmena_mnozstvi, celkova_cena_eur=celkova_cena_eur)
+            for den in sorted(chybejici)
+        ])
+        radky.filter(mnozstvi=0, celkova_cena_eur__gt=-0.005, celkova_cena_eur__lt=0.005).delete()
+    logger.debug(f'Upraveny snímky stavu skladu položky {evidencni_cislo} od {datum} o {zmena_mnozstvi}')
+
+
+def update_checkpoints(auditlog, created=False, deleted=False):
+    """
+    Promítne zápis, úpravu nebo smazání pohybu do snímků od data pohybu dál podle rozdílu proti
+    stavu načtenému z databáze (`AuditLog.checkpoint_stav`).
+
+    - Pokud původní stav upraveného pohybu není známý, přepočítají se ze záznamů pohybů jen řádky
+      snímků dotčené položky od data pohybu dál.
+    """
+    novy = None if deleted else auditlog.current_checkpoint_stav()
+    if created:
+        puvodni = None
+    elif deleted:
+        puvodni = getattr(auditlog, 'checkpoint_stav', None) or auditlog.current_checkpoint_stav()
+    else:
+        puvodni = getattr(auditlog, 'checkpoint_stav', None)
+        if puvodni is None:
+            rebuild_item_checkpoints(novy[0], novy[1])
+            auditlog.checkpoint_stav = novy
+            return
+
+    if puvodni != novy:
+        if puvodni is not None:
+            evidencni_cislo, datum, zmena_mnozstvi, celkova_cena_eur = puvodni
+            adjust_checkpoints(evidencni_cislo, datum, -zmena_mnozstvi, -(celkova_cena_eur or 0.0))
+        if novy is not None:
+            evidencni_cislo, datum, zmena_mnozstvi, celkova_cena_eur = novy
+            adjust_checkpoints(evidencni_cislo, datum, zmena_mnozstvi, celkova_cena_eur or 0.0)
+    auditlog.checkpoint_stav = novy
+
+
+SNAPSHOT_PERIODS = ('daily', 'monthly')
+
+
+def is_month_end(datum):
+    return datum.day == calendar.monthrange(datum.year, datum.month)[1]
+
+
+def period_ends(od, do, period='monthly'):
+    """
+    Vrátí konce období ('daily' = každý den, 'monthly' = poslední den měsíce) v rozsahu od–do včetně.
+    """
+    datumy = []
+    datum = od
+    while datum <= do:
+        if period == 'daily' or is_month_end(datum):
+            datumy.append(datum)
+        datum += datetime.timedelta(days=1)
+    return datumy
+
+
+def prune_checkpoints(before):
+    """
+    Smaže denní snímky starší než dané datum, měsíční snímky (k poslednímu dni měsíce) ponechá.
+
+    Vrací:
+    - Počet smazaných řádků snímků.
+    """
+    datumy = [
+        datum for datum in StavSkladu.objects.filter(datum__lt=before).values_list('datum', flat=True).distinct()
+        if not is_month_end(datum)
+    ]
+    deleted, _ = StavSkladu.objects.filter(datum__in=datumy).delete()
+    logger.info(f'Smazáno {deleted} řádků denních snímků stavu skladu starších než {before}')
+    return deleted
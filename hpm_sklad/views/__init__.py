@@ -0,0 +1,118 @@
+"""
+Views aplikace rozdělené podle oblastí:
+
+- `stock`: skladové položky.
+- `movements`: příjem, výdej, detail pohybu, event stream změn skladu a kanál změn audit logu.
+- `reports`: audit log s exporty spotřeby a grafy nákladů, ocenění skladu, nepohyblivé zásoby.
+- `suppliers`: dodavatelé a varianty.
+- `equipment`: zařízení.
+- `requests`: poptávky.
+- `stocktake`: inventury.
+- `imports`: hromadný import ze souborů CSV a XLSX.
+- `common`: úvodní stránka a změna hesla.
+
+Moduly se načítají až při prvním použití, takže proces (management příkaz, GraphQL endpoint
+nebo worker) importuje jen ty views, na které skutečně přijde požadavek.
+"""
+import importlib
+
+VIEW_MODULES = {
+    'home_view': 'common',
+    'CustomPasswordChangeView': 'common',
+    'SkladListView': 'stock',
+    'SkladCreateView': 'stock',
+    'SkladUpdateView': 'stock',
+    'SkladUpdateObjednanoView': 'stock',
+    'SkladDeleteView': 'stock',
+    'SkladDetailView': 'stock',
+    'SkladFragmentView': 'stock',
+    'stock_events_view': 'movements',
+    'auditlog_feed_view': 'movements',
+    'receipt_form_view': 'movements',
+    'dispatch_form_view': 'movements',
+    'AuditLogDetailView': 'movements',
+    'AuditLogFragmentView': 'movements',
+    'AuditLogShowView': 'movements',
+    'AuditLogListView': 'reports',
+    'StockValuationView': 'reports',
+    'DeadStockListView': 'reports',
+    'VariantyCreateView': 'suppliers',
+    'VariantyWithDodavatelCreateView': 'suppliers',
+    'VariantyUpdateView': 'suppliers',
+    'DodavateleListView': 'suppliers',
+    'DodavateleCreateView': 'suppliers',
+    'DodavateleUpdateView': 'suppliers',
+    'DodavateleDeleteView': 'suppliers',
+    'DodavateleDetailView': 'suppliers',
+    'DodavateleFragmentView': 'suppliers',
+    'ZarizeniListView': 'equipment',
+    'ZarizeniCreateView': 'equipment',
+    'ZarizeniUpdateView': 'equipment',
+    'ZarizeniDetailView': 'equipment',
+    'ZarizeniFragmentView': 'equipment',
+    'create_poptavka': 'requests',
+    'generate_reorders_view': 'requests',
+    'PoptavkaListView': 'requests',
+    'PoptavkaDetailView': 'requests',
+    'PoptavkaVariantyListView': 'requests',
+    'InventuraListView': 'stocktake',
+    'InventuraDetailView': 'stocktake',
+    'start_inventura_view': 'stocktake',
+    'inventura_count_view': 'stocktake',
+    'reconcile_inventura_view': 'stocktake',
+    'import_view': 'imports',
+}
+
+# Views, které jsou asynchronní; Django je musí poznat ještě před načtením modulu.
+ASYNC_VIEWS = {'stock_events_view'}
+
+__all__ = list(VIEW_MODULES)
+
+
+def __getattr__(name):
+    """
+    Zpřístupní view pod původní cestou `hpm_sklad.views.<název>` a modul s ním načte až teď.
+    """
+    if name not in VIEW_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f'.{VIEW_MODULES[name]}', __name__)
+    return getattr(module, name)
+
+
+def __dir__():
+    return sorted([*globals(), *VIEW_MODULES])
+
+
+def lazy_view(name, **initkwargs):
+    """
+    Vrátí view pro URLconf, které načte svůj modul až při prvním požadavku.
+
+    Parametry:
+    - name: Název view z `VIEW_MODULES`.
+    - initkwargs: Argumenty pro `as_view()` u class-based views.
+
+    Vrací:
+    - Funkci view (synchronní nebo asynchronní podle skutečného view).
+    """
+    if name not in VIEW_MODULES:
+        raise ValueError(f"Neznámé view: {name}")
+
+    resolved = None
+
+    def get_view():
+        nonlocal resolved
+        if resolved is None:
+            view = __getattr__(name)
+            resolved = view.as_view(**initkwargs) if hasattr(view, 'as_view') else view
+        return resolved
+
+    if name in ASYNC_VIEWS:
+        async def view(request, *args, **kwargs):
+            return await get_view()(request, *args, **kwargs)
+    else:
+        def view(request, *args, **kwargs):
+            return get_view()(request, *args, **kwargs)
+
+    view.__name__ = view.__qualname__ = name
+    view.__module__ = f'{__name__}.{VIEW_MODULES[name]}'
+    return view
@@ -0,0 +1,55 @@
+from django.shortcuts import render
+from django.urls import reverse_lazy
+from django.contrib.auth.views import PasswordChangeView
+
+import logging
+
+from ..kpi import kpi_values
+
+logger = logging.getLogger(__name__)
+
+
+def home_view(request):
+    """
+    Zobrazuje úvodní stránku aplikace.
+    
+    Parameters:
+    - request: HTTP request objekt.
+
+    Vrací:
+    - render: HTML stránku `home.html` s aktuálním přihlášeným uživatelem v kontextu,
+      přihlášenému uživateli i s ukazateli skladu (`kpi`, viz `kpi.kpi_values`).
+    """
+    context = {'db_table': 'home'}
+    if request.user.is_authenticated:
+        context['kpi'] = kpi_values()
+    logger.debug(f'Zahájena view home_view s uživatelem: {request.user}')
+    return render(request, "hpm_sklad/home.html", context)
+
+
+class CustomPasswordChangeView(PasswordChangeView):
+    """
+    Změní heslo uživatele pomocí formuláře.
+
+    Template:
+    - `password_change.html`
+
+    Po úspěšné změně:
+    - Přesměruje uživatele na stránku home.
+    """
+    success_url = reverse_lazy("home")  
+    template_name = "registration/password_change.html"
+
+    def form_valid(self, form):
+        logger.info(f"Uživatel {self.request.user} úspěšně změnil své heslo.")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"Uživatel {self.request.user} odeslal neplatný formulář pro změnu hesla.")
+        logger.debug(f"Chyby formuláře při změně hesla: {form.errors}")
+        return super().form_invalid(form)
+
+    def dispatch(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel stránku pro změnu hesla.")
+        return super().dispatch(request, *args, **kwargs)
+  
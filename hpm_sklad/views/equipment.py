@@ -0,0 +1,206 @@
+from django.shortcuts import get_object_or_404
+from django.urls import reverse_lazy
+from django.views.generic import ListView
+from django.views.generic.detail import DetailView
+from django.views.generic.edit import CreateView, UpdateView
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.db.models import Q
+from django.utils.functional import SimpleLazyObject
+
+import logging
+
+from ..models import Zarizeni
+from ..forms import ZarizeniCreateForm, ZarizeniUpdateForm
+from ..detail import DetailSchemaMixin, DetailFragmentMixin, DetailPanelMixin
+from ..equipment_stats import equipment_dashboard
+
+logger = logging.getLogger(__name__)
+
+
+class ZarizeniListView(LoginRequiredMixin, DetailPanelMixin, ListView):
+    """
+    Zobrazuje seznam zařízení.
+
+    Template:
+    - `zarizeni.html`
+
+    Kontext:
+    - Seznam zařízení a možnosti filtrování.
+    """
+    model = Zarizeni
+    detail_panel_url_name = 'fragment_zarizeni'
+    template_name = 'hpm_sklad/zarizeni.html'
+    paginate_by = 24
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává další data do kontextu pro zobrazení v šabloně.
+
+        Vrací:
+        - Kontext obsahující filtry, řazení a aktuálně vybraného zařízení.
+        """
+        context = super().get_context_data(**kwargs)
+        selected_id = self.request.GET.get('selected', None)
+
+        if selected_id:
+            context['selected_item'] = get_object_or_404(Zarizeni, id=selected_id)
+        else:
+            context['selected_item'] = None
+
+        context.update({
+            'db_table': 'zarizeni',
+            'sort': self.request.GET.get('sort', 'id'),
+            'order': self.request.GET.get('order', 'down'),
+            'query': self.request.GET.get('query', ''),
+        })
+
+        return context
+
+    def get_queryset(self):
+        """
+        Získává seznam zařízení na základě vyhledávání a filtrování.
+
+        Vrací:
+        - queryset: Filtrovaný a seřazený seznam zařízení.
+        """
+        queryset = Zarizeni.objects.all()
+        query = self.request.GET.get('query', '')
+        sort = self.request.GET.get('sort', 'id')
+        order = self.request.GET.get('order', 'down')
+
+        if query:
+            queryset = queryset.filter(
+                Q(kod_zarizeni__icontains=query) | Q(typ_zarizeni__icontains=query)
+            )
+
+        if order == 'down':
+            sort = f"-{sort}"
+            
+        queryset = queryset.order_by(sort)
+
+        return queryset
+    
+
+class ZarizeniCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
+    """
+    Vytváří nové zařízení.
+
+    - Povoleno pouze uživatelům s oprávněním 'add_zarizeni'.
+
+    Template:
+    - `create_zarizeni.html`
+
+    Po úspěšném vytvoření:
+    - Přesměruje uživatele zpět na seznam zařízení.
+    """
+    model = Zarizeni
+    form_class = ZarizeniCreateForm
+    template_name = 'hpm_sklad/create_zarizeni.html'
+    success_url = reverse_lazy('zarizeni')
+    permission_required = 'hpm_sklad.add_zarizeni'
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro vytvoření nového zařízení")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST požadavek pro vytvoření nového zařízení")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při vytváření nového zařízení: {e}")
+            raise
+
+    def form_valid(self, form):
+        self.object = form.save()
+        logger.info(f"{self.request.user} vytvořil nové zařízení: {self.object}")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro vytvoření zařízení.")
+        logger.debug(f"Formulářové chyby: {form.errors}")
+        return super().form_invalid(form)
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} k vytvoření zařízení')
+        return super().handle_no_permission()  
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        selected_id = self.request.GET.get('pk', None)
+        if selected_id:
+            context['zarizeni'] = get_object_or_404(Zarizeni, id=selected_id)
+            logger.debug(f"Přidáno zařízení do kontextu: ID {selected_id}")
+        return context       
+
+
+class ZarizeniUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
+    """
+    Aktualizuje existujícího zařízení.
+
+    - Povoleno pouze uživatelům s oprávněním 'change_zarizeni'.
+
+    Template:
+    - `update_zarizeni.html`
+
+    Po úspěšné aktualizaci:
+    - Přesměruje uživatele zpět na seznam zařízení.
+    """
+    model = Zarizeni
+    form_class = ZarizeniUpdateForm    
+    template_name = 'hpm_sklad/update_zarizeni.html'
+    permission_required = 'hpm_sklad.change_zarizeni'
+    success_url = reverse_lazy('zarizeni')
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro úpravu zařízení #{kwargs.get('pk')}")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST pro úpravu zařízení #{kwargs.get('pk')}")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při zpracování POST požadavku: {e}")
+            raise    
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} ke stránce pro úpravu zařízení')
+        return super().handle_no_permission()
+    
+    def form_valid(self, form):
+        zarizeni = form.save(commit=False)
+        logger.info(f"{self.request.user} odeslal platný formulář a uložil změny pro zařízení: {zarizeni}")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro úpravu zařízení #{self.get_object().pk}")
+        logger.debug(f"Form errors: {form.errors}")
+        return super().form_invalid(form)
+
+
+class ZarizeniDetailView(LoginRequiredMixin, DetailSchemaMixin, DetailView):
+    """
+    Zobrazuje detailní informace o zařízení.
+
+    Template:
+    - `detail_zarizeni.html`
+
+    Kontext:
+    - Zahrnuje detailní informace o zařízení, kromě vztahů many to many -sklad a many to one - skladzarizeni.
+    - `spotreba`: Přehled spotřeby dílů zařízení z předpočítaných souhrnů (viz `equipment_dashboard`),
+      načtený v konstantním čase bez ohledu na počet pohybů v audit logu až při vykreslení.
+    """
+    model = Zarizeni
+    template_name = 'hpm_sklad/detail_zarizeni.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['spotreba'] = SimpleLazyObject(lambda: equipment_dashboard(self.object))
+        return context
+
+
+class ZarizeniFragmentView(DetailFragmentMixin, ZarizeniDetailView):
+    """
+    Fragment detailu zařízení pro pravý panel seznamu zařízení (bez přehledu spotřeby).
+    """
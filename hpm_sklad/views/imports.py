@@ -0,0 +1,62 @@
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+
+import logging
+
+from ..forms import ImportForm
+from ..imports import read_table, import_rows, write_error_file, ImportFileError
+
+logger = logging.getLogger(__name__)
+
+IMPORT_PERMISSIONS = {
+    'sklad': 'hpm_sklad.add_sklad',
+    'dodavatele': 'hpm_sklad.add_dodavatele',
+    'zarizeni': 'hpm_sklad.add_zarizeni',
+}
+
+
+@login_required
+def import_view(request):
+    """
+    Hromadný import skladových položek, dodavatelů nebo zařízení ze souboru CSV nebo XLSX.
+
+    - Soubor se čte po řádcích, každý řádek se ověří a platné řádky se uloží po dávkách.
+    - V režimu ověření se zobrazí jen report chyb a nic se neuloží.
+    - Chybné řádky lze stáhnout jako CSV s popisem chyb, opravit a naimportovat znovu.
+
+    Parametry (POST):
+    - Pole formuláře `ImportForm` (typ importu, soubor, ověření, chybový soubor).
+
+    Template:
+    - `import.html`
+
+    Permision:
+    - Import vyžaduje oprávnění k přidání importovaných záznamů (např. 'add_sklad').
+    """
+    form = ImportForm(request.POST or None, request.FILES or None)
+    result = None
+    if request.method == 'POST' and form.is_valid():
+        kind = form.cleaned_data['typ']
+        if not request.user.has_perm(IMPORT_PERMISSIONS[kind]):
+            form.add_error('typ', "Nemáte oprávnění k tomuto importu.")
+        else:
+            soubor = form.cleaned_data['soubor']
+            logger.info(f"{request.user} spustil import {kind} ze souboru {soubor.name}")
+            try:
+                result = import_rows(kind, read_table(soubor, soubor.name), dry_run=form.cleaned_data['dry_run'])
+            except ImportFileError as e:
+                form.add_error('soubor', str(e))
+            else:
+                if result.errors and form.cleaned_data['chybovy_soubor']:
+                    response = HttpResponse(content_type='text/csv')
+                    response['Content-Disposition'] = f'attachment; filename="chyby_importu_{kind}.csv"'
+                    write_error_file(result, response)
+                    return response
+
+    context = {
+        'db_table': 'import',
+        'form': form,
+        'result': result,
+    }
+    return render(request, 'hpm_sklad/import.html', context)
@@ -0,0 +1,328 @@
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseBadRequest, StreamingHttpResponse, Http404
+from django.shortcuts import render, redirect, get_object_or_404
+from django.views.generic import ListView
+from django.views.generic.detail import DetailView
+from django.contrib.auth.decorators import login_required, permission_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+
+import asyncio
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+
+from ..models import Sklad, AuditLog, AuditLogArchiv, Dodavatele, Varianty
+from ..forms import SkladReceiptForm, SkladDispatchForm, AuditLogReceiptForm, AuditLogDispatchForm
+from ..movements import record_receipt, record_dispatch
+from ..archive import combine_auditlogs
+from ..detail import DetailSchemaMixin, DetailFragmentMixin
+from ..events import latest_stock_event_id, stock_events_since, format_sse
+from ..feed import changes_since, to_ndjson, to_compact_json, FEED_DEFAULT_LIMIT
+
+logger = logging.getLogger(__name__)
+
+STOCK_EVENTS_KEEPALIVE = 15  # sekundy mezi keepalive komentáři event streamu
+STOCK_EVENTS_POLL = 2  # sekundy mezi dotazy na nové pohyby v audit logu
+
+
+async def stock_events_view(request):
+    """
+    Event stream (server-sent events) se změnami stavu skladových položek.
+
+    - Povoleno pouze přihlášeným uživatelům.
+    - Po každém zapsaném pohybu pošle událost s evidenčním číslem, novým množstvím a příznakem pod minimem.
+    - Nové pohyby čte z audit logu (kurzor na ID záznamu), takže funguje i při více workerech.
+    - Klient se po výpadku spojení dorovná podle hlavičky `Last-Event-ID`, nový klient začíná
+      od posledního zapsaného pohybu.
+    - Stream vyžaduje běh pod ASGI serverem (`sklad.asgi:application`).
+
+    Parameters:
+    - request: HTTP request objekt.
+
+    Vrací:
+    - StreamingHttpResponse: Nekonečný stream typu `text/event-stream`.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponseForbidden()
+
+    try:
+        last_event_id = int(request.headers['Last-Event-ID'])
+    except (KeyError, ValueError):
+        last_event_id = await sync_to_async(latest_stock_event_id)()
+    logger.debug(f'{user} otevřel event stream změn skladu od události {last_event_id}')
+
+    async def event_stream():
+        sent_id = last_event_id
+        last_sent = time.monotonic()
+        while True:
+            events = await sync_to_async(stock_events_since)(sent_id)
+            for event in events:
+                sent_id = event[0]
+                yield format_sse(event)
+            if events:
+                last_sent = time.monotonic()
+                continue
+            if time.monotonic() - last_sent >= STOCK_EVENTS_KEEPALIVE:
+                last_sent = time.monotonic()
+                yield ": keepalive\n\n"
+            await asyncio.sleep(STOCK_EVENTS_POLL)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+def auditlog_feed_view(request):
+    """
+    Kanál změn audit logu pro navazující systémy (ERP, účetnictví).
+
+    - Povoleno pouze přihlášeným uživatelům.
+    - Vrací dávku záznamů s ID větším než kurzor, odběratel pokračuje s vráceným high-water mark.
+    - High-water mark a příznak dalších záznamů jsou v hlavičkách `X-High-Water-Mark` a `X-Has-More`,
+      u formátu `json` také v těle odpovědi.
+
+    Parametry (GET):
+    - after: ID posledního již staženého záznamu (výchozí 0).
+    - limit: Maximální počet záznamů v dávce (výchozí 1000, nejvýše 5000).
+    - format: `ndjson` (výchozí, jeden záznam na řádek) nebo `json` (kompaktní, řádky jako pole hodnot).
+
+    Vrací:
+    - HttpResponse s dávkou záznamů.
+    """
+    try:
+        after = int(request.GET.get('after', 0))
+        limit = int(request.GET.get('limit', FEED_DEFAULT_LIMIT))
+    except ValueError:
+        return HttpResponseBadRequest("Parametry after a limit musí být celá čísla.")
+    output_format = request.GET.get('format', 'ndjson')
+    if output_format not in ('ndjson', 'json'):
+        return HttpResponseBadRequest("Parametr format musí být ndjson nebo json.")
+
+    rows, high_water_mark, has_more = changes_since(after, limit)
+
+    if output_format == 'json':
+        response = HttpResponse(to_compact_json(rows, high_water_mark, has_more), content_type='application/json')
+    else:
+        response = HttpResponse(to_ndjson(rows), content_type='application/x-ndjson')
+    response['X-High-Water-Mark'] = str(high_water_mark)
+    response['X-Has-More'] = 'true' if has_more else 'false'
+    response['Cache-Control'] = 'no-store'
+    logger.debug(f'{request.user} stáhl kanál změn audit logu od ID {after}: {len(rows)} záznamů')
+    return response
+
+
+@login_required
+@permission_required('hpm_sklad.change_sklad', 'hpm_sklad.add_auditlog', raise_exception=True)
+def receipt_form_view(request, pk):
+    """
+    Zpracovává příjem položky na sklad.
+
+    Parameters:
+    - request: HTTP request objekt.
+    - pk: Primární klíč položky `Sklad`, která je příjímána.
+
+    POST:
+    - Zpracuje formulář příjmu položky na sklad (`SkladReceiptForm`) a audit logu (`AuditLogReceiptForm`).
+    - Aktualizuje stav skladové položky a zaznamená operaci do audit logu.
+    - Přesměruje uživatele na vytvoření varianty, pokud neexistuje varianta pro daného dodavatele.
+
+    GET:
+    - Zobrazí prázdné formuláře pro příjem položky a audit log.
+
+    Vrací:
+    - render: HTML stránku `receipt_audit_log.html` s formuláři a daty.
+    """    
+    logger.debug(f'Zahájena view receipt_form_view pro příjem na skladovou položku pk={pk}, metoda={request.method}')
+
+    sklad_instance = get_object_or_404(Sklad, pk=pk)
+    logger.debug(f'Nalezena instance skladové položky: {sklad_instance}')
+
+    if request.method == 'POST':
+        logger.debug('Request typu POST s vyplněným formulářem pro příjem zboží')
+        sklad_movement_form = SkladReceiptForm(request.POST, instance=sklad_instance)
+        auditlog_receipt_form = AuditLogReceiptForm(request.POST)
+        if sklad_movement_form.is_valid() and auditlog_receipt_form.is_valid():
+            logger.info(f'Formuláře skladu i auditlogu jsou platné, pokračuje se s uložením dat')
+
+            try:
+                updated_sklad, created_auditlog = record_receipt(
+                    sklad_instance, sklad_movement_form, auditlog_receipt_form, request.user
+                )
+
+                # Získání dodavatele z formuláře
+                dodavatel_object = Dodavatele.objects.get(dodavatel=updated_sklad.dodavatel)
+
+                # Kontrola, zda varianta existuje
+                varianty = Varianty.objects.filter(sklad=sklad_instance)
+                varianta_dodavatele = [var.dodavatel for var in varianty]
+            
+                if not varianty or dodavatel_object not in varianta_dodavatele:
+                    logger.info(f'Přesměrování na vytvoření nové varianty pro dodavatele {dodavatel_object}')
+                    return redirect('create_varianty_with_dodavatel', pk=pk, dodavatel=dodavatel_object.id)
+
+                logger.debug(f'Varianta položky s dodavatelem: {dodavatel_object} už existuje')                            
+                return redirect('audit_log')
+            
+            except Exception as e:
+                logger.exception(f'Chyba při ukládání příjmu do skladu nebo auditlogu: {e}')
+                raise
+        
+        else:
+            logger.warning("Formuláře jsou neplatné")
+            logger.debug(f"Errors (sklad): {sklad_movement_form.errors}")
+            logger.debug(f"Errors (auditlog): {auditlog_receipt_form.errors}")
+        
+    else: # GET 
+        logger.debug('Zobrazuji formuláře pro příjem skladové položky pro GET požadavek')
+        sklad_movement_form = SkladReceiptForm(instance=sklad_instance)
+        auditlog_receipt_form = AuditLogReceiptForm()
+
+    context = {
+        'sklad_movement_form': sklad_movement_form,
+        'auditlog_receipt_form': auditlog_receipt_form,
+        'object': sklad_instance,
+    }
+    return render(request, 'hpm_sklad/receipt_audit_log.html', context)
+
+
+@login_required
+@permission_required('hpm_sklad.change_sklad', 'hpm_sklad.add_auditlog', raise_exception=True)
+def dispatch_form_view(request, pk):
+    """
+    Zpracovává výdej položky ze skladu.
+
+    Parameters:
+    - request: HTTP request objekt.
+    - pk: Primární klíč položky `Sklad`, která je vydávána.
+
+    POST:
+    - Zpracuje formuláře pro výdej položky na skladě (`SkladDispatchForm`) a audit logu (`AuditLogDispatchForm`).
+    - Aktualizuje stav skladové položky a zaznamená operaci do audit logu.
+    
+    GET:
+    - Zobrazí prázdné formuláře pro výdej položky a audit log.
+
+    Vrací:
+    - render: HTML stránku `dispatch_audit_log.html` s formuláři a daty.
+    """
+    logger.debug(f'Zahájena view dispatch_form_view pro výdej skladové položky pk={pk}, metoda={request.method}')
+
+    sklad_instance = get_object_or_404(Sklad, pk=pk)
+    logger.debug(f'Nalezena instance skladové položky: {sklad_instance}')
+
+    if request.method == 'POST':
+        logger.debug('Request typu POST s vyplněným formulářem pro výdej zboží')        
+        sklad_movement_form = SkladDispatchForm(request.POST, instance=sklad_instance)
+        auditlog_dispatch_form = AuditLogDispatchForm(request.POST, max_mnozstvi=sklad_instance.mnozstvi, zarizeni=sklad_instance.zarizeni.all())
+
+        if sklad_movement_form.is_valid() and auditlog_dispatch_form.is_valid():
+            logger.info('Formuláře jsou platné, pokračuje se v ukládání dat')
+            
+            try:
+                record_dispatch(sklad_instance, sklad_movement_form, auditlog_dispatch_form, request.user)
+
+                return redirect('audit_log')
+            
+            except Exception as e:
+                logger.exception(f'Chyba při ukládání výdeje do skladu nebo auditlogu: {e}')
+                raise
+            
+        else:
+            logger.warning("Formuláře jsou neplatné")
+            logger.debug(f"Errors (sklad): {sklad_movement_form.errors}")
+            logger.debug(f"Errors (auditlog): {auditlog_dispatch_form.errors}")           
+                   
+    else: # GET 
+        logger.debug('Zobrazuji formuláře pro GET požadavek pro výdej položky')          
+        sklad_movement_form = SkladDispatchForm(instance=sklad_instance)
+        auditlog_dispatch_form = AuditLogDispatchForm(max_mnozstvi=sklad_instance.mnozstvi, zarizeni=sklad_instance.zarizeni.all())
+
+    context = {
+        'sklad_movement_form': sklad_movement_form,
+        'auditlog_dispatch_form': auditlog_dispatch_form,
+        'object': sklad_instance,
+    }
+    return render(request, 'hpm_sklad/dispatch_audit_log.html', context)
+
+
+class AuditLogDetailView(LoginRequiredMixin, DetailSchemaMixin, DetailView):
+    """
+    Zobrazuje detailní informace o záznamu v audit logu.
+
+    - Záznam, který už v audit logu není, se hledá v archivu (archivované záznamy mají původní ID).
+
+    Template:
+    - `detail_audit_log.html`
+    
+    Kontext:
+    - Detaily vybraného záznamu v audit logu.
+    """
+    model = AuditLog
+    template_name = 'hpm_sklad/detail_audit_log.html'
+
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            if queryset is not None:
+                raise
+            self.model = AuditLogArchiv
+            return super().get_object()
+
+
+class AuditLogFragmentView(DetailFragmentMixin, AuditLogDetailView):
+    """
+    Fragment detailu záznamu audit logu pro pravý panel seznamu pohybů.
+    """
+
+
+class AuditLogShowView(LoginRequiredMixin, ListView):
+    """
+    Zobrazuje omezený seznam záznamů audit logu pro vybranou položku skladu.
+
+    - Povoleno pouze přihlášeným uživatelům.
+    - Pohyby se načítají z audit logu i z archivu uzavřených roků.
+
+    Template:
+    - `show_audit_log.html`
+
+    Kontext:
+    - Zahrnuje audit logy pro vybranou položku skladu a informaci o tom, zda existuje více než 22 záznamů.
+    """    
+    model = AuditLog
+    template_name = 'hpm_sklad/show_audit_log.html' 
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává do kontextu aktuální položku skladu a informaci, zda existuje více než 22 záznamů.
+
+        Vrací:
+        - Kontext obsahující zvolený záznam skladu a stav, zda existuje více položek než 22.
+        """
+        context = super().get_context_data(**kwargs)
+        selected_id = self.request.GET.get('pk', None)
+        context['object'] = get_object_or_404(Sklad, pk=selected_id)
+        context['more_items'] = self.filtered_count > 22
+        return context    
+
+    def get_queryset(self):
+        """
+        Získává omezený seznam audit logů podle vybrané položky skladu.
+
+        - Pokud je v URL přítomný primární klíč (`pk`), filtrace proběhne podle evidenčního čísla (`evidencni_cislo_id`).
+        - Omezí počet vrácených záznamů na 22.
+
+        Vrací:
+        - queryset: Omezený seznam audit logů pro vybranou položku skladu.
+        """
+        querysets = [AuditLog.objects.all(), AuditLogArchiv.objects.all()]
+        selected_id = self.request.GET.get('pk', None)
+        if selected_id:
+            querysets = [queryset.filter(evidencni_cislo_id=selected_id) for queryset in querysets]
+        queryset = combine_auditlogs(querysets, ['-id'])
+        self.filtered_count = queryset.count()
+        return queryset[:22]
+    
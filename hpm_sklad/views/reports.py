@@ -0,0 +1,499 @@
+from django.http import HttpResponse, FileResponse
+from django.views.generic import ListView, TemplateView
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+import csv
+import datetime
+import logging
+import tempfile
+
+from ..models import Sklad, AuditLog
+from ..detail import DetailPanelMixin
+from ..valuation import valuation_rows, nearest_checkpoint
+from ..archive import auditlog_models, combine_auditlogs, find_auditlog, grouped_sums
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogListView(LoginRequiredMixin, DetailPanelMixin, ListView):
+    """
+    Zobrazuje seznam záznamů audit logu.
+
+    - Povoleno pouze přihlášeným uživatelům.
+    - Umožňuje stránkování a export do CSV nebo grafu.
+    - Bez zvoleného roku a pro archivované roky se záznamy načítají z audit logu i z archivu
+      jako jeden seřazený výběr (`combine_auditlogs`), novější roky jen z audit logu.
+
+    Template:
+    - `audit_log.html`
+
+    Kontext:
+    - Seznam záznamů logu, filtry a řazení.
+    """
+    model = AuditLog
+    detail_panel_url_name = 'fragment_audit_log'
+    template_name = 'hpm_sklad/audit_log.html' 
+    paginate_by = 24
+    export_csv = False
+    export_parquet = False
+    graph = False
+    graph_type_of_maintenance = False
+    export_consumption_to_csv = False
+    export_consumption_to_pdf = False
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává další data do kontextu pro zobrazení v šabloně.
+
+        Vrací:
+        - Kontext obsahující filtry, roky a další informace.
+        """
+        context = super().get_context_data(**kwargs)
+        selected_id = self.request.GET.get('selected', None)
+
+        if selected_id:
+            context['selected_item'] = find_auditlog(selected_id)
+        else:
+            context['selected_item'] = None
+
+        current_year = datetime.datetime.now().year
+        context['years'] = range(current_year, 2023, -1)
+
+        context.update({
+            'db_table': 'audit_log',
+            'sort': self.request.GET.get('sort', 'id'),
+            'order': self.request.GET.get('order', 'down'),
+            'query': self.request.GET.get('query', ''),
+            'typ_operace': self.request.GET.get('typ_operace', 'VŠE'),
+            'typ_udrzby': self.request.GET.get('typ_udrzby', 'VŠE'),
+            'month': self.request.GET.get('month', 'VŠE'),
+            'year': self.request.GET.get('year', 'VŠE'),
+            'ucetnictvi': self.request.GET.get('ucetnictvi', ''),         
+        })
+
+        return context    
+
+    def get_queryset(self):
+        """
+        Získává seznam audit logů na základě vyhledávání, filtrování, ročních a měsíčních kritérií.
+
+        Vrací:
+        - queryset: Filtrovaný a seřazený seznam záznamů.
+        """
+        self.query = self.request.GET.get('query', '')
+        sort = self.request.GET.get('sort', 'id')
+        order = self.request.GET.get('order', 'down')
+        typ_operace = self.request.GET.get('typ_operace', 'VŠE')
+        self.typ_udrzby = self.request.GET.get('typ_udrzby', 'VŠE')
+        self.month = self.request.GET.get('month', 'VŠE')
+        self.year = self.request.GET.get('year', 'VŠE')
+        self.ucetnictvi = self.request.GET.get('ucetnictvi', '')
+
+        if order == 'down':
+            sort = f"-{sort}"
+        querysets = [self.filter_queryset(model.objects.all(), typ_operace) for model in auditlog_models(self.year)]
+        return combine_auditlogs(querysets, [sort])
+
+    def filter_queryset(self, queryset, typ_operace):
+        """
+        Použije vyhledávání a filtry na queryset audit logu nebo archivu.
+        """
+        if self.query:
+            queryset = queryset.filter(
+                Q(nazev_dilu__icontains=self.query) | Q(dodavatel__icontains=self.query)
+            )
+
+        if  self.ucetnictvi == 'on':
+            queryset = queryset.filter(ucetnictvi=True)
+        
+        if typ_operace != 'VŠE':
+            queryset = queryset.filter(typ_operace=typ_operace)
+
+        if self.typ_udrzby != 'VŠE':
+            if self.typ_udrzby == 'Mimo_inventuru':
+                queryset = queryset.exclude(typ_udrzby='Inventura')
+            else:
+                queryset = queryset.filter(typ_udrzby=self.typ_udrzby)
+
+        if self.month != 'VŠE':
+            queryset = queryset.filter(
+                Q(datum_vydeje__month=self.month) | Q(datum_nakupu__month=self.month)
+            )
+
+        if self.year != 'VŠE':
+            queryset = queryset.filter(
+                Q(datum_vydeje__year=self.year) | Q(datum_nakupu__year=self.year)
+            )
+
+        return queryset
+
+    def generate_export_to_csv(self, queryset):
+        """
+        Exportuje seznam záznamů audit logu do CSV.
+
+        Vrací:
+        - HttpResponse s CSV souborem.
+        """
+        logger.info(f"{self.request.user} spustil export audit logu do CSV.")
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="audit_log_export.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow([
+            'Účetnictví', 'Evidenční číslo', 'Číslo karty', 'Objednáno?', 'Název dílu', 'Změna množství', 
+            'Množství', 'Jednotky', 'Typ operace', 'Pro zařízení', 'Umístění', 'Dodavatel', 
+            'Datum výdeje', 'Datum nákupu', 'Číslo objednávky', 'EUR/jednotka', 'Celkem EUR', 
+            'Čas vytvoření', 'Operaci provedl', 'Typ údržby', 'Poznámka'
+        ])
+
+        for item in queryset:
+            writer.writerow([
+                item.ucetnictvi, 
+                item.evidencni_cislo_id,  
+                item.interne_cislo, 
+                item.objednano, 
+                item.nazev_dilu, 
+                item.zmena_mnozstvi, 
+                item.mnozstvi, 
+                item.jednotky, 
+                item.typ_operace, 
+                item.pouzite_zarizeni, 
+                item.umisteni, 
+                item.dodavatel, 
+                item.datum_vydeje, 
+                item.datum_nakupu, 
+                item.cislo_objednavky, 
+                item.jednotkova_cena_eur, 
+                item.celkova_cena_eur, 
+                item.cas_vytvoreni, 
+                item.operaci_provedl.username, 
+                item.typ_udrzby,
+                item.poznamka
+            ])
+
+        logger.info(f"Export do CSV připraven. Počet položek: {queryset.count()}")
+        return response
+
+    def generate_export_to_parquet(self, queryset):
+        """
+        Exportuje seznam záznamů audit logu do souboru Parquet se zachováním datových typů.
+
+        - Parametr `since_id` v GET omezí export na záznamy s vyšším ID (přírůstkový export).
+        - ID posledního exportovaného záznamu se vrací v hlavičce `X-Last-Id`.
+        - Soubor se zapisuje po row groups do dočasného souboru na disku a odesílá se z něj
+          po částech, v paměti se tak drží jen jedna row group. Dočasný soubor se smaže
+          po odeslání odpovědi.
+
+        Vrací:
+        - FileResponse se souborem Parquet, nebo chybu 501, pokud není nainstalovaný pyarrow.
+        """
+        try:
+            from .. import columnar
+        except ImportError:
+            logger.error("Export do Parquet není dostupný, chybí knihovna pyarrow.")
+            return HttpResponse("Export do Parquet vyžaduje knihovnu pyarrow.", status=501)
+
+        since_id = self.request.GET.get('since_id')
+        since_id = int(since_id) if since_id and since_id.isdigit() else None
+        logger.info(f"{self.request.user} spustil export audit logu do Parquet (od ID {since_id}).")
+
+        export_file = tempfile.TemporaryFile()
+        try:
+            count, last_id = columnar.write_parquet(queryset, export_file, since_id=since_id)
+        except Exception:
+            export_file.close()
+            raise
+        export_file.seek(0)
+
+        response = FileResponse(
+            export_file, as_attachment=True, filename='audit_log_export.parquet',
+            content_type='application/vnd.apache.parquet',
+        )
+        response['X-Last-Id'] = '' if last_id is None else str(last_id)
+        logger.info(f"Export do Parquet připraven. Počet položek: {count}")
+        return response
+
+    def generate_export_consumption_to_csv(self, queryset):
+        """
+        Exportuje spotřebu jednotlivých dílů za vyfiltrované období do CSV.
+
+        Vrací:
+        - HttpResponse s CSV souborem.
+        """
+        rows = grouped_sums(
+            queryset, ('interne_cislo', 'evidencni_cislo', 'pouzite_zarizeni'),
+            {'celkovy_vydej': Sum('zmena_mnozstvi'), 'celkem_eur': Sum('celkova_cena_eur')},
+        )
+
+        logger.info(f"{self.request.user} spustil export spotřeby do CSV.")
+
+        today = datetime.date.today().strftime('%Y-%m-%d')
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="spotreba_export_{today}.csv"'
+
+        sklad = Sklad.objects.all()
+        writer = csv.writer(response)
+        writer.writerow(['', 'Použité filtry:', f'měsíc: {self.month}, rok: {self.year}, pouze v účetnictví: {"ano" if self.ucetnictvi=="on" else "ne"}, typ údržby: {self.typ_udrzby}, vyhledávání: {self.query}'])
+        writer.writerow([''])
+        writer.writerow(['Číslo karty', 'Evidenční č.', 'Název dílu', 'Vydáno', 'Jednotky', 'Celkem EUR', 'Použité zařízení'])
+
+        for item in rows:
+            skladova_polozka = sklad.get(pk=item['evidencni_cislo'])
+            writer.writerow([
+                item['interne_cislo'],
+                item['evidencni_cislo'],  
+                skladova_polozka.nazev_dilu, 
+                item['celkovy_vydej'], 
+                skladova_polozka.jednotky,
+                -int(item['celkem_eur']), 
+                item['pouzite_zarizeni'],                
+            ])
+
+        logger.info(f"Export spotřeby do CSV připraven. Počet položek: {len(rows)}")
+        return response
+
+    def generate_export_consumption_to_pdf(self, queryset):
+        """
+        Exportuje spotřebu jednotlivých dílů za vyfiltrované období do PDF.
+
+        Vrací:
+        - FileResponse s PDF souborem.
+        """
+        from .. import reports
+
+        logger.info(f"{self.request.user} spustil export spotřeby do PDF.")
+        return reports.consumption_pdf_response(
+            queryset, self.month, self.year, self.ucetnictvi, self.typ_udrzby, self.query
+        )
+
+    def generate_graph_to_pdf(self, queryset):
+        """
+        Generuje graf z audit logu a ukládá ho do PDF souboru.
+
+        Vrací:
+        - FileResponse obsahující graf ve formátu PDF.
+        """
+        from .. import reports
+
+        logger.info(f"{self.request.user} zahájil generování PDF grafu nákladů dle zařízení za měsíc {self.month}, rok {self.year}")
+        try:
+            response = reports.costs_by_equipment_pdf_response(queryset, self.month, self.year)
+        except Exception as e:
+            logger.exception(f"Chyba při generování PDF grafu dle zařízení: {e}")
+            raise
+        logger.info(f"{self.request.user} úspěšně vygeneroval PDF graf nákladů dle zařízení")
+        return response
+
+    def generate_graph_by_maintenance(self, queryset):
+        """
+        Generuje graf nákladů podle typu údržby za zvolený měsíc a rok a ukládá ho do PDF souboru.
+
+        Vrací:
+        - FileResponse obsahující graf ve formátu PDF.
+        """
+        from .. import reports
+
+        logger.info(f"{self.request.user} zahájil generování PDF grafu nákladů dle typu údržby za měsíc {self.month}, rok {self.year}")
+        try:
+            response = reports.costs_by_maintenance_pdf_response(queryset, self.month, self.year)
+        except Exception as e:
+            logger.exception(f"Chyba při generování PDF grafu dle typu údržby: {e}")
+            raise
+        logger.info(f"{self.request.user} úspěšně vygeneroval PDF graf nákladů dle typu údržby")
+        return response
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Určuje, zda vrátit CSV, Parquet, PDF nebo HTML stránku, na základě atributů.
+
+        Vrací:
+        - HttpResponse s HTML, CSV, Parquet nebo PDF obsahem.
+        """
+        if self.export_csv:
+            return self.generate_export_to_csv(self.get_queryset())
+        elif self.export_parquet:
+            return self.generate_export_to_parquet(self.get_queryset())
+        elif self.graph_type_of_maintenance:
+            return self.generate_graph_by_maintenance(self.get_queryset())
+        elif self.graph:
+            return self.generate_graph_to_pdf(self.get_queryset())
+        elif self.export_consumption_to_csv:
+            return self.generate_export_consumption_to_csv(self.get_queryset())
+        elif self.export_consumption_to_pdf:
+            return self.generate_export_consumption_to_pdf(self.get_queryset())
+        else:
+            return super().render_to_response(context, **response_kwargs)
+
+
+class StockValuationView(LoginRequiredMixin, TemplateView):
+    """
+    Zobrazuje množství a hodnotu skladových položek ke konci zvoleného dne.
+
+    - Povoleno pouze přihlášeným uživatelům.
+    - Stav se počítá z nejbližšího snímku stavu skladu a pohybů po něm (viz `valuation`).
+    - Umožňuje export do CSV nebo PDF.
+
+    Parametry (GET):
+    - datum: Datum ocenění ve formátu RRRR-MM-DD, výchozí je poslední den minulého měsíce.
+
+    Template:
+    - `oceneni_skladu.html`
+    """
+    template_name = 'hpm_sklad/oceneni_skladu.html'
+    export_csv = False
+    export_pdf = False
+
+    def get_datum(self):
+        try:
+            return datetime.date.fromisoformat(self.request.GET.get('datum', ''))
+        except ValueError:
+            return datetime.date.today().replace(day=1) - datetime.timedelta(days=1)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        datum = self.get_datum()
+        rows = valuation_rows(datum)
+        context.update({
+            'db_table': 'oceneni',
+            'datum': datum,
+            'snimek': nearest_checkpoint(datum),
+            'rows': rows,
+            'celkem_eur': round(sum(row['celkova_cena_eur'] for row in rows), 2),
+        })
+        return context
+
+    def generate_export_to_csv(self, rows, datum):
+        """
+        Exportuje ocenění skladu do CSV.
+
+        Vrací:
+        - HttpResponse s CSV souborem.
+        """
+        logger.info(f"{self.request.user} spustil export ocenění skladu k {datum} do CSV.")
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="oceneni_skladu_{datum.isoformat()}.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow(['Evidenční číslo', 'Číslo karty', 'Název dílu', 'Množství', 'Jednotky', 'Celkem EUR', 'V účetnictví'])
+        for row in rows:
+            writer.writerow([
+                row['evidencni_cislo'],
+                row['interne_cislo'],
+                row['nazev_dilu'],
+                row['mnozstvi'],
+                row['jednotky'],
+                row['celkova_cena_eur'],
+                row['ucetnictvi'],
+            ])
+
+        logger.info(f"Export ocenění skladu do CSV připraven. Počet položek: {len(rows)}")
+        return response
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Určuje, zda vrátit CSV, PDF nebo HTML stránku, na základě atributů.
+        """
+        if self.export_csv:
+            return self.generate_export_to_csv(context['rows'], context['datum'])
+        elif self.export_pdf:
+            from .. import reports
+
+            logger.info(f"{self.request.user} spustil export ocenění skladu k {context['datum']} do PDF.")
+            return reports.valuation_pdf_response(context['rows'], context['datum'])
+        return super().render_to_response(context, **response_kwargs)
+
+
+class DeadStockListView(LoginRequiredMixin, ListView):
+    """
+    Zobrazuje nepohyblivé zásoby: položky na skladě bez výdeje za posledních N měsíců.
+
+    - Povoleno pouze přihlášeným uživatelům.
+    - Filtruje a řadí podle indexovaného data posledního výdeje na skladové položce
+      (`posledni_vydej`), bez procházení audit logu. Položky, které nebyly nikdy vydány,
+      se posuzují podle data posledního příjmu (`posledni_prijem`).
+    - Ukazuje kapitál vázaný v těchto položkách a umožňuje export do CSV.
+
+    Parametry (GET):
+    - mesice: Počet měsíců bez výdeje, výchozí 12, nejvýše `max_mesice`.
+
+    Template:
+    - `nepohyblive_zasoby.html`
+    """
+    model = Sklad
+    template_name = 'hpm_sklad/nepohyblive_zasoby.html'
+    paginate_by = 50
+    export_csv = False
+
+    max_mesice = 240
+
+    def get_mesice(self):
+        try:
+            return min(max(1, int(self.request.GET.get('mesice', 12))), self.max_mesice)
+        except ValueError:
+            return 12
+
+    def get_hranice(self):
+        """
+        Vrátí datum, před kterým musel být poslední výdej (u nikdy nevydaných položek poslední příjem),
+        aby se položka považovala za nepohyblivou.
+        """
+        dnes = timezone.localdate()
+        index = dnes.year * 12 + dnes.month - 1 - self.get_mesice()
+        return dnes.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+    def get_queryset(self):
+        """
+        Vrací položky s nenulovým množstvím, které nebyly vydány od hranice, nebo nebyly vydány
+        nikdy a zároveň nebyly od hranice přijaty, seřazené od nejdéle nevydaných.
+        """
+        hranice = self.get_hranice()
+        nikdy_nevydano = Q(posledni_vydej__isnull=True) & (
+            Q(posledni_prijem__lt=hranice) | Q(posledni_prijem__isnull=True)
+        )
+        return Sklad.objects.filter(
+            Q(posledni_vydej__lt=hranice) | nikdy_nevydano, mnozstvi__gt=0
+        ).order_by(F('posledni_vydej').asc(nulls_first=True), '-celkova_cena_eur')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        souhrn = self.object_list.aggregate(celkem_eur=Sum('celkova_cena_eur'))
+        context.update({
+            'db_table': 'nepohyblive',
+            'mesice': self.get_mesice(),
+            'hranice': self.get_hranice(),
+            'celkem_eur': round(souhrn['celkem_eur'] or 0, 2),
+        })
+        return context
+
+    def generate_export_to_csv(self, queryset):
+        """
+        Exportuje nepohyblivé zásoby do CSV.
+
+        Vrací:
+        - HttpResponse s CSV souborem.
+        """
+        logger.info(f"{self.request.user} spustil export nepohyblivých zásob do CSV.")
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="nepohyblive_zasoby.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow(['Evidenční číslo', 'Číslo karty', 'Název dílu', 'Množství', 'Jednotky',
+                         'Poslední výdej', 'Poslední příjem', 'Celkem EUR'])
+        for row in queryset.values_list('evidencni_cislo', 'interne_cislo', 'nazev_dilu', 'mnozstvi', 'jednotky',
+                                        'posledni_vydej', 'posledni_prijem', 'celkova_cena_eur').iterator():
+            writer.writerow(row)
+
+        return response
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Určuje, zda vrátit CSV nebo HTML stránku, na základě atributu `export_csv`.
+        """
+        if self.export_csv:
+            return self.generate_export_to_csv(self.object_list)
+        return super().render_to_response(context, **response_kwargs)
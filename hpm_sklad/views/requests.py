@@ -0,0 +1,288 @@
+from django.http import HttpResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.views.generic import ListView
+from django.views.generic.detail import DetailView
+from django.contrib.auth.decorators import login_required, permission_required
+from django.views.decorators.http import require_POST
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.forms import inlineformset_factory
+
+import csv
+import logging
+
+from ..models import Dodavatele, Varianty, Poptavky, PoptavkaVarianty
+from ..forms import PoptavkaVariantyForm
+from ..detail import DetailSchemaMixin, DetailPanelMixin
+from ..reorder import plan_reorder, create_draft_poptavky, STRATEGY_CHOICES
+
+logger = logging.getLogger(__name__)
+
+
+@login_required
+@permission_required('hpm_sklad.add_poptavky')
+def create_poptavka(request, dodavatel_id):
+    """
+    Vytváří novou poptávku pro daného dodavatele.
+
+    Varianty dodavatele se načtou jediným dotazem včetně skladových položek a formulářům
+    i šabloně se předají jako slovník {pk: varianta}, vybrané řádky se uloží hromadně.
+
+    Permision:
+    - Povoleno pouze uživatelům s oprávněním 'add_poptavky'.
+
+    """
+    dodavatel = get_object_or_404(Dodavatele, id=dodavatel_id)
+    varianty_dodavatele = Varianty.objects.filter(dodavatel_id=dodavatel_id).select_related('sklad')
+    varianty = list(varianty_dodavatele)
+    varianty_map = {varianta.pk: varianta for varianta in varianty}
+    form_kwargs = {'varianty_dodavatele': varianty_dodavatele, 'varianty_map': varianty_map}
+
+    logger.info(f"{request.user} otevřel formulář pro vytvoření poptávky pro dodavatele ID {dodavatel_id}")
+
+    PoptavkaVariantyFormSet = inlineformset_factory(
+        Poptavky, PoptavkaVarianty,
+        form=PoptavkaVariantyForm,
+        extra=len(varianty),
+        can_delete=False
+    )
+
+    if request.method == 'POST':
+        formset = PoptavkaVariantyFormSet(request.POST, form_kwargs=form_kwargs)
+        logger.info(f"{request.user} odeslal POST požadavek pro vytvoření poptávky")
+
+        if formset.is_valid():
+            selected_forms = [form for form in formset.forms if form.cleaned_data.get('should_save')]
+
+            if selected_forms:
+                with transaction.atomic():
+                    poptavka = Poptavky.objects.create(
+                        dodavatel=dodavatel,
+                        stav='Tvorba',
+                    )
+                    poptavka_varianty = []
+                    for form in selected_forms:
+                        radek = form.save(commit=False)
+                        radek.poptavka = poptavka
+                        poptavka_varianty.append(radek)
+                    PoptavkaVarianty.objects.bulk_create(poptavka_varianty)
+
+                logger.info(f"{request.user} vytvořil poptávku #{poptavka.pk} pro dodavatele {dodavatel}")
+                return redirect('poptavky')
+            else:
+                logger.warning(f"{request.user} nevybral žádné položky pro vytvoření poptávky – formulář byl prázdný")
+                for form, varianta_dodavatele in zip(formset.forms, varianty):
+                    form.fields['varianta'].initial = varianta_dodavatele
+                    form.fields['jednotky'].initial = varianta_dodavatele.sklad.jednotky
+                formset.non_form_errors().append('Musíte vybrat alespoň jednu položku k uložení do poptávky.')
+        else:
+            logger.warning(f"{request.user} odeslal neplatný formulář poptávky")
+            logger.debug(f"Formset errors: {formset.errors}")
+    else:
+        formset = PoptavkaVariantyFormSet(
+            queryset=PoptavkaVarianty.objects.none(),
+            form_kwargs=form_kwargs
+        )
+        for form, varianta_dodavatele in zip(formset.forms, varianty):
+            form.fields['varianta'].initial = varianta_dodavatele
+            difference = (
+                varianta_dodavatele.sklad.min_mnozstvi_ks -
+                varianta_dodavatele.sklad.mnozstvi
+            )
+            form.fields['mnozstvi'].initial = max(difference, 0)
+            form.fields['jednotky'].initial = varianta_dodavatele.sklad.jednotky
+            if difference > 0:
+                form.fields['should_save'].initial = True
+
+    context = {
+        'formset': formset,
+        'dodavatel': dodavatel,
+        'varianty_map': varianty_map,
+    }
+    return render(request, 'hpm_sklad/create_poptavka.html', context)
+
+
+@login_required
+@permission_required('hpm_sklad.add_poptavky', raise_exception=True)
+@require_POST
+def generate_reorders_view(request):
+    """
+    Vygeneruje rozpracované poptávky pro všechny položky pod minimem v jednom dávkovém běhu.
+
+    Parametry (POST):
+    - strategy: 'cheapest' pro nejlevnějšího nebo 'fastest' pro nejrychlejšího dodavatele.
+
+    Permision:
+    - Povoleno pouze uživatelům s oprávněním 'add_poptavky'.
+    """
+    strategy = request.POST.get('strategy', 'cheapest')
+    if strategy not in dict(STRATEGY_CHOICES):
+        strategy = 'cheapest'
+
+    poptavky = create_draft_poptavky(plan_reorder(strategy))
+    logger.info(f"{request.user} vygeneroval {len(poptavky)} poptávek z položek pod minimem (strategie {strategy})")
+    return redirect('poptavky')
+
+
+class PoptavkaListView(LoginRequiredMixin, DetailPanelMixin, ListView):
+    """
+    Zobrazuje seznam poptávek.
+
+    - Povoleno pouze přihlášeným uživatelům.
+    - Stránkuje výsledky a umožňuje export do CSV.
+
+    Template:
+    - `poptavky.html`
+
+    Kontext:
+    - Zahrnuje poptávky, možnosti filtrování, řazení a vyhledávání.
+    """
+    model = Poptavky
+    detail_panel_url_name = 'poptavka_varianty'
+    template_name = 'hpm_sklad/poptavky.html'
+    paginate_by = 24
+    export_csv = False
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává do kontextu informace o aktuálně vybrané poptávce a uživatelských filtrech.
+
+        Vrací:
+        - Kontext obsahující vybraného dodavatele, možnosti filtrování, řazení a uživatele.
+        """
+        context = super().get_context_data(**kwargs)
+        selected_id = self.request.GET.get('selected', None)
+
+        if selected_id:
+            context['selected_item'] = get_object_or_404(Dodavatele, id=selected_id)
+        else:
+            context['selected_item'] = None
+
+        context.update({
+            'db_table': 'poptavky',
+            'sort': self.request.GET.get('sort', 'id'),
+            'order': self.request.GET.get('order', 'down'),
+            'query': self.request.GET.get('query', ''),
+        })
+
+        return context
+
+    def get_queryset(self):
+        """
+        Získává seznam poptávek na základě vyhledávání, filtrování a řazení.
+
+        Vrací:
+        - queryset: Filtrovaný a seřazený seznam poptávek.
+        """
+        queryset = Poptavky.objects.all()
+        query = self.request.GET.get('query', '')
+        sort = self.request.GET.get('sort', 'id')
+        order = self.request.GET.get('order', 'down')
+
+        if query:
+            queryset = queryset.filter(dodavatel__icontains=query)
+
+        if order == 'down':
+            sort = f"-{sort}"
+            
+        queryset = queryset.order_by(sort)
+
+        return queryset
+
+    def export_to_csv(self, queryset):
+        """
+        Exportuje seznam poptávek do CSV.
+
+        Vrací:
+        - HttpResponse s CSV souborem.
+        """
+        logger.info(f"{self.request.user} spustil export poptávek do CSV.")
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="poptavky_export.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow([
+            'ID', 'Dodavatel', 'Datum vytvoření', 'Stav', 'Varianty', 
+        ])
+
+        for item in queryset:
+            writer.writerow([
+                item.id, 
+                item.dodavatel, 
+                item.datum_vytvoreni, 
+                item.stav, 
+                item.varianty, 
+            ])
+
+        logger.info(f"Export poptávek do CSV připraven. Počet položek: {queryset.count()}")
+        return response
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Určuje, zda vrátit CSV nebo HTML stránku, na základě parametrů.
+
+        Vrací:
+        - HttpResponse s HTML nebo CSV obsahem.
+        """
+        if getattr(self, 'export_csv', False):
+            return self.export_to_csv(self.get_queryset())
+        else:
+            return super().render_to_response(context, **response_kwargs)        
+
+
+class PoptavkaDetailView(LoginRequiredMixin, DetailSchemaMixin, DetailView):
+    """
+    Zobrazuje detailní informace o poptávce.
+
+    Template:
+    - `detail_poptavky.html`
+
+    Kontext:
+    - Zahrnuje detailní informace o poptávce.
+    """
+    model = Poptavky
+    template_name = 'hpm_sklad/detail_poptavky.html'
+
+
+class PoptavkaVariantyListView(LoginRequiredMixin, ListView):
+    """
+    Zobrazuje seznam variant poptávky pro konkrétní poptávku.
+
+    - Povoleno pouze přihlášeným uživatelům.
+
+    Template:
+    - `poptavka_varianty.html`
+
+    Kontext:
+    - Zahrnuje varianty pro konkrétní poptávku.
+    """
+    model = PoptavkaVarianty
+    template_name = 'hpm_sklad/poptavka_varianty.html'
+
+    def get(self, request, *args, **kwargs):
+        """
+        Získává ID poptávky z URL a ukládá ho pro použití v dalších metodách.
+        """
+        self.poptavka_id = self.kwargs.get('pk')
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává ID poptávky do kontextu šablony.
+
+        Vrací:
+        - Kontext obsahující ID poptávky.
+        """
+        context = super().get_context_data(**kwargs)
+        context['poptavka_id'] = self.poptavka_id
+        return context
+
+    def get_queryset(self):
+        """
+        Získává seznam variant pro konkrétní poptávku na základě ID poptávky.
+
+        Vrací:
+        - queryset: Filtrovaný seznam variant pro konkrétní poptávku.
+        """
+        queryset = PoptavkaVarianty.objects.filter(poptavka_id=self.poptavka_id)
+        return queryset     
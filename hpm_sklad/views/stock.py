@@ -0,0 +1,412 @@
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse_lazy
+from django.views.generic import ListView
+from django.views.generic.detail import DetailView
+from django.views.generic.edit import CreateView, UpdateView, DeleteView
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.db.models import Q
+from django.utils.functional import SimpleLazyObject
+
+import csv
+import logging
+
+from ..models import Sklad, Zarizeni, ABC_CHOICES, XYZ_CHOICES
+from ..forms import SkladCreateForm, SkladUpdateForm, SkladUpdateObjednanoForm
+from ..devices import is_pc
+from ..detail import DetailSchemaMixin, DetailFragmentMixin, DetailPanelMixin
+
+logger = logging.getLogger(__name__)
+
+
+class SkladListView(LoginRequiredMixin, DetailPanelMixin, ListView):
+    """
+    Zobrazuje seznam všech položek ve skladu.
+
+    - Povoleno pouze přihlášeným uživatelům.
+    - Stránkuje výsledky (na PC) a umožňuje export do CSV.
+
+    Template:
+    - `sklad.html` pro PC, `sklad_mobile.html` pro mobilní zařízení.
+
+    Kontext:
+    - Seznam položek skladů, možnosti filtrování a řazení.
+    """
+    model = Sklad
+    detail_panel_url_name = 'fragment_sklad'
+    export_csv = False
+    
+    def get_paginate_by(self, queryset):
+        """
+        Určuje, zda se má použít stránkování, nebo ne.
+        Na PC bude stránkování po 20 záznamech, na mobilu se zobrazí vše.
+        """
+        if is_pc(self.request):
+            return 24
+        return None
+
+    def get_template_names(self):
+        """
+        Dynamicky volí šablonu podle toho, zda je uživatel na PC nebo mobilu.
+        """
+        if is_pc(self.request):
+            return ['hpm_sklad/sklad.html']
+        return ['hpm_sklad/sklad_mobile.html']
+
+    def get_detail_panel_pk(self, context):
+        """
+        Mobilní šablona nemá pravý panel, detail se do ní nevkládá.
+        """
+        if not is_pc(self.request):
+            return None
+        return super().get_detail_panel_pk(context)
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává další data do kontextu pro zobrazení v šabloně.
+
+        Vrací:
+        - Kontext obsahující filtry, řazení a vybranou položku skladu.
+        """
+        context = super().get_context_data(**kwargs)
+        selected_ev_cislo = self.request.GET.get('selected', None)
+
+        if selected_ev_cislo:
+            context['selected_item'] = get_object_or_404(Sklad, evidencni_cislo=selected_ev_cislo)
+        else:
+            context['selected_item'] = None
+
+        zarizeni_qs = Zarizeni.objects.all()
+        zarizeni_choices = [("", "VŠE")] + [(z.kod_zarizeni, z.nazev_zarizeni) for z in zarizeni_qs]
+
+        context.update({
+            'db_table': 'sklad',
+            'sort': self.request.GET.get('sort', 'evidencni_cislo'),
+            'order': self.request.GET.get('order', 'down'),
+            'query': self.request.GET.get('query', ''),
+            'kriticky_dil': self.request.GET.get('kriticky_dil', ''),
+            'ucetnictvi': self.request.GET.get('ucetnictvi', ''),
+            'pod_minimem': self.request.GET.get('pod_minimem', ''),
+            'zarizeni_filter': self.request.GET.get('zarizeni_filter', 'VŠE'),
+            'zarizeni_choices': zarizeni_choices,
+            'abc_choices': [("", "VŠE")] + [(value, value) for value, _ in ABC_CHOICES],
+            'xyz_choices': [("", "VŠE")] + [(value, value) for value, _ in XYZ_CHOICES],
+        })
+
+        return context
+
+    def get_queryset(self):
+        """
+        Získává seznam položek skladu na základě vyhledávání a filtrování.
+
+        Vrací:
+        - queryset: Filtrovaný a seřazený seznam skladových položek.
+        """
+        queryset = Sklad.objects.select_related('prognoza').prefetch_related('zarizeni')
+
+        query = self.request.GET.get('query', '')
+        sort = self.request.GET.get('sort', 'evidencni_cislo')
+        order = self.request.GET.get('order', 'down')
+        filters = {
+            'kriticky_dil': self.request.GET.get('kriticky_dil'),
+            'ucetnictvi': self.request.GET.get('ucetnictvi'),
+        }
+        pod_minimem = self.request.GET.get('pod_minimem')
+        zarizeni_filter = self.request.GET.get('zarizeni_filter','VŠE')
+        tridy = {
+            'abc_trida': self.request.GET.get('abc_trida'),
+            'xyz_trida': self.request.GET.get('xyz_trida'),
+        }
+
+        if query:
+            queryset = queryset.filter(
+                Q(evidencni_cislo__icontains=query) | Q(interne_cislo__icontains=query) | Q(nazev_dilu__icontains=query)
+            )
+
+        for field, value in filters.items():
+            if value == 'on':
+                queryset = queryset.filter(**{field: True})
+
+        # položky pod minimem se filtrují přes průběžně udržovanou tabulku nedostatků
+        if pod_minimem == 'on':
+            queryset = queryset.filter(nedostatek__isnull=False)
+
+        if zarizeni_filter and zarizeni_filter != 'VŠE':
+            queryset = queryset.filter(zarizeni__kod_zarizeni__iexact=zarizeni_filter)   
+
+        # třídy ABC/XYZ jsou uložené na položce a indexované, přepočítává je příkaz `classify_stock`
+        for field, value in tridy.items():
+            if value:
+                queryset = queryset.filter(**{field: value})
+
+        if order == 'down':
+            sort = f"-{sort}"
+        queryset = queryset.order_by(sort)
+
+        return queryset
+
+    def export_to_csv(self, queryset):
+        logger.info(f"{self.request.user} spustil export skladových položek do CSV.")
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="sklad_export.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow([
+            'Evidenční číslo', 'Číslo karty', 'Objednáno?', 'Název dílu', 'Minimum', 'Množství', 'Jednotky',
+            'Umístění', 'Dodavatel', 'Datum nákupu', 'Číslo objednávky', 'EUR/jednotka', 'Celkem EUR',
+            'Poznámka', 'Účetnictví', 'Kritický díl', 'Zařízení'
+        ])
+
+        for item in queryset:
+            writer.writerow([
+                item.evidencni_cislo,
+                item.interne_cislo,
+                item.objednano,
+                item.nazev_dilu,
+                item.min_mnozstvi_ks,
+                item.mnozstvi,
+                item.jednotky,
+                item.umisteni,
+                item.dodavatel,
+                item.datum_nakupu,
+                item.cislo_objednavky,
+                item.jednotkova_cena_eur,
+                item.celkova_cena_eur,
+                item.poznamka,
+                item.ucetnictvi,
+                item.kriticky_dil,
+                ', '.join([z.kod_zarizeni.upper() for z in item.zarizeni.all()])
+            ])
+
+        logger.info(f"Export do CSV připraven. Počet položek: {queryset.count()}")
+        return response
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Určuje, zda vrátit CSV nebo HTML stránku, na základě parametrů.
+
+        Vrací:
+        - HttpResponse s HTML nebo CSV obsahem.
+        """
+        if getattr(self, 'export_csv', False):
+            queryset = self.get_queryset()
+            if not queryset.exists():
+                logger.warning(f"{self.request.user} spustil export CSV, ale po filtraci nebyly vybrány žádné položky k uložení.")
+                return HttpResponse("Export selhal, nebyly nalezeny zadne polozky k exportu.", content_type="text/plain")
+            return self.export_to_csv(queryset)
+
+        return super().render_to_response(context, **response_kwargs)
+ 
+
+
+class SkladCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
+    """
+    Vytváří novou položku ve skladu.
+
+    - Povoleno pouze uživatelům s oprávněním 'add_sklad'.
+    
+    Template:
+    - `create_sklad.html`
+
+    Po úspěšném vytvoření:
+    - Přesměruje uživatele zpět na seznam skladů.
+    """
+    model = Sklad
+    form_class = SkladCreateForm
+    template_name = 'hpm_sklad/create_sklad.html'
+    success_url = reverse_lazy('sklad')
+    permission_required = 'hpm_sklad.add_sklad'
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro vytvoření nové skladové položky")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST požadavek pro vytvoření nové skladové položky")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při vytváření nové položky: {e}")
+            raise
+
+    def form_valid(self, form):
+        self.object = form.save()
+        logger.info(f"{self.request.user} vytvořil novou skladovou položku: {self.object}")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro vytvoření skladové položky.")
+        logger.debug(f"Formulářové chyby: {form.errors}")
+        return super().form_invalid(form)
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} k vytvoření nové položky')
+        return super().handle_no_permission()    
+      
+    def get_context_data(self, **kwargs):
+        """
+        Přidává vybranou položku do kontextu šablony.
+        """
+        context = super().get_context_data(**kwargs)
+        selected_id = self.request.GET.get('pk', None)
+        if selected_id:
+            context['skladova_polozka'] = get_object_or_404(Sklad, evidencni_cislo=selected_id)
+            logger.debug(f"Přidána skladová položka do kontextu: ID {selected_id}")            
+        return context       
+
+
+class SkladUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
+    """
+    Aktualizuje existující položku ve skladu.
+
+    - Povoleno pouze uživatelům s oprávněním 'change_sklad'.
+    
+    Template:
+    - `update_sklad.html`
+
+    Po úspěšné aktualizaci:
+    - Přesměruje uživatele zpět na seznam skladů.
+    """
+    model = Sklad
+    form_class = SkladUpdateForm    
+    template_name = 'hpm_sklad/update_sklad.html'
+    permission_required = 'hpm_sklad.change_sklad'
+    success_url = reverse_lazy('sklad')
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro úpravu skladové položky #{kwargs.get('pk')}")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST pro úpravu skladové položky #{kwargs.get('pk')}")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při zpracování POST požadavku: {e}")
+            raise    
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} ke stránce pro úpravu skladové položky')
+        return super().handle_no_permission()
+    
+    def form_valid(self, form):
+        sklad = form.save(commit=False)
+        logger.info(f"{self.request.user} odeslal platný formulář a uložil změny pro skladovou položku: {sklad}")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro úpravu skladové položky #{self.get_object().pk}")
+        logger.debug(f"Form errors: {form.errors}")
+        return super().form_invalid(form)
+    
+    
+class SkladUpdateObjednanoView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
+    """
+    Aktualizuje stav položky 'objednáno' ve skladu.
+
+    Template:
+    - `update_objednano_sklad.html`
+
+    Po úspěšné aktualizaci:
+    - Přesměruje uživatele zpět na seznam skladů.
+    """
+    model = Sklad
+    form_class = SkladUpdateObjednanoForm    
+    template_name = 'hpm_sklad/update_objednano_sklad.html'
+    permission_required = 'hpm_sklad.change_objednano_in_sklad'
+    success_url = reverse_lazy('sklad')
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro úpravu sloupce Objednáno? skladové položky #{kwargs.get('pk')}")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST pro úpravu sloupce Objednáno? skladové položky #{kwargs.get('pk')}")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při zpracování POST požadavku: {e}")
+            raise    
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} ke stránce pro úpravu sloupce Objednáno? skladové položky')
+        return super().handle_no_permission()    
+    
+    def form_valid(self, form):
+        sklad = form.save(commit=False)
+        logger.info(f"{self.request.user} odeslal platný formulář a uložil změny sloupce Objednáno? pro skladovou položku: {sklad}")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro úpravu sloupce Objednáno? skladové položky #{self.get_object().pk}")
+        logger.debug(f"Form errors: {form.errors}")
+        return super().form_invalid(form)
+
+
+class SkladDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+    """
+    Maže existující položku ve skladu.
+
+    - Povoleno pouze uživatelům s oprávněním 'delete_sklad'.
+    
+    Template:
+    - `delete_sklad.html`
+
+    Po úspěšném smazání:
+    - Přesměruje uživatele zpět na seznam skladů.
+    """
+    model = Sklad
+    template_name = 'hpm_sklad/delete_sklad.html'
+    success_url = reverse_lazy('sklad')
+    permission_required = 'hpm_sklad.delete_sklad'
+
+    def delete(self, request, *args, **kwargs):
+        obj = self.get_object()
+        logger.warning(f"{request.user} SMAZAL skladovou položku: Evid. č. {obj.evidencni_cislo}, {obj.nazev_dilu}")
+        return super().delete(request, *args, **kwargs)
+
+    def handle_no_permission(self):
+        logger.warning(f'Uživatel {self.request.user} se pokusil smazat položku bez oprávnění.')
+        return super().handle_no_permission()    
+    
+
+class SkladDetailView(LoginRequiredMixin, DetailSchemaMixin, DetailView):
+    """
+    Zobrazuje detailní informace o skladové položce.
+
+    Template:
+    - 'detail_sklad.html'
+    
+    Kontext:
+    - Zahrnuje detaily skladové položky, seznam variant a pole přiřazených zařízení.
+    """
+    model = Sklad
+    template_name = 'hpm_sklad/detail_sklad.html'
+    detail_schemas = {'detail_item_fields': 'detail', 'info_fields': 'info'}
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává detaily skladové položky do kontextu šablony.
+
+        Řádky detailu a informační pole doplní `DetailSchemaMixin` z předpočítaných schémat.
+
+        Vrací:
+        - Kontext obsahující pole položek, varianty a atributy zařízení.
+        """
+        context = super().get_context_data(**kwargs)
+        varianty = self.object.varianty_skladu.all()      
+        zarizeni = self.object.zarizeni.all()  
+
+        # seznam zařízení se načte až při vykreslení, při zásahu do cache fragmentu vůbec
+        equipment_fields = SimpleLazyObject(lambda: [z.kod_zarizeni for z in zarizeni])
+
+        context['equipment_fields'] = equipment_fields
+        context['varianty'] = varianty      
+        return context
+
+
+class SkladFragmentView(DetailFragmentMixin, SkladDetailView):
+    """
+    Fragment detailu skladové položky pro pravý panel seznamu skladu.
+    """
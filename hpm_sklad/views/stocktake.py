@@ -0,0 +1,162 @@
+from django.shortcuts import render, redirect, get_object_or_404
+from django.views.generic import ListView
+from django.views.generic.detail import DetailView
+from django.contrib.auth.decorators import login_required, permission_required
+from django.views.decorators.http import require_POST
+from django.contrib.auth.mixins import LoginRequiredMixin
+
+import logging
+
+from ..models import Inventura
+from ..forms import InventuraCreateForm, InventuraPocitaniForm
+from ..movements import MovementBatchError
+from ..stocktake import start_stocktake, stocktake_locations, record_counts, reconcile_stocktake, StocktakeError
+
+logger = logging.getLogger(__name__)
+
+
+class InventuraListView(LoginRequiredMixin, ListView):
+    """
+    Zobrazuje seznam inventur a formulář pro zahájení nové inventury.
+
+    - Povoleno pouze přihlášeným uživatelům.
+
+    Template:
+    - `inventury.html`
+
+    Kontext:
+    - Seznam inventur a formulář `InventuraCreateForm`.
+    """
+    model = Inventura
+    template_name = 'hpm_sklad/inventury.html'
+    paginate_by = 24
+
+    def get_queryset(self):
+        return Inventura.objects.select_related('zahajil', 'zauctoval')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['db_table'] = 'inventury'
+        context.setdefault('form', InventuraCreateForm())
+        return context
+
+
+@login_required
+@permission_required('hpm_sklad.add_inventura', raise_exception=True)
+@require_POST
+def start_inventura_view(request):
+    """
+    Zahájí novou inventuru a uloží snímek množství položek v jejím rozsahu.
+
+    Parametry (POST):
+    - Pole formuláře `InventuraCreateForm` (datum, umístění, poznámka).
+
+    Permision:
+    - Povoleno pouze uživatelům s oprávněním 'add_inventura'.
+    """
+    form = InventuraCreateForm(request.POST)
+    if not form.is_valid():
+        logger.warning(f"{request.user} odeslal neplatný formulář pro zahájení inventury")
+        view = InventuraListView(request=request, kwargs={}, args=())
+        view.object_list = view.get_queryset()
+        return render(request, view.template_name, view.get_context_data(form=form))
+
+    inventura = start_stocktake(
+        request.user, form.cleaned_data['datum'], form.cleaned_data['umisteni'], form.cleaned_data['poznamka']
+    )
+    return redirect(inventura)
+
+
+class InventuraDetailView(LoginRequiredMixin, DetailView):
+    """
+    Zobrazuje průběh inventury po umístěních a sečtené rozdíly.
+
+    Template:
+    - `detail_inventury.html`
+
+    Kontext:
+    - Přehled umístění s počtem sečtených položek a seznam položek s rozdílem proti snímku.
+    """
+    model = Inventura
+    template_name = 'hpm_sklad/detail_inventury.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['db_table'] = 'inventury'
+        context['lokace'] = stocktake_locations(self.object)
+        context['rozdily'] = [
+            polozka for polozka in self.object.polozky.filter(sectene_mnozstvi__isnull=False).select_related('sklad')
+            if polozka.rozdil != 0
+        ]
+        return context
+
+
+@login_required
+@permission_required('hpm_sklad.change_inventurapolozka', raise_exception=True)
+def inventura_count_view(request, pk):
+    """
+    Zadání sečtených množství položek jednoho umístění, určeno i pro mobilní zařízení.
+
+    Parameters:
+    - request: HTTP request objekt.
+    - pk: Primární klíč inventury.
+
+    Parametry (GET):
+    - umisteni: Umístění, jehož položky se počítají.
+
+    POST:
+    - Uloží vyplněná sečtená množství a přesměruje zpět na detail inventury.
+
+    Vrací:
+    - render: HTML stránku `inventura_pocitani.html` s formulářem.
+    """
+    inventura = get_object_or_404(Inventura, pk=pk)
+    umisteni = request.GET.get('umisteni', '')
+    polozky = inventura.polozky.filter(umisteni=umisteni).select_related('sklad')
+
+    if inventura.stav != 'Otevřená':
+        return redirect(inventura)
+
+    if request.method == 'POST':
+        form = InventuraPocitaniForm(request.POST, polozky=polozky)
+        if form.is_valid():
+            record_counts(inventura, form.counts(), request.user)
+            return redirect(inventura)
+        logger.warning(f"{request.user} odeslal neplatné sečtené množství v {inventura}")
+        logger.debug(f"Chyby formuláře: {form.errors}")
+    else:
+        form = InventuraPocitaniForm(polozky=polozky)
+
+    context = {
+        'db_table': 'inventury',
+        'object': inventura,
+        'umisteni': umisteni,
+        'form': form,
+    }
+    return render(request, 'hpm_sklad/inventura_pocitani.html', context)
+
+
+@login_required
+@permission_required(('hpm_sklad.change_sklad', 'hpm_sklad.add_auditlog'), raise_exception=True)
+@require_POST
+def reconcile_inventura_view(request, pk):
+    """
+    Zaúčtuje inventurní rozdíly jako jednu dávku pohybů 'Inventura'.
+
+    - Pokud je některý pohyb neplatný, nic se nezapíše a zobrazí se detail inventury s chybami.
+
+    Permision:
+    - Povoleno pouze uživatelům s oprávněními 'change_sklad' a 'add_auditlog'.
+    """
+    inventura = get_object_or_404(Inventura, pk=pk)
+    try:
+        reconcile_stocktake(inventura, request.user)
+    except StocktakeError as e:
+        logger.warning(f"{request.user}: {e}")
+    except MovementBatchError as e:
+        logger.warning(f"{request.user} nemohl zaúčtovat {inventura}: {e}")
+        view = InventuraDetailView(request=request, kwargs={'pk': pk}, args=())
+        view.object = inventura
+        context = view.get_context_data(object=inventura, batch_errors=e.errors)
+        return render(request, view.template_name, context)
+    return redirect(inventura)
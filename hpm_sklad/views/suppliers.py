@@ -0,0 +1,504 @@
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse_lazy
+from django.views.generic import ListView
+from django.views.generic.detail import DetailView
+from django.views.generic.edit import CreateView, UpdateView, DeleteView
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.db.models import Q
+
+import csv
+import logging
+
+from ..models import Sklad, Dodavatele, Varianty
+from ..forms import VariantyCreateForm, VariantyUpdateForm, DodavateleCreateForm, DodavateleUpdateForm
+from ..detail import DetailSchemaMixin, DetailFragmentMixin, DetailPanelMixin
+
+logger = logging.getLogger(__name__)
+
+
+class VariantyCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
+    """
+    Vytváří novou variantu skladové položky.
+
+    - Povoleno pouze uživatelům s oprávněním 'add_varianty'.
+
+    Template:
+    - `create_varianty.html`
+
+    Po úspěšném vytvoření:
+    - Přesměruje uživatele zpět na seznam skladových položek.
+    """
+    model = Varianty
+    form_class = VariantyCreateForm
+    template_name = 'hpm_sklad/create_varianty.html'
+    success_url = reverse_lazy('sklad')
+    permission_required = 'hpm_sklad.add_varianty'
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro vytvoření nové varianty")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST požadavek pro vytvoření nové varianty")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při vytváření nové varianty: {e}")
+            raise
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává skladovou položku do kontextu šablony.
+        """
+        context = super().get_context_data(**kwargs)
+        context['skladova_polozka'] = get_object_or_404(Sklad, pk=self.kwargs['pk'])
+        logger.debug(f"Přidána skladová položka do kontextu: ID {self.kwargs['pk']}")
+        return context
+
+    def get_form(self, form_class=None):
+        """
+        Přizpůsobuje formulář tak, aby vyloučil dodavatele, kteří již mají přiřazenou variantu pro tuto skladovou položku.
+        """
+        form = super().get_form(form_class)
+        skladova_polozka = get_object_or_404(Sklad, pk=self.kwargs['pk'])
+        
+        # Získání dodavatelů, kteří ještě nemají variantu pro danou skladovou položku
+        existing_dodavatele_ids = Varianty.objects.filter(sklad=skladova_polozka).values_list('dodavatel', flat=True)
+        form.fields['dodavatel'].queryset = Dodavatele.objects.exclude(pk__in=existing_dodavatele_ids)
+        
+        return form    
+
+    def form_valid(self, form):
+        skladova_polozka = get_object_or_404(Sklad, pk=self.kwargs['pk'])
+        form.instance.sklad = skladova_polozka
+
+        if Varianty.objects.filter(sklad=skladova_polozka, dodavatel=form.instance.dodavatel).exists():
+            logger.warning(
+                f"{self.request.user} se pokusil vytvořit duplicitní variantu "
+                f"pro sklad {skladova_polozka.pk} a dodavatele {form.instance.dodavatel}"
+            )
+            form.add_error('dodavatel', 'Varianta se stejným dodavatelem již existuje.')
+            return self.form_invalid(form)
+
+        logger.info(
+            f"{self.request.user} vytvořil novou variantu pro skladovou položku {skladova_polozka.pk} "
+            f"a dodavatele {form.instance.dodavatel}"
+        )
+        return super().form_valid(form)
+
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro vytvoření nové varianty.")
+        logger.debug(f"Formulářové chyby: {form.errors}")
+        return super().form_invalid(form)
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} k vytvoření nové varianty')
+        return super().handle_no_permission()  
+
+
+class VariantyWithDodavatelCreateView(CreateView):
+    """
+    Vytváří novou variantu skladové položky s předdefinovaným dodavatelem.
+
+    Template:
+    - `create_varianty_with_dodavatel.html`
+
+    Kontext:
+    - Skladová položka a dodavatel z kontextu URL.
+
+    Po úspěšném vytvoření:
+    - Přesměruje uživatele zpět na seznam skladů.
+    """
+    model = Varianty
+    form_class = VariantyCreateForm
+    template_name = 'hpm_sklad/create_varianty_with_dodavatel.html'
+    success_url = reverse_lazy('sklad')
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro vytvoření nové varianty")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST požadavek pro vytvoření nové varianty")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při vytváření nové varianty: {e}")
+            raise
+
+    def get_initial(self):
+        """
+        Inicializuje hodnoty pro pole formuláře, včetně dodavatele.
+        """
+        initial = super().get_initial()
+        dodavatel_id = self.kwargs.get('dodavatel')
+        if dodavatel_id:
+            initial['dodavatel'] = Dodavatele.objects.get(id=dodavatel_id)
+        return initial
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává dodavatele a skladovou položku do kontextu šablony.
+        """
+        context = super().get_context_data(**kwargs)
+        dodavatel_id = self.kwargs.get('dodavatel')
+        skladova_polozka = get_object_or_404(Sklad, pk=self.kwargs.get('pk'))
+        context['skladova_polozka'] = skladova_polozka
+        logger.debug(f"Přidána skladová položka do kontextu: ID {self.kwargs['pk']}")        
+        if dodavatel_id:
+            dodavatel_object = Dodavatele.objects.get(id=dodavatel_id)
+            context['dodavatel'] = dodavatel_object
+            context['dodavatel_id'] = dodavatel_id  # Dodání ID do kontextu
+            logger.debug(f"Přidán dodavatel do kontextu: ID {dodavatel_id}")
+        return context
+
+    def form_valid(self, form):
+        skladova_polozka = get_object_or_404(Sklad, pk=self.kwargs['pk'])
+        form.instance.sklad = skladova_polozka
+
+        if Varianty.objects.filter(sklad=skladova_polozka, dodavatel=form.instance.dodavatel).exists():
+            logger.warning(
+                f"{self.request.user} se pokusil vytvořit duplicitní variantu "
+                f"pro sklad {skladova_polozka.pk} a dodavatele {form.instance.dodavatel}"
+            )
+            form.add_error('dodavatel', 'Varianta se stejným dodavatelem již existuje.')
+            return self.form_invalid(form)
+
+        logger.info(
+            f"{self.request.user} vytvořil novou variantu pro skladovou položku {skladova_polozka.pk} "
+            f"a dodavatele {form.instance.dodavatel}"
+        )
+        return super().form_valid(form)
+
+    
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro vytvoření nové varianty.")
+        logger.debug(f"Formulářové chyby: {form.errors}")
+        return super().form_invalid(form)
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} k vytvoření nové varianty')
+        return super().handle_no_permission()      
+
+
+class VariantyUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
+    """
+    Aktualizuje existující variantu skladové položky.
+
+    - Povoleno pouze uživatelům s oprávněním 'change_varianty'.
+
+    Template:
+    - `update_varianty.html`
+
+    Po úspěšné aktualizaci:
+    - Přesměruje uživatele zpět na seznam skladů.
+    """
+    model = Varianty
+    form_class = VariantyUpdateForm
+    template_name = 'hpm_sklad/update_varianty.html'
+    success_url = reverse_lazy('sklad')
+    permission_required = 'hpm_sklad.change_varianty'
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává skladovou položku do kontextu šablony.
+        """
+        context = super().get_context_data(**kwargs)
+        varianta = self.get_object()
+        context['skladova_polozka'] = varianta.sklad
+        logger.debug(f"Přidána skladová položka do kontextu: ID {varianta.sklad.pk}")
+        return context
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro úpravu varianty #{kwargs.get('pk')}")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST pro úpravu varianty #{kwargs.get('pk')}")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při zpracování POST požadavku: {e}")
+            raise    
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} ke stránce pro úpravu varianty #{self.kwargs.get("pk")}')
+        return super().handle_no_permission()
+    
+    def form_valid(self, form):
+        varianta = form.save(commit=False)
+        logger.info(f"{self.request.user} odeslal platný formulář a uložil změny pro variantu: {varianta}")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro úpravu varianty #{self.get_object().pk}")
+        logger.debug(f"Form errors: {form.errors}")
+        return super().form_invalid(form)    
+
+
+class DodavateleListView(LoginRequiredMixin, DetailPanelMixin, ListView):
+    """
+    Zobrazuje seznam dodavatelů.
+
+    Template:
+    - `dodavatele.html`
+
+    Kontext:
+    - Seznam dodavatelů a možnosti filtrování.
+    """
+    model = Dodavatele
+    detail_panel_url_name = 'fragment_dodavatele'
+    template_name = 'hpm_sklad/dodavatele.html'
+    paginate_by = 24
+    export_csv = False
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává další data do kontextu pro zobrazení v šabloně.
+
+        Vrací:
+        - Kontext obsahující filtry, řazení a aktuálně vybraného dodavatele.
+        """
+        context = super().get_context_data(**kwargs)
+        selected_id = self.request.GET.get('selected', None)
+
+        if selected_id:
+            context['selected_item'] = get_object_or_404(Dodavatele, id=selected_id)
+        else:
+            context['selected_item'] = None
+
+        context.update({
+            'db_table': 'dodavatele',
+            'sort': self.request.GET.get('sort', 'id'),
+            'order': self.request.GET.get('order', 'down'),
+            'query': self.request.GET.get('query', ''),
+        })
+
+        return context
+
+    def get_queryset(self):
+        """
+        Získává seznam dodavatelů na základě vyhledávání a filtrování.
+
+        Vrací:
+        - queryset: Filtrovaný a seřazený seznam dodavatelů.
+        """
+        queryset = Dodavatele.objects.all()
+        query = self.request.GET.get('query', '')
+        sort = self.request.GET.get('sort', 'id')
+        order = self.request.GET.get('order', 'down')
+
+        if query:
+            queryset = queryset.filter(
+                Q(dodavatel__icontains=query) | Q(kontakt__icontains=query)
+            )
+
+        if order == 'down':
+            sort = f"-{sort}"
+            
+        queryset = queryset.order_by(sort)
+
+        return queryset
+
+    def export_to_csv(self, queryset):
+        """
+        Exportuje seznam dodavatelů do CSV.
+
+        Vrací:
+        - HttpResponse s CSV souborem.
+        """
+        logger.info(f"{self.request.user} spustil export dodavatelů do CSV.")
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="dodavatele_export.csv"'
+
+        writer = csv.writer(response)
+        writer.writerow([
+            'ID', 'Dodavatel', 'Kontaktní osoba', 'E-mail', 'Telefon', 'Jazyk', 
+        ])
+
+        for item in queryset:
+            writer.writerow([
+                item.id, 
+                item.dodavatel, 
+                item.kontakt, 
+                item.email, 
+                item.telefon, 
+                item.jazyk, 
+            ])         
+
+        logger.info(f"Export dodavatelů do CSV připraven. Počet položek: {queryset.count()}")
+        return response
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Určuje, zda vrátit CSV nebo HTML stránku, na základě parametrů.
+
+        Vrací:
+        - HttpResponse s HTML nebo CSV obsahem.
+        """
+        if getattr(self, 'export_csv', False):
+            return self.export_to_csv(self.get_queryset())
+        else:
+            return super().render_to_response(context, **response_kwargs)
+
+
+class DodavateleCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
+    """
+    Vytváří nového dodavatele.
+
+    - Povoleno pouze uživatelům s oprávněním 'add_dodavatele'.
+
+    Template:
+    - `create_dodavatele.html`
+
+    Po úspěšném vytvoření:
+    - Přesměruje uživatele zpět na seznam dodavatelů.
+    """
+    model = Dodavatele
+    form_class = DodavateleCreateForm
+    template_name = 'hpm_sklad/create_dodavatele.html'
+    success_url = reverse_lazy('dodavatele')
+    permission_required = 'hpm_sklad.add_dodavatele'
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro vytvoření nového dodavatele")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST požadavek pro vytvoření nového dodavatele")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při vytváření nového dodavatele: {e}")
+            raise
+
+    def form_valid(self, form):
+        self.object = form.save()
+        logger.info(f"{self.request.user} vytvořil nového dodavatele: {self.object}")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro vytvoření dodavatele.")
+        logger.debug(f"Formulářové chyby: {form.errors}")
+        return super().form_invalid(form)
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} k vytvoření dodavatele')
+        return super().handle_no_permission()  
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        selected_id = self.request.GET.get('pk', None)
+        if selected_id:
+            context['dodavatel'] = get_object_or_404(Dodavatele, id=selected_id)
+            logger.debug(f"Přidán dodavatel do kontextu: ID {selected_id}")
+        return context       
+
+
+class DodavateleUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
+    """
+    Aktualizuje existujícího dodavatele.
+
+    - Povoleno pouze uživatelům s oprávněním 'change_dodavatele'.
+
+    Template:
+    - `update_dodavatele.html`
+
+    Po úspěšné aktualizaci:
+    - Přesměruje uživatele zpět na seznam dodavatelů.
+    """
+    model = Dodavatele
+    form_class = DodavateleUpdateForm    
+    template_name = 'hpm_sklad/update_dodavatele.html'
+    permission_required = 'hpm_sklad.change_dodavatele'
+    success_url = reverse_lazy('dodavatele')
+
+    def get(self, request, *args, **kwargs):
+        logger.info(f"{request.user} otevřel formulář pro úpravu dodavatele #{kwargs.get('pk')}")
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        logger.info(f"{request.user} odeslal POST pro úpravu dodavatele #{kwargs.get('pk')}")
+        try:
+            return super().post(request, *args, **kwargs)
+        except Exception as e:
+            logger.exception(f"Chyba při zpracování POST požadavku: {e}")
+            raise    
+
+    def handle_no_permission(self):
+        logger.warning(f'Neoprávněný přístup uživatele {self.request.user} ke stránce pro úpravu dodavatele')
+        return super().handle_no_permission()
+    
+    def form_valid(self, form):
+        dodavatel = form.save(commit=False)
+        logger.info(f"{self.request.user} odeslal platný formulář a uložil změny pro dodavatele: {dodavatel}")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"{self.request.user} odeslal neplatný formulář pro úpravu dodavatele #{self.get_object().pk}")
+        logger.debug(f"Form errors: {form.errors}")
+        return super().form_invalid(form)
+    
+class DodavateleDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+    """
+    Maže existujícího dodavatele.
+
+    - Povoleno pouze uživatelům s oprávněním 'delete_dodavatele'.
+
+    Template:
+    - `delete_dodavatele.html`
+
+    Po úspěšném smazání:
+    - Přesměruje uživatele zpět na seznam dodavatelů.
+    """
+    model = Dodavatele
+    template_name = 'hpm_sklad/delete_dodavatele.html'
+    success_url = reverse_lazy('dodavatele')
+    permission_required = 'hpm_sklad.delete_dodavatele'        
+
+    def delete(self, request, *args, **kwargs):
+        obj = self.get_object()
+        logger.warning(f"{request.user} SMAZAL dodavatele: ID #{obj.pk}, {obj.dodavatel}")
+        return super().delete(request, *args, **kwargs)
+
+    def handle_no_permission(self):
+        logger.warning(f'Uživatel {self.request.user} se pokusil smazat dodavatele bez oprávnění.')
+        return super().handle_no_permission()   
+
+
+class DodavateleDetailView(LoginRequiredMixin, DetailSchemaMixin, DetailView):
+    """
+    Zobrazuje detailní informace o dodavateli.
+
+    Template:
+    - `hpm_sklad/detail_dodavatele.html`.
+
+    Kontext:
+    - Zahrnuje detaily dodavatele, varianty a poptávky spojené s dodavatelem.
+    """
+    model = Dodavatele
+    template_name = 'hpm_sklad/detail_dodavatele.html'    
+    
+
+    def get_context_data(self, **kwargs):
+        """
+        Přidává detaily dodavatele a jeho varianty a poptávky do kontextu šablony.
+
+        Vrací:
+        - Kontext obsahující detailní položky dodavatele, varianty a poptávky.
+        """
+        context = super().get_context_data(**kwargs)
+        varianty = self.object.varianty_dodavatele.all()
+        poptavky = self.object.poptavky_dodavatele.all()
+
+        context['varianty'] = varianty      
+        context['poptavky'] = poptavky
+        return context
+
+
+class DodavateleFragmentView(DetailFragmentMixin, DodavateleDetailView):
+    """
+    Fragment detailu dodavatele pro pravý panel seznamu dodavatelů.
+    """
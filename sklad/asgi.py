@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+
+The stock change event stream (/sklad/events/) is an async streaming view and
+needs to be served through this application by an ASGI server, e.g.
+`uvicorn sklad.asgi:application`.
 """
 
 import os
@@ -43,7 +43,6 @@ LOGOUT_REDIRECT_URL = 'home'
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
-    'django_user_agents',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
@@ -51,6 +50,7 @@ INSTALLED_APPS = [
     'django_filters',
     'django_extensions',
     'graphene_django',
+    'django_htmx',
     'corsheaders',
     'crispy_forms',
     'crispy_bootstrap4',
@@ -71,7 +71,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django_user_agents.middleware.UserAgentMiddleware',
+    'django_htmx.middleware.HtmxMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'simple_history.middleware.HistoryRequestMiddleware',
 ]
@@ -91,6 +91,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'hpm_sklad.devices.device_context',
             ],
         },
     },
@@ -116,6 +117,17 @@ DATABASES = {
     }
 }
 
+# Cache
+# Sdílená mezi všemi workery (Gunicorn), verze fragmentů detailu musí vidět všechny procesy.
+# Tabulku vytvoří `python manage.py createcachetable`.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'hpm_sklad_cache',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators